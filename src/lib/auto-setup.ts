@@ -2,6 +2,8 @@ import { spawn } from 'child_process';
 import { promises as fs } from 'fs';
 import path from 'path';
 import os from 'os';
+import { ConfigManager } from './config.js';
+import { environmentFingerprint } from './environment-cache.js';
 
 export interface SetupStatus {
   isReady: boolean;
@@ -56,6 +58,32 @@ export class AutoSetup {
     return status;
   }
 
+  /**
+   * detectSetup() reusing the last ready result while Python and the relevant
+   * environment are unchanged (the server's startup path; --setup and --check
+   * always probe afresh). Only ready results are cached, so a broken setup is
+   * re-checked on every start until it is fixed.
+   */
+  static async detectSetupCached(): Promise<SetupStatus & { cached?: boolean }> {
+    const cache = ConfigManager.getInstance().getEnvironmentCache();
+    if (!cache) {
+      return this.detectSetup();
+    }
+    const envPython = process.env.PYTHON_EXECUTABLE;
+    const commands = envPython ? [envPython, ...this.PYTHON_COMMANDS] : this.PYTHON_COMMANDS;
+    const fingerprint = environmentFingerprint(commands);
+    const cached = await cache.get<SetupStatus>('setup', fingerprint);
+    if (cached?.isReady) {
+      return { ...cached, cached: true };
+    }
+
+    const status = await this.detectSetup();
+    if (status.isReady) {
+      await cache.set('setup', fingerprint, status);
+    }
+    return status;
+  }
+
   /**
    * Auto-detect Python installation and version
    */
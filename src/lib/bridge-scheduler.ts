@@ -0,0 +1,213 @@
+/**
+ * Admission control and priority queue for Python bridge requests
+ *
+ * Bounds how many requests are written to the bridge at once and how many may
+ * wait behind them. Interactive lookups are dispatched before appends, and
+ * appends before bulk builds; one in-flight slot is always kept free of bulk
+ * work. Requests whose deadline passes (or whose AbortSignal fires) while
+ * queued are rejected without ever reaching the bridge. Long-running jobs pass
+ * a `null` deadline.
+ */
+
+import { logger } from './logger.js';
+
+export type BridgePriority = 'interactive' | 'normal' | 'bulk';
+
+const PRIORITY_ORDER: BridgePriority[] = ['interactive', 'normal', 'bulk'];
+
+export interface BridgeSchedulerOptions {
+  maxInFlight: number;
+  maxQueued: number;
+}
+
+export const DEFAULT_BRIDGE_SCHEDULER_OPTIONS: BridgeSchedulerOptions = {
+  maxInFlight: 4,
+  maxQueued: 64
+};
+
+export class BridgeQueueFullError extends Error {
+  constructor(queued: number) {
+    super(`Bridge request queue is full (${queued} waiting); temporary resource constraint, try again shortly`);
+    this.name = 'BridgeQueueFullError';
+  }
+}
+
+interface QueuedRequest {
+  label: string;
+  priority: BridgePriority;
+  start: () => Promise<any>;
+  resolve: (value: any) => void;
+  reject: (error: Error) => void;
+  expiryTimer: NodeJS.Timeout | null;
+  signal: AbortSignal | undefined;
+  onAbort: () => void;
+}
+
+export interface BridgeSchedulerStats {
+  inFlight: number;
+  maxInFlight: number;
+  maxQueued: number;
+  queued: Record<BridgePriority, number>;
+  dispatched: number;
+  rejected: number;
+  expired: number;
+}
+
+export class BridgeRequestScheduler {
+  private lanes: Record<BridgePriority, QueuedRequest[]> = { interactive: [], normal: [], bulk: [] };
+  private inFlight = 0;
+  private bulkInFlight = 0;
+  private dispatched = 0;
+  private rejected = 0;
+  private expired = 0;
+  private options: BridgeSchedulerOptions;
+
+  constructor(options: Partial<BridgeSchedulerOptions> = {}) {
+    this.options = { ...DEFAULT_BRIDGE_SCHEDULER_OPTIONS, ...options };
+  }
+
+  /**
+   * Queue `start` to run once a slot is free; rejects immediately when the queue is full
+   */
+  schedule<T>(
+    label: string,
+    priority: BridgePriority,
+    deadline: number | null,
+    start: () => Promise<T>,
+    signal?: AbortSignal
+  ): Promise<T> {
+    const queued = this.queuedCount();
+    if (queued >= this.options.maxQueued) {
+      this.rejected++;
+      return Promise.reject(new BridgeQueueFullError(queued));
+    }
+    if (signal?.aborted) {
+      return Promise.reject(new Error(`Request cancelled: ${label}`));
+    }
+
+    return new Promise<T>((resolve, reject) => {
+      const entry: QueuedRequest = {
+        label,
+        priority,
+        start,
+        resolve,
+        reject,
+        expiryTimer: null,
+        signal,
+        onAbort: () => {
+          if (this.remove(entry)) {
+            entry.reject(new Error(`Request cancelled: ${label} (while queued)`));
+          }
+        }
+      };
+      if (deadline !== null) {
+        entry.expiryTimer = setTimeout(() => this.expire(entry), Math.max(0, deadline - Date.now()));
+      }
+      signal?.addEventListener('abort', entry.onAbort, { once: true });
+      this.lanes[priority].push(entry);
+      this.pump();
+    });
+  }
+
+  private remove(entry: QueuedRequest): boolean {
+    const lane = this.lanes[entry.priority];
+    const index = lane.indexOf(entry);
+    if (index === -1) {
+      return false;
+    }
+    lane.splice(index, 1);
+    this.release(entry);
+    return true;
+  }
+
+  private release(entry: QueuedRequest): void {
+    if (entry.expiryTimer) {
+      clearTimeout(entry.expiryTimer);
+    }
+    entry.signal?.removeEventListener('abort', entry.onAbort);
+  }
+
+  private expire(entry: QueuedRequest): void {
+    if (!this.remove(entry)) {
+      return;
+    }
+    this.expired++;
+    logger.warn(`Bridge request ${entry.label} expired after waiting in the queue`);
+    entry.reject(new Error(`Request timeout: ${entry.label} (expired while queued)`));
+  }
+
+  private next(): QueuedRequest | undefined {
+    for (const priority of PRIORITY_ORDER) {
+      const lane = this.lanes[priority];
+      if (lane.length === 0) {
+        continue;
+      }
+      // Keep one slot for interactive/normal work whenever there is more than one
+      if (priority === 'bulk' && this.bulkInFlight >= Math.max(1, this.options.maxInFlight - 1)) {
+        continue;
+      }
+      return lane.shift();
+    }
+    return undefined;
+  }
+
+  private pump(): void {
+    while (this.inFlight < this.options.maxInFlight) {
+      const entry = this.next();
+      if (!entry) {
+        return;
+      }
+      this.release(entry);
+
+      this.inFlight++;
+      this.dispatched++;
+      const isBulk = entry.priority === 'bulk';
+      if (isBulk) {
+        this.bulkInFlight++;
+      }
+
+      Promise.resolve()
+        .then(entry.start)
+        .then(entry.resolve, entry.reject)
+        .finally(() => {
+          this.inFlight--;
+          if (isBulk) {
+            this.bulkInFlight--;
+          }
+          this.pump();
+        });
+    }
+  }
+
+  private queuedCount(): number {
+    return PRIORITY_ORDER.reduce((total, priority) => total + this.lanes[priority].length, 0);
+  }
+
+  /**
+   * Reject everything still queued (bridge shutting down)
+   */
+  drain(reason: string): void {
+    for (const priority of PRIORITY_ORDER) {
+      for (const entry of this.lanes[priority].splice(0)) {
+        this.release(entry);
+        entry.reject(new Error(reason));
+      }
+    }
+  }
+
+  getStats(): BridgeSchedulerStats {
+    return {
+      inFlight: this.inFlight,
+      maxInFlight: this.options.maxInFlight,
+      maxQueued: this.options.maxQueued,
+      queued: {
+        interactive: this.lanes.interactive.length,
+        normal: this.lanes.normal.length,
+        bulk: this.lanes.bulk.length
+      },
+      dispatched: this.dispatched,
+      rejected: this.rejected,
+      expired: this.expired
+    };
+  }
+}
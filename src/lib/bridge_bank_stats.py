@@ -0,0 +1,92 @@
+"""
+Header-only statistics for MemVid banks.
+
+``list_memory_banks`` with ``include_stats`` asks for every bank at once, so
+stats must never load a bank: the chunk count, vector dimension and index type
+come from the first few bytes of the ``.faiss`` file (FAISS writes a fourcc and
+a fixed index header before any vectors), the embedding model from the
+``.chunks`` store header, and sizes from ``stat``. Nothing here imports faiss
+or numpy.
+"""
+
+import glob
+import os
+import struct
+from typing import Any, Dict, Optional
+
+# fourcc -> index type for the indexes memvid builds (and a few common others)
+FAISS_INDEX_TYPES = {
+    b'IxFI': 'IndexFlatIP',
+    b'IxF2': 'IndexFlatL2',
+    b'IxFl': 'IndexFlat',
+    b'IxMp': 'IndexIDMap',
+    b'IxM2': 'IndexIDMap2',
+    b'IwFl': 'IndexIVFFlat',
+    b'IwPQ': 'IndexIVFPQ',
+    b'IwSq': 'IndexIVFScalarQuantizer',
+    b'IxPQ': 'IndexPQ',
+    b'IxSQ': 'IndexScalarQuantizer',
+    b'IHNf': 'IndexHNSWFlat',
+    b'IHNp': 'IndexHNSWPQ',
+}
+_WRAPPERS = (b'IxMp', b'IxM2')
+# d (int32), ntotal (int64), two dummy int64s, is_trained (uint8), metric_type (int32)
+_INDEX_HEADER = struct.Struct('<iqqqBi')
+_METRICS = {0: 'inner_product', 1: 'l2'}
+
+
+def read_faiss_header(path: str) -> Optional[Dict[str, Any]]:
+    """Index type, dimension, vector count and metric from a ``.faiss`` file's header.
+
+    ID-map wrappers are reported together with the index they wrap, e.g.
+    ``IndexIDMap(IndexFlatL2)``. Returns None for missing or unreadable files.
+    """
+    try:
+        with open(path, 'rb') as f:
+            fourcc = f.read(4)
+            header = f.read(_INDEX_HEADER.size)
+            if len(fourcc) < 4 or len(header) < _INDEX_HEADER.size:
+                return None
+            dimension, ntotal, _, _, _, metric = _INDEX_HEADER.unpack(header)
+            index_type = FAISS_INDEX_TYPES.get(fourcc, fourcc.decode('ascii', 'replace'))
+            if fourcc in _WRAPPERS:
+                if metric > 1:
+                    f.read(4)  # metric_arg
+                inner = f.read(4)
+                index_type = f"{index_type}({FAISS_INDEX_TYPES.get(inner, inner.decode('ascii', 'replace'))})"
+    except OSError:
+        return None
+    return {
+        'index_type': index_type,
+        'dimension': dimension,
+        'vectors': ntotal,
+        'metric': _METRICS.get(metric, str(metric)),
+    }
+
+
+def bank_files(index_base: str) -> Dict[str, int]:
+    """Bytes on disk per file suffix for one bank base (video, indexes, sidecars)."""
+    files = {}
+    prefix_len = len(index_base)
+    for path in glob.glob(f"{glob.escape(index_base)}.*"):
+        if os.path.isfile(path) and not path.endswith(('.tmp', '.current')):
+            files[path[prefix_len:]] = os.path.getsize(path)
+    return files
+
+
+def memory_footprint(files: Dict[str, int], load_mode: Optional[str], mapped_store: bool) -> Dict[str, int]:
+    """Estimated memory held by an open bank, split into private and shared (mapped) bytes.
+
+    A mapped FAISS index and chunk store live in the page cache and are shared
+    between bridge processes; an index read into memory is private, and memvid's
+    own retriever also keeps the parsed ``.json`` index (counted at file size,
+    a lower bound).
+    """
+    if load_mode is None:
+        return {'private_bytes': 0, 'mapped_bytes': 0}
+    index_bytes = files.get('.faiss', 0)
+    store_bytes = files.get('.chunks', 0) if mapped_store else 0
+    if load_mode == 'mmap':
+        return {'private_bytes': 0, 'mapped_bytes': index_bytes + store_bytes}
+    private = index_bytes + (0 if mapped_store else files.get('.json', 0))
+    return {'private_bytes': private, 'mapped_bytes': store_bytes}
@@ -0,0 +1,135 @@
+"""
+Per-chunk metadata sidecar and search filters for MemVid banks.
+
+``<bank>.meta.json`` holds one entry per chunk id (source path, file type,
+timestamp, length, file size and any caller-supplied labels) so the bridge can
+evaluate ``search_memory`` filters during retrieval instead of the server
+discarding hits after only ``top_k`` were fetched.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+METADATA_SUFFIX = '.meta.json'
+METADATA_VERSION = 1
+
+
+def chunk_metadata_path(index_base: str) -> str:
+    """Path of the chunk metadata sidecar for an index base path (no extension)."""
+    return f"{index_base}{METADATA_SUFFIX}"
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def now_iso() -> str:
+    return datetime.now(tz=timezone.utc).isoformat()
+
+
+def file_type_of(source: Optional[str]) -> Optional[str]:
+    """Lower-case extension without the dot, as used by the ``file_types`` filter."""
+    if not source:
+        return None
+    ext = os.path.splitext(source.split('?', 1)[0])[1]
+    return ext[1:].lower() if ext else None
+
+
+def describe_file(path: str, label: Optional[str] = None) -> Dict[str, Any]:
+    """Metadata for a chunk read from a local file."""
+    meta: Dict[str, Any] = {'source': label or path, 'file_type': file_type_of(path)}
+    try:
+        stat = os.stat(path)
+        meta['timestamp'] = _iso(stat.st_mtime)
+        meta['file_size'] = stat.st_size
+    except OSError:
+        meta['timestamp'] = now_iso()
+    return meta
+
+
+def describe_text(source: Optional[str] = None, **labels) -> Dict[str, Any]:
+    """Metadata for inline text, URLs and appended content."""
+    meta: Dict[str, Any] = {'source': source, 'file_type': file_type_of(source), 'timestamp': now_iso()}
+    for key, value in labels.items():
+        if value is not None:
+            meta[key] = value
+    return meta
+
+
+def write_chunk_metadata(index_base: str, entries: List[Dict[str, Any]]) -> None:
+    """Atomically write the sidecar; ``entries[i]`` describes chunk id ``i``."""
+    path = chunk_metadata_path(index_base)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': METADATA_VERSION, 'chunks': entries}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def read_chunk_metadata(index_base: str) -> List[Dict[str, Any]]:
+    """Read the sidecar, or an empty list for banks built before it existed."""
+    try:
+        with open(chunk_metadata_path(index_base), 'r', encoding='utf-8') as f:
+            return json.load(f).get('chunks', [])
+    except FileNotFoundError:
+        return []
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class ChunkFilter:
+    """Compiled ``search_memory`` filters (bank-level ``tags`` are handled by the server)."""
+
+    def __init__(self, filters: Optional[Dict[str, Any]] = None):
+        filters = filters or {}
+        self.file_types = {ft.lower().lstrip('.') for ft in filters.get('file_types') or []}
+        date_range = filters.get('date_range') or {}
+        self.date_start = _parse_date(date_range['start']) if date_range.get('start') else None
+        self.date_end = _parse_date(date_range['end']) if date_range.get('end') else None
+        length = filters.get('content_length') or {}
+        self.min_length = length.get('min')
+        self.max_length = length.get('max')
+        self.min_file_size = filters.get('min_file_size')
+        self.max_file_size = filters.get('max_file_size')
+
+    @property
+    def active(self) -> bool:
+        return bool(self.file_types or self.date_start or self.date_end or self.min_length
+                    or self.max_length or self.min_file_size or self.max_file_size)
+
+    def matches(self, meta: Dict[str, Any]) -> bool:
+        if self.file_types and meta.get('file_type') not in self.file_types:
+            return False
+
+        # Chunks without a timestamp are not excluded by a date range; compacted
+        # chunks span first_timestamp..timestamp and match when that overlaps it
+        timestamp = _parse_date(meta['timestamp']) if meta.get('timestamp') else None
+        if timestamp is not None:
+            first = _parse_date(meta['first_timestamp']) if meta.get('first_timestamp') else None
+            if self.date_start and timestamp < self.date_start:
+                return False
+            if self.date_end and (first or timestamp) > self.date_end:
+                return False
+
+        length = meta.get('length')
+        if length is not None:
+            if self.min_length and length < self.min_length:
+                return False
+            if self.max_length and length > self.max_length:
+                return False
+
+        file_size = meta.get('file_size')
+        if file_size is not None:
+            if self.min_file_size and file_size < self.min_file_size:
+                return False
+            if self.max_file_size and file_size > self.max_file_size:
+                return False
+
+        return True
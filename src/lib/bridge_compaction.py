@@ -0,0 +1,119 @@
+"""
+Compaction planning for MemVid banks that have accumulated many small appends.
+
+Every ``add_to_memory`` call is chunked as a document of its own, so a bank fed
+by agent sessions fills up with short, fragmented chunks. Compaction walks the
+bank in chunk order, treats adjacent chunks with identical metadata as one
+piece (one original document), merges runs of adjacent small pieces into one
+document to be re-chunked at the bank's chunk size, keeps every other chunk
+exactly as it is, and finally drops exact-duplicate chunks by content hash.
+A run only spans pieces whose metadata agrees on everything but the time, so
+search filters see the same source, type, size and labels after compaction;
+the merged chunk records the span of its pieces' timestamps.
+The bridge builds the result as a new bank generation, so searches keep
+running on the current one until the swap.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Sequence, Tuple
+
+from bridge_bank_stats import bank_files
+
+TIME_FIELDS = ('timestamp', 'first_timestamp', 'compacted_from')  # combined when pieces merge
+SMALL_PIECE_FRACTION = 0.5  # a single-chunk piece shorter than half a chunk counts as a small append
+MIN_RUN = 2  # small pieces merged only when at least this many are adjacent
+
+
+def split_pieces(texts: Sequence[str], metas: Sequence[Dict[str, Any]]) -> List[Tuple[List[str], Dict[str, Any]]]:
+    """Group adjacent chunks that share identical metadata into ``(chunk texts, metadata)`` pieces."""
+    pieces: List[Tuple[List[str], Dict[str, Any]]] = []
+    for i, text in enumerate(texts):
+        meta = dict(metas[i]) if i < len(metas) else {}
+        # length/frame differ per chunk and are recomputed on rebuild
+        meta.pop('length', None)
+        meta.pop('frame', None)
+        if pieces and pieces[-1][1] == meta:
+            pieces[-1][0].append(text)
+        else:
+            pieces.append(([text], meta))
+    return pieces
+
+
+def run_key(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """The metadata pieces must share to be merged: everything but the time fields."""
+    return {key: value for key, value in meta.items() if key not in TIME_FIELDS}
+
+
+def merged_metadata(metas: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Metadata for a merged run of pieces with the same ``run_key``.
+
+    ``timestamp`` is the newest piece's and ``first_timestamp`` the oldest's, so
+    a date range filter still matches the chunk when any of its notes is in range.
+    """
+    merged = run_key(metas[0])
+    timestamps = [m['timestamp'] for m in metas if m.get('timestamp')]
+    firsts = [m.get('first_timestamp') or m['timestamp'] for m in metas if m.get('timestamp')]
+    if timestamps:
+        merged['timestamp'] = max(timestamps)
+        if min(firsts) != merged['timestamp']:
+            merged['first_timestamp'] = min(firsts)
+    merged['compacted_from'] = sum(m.get('compacted_from', 1) for m in metas)
+    return merged
+
+
+def plan_compaction(texts: Sequence[str], metas: Sequence[Dict[str, Any]],
+                    chunk_size: int) -> Tuple[List[Tuple[str, Any, Dict[str, Any]]], int]:
+    """Return ``(segments, appends merged)``.
+
+    Segments come in bank order: ``('keep', [chunk texts], meta)`` for chunks
+    carried over unchanged and ``('merge', text, meta)`` for a run of small
+    appends to re-chunk as one document.
+    """
+    segments: List[Tuple[str, Any, Dict[str, Any]]] = []
+    run: List[Tuple[List[str], Dict[str, Any]]] = []
+    merged = 0
+
+    def flush():
+        nonlocal merged
+        if len(run) >= MIN_RUN:
+            segments.append(('merge', '\n\n'.join(piece[0][0] for piece in run),
+                             merged_metadata([piece[1] for piece in run])))
+            merged += len(run)
+        else:
+            segments.extend(('keep', chunks, meta) for chunks, meta in run)
+        run.clear()
+
+    for chunks, meta in split_pieces(texts, metas):
+        if len(chunks) == 1 and len(chunks[0]) < chunk_size * SMALL_PIECE_FRACTION:
+            if run and run_key(run[0][1]) != run_key(meta):
+                flush()
+            run.append((chunks, meta))
+            continue
+        flush()
+        segments.append(('keep', chunks, meta))
+    flush()
+    return segments, merged
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+
+def dedupe_chunks(chunks: Sequence[str], metas: Sequence[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]], int]:
+    """Drop later exact duplicates (same stripped text); returns kept chunks, their metadata and the count removed."""
+    seen = set()
+    kept_chunks: List[str] = []
+    kept_metas: List[Dict[str, Any]] = []
+    for i, chunk in enumerate(chunks):
+        digest = chunk_hash(chunk)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        kept_chunks.append(chunk)
+        kept_metas.append(metas[i] if i < len(metas) else {})
+    return kept_chunks, kept_metas, len(chunks) - len(kept_chunks)
+
+
+def bank_bytes(index_base: str) -> int:
+    """Bytes on disk of the files written for one bank base (video, indexes, sidecars)."""
+    return sum(bank_files(index_base).values())
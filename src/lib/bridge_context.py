@@ -0,0 +1,248 @@
+"""
+Context assembly for ``get_context``: one bridge call per agent turn.
+
+``get_context`` used to run a full search with a top_k guessed from the token
+budget, estimate tokens as characters / 4 and concatenate the hits, so it
+under- or over-filled the budget and agents retried with other limits. The
+bridge's ``assemble_context`` RPC searches every bank and these helpers turn
+the hits into the final text: each hit is widened with adjacent chunks of the
+same document (adjacent chunks with identical metadata, the rule compaction
+uses), overlapping spans are merged, text repeated by chunk overlap or across
+banks is dropped, and spans are packed best-first against the budget counted
+with a real tokenizer.
+"""
+
+import hashlib
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_SEPARATOR = '\n\n---\n\n'
+MIN_TAIL_TOKENS = 32  # a span is cut to fit the remaining budget only if at least this much is left
+MIN_OVERLAP_CHARS = 8
+MAX_OVERLAP_CHARS = 2048
+# Per-chunk fields that differ between chunks of one document
+_CHUNK_FIELDS = ('length', 'frame', 'chunk_id')
+
+ChunkLookup = Callable[[int], Optional[Tuple[str, Dict[str, Any]]]]
+
+
+class EstimateTokenizer:
+    """Fallback when no tokenizer is available: one token per symbol or run of up to 4 word characters."""
+
+    name = 'estimate'
+    _PIECE = re.compile(r'\w{1,4}|[^\w\s]')
+
+    def count(self, text: str) -> int:
+        return sum(1 for _ in self._PIECE.finditer(text))
+
+    def truncate(self, text: str, tokens: int) -> str:
+        end = 0
+        for used, match in enumerate(self._PIECE.finditer(text)):
+            if used >= tokens:
+                break
+            end = match.end()
+        return text[:end]
+
+
+class HuggingFaceTokenizer:
+    """The embedding model's own tokenizer (already in memory; never downloads anything)."""
+
+    def __init__(self, tokenizer, name: str):
+        self._tokenizer = tokenizer
+        self.name = f'model:{name}'
+
+    def count(self, text: str) -> int:
+        return len(self._tokenizer(text, add_special_tokens=False, verbose=False)['input_ids'])
+
+    def truncate(self, text: str, tokens: int) -> str:
+        if tokens <= 0:
+            return ''
+        try:
+            encoded = self._tokenizer(text, add_special_tokens=False, verbose=False, return_offsets_mapping=True)
+        except NotImplementedError:  # slow tokenizers have no offsets
+            ids = self._tokenizer(text, add_special_tokens=False, verbose=False)['input_ids']
+            return text if len(ids) <= tokens else self._tokenizer.decode(ids[:tokens])
+        if len(encoded['input_ids']) <= tokens:
+            return text
+        return text[:encoded['offset_mapping'][tokens - 1][1]]
+
+
+class TiktokenTokenizer:
+    """A tiktoken BPE encoding, for budgets counted the way OpenAI-style models count them."""
+
+    def __init__(self, encoding):
+        self._encoding = encoding
+        self.name = f'tiktoken:{encoding.name}'
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, tokens: int) -> str:
+        ids = self._encoding.encode(text, disallowed_special=())
+        return text if len(ids) <= tokens else self._encoding.decode(ids[:max(0, tokens)])
+
+
+def make_tokenizer(spec: Optional[str], embedding_model=None):
+    """Tokenizer for ``auto`` (the embedding model's, else the estimate), ``model``,
+    ``estimate`` or ``tiktoken[:<encoding>]`` (needs the optional tiktoken package)."""
+    spec = (spec or 'auto').strip()
+    if spec.startswith('tiktoken'):
+        try:
+            import tiktoken
+        except ImportError:
+            raise ValueError('tiktoken is not installed (pip install tiktoken)')
+        return TiktokenTokenizer(tiktoken.get_encoding(spec.partition(':')[2] or 'cl100k_base'))
+    if spec in ('auto', 'model'):
+        tokenizer = getattr(embedding_model, 'tokenizer', None)
+        if tokenizer is not None:
+            return HuggingFaceTokenizer(tokenizer, getattr(tokenizer, 'name_or_path', '') or 'embedding')
+        if spec == 'model':
+            raise ValueError('The embedding model has no tokenizer')
+        return EstimateTokenizer()
+    if spec == 'estimate':
+        return EstimateTokenizer()
+    raise ValueError(f"Unknown tokenizer: {spec}")
+
+
+def document_key(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata shared by every chunk of one document."""
+    return {key: value for key, value in meta.items() if key not in _CHUNK_FIELDS}
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha1(' '.join(text.split()).lower().encode('utf-8')).hexdigest()
+
+
+def dedupe_hits(hits: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop hits whose text repeats an earlier (better) hit, e.g. the same chunk in two banks."""
+    seen, kept = set(), []
+    for hit in hits:
+        fingerprint = _fingerprint(hit['content'])
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            kept.append(hit)
+    return kept
+
+
+def expand_hits(hits: Sequence[Dict[str, Any]], neighbors: int,
+                lookups: Dict[str, ChunkLookup]) -> List[Dict[str, Any]]:
+    """Widen each hit by up to ``neighbors`` chunks on each side and merge overlapping spans.
+
+    Hits are dicts with ``bank``, ``chunk_id``, ``score`` and ``metadata``;
+    ``lookups[bank](chunk_id)`` returns ``(text, metadata)`` or None. Neighbors
+    are only taken from the same document, so banks without chunk metadata are
+    never expanded. Spans come back best first as dicts with ``bank``,
+    ``start``/``end`` (inclusive chunk ids), ``score``, ``hits`` and ``metadata``.
+    """
+    spans: List[Dict[str, Any]] = []
+    for hit in hits:
+        key = document_key(hit['metadata'])
+        start = end = hit['chunk_id']
+        lookup = lookups[hit['bank']]
+        if key and neighbors > 0:
+            for direction in (-1, 1):
+                for step in range(1, neighbors + 1):
+                    neighbor = lookup(hit['chunk_id'] + direction * step)
+                    if neighbor is None or document_key(neighbor[1]) != key:
+                        break
+                    if direction < 0:
+                        start = hit['chunk_id'] - step
+                    else:
+                        end = hit['chunk_id'] + step
+        spans.append({'bank': hit['bank'], 'start': start, 'end': end, 'score': hit['score'],
+                      'hits': [hit['chunk_id']], 'metadata': dict(hit['metadata'], chunk_id=hit['chunk_id']),
+                      'key': key})
+
+    merged: List[Dict[str, Any]] = []
+    for span in sorted(spans, key=lambda s: (s['bank'], s['start'])):
+        last = merged[-1] if merged else None
+        if last and last['bank'] == span['bank'] and span['start'] <= last['end'] + 1 and \
+                last['key'] and last['key'] == span['key']:
+            last['end'] = max(last['end'], span['end'])
+            last['hits'].extend(span['hits'])
+            if span['score'] > last['score']:
+                last['score'], last['metadata'] = span['score'], span['metadata']
+        else:
+            merged.append(span)
+    for span in merged:
+        span.pop('key')
+        span['hits'].sort()
+    merged.sort(key=lambda s: s['score'], reverse=True)
+    return merged
+
+
+def overlap_length(previous: str, text: str) -> int:
+    """Length of the longest suffix of ``previous`` that ``text`` starts with (chunk overlap)."""
+    if len(text) < MIN_OVERLAP_CHARS:
+        return 0
+    probe = text[:MIN_OVERLAP_CHARS]
+    start = previous.find(probe, max(0, len(previous) - MAX_OVERLAP_CHARS))
+    while start != -1:
+        if text.startswith(previous[start:]):
+            return len(previous) - start
+        start = previous.find(probe, start + 1)
+    return 0
+
+
+def join_chunks(texts: Sequence[str]) -> str:
+    """Consecutive chunks of one document as one text, without the overlap between them."""
+    joined = ''
+    for text in texts:
+        if not joined:
+            joined = text
+        elif text in joined[-MAX_OVERLAP_CHARS:]:
+            continue
+        else:
+            cut = overlap_length(joined, text)
+            joined = joined + text[cut:] if cut else f"{joined} {text}"
+    return joined
+
+
+def pack_context(sections: Sequence[Dict[str, Any]], max_tokens: int, tokenizer,
+                 separator: str = DEFAULT_SEPARATOR) -> Tuple[str, List[Dict[str, Any]], int]:
+    """Pack ``{'header', 'text', ...}`` sections best-first into ``max_tokens``.
+
+    Sections that do not fit are skipped (a later, shorter one may), except
+    that one is cut to the remaining budget when at least ``MIN_TAIL_TOKENS``
+    are left. Returns ``(context, packed sections, tokens)``; every packed
+    section gains ``tokens`` and ``truncated``, and repeated texts are dropped.
+    """
+    separator_tokens = tokenizer.count(separator)
+    packed: List[Dict[str, Any]] = []
+    seen = set()
+    used = 0
+    for section in sections:
+        fingerprint = _fingerprint(section['text'])
+        if fingerprint in seen:
+            continue
+        gap = separator_tokens if packed else 0
+        header_tokens = tokenizer.count(section['header']) if section['header'] else 0
+        tokens = header_tokens + tokenizer.count(section['text'])
+        if used + gap + tokens <= max_tokens:
+            packed.append(dict(section, tokens=tokens, truncated=False))
+        else:
+            remaining = max_tokens - used - gap - header_tokens
+            if remaining < MIN_TAIL_TOKENS:
+                continue
+            text = tokenizer.truncate(section['text'], remaining)
+            tokens = header_tokens + tokenizer.count(text)
+            packed.append(dict(section, text=text, tokens=tokens, truncated=True))
+        seen.add(fingerprint)
+        used += gap + tokens
+
+    context = separator.join(f"{s['header']}{s['text']}" for s in packed)
+    total = tokenizer.count(context)
+    # Token counts are not exactly additive across joins; trim the last section if that tipped it over
+    while packed and total > max_tokens:
+        last = packed[-1]
+        keep = tokenizer.count(last['text']) - (total - max_tokens)
+        text = tokenizer.truncate(last['text'], keep) if keep >= MIN_TAIL_TOKENS else ''
+        if not text or text == last['text']:
+            packed.pop()
+        else:
+            packed[-1] = dict(last, text=text, truncated=True)
+        context = separator.join(f"{s['header']}{s['text']}" for s in packed)
+        total = tokenizer.count(context)
+    for section in packed:
+        section['tokens'] = tokenizer.count(f"{section['header']}{section['text']}")
+    return context, packed, total
@@ -0,0 +1,101 @@
+"""
+Out-of-band control channel for the bridge.
+
+Control requests (``ping``, ``metrics``, ``logs``, ``cancel``, the
+header-only bank ``stats`` and the cache-control ``memory`` request) used to share stdin and stdout with the data
+plane. They were answered inline, but still had to wait for the stdin reader
+and for the single stdout lock. Large search results and a steady stream of
+build progress events hold that lock, and a pipe the server is slow to drain
+stalls it. Health checks then timed out during long ``encode`` runs.
+
+The server now spawns the bridge with one more bidirectional pipe (a socketpair
+on POSIX) and passes its descriptor in ``MEMVID_CONTROL_FD``. A dedicated
+thread reads newline-delimited JSON requests from it and writes each response
+back on the same descriptor, so control latency does not depend on how much
+data-plane traffic is queued. In zygote mode the forked worker inherits the
+descriptor and serves it. Without the variable (e.g. on Windows, where the
+extra descriptor is not available to Python) control requests keep arriving
+on stdin.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CONTROL_FD_ENV = 'MEMVID_CONTROL_FD'
+
+# Requests answered by the control handler instead of the scheduler
+CONTROL_METHODS = frozenset({'ping', 'logs', 'metrics', 'cancel', 'memory', 'stats'})
+
+
+def control_fd() -> Optional[int]:
+    """The descriptor named by ``MEMVID_CONTROL_FD``, or None when unset, invalid or closed."""
+    value = os.environ.get(CONTROL_FD_ENV, '').strip()
+    if not value:
+        return None
+    try:
+        fd = int(value)
+        os.fstat(fd)
+    except (ValueError, OSError):
+        logger.warning(f"{CONTROL_FD_ENV}={value!r} is not an open descriptor; control requests use stdin")
+        return None
+    return fd
+
+
+class ControlChannel:
+    """Serves control requests from one descriptor on its own thread.
+
+    ``handle`` maps a request to its response message; it runs on the channel
+    thread, so it must only touch thread-safe state.
+    """
+
+    def __init__(self, fd: int, handle: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self._reader = os.fdopen(fd, 'rb', buffering=0)
+        self._writer = os.fdopen(os.dup(fd), 'wb', buffering=0)
+        self._handle = handle
+        self._thread: Optional[threading.Thread] = None
+        self.served = 0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._serve, name='bridge-control', daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _serve(self) -> None:
+        buffer = b''
+        try:
+            while True:
+                data = self._reader.read(65536)
+                if not data:
+                    break
+                buffer += data
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    if line.strip():
+                        self._answer(line)
+        except OSError as e:
+            logger.warning(f"Control channel closed: {e}")
+        finally:
+            for stream in (self._reader, self._writer):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+
+    def _answer(self, line: bytes) -> None:
+        request: Dict[str, Any] = {}
+        try:
+            request = json.loads(line)
+            response = self._handle(request)
+        except Exception as e:
+            logger.error(f"Control request failed: {e}")
+            response = {'id': request.get('id'), 'error': {'message': str(e), 'type': type(e).__name__}}
+        self._writer.write((json.dumps(response) + '\n').encode('utf-8'))
+        self.served += 1
@@ -0,0 +1,228 @@
+"""
+Embedding stage for MemVid bank builds.
+
+memvid embeds every chunk with whatever batch size and torch thread counts the
+libraries default to. During ``build_video`` the bridge instead runs chunks
+through an ``EmbeddingStage``: chunks are sorted into length buckets so each
+batch pads to similar lengths, the batch size adapts to the throughput and
+memory growth observed so far, and torch's intra-op/inter-op thread pools are
+configured explicitly once per process. The vectors are handed back to memvid
+through ``PrecomputedEmbeddings`` so the index it writes is unchanged.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 32
+MIN_BATCH_SIZE = 4
+MAX_BATCH_SIZE = 512
+DEFAULT_BATCH_CHARS = 64 * 1024  # padded characters per batch (batch size x longest chunk)
+DEFAULT_MEMORY_MB = 1024  # RSS growth allowed during one stage before batches shrink
+THROUGHPUT_TOLERANCE = 0.05
+
+_threads_lock = threading.Lock()
+_thread_config: Optional[Dict[str, int]] = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def usable_cpus() -> int:
+    """CPUs this process may run on (respects affinity masks and cgroup pinning)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def configure_torch_threads() -> Dict[str, int]:
+    """Set torch's intra-op and inter-op thread counts once per process.
+
+    ``MEMVID_TORCH_THREADS`` (default: ``OMP_NUM_THREADS`` or every usable CPU)
+    sizes the intra-op pool that parallelizes each matmul; ``MEMVID_TORCH_INTEROP_THREADS``
+    (default 1) sizes the pool for independent ops, which encoder inference barely uses.
+    """
+    global _thread_config
+    with _threads_lock:
+        if _thread_config is not None:
+            return _thread_config
+
+        intra = _env_int('MEMVID_TORCH_THREADS', _env_int('OMP_NUM_THREADS', usable_cpus()))
+        inter = _env_int('MEMVID_TORCH_INTEROP_THREADS', 1)
+        try:
+            import torch
+            torch.set_num_threads(intra)
+            try:
+                # Only allowed before torch starts any inter-op work
+                torch.set_num_interop_threads(inter)
+            except RuntimeError as e:
+                logger.warning(f"Could not set torch inter-op threads: {e}")
+            intra, inter = torch.get_num_threads(), torch.get_num_interop_threads()
+        except ImportError:
+            pass
+        _thread_config = {'intra_op_threads': intra, 'inter_op_threads': inter}
+        logger.info(f"Torch threads: {intra} intra-op, {inter} inter-op ({usable_cpus()} usable CPUs)")
+        return _thread_config
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size in MB, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class AdaptiveBatchSize:
+    """Hill-climbs the batch size on observed throughput (chars/sec).
+
+    The size doubles while throughput keeps improving, steps back and settles once
+    it drops, and halves whenever memory grows past the stage's budget.
+    """
+
+    def __init__(self, initial: int = DEFAULT_BATCH_SIZE, minimum: int = MIN_BATCH_SIZE,
+                 maximum: int = MAX_BATCH_SIZE):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.size = min(self.maximum, max(minimum, initial))
+        self._direction = 1
+        self._settled = False
+        self._warmed_up = False
+        self._last_throughput: Optional[float] = None
+
+    def observe(self, chars: int, seconds: float, over_memory: bool = False) -> int:
+        if over_memory:
+            self.size = max(self.minimum, self.size // 2)
+            self._settled = True
+            self._last_throughput = None
+            return self.size
+        if seconds <= 0 or self._settled:
+            return self.size
+        if not self._warmed_up:
+            # The first batch pays for lazy initialization; don't judge throughput on it
+            self._warmed_up = True
+            return self.size
+
+        throughput = chars / seconds
+        last = self._last_throughput
+        self._last_throughput = throughput
+        if last is not None and throughput < last * (1 - THROUGHPUT_TOLERANCE):
+            # The previous size was better: go back to it and stop exploring
+            self._direction = -self._direction
+            self._settled = True
+        elif last is not None and throughput < last * (1 + THROUGHPUT_TOLERANCE):
+            self._settled = True
+            return self.size
+
+        step = self.size * 2 if self._direction > 0 else self.size // 2
+        self.size = min(self.maximum, max(self.minimum, step))
+        return self.size
+
+
+class EmbeddingStage:
+    """Embeds chunk texts in length-bucketed, adaptively sized batches."""
+
+    def __init__(self, model, batch_size: Optional[int] = None, batch_chars: Optional[int] = None,
+                 memory_mb: Optional[int] = None):
+        self.model = model
+        self.batcher = AdaptiveBatchSize(batch_size or _env_int('MEMVID_EMBED_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+        self.batch_chars = batch_chars or _env_int('MEMVID_EMBED_BATCH_CHARS', DEFAULT_BATCH_CHARS)
+        self.memory_mb = memory_mb or _env_int('MEMVID_EMBED_MEMORY_MB', DEFAULT_MEMORY_MB)
+        self.stats: Dict[str, Any] = {}
+
+    def embed(self, texts: Sequence[str],
+              on_batch: Optional[Callable[[int, int], None]] = None) -> List[Any]:
+        """Return one vector per text, in input order.
+
+        ``on_batch(done, total)`` runs after every batch; raising from it (e.g. a
+        cancellation checkpoint) stops the stage.
+        """
+        total = len(texts)
+        # Longest first: the most expensive batches run while the size is still conservative
+        order = sorted(range(total), key=lambda i: len(texts[i]), reverse=True)
+        vectors: List[Any] = [None] * total
+        baseline_rss = _rss_mb()
+        started = time.perf_counter()
+        batches = 0
+        sizes_used = set()
+        position = 0
+
+        while position < total:
+            longest = max(1, len(texts[order[position]]))
+            # Cap padded work per batch so buckets of long chunks use smaller batches
+            size = max(1, min(self.batcher.size, self.batch_chars // longest, total - position))
+            indices = order[position:position + size]
+            batch = [texts[i] for i in indices]
+
+            batch_start = time.perf_counter()
+            output = self.model.encode(batch, batch_size=len(batch), show_progress_bar=False)
+            elapsed = time.perf_counter() - batch_start
+            for index, vector in zip(indices, output):
+                vectors[index] = vector
+
+            position += size
+            batches += 1
+            sizes_used.add(size)
+            rss = _rss_mb()
+            over_memory = (baseline_rss is not None and rss is not None
+                           and rss - baseline_rss > self.memory_mb)
+            self.batcher.observe(sum(len(t) for t in batch), elapsed, over_memory)
+            if on_batch is not None:
+                on_batch(position, total)
+
+        seconds = time.perf_counter() - started
+        self.stats = {
+            'chunks': total,
+            'seconds': round(seconds, 3),
+            'chunks_per_sec': round(total / seconds, 1) if seconds > 0 else None,
+            'batches': batches,
+            'batch_size': self.batcher.size,
+            'batch_sizes': sorted(sizes_used),
+            **configure_torch_threads(),
+        }
+        logger.info(f"Embedded {total} chunks in {seconds:.2f}s "
+                    f"({self.stats['chunks_per_sec']} chunks/sec, {batches} batches, "
+                    f"final batch size {self.batcher.size})")
+        return vectors
+
+
+class PrecomputedEmbeddings:
+    """Stands in for an embedding model, answering ``encode`` from vectors already computed.
+
+    Texts that were not precomputed fall through to the wrapped model; every
+    other attribute (dimension lookups, tokenizer, ...) is delegated to it.
+    """
+
+    def __init__(self, model, texts: Sequence[str], vectors: Sequence[Any]):
+        self._model = model
+        self._vectors = dict(zip(texts, vectors))
+
+    def encode(self, sentences, *args, **kwargs):
+        single = isinstance(sentences, str)
+        items = [sentences] if single else list(sentences)
+        if not all(text in self._vectors for text in items):
+            return self._model.encode(sentences, *args, **kwargs)
+
+        import numpy as np
+
+        result = np.asarray([self._vectors[text] for text in items], dtype='float32')
+        if kwargs.get('normalize_embeddings'):
+            norms = np.linalg.norm(result, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            result = result / norms
+        return result[0] if single else result
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
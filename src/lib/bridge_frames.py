@@ -0,0 +1,293 @@
+"""
+QR frame rendering and the frame-indexed container for MemVid banks.
+
+memvid's ``build_video`` renders one QR image per chunk on a single core and
+hands the frames to the video writer one at a time. ``render_frames`` spreads
+rendering over a process pool and yields frames strictly in chunk order from a
+bounded window of in-flight batches, so the writer streams them without
+holding the whole bank in memory.
+
+Render workers are started by a ``forkserver``, not forked from the bridge:
+by the time a build renders, the bridge runs scheduler workers (possibly inside
+torch or OpenCV), the log writer and the control thread, and a child forked
+from a multithreaded process can deadlock on a lock one of them held. The fork
+server is a single-threaded process with ``memvid.utils`` preloaded, so workers
+still start without re-importing memvid.
+
+With ``MEMVID_FRAME_CONTAINER=frames`` the same frames are also written
+losslessly to ``<bank>.frames``: a fixed header, a table of frame offsets and
+one PNG per frame. ``FrameContainer`` maps the file and reads any frame in O(1)
+(one offset lookup and one slice), without the keyframe seeking and lossy
+decode an ``.mp4`` needs.
+"""
+
+import base64
+import gzip
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+FRAMES_SUFFIX = '.frames'
+FRAMES_MAGIC = b'MVFRAMES'
+FRAMES_VERSION = 1
+_HEADER = struct.Struct('<8sIIII')  # magic, version, frame count, width, height
+_OFFSET = struct.Struct('<Q')
+
+DEFAULT_FRAME_SIZE = (256, 256)
+DEFAULT_FPS = 15
+RENDER_BATCH = 16  # chunks per pool task; amortizes IPC for small frames
+WINDOW_PER_WORKER = 4  # in-flight batches per worker before the consumer must catch up
+PROGRESS_STEPS = 20
+
+_worker_state: Dict[str, Any] = {}
+
+
+def frames_path(index_base: str) -> str:
+    """Path of the frame container for an index base path (no extension)."""
+    return f"{index_base}{FRAMES_SUFFIX}"
+
+
+def frame_workers() -> int:
+    """Render processes from ``MEMVID_FRAME_WORKERS`` (0 keeps memvid's own ``build_video``).
+
+    Defaults to one less than the usable CPUs, capped at 8. Pools need the
+    ``forkserver`` start method (POSIX); elsewhere rendering is serial.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    try:
+        workers = int(os.environ.get('MEMVID_FRAME_WORKERS', min(8, max(1, cpus - 1))))
+    except ValueError:
+        workers = 1
+    if workers > 1 and 'forkserver' not in multiprocessing.get_all_start_methods():
+        return 1
+    return max(0, workers)
+
+
+def container_enabled() -> bool:
+    return os.environ.get('MEMVID_FRAME_CONTAINER', '').lower() == 'frames'
+
+
+def video_settings() -> Tuple[Tuple[int, int], int]:
+    """Frame size and fps memvid uses for its native ``mp4v`` codec."""
+    try:
+        from memvid.config import get_codec_parameters
+        params = get_codec_parameters('mp4v')
+        return (int(params['frame_width']), int(params['frame_height'])), int(params['video_fps'])
+    except Exception:
+        return DEFAULT_FRAME_SIZE, DEFAULT_FPS
+
+
+def qr_helpers_available() -> bool:
+    """True when memvid exposes the QR helpers the fast path renders with."""
+    try:
+        from memvid.utils import encode_to_qr, qr_to_frame  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _init_worker(frame_size: Tuple[int, int], want_png: bool) -> None:
+    from memvid.utils import encode_to_qr, qr_to_frame
+    _worker_state.update(encode=encode_to_qr, to_frame=qr_to_frame, size=frame_size, png=want_png)
+
+
+def _render_batch(start: int, texts: Sequence[str]) -> List[Tuple[int, Any, Optional[bytes]]]:
+    """Render frames ``start .. start+len(texts)``; payloads match memvid's ``build_video``."""
+    encode, to_frame = _worker_state['encode'], _worker_state['to_frame']
+    rendered = []
+    for offset, text in enumerate(texts):
+        frame_number = start + offset
+        payload = json.dumps({"id": frame_number, "text": text, "frame": frame_number})
+        frame = to_frame(encode(payload), _worker_state['size'])
+        png = None
+        if _worker_state['png']:
+            import cv2
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+            png = cv2.imencode('.png', gray, [cv2.IMWRITE_PNG_COMPRESSION, 1])[1].tobytes()
+        rendered.append((frame_number, frame, png))
+    return rendered
+
+
+def render_frames(texts: Sequence[str], workers: int, frame_size: Tuple[int, int],
+                  want_png: bool = False) -> Iterator[Tuple[int, Any, Optional[bytes]]]:
+    """Yield ``(frame_number, frame, png)`` in order, rendering on ``workers`` processes."""
+    batches = ((start, texts[start:start + RENDER_BATCH]) for start in range(0, len(texts), RENDER_BATCH))
+    if workers <= 1:
+        _init_worker(frame_size, want_png)
+        for start, batch in batches:
+            yield from _render_batch(start, batch)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context('forkserver')
+    # Only takes effect before the fork server first starts; missing modules are skipped
+    context.set_forkserver_preload(['bridge_frames', 'memvid.utils'])
+    pool = ProcessPoolExecutor(workers, mp_context=context,
+                               initializer=_init_worker, initargs=(frame_size, want_png))
+    try:
+        window = deque()
+        for start, batch in batches:
+            window.append(pool.submit(_render_batch, start, batch))
+            if len(window) >= workers * WINDOW_PER_WORKER:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+    finally:
+        # Also runs when the consumer stops early (cancellation): drop queued batches
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class FrameContainerWriter:
+    """Streams PNG frames into ``<bank>.frames`` and publishes it atomically on close."""
+
+    def __init__(self, path: str, count: int, frame_size: Tuple[int, int]):
+        self.path = path
+        self.count = count
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(_HEADER.pack(FRAMES_MAGIC, FRAMES_VERSION, count, frame_size[0], frame_size[1]))
+        self._table_at = self._file.tell()
+        self._offsets: List[int] = []
+        # Reserve the offset table (count + 1 entries: the last marks the end of the data)
+        self._file.write(b'\0' * _OFFSET.size * (count + 1))
+
+    def append(self, png: bytes) -> None:
+        self._offsets.append(self._file.tell())
+        self._file.write(png)
+
+    def close(self) -> None:
+        if len(self._offsets) != self.count:
+            raise ValueError(f"Frame container expected {self.count} frames, got {len(self._offsets)}")
+        self._offsets.append(self._file.tell())
+        self._file.seek(self._table_at)
+        self._file.write(b''.join(_OFFSET.pack(offset) for offset in self._offsets))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+
+class FrameContainer:
+    """Read-only, memory-mapped view of a ``.frames`` file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, width, height = _HEADER.unpack_from(self._map, 0)
+        if magic != FRAMES_MAGIC or version != FRAMES_VERSION:
+            self._map.close()
+            raise ValueError(f"Not a version {FRAMES_VERSION} frame container: {path}")
+        self.frame_size = (width, height)
+        self._table_at = _HEADER.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def frame_bytes(self, frame_number: int) -> bytes:
+        if not 0 <= frame_number < self.count:
+            raise IndexError(f"Frame {frame_number} out of range (0..{self.count - 1})")
+        at = self._table_at + frame_number * _OFFSET.size
+        start, = _OFFSET.unpack_from(self._map, at)
+        end, = _OFFSET.unpack_from(self._map, at + _OFFSET.size)
+        return self._map[start:end]
+
+    def read_frame(self, frame_number: int):
+        """Decoded grayscale frame as a numpy array."""
+        import cv2
+        import numpy as np
+        return cv2.imdecode(np.frombuffer(self.frame_bytes(frame_number), dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+
+    def read_chunk(self, frame_number: int) -> Optional[str]:
+        """Chunk text stored in a frame's QR code, or None if it cannot be decoded."""
+        try:
+            from memvid.utils import decode_qr
+            data = decode_qr(self.read_frame(frame_number))
+        except ImportError:
+            import cv2
+            data, _, _ = cv2.QRCodeDetector().detectAndDecode(self.read_frame(frame_number))
+            if data and data.startswith('GZ:'):
+                # memvid gzips long payloads before encoding them
+                data = gzip.decompress(base64.b64decode(data[3:])).decode('utf-8')
+        if not data:
+            return None
+        try:
+            return json.loads(data).get('text')
+        except (ValueError, AttributeError):
+            return None
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def write_video(texts: Sequence[str], video_path: str, index_base: str,
+                on_frame=None) -> Dict[str, Any]:
+    """Render every chunk and stream it into ``video_path`` (and the container, if enabled).
+
+    ``on_frame(done, total)`` runs every few percent; raising from it stops the
+    render and removes nothing itself (callers clean up partial banks).
+    """
+    import cv2
+
+    frame_size, fps = video_settings()
+    workers = frame_workers()
+    want_container = container_enabled()
+    total = len(texts)
+    report_every = max(1, total // PROGRESS_STEPS)
+
+    started = time.perf_counter()
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, frame_size)
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not open video writer for {video_path}")
+    container = FrameContainerWriter(frames_path(index_base), total, frame_size) if want_container else None
+    try:
+        for frame_number, frame, png in render_frames(texts, workers, frame_size, want_container):
+            writer.write(frame)
+            if container is not None:
+                container.append(png)
+            if on_frame is not None and ((frame_number + 1) % report_every == 0 or frame_number + 1 == total):
+                on_frame(frame_number + 1, total)
+        writer.release()
+        if container is not None:
+            container.close()
+    except BaseException:
+        writer.release()
+        if container is not None:
+            container.abort()
+        raise
+
+    seconds = time.perf_counter() - started
+    stats = {
+        'total_chunks': total,
+        'total_frames': total,
+        'video_file': video_path,
+        'video_size_mb': round(os.path.getsize(video_path) / (1024 * 1024), 3),
+        'fps': fps,
+        'codec': 'mp4v',
+        'render_workers': workers,
+        'render_seconds': round(seconds, 3),
+        'frames_per_sec': round(total / seconds, 1) if seconds > 0 else None,
+    }
+    if want_container:
+        stats['frames_file'] = frames_path(index_base)
+        stats['frames_size_mb'] = round(os.path.getsize(stats['frames_file']) / (1024 * 1024), 3)
+    logger.info(f"Rendered {total} frames in {seconds:.2f}s on {workers} worker(s) "
+                f"({stats['frames_per_sec']} frames/sec)")
+    return stats
@@ -0,0 +1,180 @@
+"""
+Versioned bank generations with an atomic pointer swap.
+
+Every build or append writes a complete new generation of the bank into its
+own directory and only then publishes it by atomically replacing the bank's
+pointer file. Readers resolve the pointer once per request and keep using that
+generation until they finish, so a rebuild never makes the bank disappear and
+never mixes files from two builds. A generation that is no longer current is
+deleted once no request in this process still uses it.
+
+Layout for a bank whose index base is ``<dir>/<name>``::
+
+    <name>.current                       pointer: {"generation": N, ...}
+    <name>.generations/g000007/<name>.*  one complete bank (mp4, json, faiss, sidecars)
+    <name>.mp4 / .json / .faiss          hard links to the current generation's files
+
+The flat files keep the server's existence checks, registry sizes and older
+tools working; each is swapped with ``os.replace`` so it never goes missing
+either. Banks without a pointer are plain flat banks and resolve to themselves.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+POINTER_SUFFIX = '.current'
+GENERATIONS_SUFFIX = '.generations'
+FLAT_SUFFIXES = ('.mp4', '.json', '.faiss')
+
+
+def pointer_path(index_base: str) -> str:
+    return f"{index_base}{POINTER_SUFFIX}"
+
+
+def generations_dir(index_base: str) -> str:
+    return f"{index_base}{GENERATIONS_SUFFIX}"
+
+
+def generation_base(index_base: str, number: int) -> str:
+    """Index base path of one generation's files."""
+    return os.path.join(generations_dir(index_base), f"g{number:06d}", os.path.basename(index_base))
+
+
+def current_generation(index_base: str) -> Optional[int]:
+    """The published generation number, or None for flat banks."""
+    try:
+        with open(pointer_path(index_base), 'r', encoding='utf-8') as f:
+            return int(json.load(f)['generation'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def resolve(index_base: str) -> Tuple[Optional[int], str]:
+    """``(generation, base path to read from)``; flat banks resolve to themselves."""
+    number = current_generation(index_base)
+    if number is None:
+        return None, index_base
+    return number, generation_base(index_base, number)
+
+
+def list_generations(index_base: str) -> List[int]:
+    try:
+        names = os.listdir(generations_dir(index_base))
+    except OSError:
+        return []
+    return sorted(int(name[1:]) for name in names if name.startswith('g') and name[1:].isdigit())
+
+
+def allocate(index_base: str) -> Tuple[int, str]:
+    """Create the directory for the next generation and return ``(number, base path)``."""
+    existing = list_generations(index_base) + [current_generation(index_base) or 0]
+    number = max(existing) + 1
+    base = generation_base(index_base, number)
+    os.makedirs(os.path.dirname(base), exist_ok=False)
+    return number, base
+
+
+def _replace_with_link(source: str, target: str) -> None:
+    tmp_path = f"{target}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        # Filesystems without hard links get a copy
+        shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def publish(index_base: str, number: int) -> None:
+    """Make generation ``number`` the bank's current one.
+
+    The flat files are swapped first, then the pointer; both steps are single
+    ``os.replace`` calls, so readers see either the old or the new file.
+    """
+    base = generation_base(index_base, number)
+    for suffix in FLAT_SUFFIXES:
+        if os.path.exists(f"{base}{suffix}"):
+            _replace_with_link(f"{base}{suffix}", f"{index_base}{suffix}")
+    tmp_path = f"{pointer_path(index_base)}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'generation': number, 'published_at': time.time()}, f)
+    os.replace(tmp_path, pointer_path(index_base))
+
+
+def discard(index_base: str, number: int) -> None:
+    """Remove an unpublished (failed or cancelled) generation."""
+    shutil.rmtree(os.path.dirname(generation_base(index_base, number)), ignore_errors=True)
+
+
+class GenerationTracker:
+    """Counts the requests using each generation and deletes superseded ones once unused.
+
+    ``on_removed(base)`` runs for every deleted generation so callers can drop
+    retrievers and mapped files cached for it.
+    """
+
+    def __init__(self, on_removed: Optional[Callable[[str], None]] = None):
+        self._refs: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self._on_removed = on_removed
+
+    @contextmanager
+    def use(self, index_base: str) -> Iterator[str]:
+        """Pin the bank's current generation for the duration of a request; yields its base path."""
+        with self._lock:
+            number, base = resolve(index_base)
+            if number is not None:
+                key = (index_base, number)
+                self._refs[key] = self._refs.get(key, 0) + 1
+        try:
+            yield base
+        finally:
+            if number is not None:
+                with self._lock:
+                    self._refs[key] -= 1
+                    if self._refs[key] == 0:
+                        del self._refs[key]
+                if number != current_generation(index_base):
+                    self.collect(index_base)
+
+    def in_use(self, index_base: str) -> Dict[int, int]:
+        with self._lock:
+            return {number: count for (base, number), count in self._refs.items() if base == index_base}
+
+    def pinned(self) -> int:
+        """Generation pins held by running requests, across all banks."""
+        with self._lock:
+            return sum(self._refs.values())
+
+    def collect(self, index_base: str) -> List[int]:
+        """Delete superseded generations nobody in this process is using; returns their numbers."""
+        removed = []
+        with self._lock:
+            current = current_generation(index_base)
+            if current is None:
+                return removed
+            for number in list_generations(index_base):
+                if number >= current or (index_base, number) in self._refs:
+                    continue
+                base = generation_base(index_base, number)
+                if self._on_removed is not None:
+                    self._on_removed(base)
+                try:
+                    shutil.rmtree(os.path.dirname(base))
+                except OSError as e:
+                    # e.g. still mapped on Windows; retried at the next collection
+                    logger.warning(f"Could not remove bank generation {base}: {e}")
+                    continue
+                removed.append(number)
+        if removed:
+            logger.info(f"Collected generations {removed} of {index_base} (current: {current})")
+        return removed
@@ -0,0 +1,249 @@
+"""
+Compact BM25 keyword index for MemVid banks.
+
+Built alongside the vector index during ``encode`` and written as
+``<bank>.kwidx``. The file is memory-mapped on open: the sorted term table is
+binary-searched in place and postings are read straight out of the mapping, so
+exact-term lookups need neither the embedding model nor any heavy imports.
+
+Layout (native byte order, recorded in the header)::
+
+    header        64 bytes
+    doc_ids       u32[n_docs]       chunk id of each document
+    doc_lens      u32[n_docs]       token count of each document
+    term_offsets  u64[n_terms + 1]  offsets of each term in term_blob
+    post_offsets  u64[n_terms]      offset of each term's postings block
+    doc_freqs     u32[n_terms]
+    term_blob     utf-8 terms, sorted
+    postings      per term: doc positions u32[df] followed by term freqs u32[df]
+"""
+
+import heapq
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+KEYWORD_SUFFIX = '.kwidx'
+MAGIC = b'MVKW'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIIf5Q')  # magic, version, byteorder, n_docs, n_terms, avgdl, 5 section offsets
+HEADER_SIZE = 64
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_RE = re.compile(r"[A-Za-z0-9_]+(?:[.:/\-][A-Za-z0-9_]+)*")
+_SPLIT_RE = re.compile(r"[.:/\-_]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def keyword_index_path(index_base: str) -> str:
+    """Path of the keyword index for an index base path (no extension)."""
+    return f"{index_base}{KEYWORD_SUFFIX}"
+
+
+def tokenize(text: str) -> List[str]:
+    """Identifier-aware tokenizer.
+
+    ``ErrorRecoveryManager.executeWithRecovery`` yields the whole dotted name,
+    each dotted component and each camelCase word, so both exact identifier
+    queries and natural-language fragments match.
+    """
+    tokens = []
+    for match in _WORD_RE.finditer(text):
+        word = match.group(0)
+        tokens.append(word.lower())
+        parts = [p for p in _SPLIT_RE.split(word) if p]
+        if len(parts) > 1:
+            tokens.extend(p.lower() for p in parts)
+        for part in parts:
+            words = _CAMEL_RE.findall(part)
+            if len(words) > 1:
+                tokens.extend(w.lower() for w in words)
+    return tokens
+
+
+def build_keyword_index(index_base: str, documents: Iterable[Tuple[int, str]]) -> Dict[str, int]:
+    """Write ``<index_base>.kwidx`` for ``(chunk_id, text)`` pairs."""
+    doc_ids = array('I')
+    doc_lens = array('I')
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+
+    for position, (chunk_id, text) in enumerate(documents):
+        counts = Counter(tokenize(text or ''))
+        doc_ids.append(int(chunk_id))
+        doc_lens.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((position, tf))
+
+    n_docs = len(doc_ids)
+    terms = sorted(postings)
+    avgdl = (sum(doc_lens) / n_docs) if n_docs else 0.0
+
+    term_offsets = array('Q', [0])
+    term_blob = bytearray()
+    post_offsets = array('Q')
+    doc_freqs = array('I')
+    postings_blob = bytearray()
+    for term in terms:
+        term_blob += term.encode('utf-8')
+        term_offsets.append(len(term_blob))
+        plist = postings[term]
+        post_offsets.append(len(postings_blob))
+        doc_freqs.append(len(plist))
+        postings_blob += array('I', (p for p, _ in plist)).tobytes()
+        postings_blob += array('I', (tf for _, tf in plist)).tobytes()
+
+    sections = [doc_ids.tobytes(), doc_lens.tobytes(), term_offsets.tobytes(),
+                post_offsets.tobytes(), doc_freqs.tobytes(), bytes(term_blob), bytes(postings_blob)]
+    offsets = []
+    cursor = HEADER_SIZE
+    for section in sections:
+        offsets.append(cursor)
+        cursor += len(section)
+
+    # Section offsets for doc_ids and doc_lens are implied by n_docs
+    header = HEADER.pack(MAGIC, VERSION, 0 if sys.byteorder == 'little' else 1, n_docs, len(terms),
+                         avgdl, offsets[2], offsets[3], offsets[4], offsets[5], offsets[6])
+
+    path = keyword_index_path(index_base)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return {'documents': n_docs, 'terms': len(terms), 'bytes': cursor}
+
+
+class KeywordIndex:
+    """Read-only, memory-mapped view over a ``.kwidx`` file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file (bank with no chunks) cannot be mapped
+            self._file.close()
+            raise ValueError(f"Keyword index is empty: {path}")
+
+        (magic, version, byteorder, self.n_docs, self.n_terms, self.avgdl,
+         terms_off, posts_off, dfs_off, blob_off, postings_off) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a keyword index (or unsupported version): {path}")
+        if byteorder != (0 if sys.byteorder == 'little' else 1):
+            self.close()
+            raise ValueError(f"Keyword index byte order does not match this platform: {path}")
+
+        view = memoryview(self._mm)
+        n, t = self.n_docs, self.n_terms
+        self._doc_ids = view[HEADER_SIZE:HEADER_SIZE + 4 * n].cast('I')
+        self._doc_lens = view[HEADER_SIZE + 4 * n:HEADER_SIZE + 8 * n].cast('I')
+        self._term_offsets = view[terms_off:terms_off + 8 * (t + 1)].cast('Q')
+        self._post_offsets = view[posts_off:posts_off + 8 * t].cast('Q')
+        self._doc_freqs = view[dfs_off:dfs_off + 4 * t].cast('I')
+        self._blob_off = blob_off
+        self._postings_off = postings_off
+
+    def close(self) -> None:
+        for name in ('_doc_ids', '_doc_lens', '_term_offsets', '_post_offsets', '_doc_freqs'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+        self._file.close()
+
+    def _term_at(self, i: int) -> bytes:
+        start = self._blob_off + self._term_offsets[i]
+        end = self._blob_off + self._term_offsets[i + 1]
+        return self._mm[start:end]
+
+    def _find_term(self, term: str) -> int:
+        key = term.encode('utf-8')
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_terms and self._term_at(lo) == key:
+            return lo
+        return -1
+
+    def _postings(self, term_idx: int) -> Tuple[memoryview, memoryview]:
+        df = self._doc_freqs[term_idx]
+        start = self._postings_off + self._post_offsets[term_idx]
+        view = memoryview(self._mm)
+        return view[start:start + 4 * df].cast('I'), view[start + 4 * df:start + 8 * df].cast('I')
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """BM25 top-k as ``(chunk_id, score)`` pairs, best first."""
+        if self.n_docs == 0:
+            return []
+        scores: Dict[int, float] = {}
+        for term, qtf in Counter(tokenize(query)).items():
+            idx = self._find_term(term)
+            if idx < 0:
+                continue
+            df = self._doc_freqs[idx]
+            idf = math.log(1.0 + (self.n_docs - df + 0.5) / (df + 0.5))
+            positions, freqs = self._postings(idx)
+            for pos, tf in zip(positions, freqs):
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lens[pos] / (self.avgdl or 1.0))
+                scores[pos] = scores.get(pos, 0.0) + qtf * idf * tf * (BM25_K1 + 1) / (tf + norm)
+            positions.release()
+            freqs.release()
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(int(self._doc_ids[pos]), score) for pos, score in best]
+
+
+class KeywordIndexCache:
+    """Opens keyword indexes once per bank and reopens them when rebuilt."""
+
+    def __init__(self):
+        self._indexes: Dict[str, Tuple[float, KeywordIndex]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def get(self, index_base: str) -> Optional[KeywordIndex]:
+        path = keyword_index_path(index_base)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._indexes.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            # A rebuilt file gets a fresh mapping; the old one is released once
+            # in-flight searches drop their reference.
+            index = KeywordIndex(path)
+            self._indexes[path] = (mtime, index)
+            return index
+
+    def invalidate(self, index_base: str) -> None:
+        """Drop the bank's index; its mapping closes once in-flight searches let go."""
+        with self._lock:
+            self._indexes.pop(keyword_index_path(index_base), None)
+
+    def clear(self) -> int:
+        """Drop every open index; mappings close once in-flight searches let go. Returns the count."""
+        with self._lock:
+            count = len(self._indexes)
+            self._indexes.clear()
+        return count
@@ -0,0 +1,201 @@
+"""
+Structured, off-the-hot-path logging for the MemVid bridge.
+
+The bridge logs several lines per request. With plain handlers every one of
+them is formatted and written to ``memvid_bridge.log`` and to stderr by the
+thread serving the request, and the server then logs each stderr line again.
+In ``structured`` mode (``MEMVID_LOG_MODE``, the default) a request thread
+only puts the record on a queue; one writer thread turns it into a JSON line
+for the log file, keeps it in an in-memory ring buffer that diagnostics can
+dump, and forwards only warnings and errors to stderr, where the server picks
+them up as structured entries.
+
+Levels are set per component (logger name) with
+``MEMVID_LOG_LEVELS=bridge_frames=debug,memvid=warning`` on top of
+``MEMVID_LOG_LEVEL`` (falling back to the server's ``LOG_LEVEL``). ``MEMVID_LOG_SAMPLE`` (0-1) keeps that fraction of the
+per-request ``[REQ-n]`` info lines in the log file; a request is either kept
+whole or dropped whole, and warnings, errors and the ring buffer are never
+sampled. ``MEMVID_LOG_MODE=classic`` restores the old synchronous handlers.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+LOG_MODES = ('structured', 'classic')
+DEFAULT_LOG_FILE = 'memvid_bridge.log'
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 2
+RING_SIZE = 2000
+CLASSIC_FORMAT = '%(asctime)s - %(levelname)s - [%(threadName)s] - %(message)s'
+
+_REQUEST_TAG = re.compile(r'^\[REQ-(\d+)\]')
+_SAMPLE_MULTIPLIER = 2654435761  # Knuth's multiplicative hash spreads consecutive request numbers
+
+_ring: Optional['RingBuffer'] = None
+
+
+def log_mode() -> str:
+    mode = os.environ.get('MEMVID_LOG_MODE', 'structured').strip().lower()
+    return mode if mode in LOG_MODES else 'structured'
+
+
+def parse_level(value: Optional[str], default: int) -> int:
+    name = (value or '').strip().upper()
+    level = logging.getLevelName('WARNING' if name == 'WARN' else name)
+    return level if isinstance(level, int) else default
+
+
+def parse_levels(spec: Optional[str]) -> Dict[str, int]:
+    """``name=level,name=level`` -> {logger name: level}; malformed entries are skipped."""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, value = item.partition('=')
+        level = parse_level(value, -1)
+        if name.strip() and level >= 0:
+            levels[name.strip()] = level
+    return levels
+
+
+def request_number(message: str) -> Optional[int]:
+    match = _REQUEST_TAG.match(message)
+    return int(match.group(1)) if match else None
+
+
+def record_entry(record: logging.LogRecord) -> Dict[str, Any]:
+    """One log record as a structured entry (what the file, stderr and the ring buffer hold)."""
+    message = record.getMessage()
+    entry = {
+        'ts': round(record.created, 3),
+        'level': record.levelname.lower(),
+        'component': record.name,
+        'thread': record.threadName,
+        'msg': message,
+    }
+    req = request_number(message)
+    if req is not None:
+        entry['req'] = req
+    return entry
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record_entry(record), ensure_ascii=False)
+
+
+class RequestSampler(logging.Filter):
+    """Keeps a fixed fraction of requests' info/debug lines, chosen per request number."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = min(max(rate, 0.0), 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        req = request_number(record.getMessage())
+        if req is None:
+            return True
+        return (req * _SAMPLE_MULTIPLIER) % 2 ** 32 < self.rate * 2 ** 32
+
+
+class RingBuffer(logging.Handler):
+    """The most recent log entries, kept in memory for diagnostics."""
+
+    def __init__(self, size: int = RING_SIZE):
+        super().__init__()
+        self._entries: deque = deque(maxlen=size)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._entries.append(record_entry(record))
+
+    def entries(self, limit: Optional[int] = None, min_level: str = 'debug') -> List[Dict[str, Any]]:
+        threshold = parse_level(min_level, logging.DEBUG)
+        selected = [entry for entry in list(self._entries)
+                    if parse_level(entry['level'], logging.INFO) >= threshold]
+        return selected[-limit:] if limit else selected
+
+
+class BackgroundHandler(logging.handlers.QueueHandler):
+    """Queues records for a writer thread; ``close()`` (run by ``logging.shutdown``) drains it."""
+
+    def __init__(self, handlers: List[logging.Handler]):
+        super().__init__(queue.SimpleQueue())
+        self._handlers = handlers
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._lock = threading.Lock()
+        self.start()
+
+    def start(self) -> None:
+        """Start a writer thread on a fresh queue."""
+        with self._lock:
+            self.queue = queue.SimpleQueue()
+            self._listener = logging.handlers.QueueListener(self.queue, *self._handlers,
+                                                            respect_handler_level=True)
+            self._listener.start()
+
+    def restart_after_fork(self) -> None:
+        """A forked child inherits the queue but not the writer thread (or a usable lock)."""
+        self._lock = threading.Lock()
+        self.start()
+
+    def close(self) -> None:
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+        super().close()
+
+
+def configure_logging() -> None:
+    """Install the bridge's log handlers on the root logger (call once, at startup)."""
+    global _ring
+    root = logging.getLogger()
+    root.setLevel(parse_level(os.environ.get('MEMVID_LOG_LEVEL') or os.environ.get('LOG_LEVEL'), logging.INFO))
+    for name, level in parse_levels(os.environ.get('MEMVID_LOG_LEVELS')).items():
+        logging.getLogger(name).setLevel(level)
+
+    log_file = os.environ.get('MEMVID_LOG_FILE', DEFAULT_LOG_FILE).strip()
+    _ring = RingBuffer()
+
+    if log_mode() == 'classic':
+        handlers: List[logging.Handler] = [logging.StreamHandler(), _ring]
+        if log_file:
+            handlers.insert(0, logging.FileHandler(log_file, mode='w'))
+        for handler in handlers[:-1]:
+            handler.setFormatter(logging.Formatter(CLASSIC_FORMAT))
+        root.handlers = handlers
+        return
+
+    formatter = JsonLinesFormatter()
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setLevel(logging.WARNING)
+    stderr_handler.setFormatter(formatter)
+    writers: List[logging.Handler] = [_ring, stderr_handler]
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8', delay=True)
+        file_handler.setFormatter(formatter)
+        try:
+            rate = float(os.environ.get('MEMVID_LOG_SAMPLE', '1'))
+        except ValueError:
+            rate = 1.0
+        file_handler.addFilter(RequestSampler(rate))
+        writers.append(file_handler)
+
+    background = BackgroundHandler(writers)
+    root.handlers = [background]
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=background.restart_after_fork)
+
+
+def recent_logs(limit: Optional[int] = None, min_level: str = 'debug') -> List[Dict[str, Any]]:
+    """Entries from the ring buffer, oldest first (empty before ``configure_logging``)."""
+    return _ring.entries(limit, min_level) if _ring is not None else []
@@ -0,0 +1,273 @@
+"""
+Memory-mapped bank loading for searches.
+
+``MemvidRetriever`` reads the whole ``.faiss`` file and parses the bank's
+``.json`` index (every chunk's text plus frame maps) into private memory
+before the first search, and every bridge process pays for its own copy. In
+``mmap`` load mode (``MEMVID_INDEX_LOAD``, the default) a search instead opens:
+
+- the FAISS index with ``IO_FLAG_MMAP`` (plus ``IO_FLAG_MMAP_IFC`` where the
+  installed faiss has it, which also maps flat vector codes), and
+- ``<bank>.chunks``, a binary store of chunk texts and per-chunk metadata read
+  lazily through one read-only mapping.
+
+Opening a bank is then a header read, and the pages live in the OS page cache
+shared by every worker. Stores are written with the bank and backfilled once
+from the ``.json`` index for banks built before they existed.
+
+Layout (little endian)::
+
+    header        24 bytes: magic, version, chunk count, info size, reserved
+    info          JSON (embedding model, dimension), padded to 8 bytes
+    text_offsets  u64[count + 1]  absolute offsets of each chunk's UTF-8 text
+    meta_offsets  u64[count + 1]  absolute offsets of each chunk's compact JSON metadata
+    texts, metadata
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHUNKS_SUFFIX = '.chunks'
+CHUNKS_MAGIC = b'MVCHUNKS'
+CHUNKS_VERSION = 1
+_HEADER = struct.Struct('<8sIIII')  # magic, version, chunk count, info size, reserved
+_OFFSET = struct.Struct('<Q')
+
+LOAD_MODES = ('mmap', 'memory')
+
+
+def chunk_store_path(index_base: str) -> str:
+    """Path of the chunk store for an index base path (no extension)."""
+    return f"{index_base}{CHUNKS_SUFFIX}"
+
+
+def index_load_mode() -> str:
+    """``MEMVID_INDEX_LOAD``: ``mmap`` (default) or ``memory`` for memvid's own retriever."""
+    mode = os.environ.get('MEMVID_INDEX_LOAD', 'mmap').strip().lower()
+    return mode if mode in LOAD_MODES else 'mmap'
+
+
+def write_chunk_store(index_base: str, texts: Sequence[str], metadata: Sequence[Dict[str, Any]],
+                      info: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """Atomically write ``<index_base>.chunks``; ``texts[i]``/``metadata[i]`` describe chunk id ``i``."""
+    count = len(texts)
+    info_blob = json.dumps(info or {}, separators=(',', ':')).encode('utf-8')
+    info_size = len(info_blob)
+    info_blob += b'\0' * (-(_HEADER.size + info_size) % 8)
+
+    text_blobs = [(text or '').encode('utf-8') for text in texts]
+    meta_blobs = [json.dumps(metadata[i], separators=(',', ':')).encode('utf-8')
+                  if i < len(metadata) and metadata[i] else b'' for i in range(count)]
+
+    cursor = _HEADER.size + len(info_blob) + 2 * _OFFSET.size * (count + 1)
+    text_offsets = []
+    for blob in text_blobs:
+        text_offsets.append(cursor)
+        cursor += len(blob)
+    text_offsets.append(cursor)
+    meta_offsets = []
+    for blob in meta_blobs:
+        meta_offsets.append(cursor)
+        cursor += len(blob)
+    meta_offsets.append(cursor)
+
+    path = chunk_store_path(index_base)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(CHUNKS_MAGIC, CHUNKS_VERSION, count, info_size, 0))
+        f.write(info_blob)
+        f.write(b''.join(_OFFSET.pack(offset) for offset in text_offsets))
+        f.write(b''.join(_OFFSET.pack(offset) for offset in meta_offsets))
+        for blob in text_blobs:
+            f.write(blob)
+        for blob in meta_blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return {'chunks': count, 'bytes': cursor}
+
+
+def backfill_chunk_store(index_base: str, chunk_meta: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    """Write the chunk store of an older bank from its ``.json`` index (a one-time parse)."""
+    with open(f"{index_base}.json", 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    texts: List[str] = []
+    for i, m in enumerate(data.get('metadata', [])):
+        chunk_id = m.get('id', i)
+        while len(texts) <= chunk_id:
+            texts.append('')
+        texts[chunk_id] = m.get('text', '')
+    model = data.get('config', {}).get('embedding', {}).get('model')
+    return write_chunk_store(index_base, texts, list(chunk_meta), {'embedding_model': model} if model else {})
+
+
+def chunk_store_current(index_base: str) -> bool:
+    """True when the bank has a chunk store at least as new as its ``.json`` index."""
+    try:
+        return os.path.getmtime(chunk_store_path(index_base)) >= os.path.getmtime(f"{index_base}.json")
+    except OSError:
+        return False
+
+
+def read_chunk_store_header(index_base: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """``(chunk count, info)`` from a store's header alone, or None without a valid store."""
+    try:
+        with open(chunk_store_path(index_base), 'rb') as f:
+            head = f.read(_HEADER.size)
+            if len(head) < _HEADER.size:
+                return None
+            magic, version, count, info_size, _ = _HEADER.unpack(head)
+            if magic != CHUNKS_MAGIC or version != CHUNKS_VERSION:
+                return None
+            return count, json.loads(f.read(info_size) or b'{}')
+    except (OSError, ValueError):
+        return None
+
+
+class _ChunkTexts:
+    """``texts.get(chunk_id)`` view over a store, decoded on access."""
+
+    def __init__(self, store: 'ChunkStore'):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store.count
+
+    def get(self, chunk_id: int, default: Optional[str] = None) -> Optional[str]:
+        return self._store.text(chunk_id) if 0 <= chunk_id < self._store.count else default
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        return ((i, self._store.text(i)) for i in range(self._store.count))
+
+
+class _ChunkMetadata:
+    """``metadata[chunk_id]`` view over a store, decoded on access."""
+
+    def __init__(self, store: 'ChunkStore'):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store.count
+
+    def __getitem__(self, chunk_id: int) -> Dict[str, Any]:
+        if not 0 <= chunk_id < self._store.count:
+            raise IndexError(chunk_id)
+        return self._store.chunk_metadata(chunk_id)
+
+
+class ChunkStore:
+    """Read-only, memory-mapped view of a ``.chunks`` file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, info_size, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != CHUNKS_MAGIC or version != CHUNKS_VERSION:
+            self._map.close()
+            raise ValueError(f"Not a version {CHUNKS_VERSION} chunk store: {path}")
+        self.info = json.loads(self._map[_HEADER.size:_HEADER.size + info_size] or b'{}')
+        self._text_table = _HEADER.size + info_size + (-(_HEADER.size + info_size) % 8)
+        self._meta_table = self._text_table + _OFFSET.size * (self.count + 1)
+        self.texts = _ChunkTexts(self)
+        self.metadata = _ChunkMetadata(self)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def embedding_model(self) -> Optional[str]:
+        return self.info.get('embedding_model')
+
+    def _slice(self, table: int, chunk_id: int) -> bytes:
+        at = table + chunk_id * _OFFSET.size
+        start, = _OFFSET.unpack_from(self._map, at)
+        end, = _OFFSET.unpack_from(self._map, at + _OFFSET.size)
+        return self._map[start:end]
+
+    def text(self, chunk_id: int) -> str:
+        return self._slice(self._text_table, chunk_id).decode('utf-8')
+
+    def chunk_metadata(self, chunk_id: int) -> Dict[str, Any]:
+        blob = self._slice(self._meta_table, chunk_id)
+        return json.loads(blob) if blob else {}
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class ChunkStoreCache:
+    """Opens chunk stores once per bank and reopens them when rewritten."""
+
+    def __init__(self):
+        self._stores: Dict[str, Tuple[float, ChunkStore]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, index_base: str) -> Optional[ChunkStore]:
+        path = chunk_store_path(index_base)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._stores.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            # The old mapping is released once in-flight searches drop their reference
+            store = ChunkStore(path)
+            self._stores[path] = (mtime, store)
+            return store
+
+    def invalidate(self, index_base: str) -> None:
+        with self._lock:
+            self._stores.pop(chunk_store_path(index_base), None)
+
+    def clear(self) -> int:
+        """Drop every open store; mappings close once in-flight searches let go. Returns the count."""
+        with self._lock:
+            count = len(self._stores)
+            self._stores.clear()
+        return count
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+
+def open_faiss_index(path: str) -> Tuple[Any, str]:
+    """Read a FAISS index memory-mapped where faiss supports it; returns ``(index, mode)``.
+
+    ``IO_FLAG_MMAP`` maps IVF inverted lists; ``IO_FLAG_MMAP_IFC`` (newer faiss)
+    also maps flat codes. Indexes that cannot be mapped are read into memory.
+    """
+    import faiss
+
+    flags = getattr(faiss, 'IO_FLAG_MMAP', 0) | getattr(faiss, 'IO_FLAG_MMAP_IFC', 0)
+    if flags:
+        try:
+            return faiss.read_index(path, flags | getattr(faiss, 'IO_FLAG_READ_ONLY', 0)), 'mmap'
+        except RuntimeError as e:
+            logger.info(f"FAISS index {path} cannot be memory-mapped, reading it instead: {e}")
+    return faiss.read_index(path), 'memory'
+
+
+class MappedRetriever:
+    """Search-side stand-in for ``MemvidRetriever`` over a mapped index and chunk store.
+
+    Exposes the ``index_manager.index`` / ``index_manager.embedding_model`` pair the
+    bridge searches with, plus how the bank was opened.
+    """
+
+    def __init__(self, index_base: str, store: ChunkStore, embedding_model):
+        started = time.perf_counter()
+        index, self.load_mode = open_faiss_index(f"{index_base}.faiss")
+        self.open_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.store = store
+        self.index_manager = SimpleNamespace(index=index, embedding_model=embedding_model)
@@ -0,0 +1,86 @@
+"""
+Memory relief for the bridge under host memory pressure.
+
+The bridge keeps everything it has opened: a retriever per bank generation
+(FAISS index and memvid state), chunk texts and metadata decoded from JSON,
+keyword index and chunk store mappings, routing codebooks and frame
+containers. Nothing bounds them, so a long session over many banks grows until
+the host runs short. The server's resource governor watches system memory and
+this process's RSS (reported by the inline ``memory`` RPC) and, as pressure
+rises, asks the bridge to evict retrievers that have sat idle and then to drop
+its decoded buffers. Anything released is reopened by the next request that
+needs it; requests already holding a reference keep it until they finish.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import os
+import threading
+import time
+from typing import Dict, Hashable, Iterable, List, Optional
+
+_libc = None
+_libc_loaded = False
+
+
+def rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (Linux; None elsewhere)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return round(resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def trim_heap() -> bool:
+    """Collect garbage and hand freed heap pages back to the OS.
+
+    CPython frees objects into glibc's arenas, which keep the pages; without
+    ``malloc_trim`` the RSS stays at its peak after caches are dropped. Returns
+    True when the trim ran (glibc only).
+    """
+    global _libc, _libc_loaded
+    gc.collect()
+    if not _libc_loaded:
+        _libc_loaded = True
+        name = ctypes.util.find_library('c')
+        try:
+            libc = ctypes.CDLL(name) if name else None
+            _libc = libc if libc is not None and hasattr(libc, 'malloc_trim') else None
+        except OSError:
+            _libc = None
+    if _libc is None:
+        return False
+    try:
+        _libc.malloc_trim(0)
+        return True
+    except Exception:
+        return False
+
+
+class UsageClock:
+    """Last-use times of cached objects, so the ones sitting idle can be evicted first."""
+
+    def __init__(self):
+        self._last_used: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, key: Hashable, now: Optional[float] = None) -> None:
+        with self._lock:
+            self._last_used[key] = time.monotonic() if now is None else now
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._last_used.pop(key, None)
+
+    def idle(self, keys: Iterable[Hashable], idle_seconds: float, now: Optional[float] = None) -> List[Hashable]:
+        """The given keys unused for at least ``idle_seconds``, least recently used first.
+
+        Keys never touched count as idle since forever.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            aged = [(self._last_used.get(key, float('-inf')), key) for key in keys]
+        return [key for used, key in sorted(aged, key=lambda item: item[0]) if now - used >= idle_seconds]
@@ -0,0 +1,127 @@
+"""
+Request counters and latency histograms for the MemVid bridge.
+
+``stats`` and the scheduler snapshot only say what the bridge is doing right
+now. ``BridgeMetrics`` accumulates what it has done since it started: requests
+by method and outcome, how long they waited in the queue and ran, and how long
+each pipeline stage took (measured between ``checkpoint(stage)`` calls). The
+inline ``metrics`` RPC returns it together with gauges for queue depth and the
+retriever pool, in the metric-family shape the server merges into
+``get_metrics`` and its Prometheus textfile.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Upper bounds in milliseconds, from a cached search to a large build
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+QUANTILES = (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def estimate_quantile(bounds: Sequence[float], counts: Sequence[int], total: int, q: float) -> Optional[float]:
+    """Interpolate a quantile from per-bucket counts (the last count is the overflow bucket)."""
+    if total == 0:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if i >= len(bounds):
+                return float(bounds[-1])  # beyond the largest bound; report the bound
+            lower = bounds[i - 1] if i > 0 else 0.0
+            return round(lower + (bounds[i] - lower) * (rank - seen) / count, 3)
+        seen += count
+    return float(bounds[-1])
+
+
+class Histogram:
+    """Fixed-bucket histogram; not thread-safe on its own (``BridgeMetrics`` locks around it)."""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def series(self, labels: LabelKey) -> Dict[str, Any]:
+        cumulative, buckets = 0, []
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            buckets.append([bound, cumulative])
+        entry = {'labels': dict(labels), 'count': self.count, 'sum': round(self.sum, 3), 'buckets': buckets}
+        for name, q in QUANTILES:
+            entry[name] = estimate_quantile(self.bounds, self.counts, self.count, q)
+        return entry
+
+
+class BridgeMetrics:
+    """Thread-safe counters and histograms recorded by the scheduler's workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._requests: Dict[LabelKey, int] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {
+            'queue_wait_ms': {}, 'request_duration_ms': {}, 'stage_duration_ms': {},
+        }
+
+    def _observe(self, family: str, labels: Dict[str, Any], value_ms: float) -> None:
+        key = label_key(labels)
+        histogram = self._histograms[family].get(key)
+        if histogram is None:
+            histogram = self._histograms[family][key] = Histogram()
+        histogram.observe(value_ms)
+
+    def record_request(self, method: str, outcome: str, queued_ms: Optional[float] = None,
+                       duration_ms: Optional[float] = None,
+                       stages: Iterable[Tuple[str, float]] = ()) -> None:
+        """Count one finished (or dropped) request and record its timings."""
+        with self._lock:
+            key = label_key({'method': method, 'outcome': outcome})
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if queued_ms is not None:
+                self._observe('queue_wait_ms', {'method': method}, queued_ms)
+            if duration_ms is not None:
+                self._observe('request_duration_ms', {'method': method}, duration_ms)
+            for stage, stage_ms in stages:
+                self._observe('stage_duration_ms', {'method': method, 'stage': stage}, stage_ms)
+
+    def snapshot(self, gauges: Sequence[Dict[str, Any]] = ()) -> Dict[str, Any]:
+        """Metric families (counters, histograms, then the given gauge families)."""
+        with self._lock:
+            families: List[Dict[str, Any]] = [{
+                'name': 'requests_total', 'type': 'counter',
+                'help': 'Bridge requests by method and outcome',
+                'series': [{'labels': dict(key), 'value': value} for key, value in sorted(self._requests.items())],
+            }]
+            helps = {
+                'queue_wait_ms': 'Time requests spent queued in the bridge before a worker took them',
+                'request_duration_ms': 'Time bridge workers spent running requests',
+                'stage_duration_ms': 'Time spent in each pipeline stage, between checkpoints',
+            }
+            for name, by_labels in self._histograms.items():
+                families.append({
+                    'name': name, 'type': 'histogram', 'help': helps[name],
+                    'series': [histogram.series(key) for key, histogram in sorted(by_labels.items())],
+                })
+        families.extend(gauges)
+        return {'uptime_seconds': round(time.time() - self._started, 3), 'families': families}
+
+
+def gauge(name: str, help_text: str, series: Sequence[Tuple[Dict[str, Any], float]]) -> Dict[str, Any]:
+    """A gauge family from ``(labels, value)`` pairs."""
+    return {'name': name, 'type': 'gauge', 'help': help_text,
+            'series': [{'labels': {k: str(v) for k, v in labels.items()}, 'value': value} for labels, value in series]}
@@ -0,0 +1,207 @@
+"""
+Bank routing summaries for the MemVid bridge.
+
+Each bank gets a tiny k-means codebook of its chunk embeddings written next to
+the index (``<bank>.route.npz``). At query time the bridge embeds the query once
+and scores every candidate bank against its codebook, so the server can send the
+full search only to the top-M banks instead of fanning out to all of them.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROUTE_SUFFIX = '.route.npz'
+DEFAULT_CENTROIDS = 8
+KMEANS_ITERATIONS = 12
+
+
+def route_summary_path(index_base: str) -> str:
+    """Path of the routing summary for an index base path (no extension)."""
+    return f"{index_base}{ROUTE_SUFFIX}"
+
+
+def _centroid_count(total_vectors: int) -> int:
+    try:
+        configured = int(os.environ.get('MEMVID_ROUTING_CENTROIDS', DEFAULT_CENTROIDS))
+    except ValueError:
+        configured = DEFAULT_CENTROIDS
+    return max(1, min(configured, total_vectors))
+
+
+def _normalize(vectors):
+    import numpy as np
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def extract_index_vectors(index) -> Optional[Any]:
+    """Reconstruct stored vectors from a FAISS index, or None if unsupported."""
+    import faiss
+    try:
+        inner = index
+        if hasattr(inner, 'id_map'):
+            inner = faiss.downcast_index(inner.index)
+        if hasattr(inner, 'make_direct_map'):
+            inner.make_direct_map()
+        if inner.ntotal == 0:
+            return None
+        return inner.reconstruct_n(0, inner.ntotal)
+    except Exception as e:
+        logger.warning(f"Could not reconstruct vectors from index: {e}")
+        return None
+
+
+def compute_codebook(vectors, k: Optional[int] = None, seed: int = 0):
+    """Spherical k-means over unit-normalized vectors.
+
+    Returns ``(centroids, counts)`` where centroids are unit-normalized.
+    """
+    import numpy as np
+
+    data = _normalize(np.asarray(vectors, dtype='float32'))
+    n = data.shape[0]
+    k = k or _centroid_count(n)
+    rng = np.random.default_rng(seed)
+
+    # k-means++ seeding on cosine distance
+    centroids = np.empty((k, data.shape[1]), dtype='float32')
+    centroids[0] = data[rng.integers(n)]
+    closest = 1.0 - data @ centroids[0]
+    for i in range(1, k):
+        weights = np.clip(closest, 0, None)
+        total = float(weights.sum())
+        pick = rng.choice(n, p=weights / total) if total > 0 else rng.integers(n)
+        centroids[i] = data[pick]
+        closest = np.minimum(closest, 1.0 - data @ centroids[i])
+
+    assignments = np.zeros(n, dtype='int64')
+    for iteration in range(KMEANS_ITERATIONS):
+        new_assignments = np.argmax(data @ centroids.T, axis=1)
+        if iteration > 0 and np.array_equal(new_assignments, assignments):
+            break
+        assignments = new_assignments
+        for c in range(k):
+            members = data[assignments == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+        centroids = _normalize(centroids)
+
+    counts = np.bincount(assignments, minlength=k).astype('int64')
+    return centroids, counts
+
+
+def write_route_summary(index_base: str, vectors, model_name: str) -> Optional[Dict[str, Any]]:
+    """Compute and persist a routing summary for a freshly built bank."""
+    import numpy as np
+
+    if vectors is None or len(vectors) == 0:
+        return None
+    centroids, counts = compute_codebook(vectors)
+    path = route_summary_path(index_base)
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, centroids=centroids, counts=counts,
+             model=np.array(model_name or ''), total=np.array(len(vectors)))
+    os.replace(tmp_path, path)
+    return {'centroids': int(centroids.shape[0]), 'dimension': int(centroids.shape[1])}
+
+
+def select_top_m(ranked: List[Dict[str, Any]], top_m: int) -> Tuple[List[str], List[str]]:
+    """Split ``rank()`` output into (selected, pruned) bank names.
+
+    The ``top_m`` best scored banks are selected; banks without a summary are
+    always selected, since there is nothing to prune them on.
+    """
+    scored = [entry['bank_name'] for entry in ranked if entry['score'] is not None]
+    unscored = [entry['bank_name'] for entry in ranked if entry['score'] is None]
+    return scored[:top_m] + unscored, scored[top_m:]
+
+
+class BankRouter:
+    """Scores banks against a query embedding using their stored codebooks."""
+
+    def __init__(self):
+        self._summaries: Dict[str, tuple] = {}
+        # Index mtime of banks whose summary could not be backfilled (empty or
+        # unreadable index); they are not retried until the index changes
+        self._failed_backfills: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def should_backfill(self, index_base: str, index_mtime: float) -> bool:
+        """False when a backfill already failed for this version of the bank's index."""
+        with self._lock:
+            return self._failed_backfills.get(index_base) != index_mtime
+
+    def backfill_failed(self, index_base: str, index_mtime: float) -> None:
+        with self._lock:
+            self._failed_backfills[index_base] = index_mtime
+
+    def load(self, index_base: str) -> Optional[Dict[str, Any]]:
+        """Load (and cache by mtime) the routing summary for a bank."""
+        import numpy as np
+
+        path = route_summary_path(index_base)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._summaries.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        with np.load(path) as data:
+            summary = {
+                'centroids': data['centroids'].astype('float32'),
+                'counts': data['counts'],
+                'model': str(data['model']),
+                'total': int(data['total']),
+            }
+        with self._lock:
+            self._summaries[path] = (mtime, summary)
+        return summary
+
+    def invalidate(self, index_base: str) -> None:
+        with self._lock:
+            self._summaries.pop(route_summary_path(index_base), None)
+
+    def clear(self) -> int:
+        """Drop every loaded summary; they reload on the next routed search. Returns the count."""
+        with self._lock:
+            count = len(self._summaries)
+            self._summaries.clear()
+        return count
+
+    def rank(self, query_vector, banks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return banks ordered by best centroid similarity.
+
+        Banks without a usable summary get ``score: None`` and are listed last;
+        callers should always search those rather than prune them.
+        """
+        import numpy as np
+
+        query = np.asarray(query_vector, dtype='float32').reshape(-1)
+        norm = float(np.linalg.norm(query)) or 1.0
+        query = query / norm
+
+        ranked = []
+        for bank in banks:
+            entry = {'bank_name': bank['name'], 'score': None, 'has_summary': False}
+            try:
+                summary = self.load(bank['index_base'])
+            except Exception as e:
+                logger.warning(f"Could not load routing summary for {bank['name']}: {e}")
+                summary = None
+            if summary is not None and summary['centroids'].shape[1] == query.shape[0]:
+                entry['score'] = float(np.max(summary['centroids'] @ query))
+                entry['has_summary'] = True
+                entry['chunks'] = summary['total']
+            ranked.append(entry)
+
+        ranked.sort(key=lambda e: (e['score'] is None, -(e['score'] or 0.0)))
+        return ranked
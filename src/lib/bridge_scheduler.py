@@ -0,0 +1,302 @@
+"""
+Request scheduler for the MemVid bridge.
+
+The stdin reader hands each request to a ``BridgeScheduler`` instead of running
+it inline. Requests wait in a bounded, priority-ordered queue (interactive
+search before bulk encode) and run on a small worker pool, with one worker
+always kept free of bulk work so searches are never stuck behind builds.
+
+Every request carries a ``RequestContext``. Work whose ``deadline`` (epoch ms,
+set by the server from its own timeout) has passed is dropped before it
+starts, and long pipelines call ``checkpoint(stage)`` between stages so a
+``cancel`` RPC or an expired deadline aborts them at the next stage boundary.
+``progress(stage, ...)`` reports how far a pipeline has got; the bridge turns
+it into ``{"event": "progress"}`` lines for the server.
+
+With a ``BridgeMetrics`` the scheduler records every request's outcome, queue
+wait, run time and the time spent in each checkpointed stage.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from bridge_metrics import BridgeMetrics
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_NORMAL: 'normal', PRIORITY_BULK: 'bulk'}
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_QUEUED = 64
+
+_local = threading.local()
+
+
+class RequestAborted(Exception):
+    """Raised at a checkpoint when a request was cancelled or ran past its deadline."""
+
+
+class RequestCancelled(RequestAborted):
+    pass
+
+
+class DeadlineExceeded(RequestAborted):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class RequestContext:
+    """Cancellation and deadline state for one bridge request."""
+
+    def __init__(self, request_id: Any, method: str, priority: int, deadline_ms: Optional[float] = None):
+        self.request_id = request_id
+        self.method = method
+        self.priority = priority
+        self.deadline = deadline_ms / 1000.0 if deadline_ms else None
+        self.enqueued_at = time.time()
+        self.started_at: Optional[float] = None
+        self.stage = 'queued'
+        self.stage_durations: Dict[str, float] = {}  # seconds per stage, in the order entered
+        self._stage_started: Optional[float] = None
+        self.progress_sink: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.time() > self.deadline
+
+    def checkpoint(self, stage: str) -> None:
+        if self.cancelled:
+            raise RequestCancelled(f"Request {self.request_id} cancelled before stage '{stage}'")
+        if self.expired():
+            raise DeadlineExceeded(f"Request {self.request_id} deadline exceeded before stage '{stage}'")
+        if stage != self.stage:
+            self.close_stage()
+            self._stage_started = time.time()
+        self.stage = stage
+
+    def close_stage(self) -> None:
+        """Add the time since the current stage began to its total."""
+        if self._stage_started is None:
+            return
+        elapsed = time.time() - self._stage_started
+        self.stage_durations[self.stage] = self.stage_durations.get(self.stage, 0.0) + elapsed
+        self._stage_started = None
+
+
+def current_context() -> Optional[RequestContext]:
+    """Context of the request running on this thread, if any."""
+    return getattr(_local, 'context', None)
+
+
+def checkpoint(stage: str) -> None:
+    """Abort the current request if it was cancelled or its deadline passed.
+
+    A no-op outside scheduled requests, so bridge methods can call it freely.
+    """
+    context = current_context()
+    if context is not None:
+        context.checkpoint(stage)
+
+
+def progress(stage: str, current: Optional[int] = None, total: Optional[int] = None,
+             message: Optional[str] = None) -> None:
+    """Report pipeline progress for the current request (no-op when nobody listens)."""
+    context = current_context()
+    if context is None or context.progress_sink is None:
+        return
+    event: Dict[str, Any] = {'stage': stage}
+    if current is not None:
+        event['current'] = current
+    if total is not None:
+        event['total'] = total
+    if message:
+        event['message'] = message
+    try:
+        context.progress_sink(event)
+    except Exception as e:
+        logger.debug(f"Progress sink failed for request {context.request_id}: {e}")
+
+
+class BridgeScheduler:
+    """Bounded priority queue in front of a worker pool."""
+
+    def __init__(self, handler: Callable[[Dict[str, Any], RequestContext], Optional[str]],
+                 on_dropped: Callable[[Dict[str, Any], RequestContext, str, str], None],
+                 workers: Optional[int] = None, max_queued: Optional[int] = None,
+                 metrics: Optional[BridgeMetrics] = None):
+        """``handler`` may return the request's outcome for metrics (default ``ok``)."""
+        self._handler = handler
+        self._on_dropped = on_dropped
+        self.metrics = metrics
+        self.workers = workers or _env_int('MEMVID_BRIDGE_WORKERS', DEFAULT_WORKERS)
+        self.max_queued = max_queued or _env_int('MEMVID_BRIDGE_QUEUE', DEFAULT_MAX_QUEUED)
+        # Keep one worker for interactive/normal work whenever there is more than one
+        self.max_bulk = max(1, self.workers - 1)
+
+        self._lanes = {p: deque() for p in PRIORITY_NAMES}
+        self._contexts: Dict[Any, RequestContext] = {}
+        self._running: Dict[Any, RequestContext] = {}
+        self._running_bulk = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self.stats = {'completed': 0, 'rejected': 0, 'expired': 0, 'cancelled': 0}
+
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"bridge-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, request: Dict[str, Any], priority: int) -> RequestContext:
+        """Queue a request; raises ``QueueFull`` when admission control rejects it."""
+        context = RequestContext(request.get('id'), request.get('method'), priority, request.get('deadline'))
+        with self._cond:
+            queued = sum(len(lane) for lane in self._lanes.values())
+            if queued >= self.max_queued:
+                self.stats['rejected'] += 1
+                self._record(context, 'rejected')
+                raise QueueFull(f"Bridge queue is full ({queued} requests waiting); try again shortly")
+            self._lanes[priority].append((request, context))
+            self._contexts[context.request_id] = context
+            self._cond.notify()
+        return context
+
+    def cancel(self, request_id: Any) -> str:
+        """Cancel a queued or running request. Returns its state: queued, running or unknown."""
+        with self._cond:
+            context = self._contexts.get(request_id)
+            if context is None:
+                return 'unknown'
+            context.cancel()
+            if request_id in self._running:
+                return 'running'
+            for lane in self._lanes.values():
+                for entry in lane:
+                    if entry[1] is context:
+                        lane.remove(entry)
+                        self._contexts.pop(request_id, None)
+                        self.stats['cancelled'] += 1
+                        self._record(context, 'cancelled', queued=True)
+                        self._on_dropped(entry[0], context, 'RequestCancelled',
+                                         f"Request {request_id} cancelled while queued")
+                        return 'queued'
+        return 'unknown'
+
+    def _next(self):
+        for priority in sorted(self._lanes):
+            lane = self._lanes[priority]
+            if not lane:
+                continue
+            if priority == PRIORITY_BULK and self._running_bulk >= self.max_bulk:
+                continue
+            return lane.popleft()
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                entry = self._next()
+                while entry is None and not self._stopping:
+                    self._cond.wait()
+                    entry = self._next()
+                if entry is None:
+                    return
+                request, context = entry
+                if context.expired():
+                    self._contexts.pop(context.request_id, None)
+                    self.stats['expired'] += 1
+                    self._record(context, 'expired', queued=True)
+                    expired = True
+                else:
+                    expired = False
+                    context.started_at = time.time()
+                    self._running[context.request_id] = context
+                    if context.priority == PRIORITY_BULK:
+                        self._running_bulk += 1
+
+            if expired:
+                logger.warning(f"Dropping expired request {context.request_id} ({context.method}) "
+                               f"after {time.time() - context.enqueued_at:.2f}s in queue")
+                self._on_dropped(request, context, 'DeadlineExceeded',
+                                 f"Request {context.request_id} deadline exceeded before it started")
+                continue
+
+            _local.context = context
+            outcome = 'error'
+            try:
+                outcome = self._handler(request, context) or 'ok'
+            except Exception as e:
+                logger.error(f"Unhandled error in request {context.request_id}: {e}")
+            finally:
+                _local.context = None
+                context.close_stage()
+                self._record(context, outcome, queued=True, ran=True)
+                with self._cond:
+                    self._running.pop(context.request_id, None)
+                    self._contexts.pop(context.request_id, None)
+                    if context.priority == PRIORITY_BULK:
+                        self._running_bulk -= 1
+                    self.stats['completed'] += 1
+                    # A finished bulk job may unblock the bulk lane for another worker
+                    self._cond.notify_all()
+
+    def _record(self, context: RequestContext, outcome: str, queued: bool = False, ran: bool = False) -> None:
+        if self.metrics is None:
+            return
+        started = context.started_at if ran else None
+        waited_until = started or time.time()
+        self.metrics.record_request(
+            context.method or 'unknown', outcome,
+            queued_ms=(waited_until - context.enqueued_at) * 1000 if queued else None,
+            duration_ms=(time.time() - started) * 1000 if started else None,
+            stages=[(stage, seconds * 1000) for stage, seconds in context.stage_durations.items()],
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'workers': self.workers,
+                'max_queued': self.max_queued,
+                'queued': {PRIORITY_NAMES[p]: len(lane) for p, lane in self._lanes.items()},
+                'running': [
+                    {'id': c.request_id, 'method': c.method, 'stage': c.stage,
+                     'elapsed': round(time.time() - (c.started_at or c.enqueued_at), 3)}
+                    for c in self._running.values()
+                ],
+                **self.stats,
+            }
+
+    def stop(self) -> None:
+        """Stop accepting work; workers exit once the queue is drained."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
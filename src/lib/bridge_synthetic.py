@@ -0,0 +1,174 @@
+"""
+Offline stand-ins for benchmarking the MemVid bridge at scale.
+
+Realistic bank sizes could not be benchmarked without the sentence-transformers
+model (a download, and minutes of CPU per 100k chunks) or with the tiny
+repeated-text inputs of the older perf scripts. This module provides:
+
+* ``HashingEmbedder``: a feature-hashing embedder selected with
+  ``embedding_model: "hashing"`` or ``"hashing:<dimension>"`` in the server's
+  ``memvid`` config. Word unigrams and bigrams are hashed (blake2b, so vectors
+  are identical across processes and runs) into a signed, L2-normalized vector.
+  Texts that share words land close together, which is all the index, routing
+  and search paths need to be exercised; it is not a semantic model.
+* ``SyntheticCorpus``: a deterministic generator of topic-clustered chunks
+  (1k to 1M and beyond) and matching queries, used by the bridge's internal
+  ``synthetic`` source type and ``tests/performance/scale-benchmark.py``.
+"""
+
+import hashlib
+import random
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+HASHING_MODEL = 'hashing'
+DEFAULT_HASHING_DIMENSION = 384
+MAX_CACHED_TOKENS = 1 << 20
+
+_TOKEN = re.compile(r'\w+')
+_SYLLABLES = ('ka', 'ri', 'to', 'ne', 'mo', 'sa', 'lu', 'vi', 'de', 'po', 'zan', 'tel', 'mir', 'gos',
+              'ber', 'qui', 'ul', 'fa', 'ech', 'ost', 'rin', 'dal', 'pex', 'yor')
+
+
+def hashing_dimension(model_name: Optional[str]) -> Optional[int]:
+    """The dimension for a ``hashing[:<dimension>]`` model name; None for any other model."""
+    if not model_name:
+        return None
+    name, _, dimension = model_name.strip().partition(':')
+    if name.lower() != HASHING_MODEL:
+        return None
+    try:
+        value = int(dimension) if dimension else DEFAULT_HASHING_DIMENSION
+    except ValueError:
+        raise ValueError(f"Invalid hashing embedder dimension in '{model_name}'")
+    if not 8 <= value <= 4096:
+        raise ValueError(f"Hashing embedder dimension must be between 8 and 4096, got {value}")
+    return value
+
+
+class HashingEmbedder:
+    """Signed feature hashing of word unigrams and bigrams, with the slice of the
+    SentenceTransformer interface the bridge and memvid call (``encode`` and
+    ``get_sentence_embedding_dimension``)."""
+
+    def __init__(self, dimension: int = DEFAULT_HASHING_DIMENSION):
+        self.dimension = dimension
+        self._slots: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def _slot(self, feature: str) -> Tuple[int, float]:
+        slot = self._slots.get(feature)
+        if slot is None:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+            slot = (digest % self.dimension, 1.0 if digest >> 63 else -1.0)
+            with self._lock:
+                if len(self._slots) >= MAX_CACHED_TOKENS:
+                    self._slots.clear()
+                self._slots[feature] = slot
+        return slot
+
+    def features(self, text: str) -> List[Tuple[int, float]]:
+        """``(index, sign)`` for every unigram and bigram in ``text``."""
+        tokens = _TOKEN.findall(text.lower())
+        slots = [self._slot(token) for token in tokens]
+        slots.extend(self._slot(f"{a} {b}") for a, b in zip(tokens, tokens[1:]))
+        return slots
+
+    def embed_text(self, text: str) -> List[float]:
+        """One text's normalized vector as a list (no numpy needed)."""
+        vector = [0.0] * self.dimension
+        for index, sign in self.features(text):
+            vector[index] += sign
+        norm = sum(v * v for v in vector) ** 0.5
+        return [v / norm for v in vector] if norm else vector
+
+    def encode(self, sentences, batch_size: Optional[int] = None, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False, **kwargs):
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(texts):
+            for index, sign in self.features(text):
+                rows.append(row)
+                cols.append(index)
+                signs.append(sign)
+        vectors = np.zeros((len(texts), self.dimension), dtype='float32')
+        if rows:
+            np.add.at(vectors, (np.asarray(rows), np.asarray(cols)), np.asarray(signs, dtype='float32'))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        return vectors[0] if single else vectors
+
+
+class SyntheticCorpus:
+    """Deterministic, topic-clustered text: chunk ``i`` depends only on the seed and ``i``.
+
+    Each chunk belongs to topic ``i % topics`` and mixes that topic's words
+    (Zipf-weighted) with a shared pool of common words, so a query made of one
+    topic's words is closest to that topic's chunks.
+    """
+
+    def __init__(self, seed: int = 0, topics: int = 64, topic_words: int = 48, common_words: int = 256):
+        self.seed = seed
+        self.topics = topics
+        rng = random.Random(f"memvid-synthetic:{seed}")
+        vocabulary: List[str] = []
+        seen = set()
+        while len(vocabulary) < topics * topic_words + common_words:
+            word = ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+            if word not in seen:
+                seen.add(word)
+                vocabulary.append(word)
+        self.common = vocabulary[:common_words]
+        self.topic_vocabularies = [vocabulary[common_words + t * topic_words: common_words + (t + 1) * topic_words]
+                                   for t in range(topics)]
+        weights = [1.0 / (rank + 1) for rank in range(topic_words)]
+        self._topic_cum_weights = [sum(weights[:n + 1]) for n in range(topic_words)]
+
+    def topic_of(self, index: int) -> int:
+        return index % self.topics
+
+    def chunk(self, index: int, chars: int = 480) -> str:
+        """Chunk ``index``: sentences of topic and common words, at most ``chars`` long."""
+        rng = random.Random(f"{self.seed}:{index}")
+        words = self.topic_vocabularies[self.topic_of(index)]
+        sentences, length = [], 0
+        while length < chars:
+            count = rng.randint(8, 14)
+            picked = rng.choices(words, cum_weights=self._topic_cum_weights, k=count)
+            for position in rng.sample(range(count), k=count // 3):
+                picked[position] = rng.choice(self.common)
+            sentence = ' '.join(picked).capitalize() + '.'
+            sentences.append(sentence)
+            length += len(sentence) + 1
+        return ' '.join(sentences)[:chars].rstrip()
+
+    def chunks(self, count: int, chars: int = 480, start: int = 0) -> Iterator[str]:
+        for index in range(start, start + count):
+            yield self.chunk(index, chars)
+
+    def queries(self, count: int, words: int = 4) -> List[Tuple[str, int]]:
+        """``(query, topic)`` pairs drawn from each topic's most frequent words."""
+        rng = random.Random(f"{self.seed}:queries")
+        result = []
+        for n in range(count):
+            topic = n % self.topics
+            top = self.topic_vocabularies[topic][:max(words * 2, 8)]
+            result.append((' '.join(rng.sample(top, k=min(words, len(top)))), topic))
+        return result
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (``q`` in 0-100) of ``values``; None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
@@ -0,0 +1,133 @@
+"""
+Zygote mode for the MemVid bridge.
+
+A plain bridge pays for importing torch, sentence_transformers, faiss and cv2
+and for loading the embedding model every time it starts, including restarts
+after a crash. With ``--zygote`` the process spawned by the server does that
+work once and then forks the bridge worker that actually serves requests. The
+worker inherits the imported modules and model weights copy-on-write, so it is
+ready in well under a second, and a crashed worker is replaced by a fresh fork
+instead of a cold start.
+
+The zygote never runs inference itself: torch's thread pools must first start
+in the forked worker, not in the parent.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_RESTARTS = 5
+RESTART_WINDOW_SECONDS = 60.0
+
+
+def zygote_supported() -> bool:
+    return hasattr(os, 'fork') and hasattr(os, 'waitpid')
+
+
+def memory_snapshot() -> Dict[str, float]:
+    """RSS of this process split into private and shared pages (MB); empty off Linux.
+
+    In a forked worker ``private_mb`` is the memory it added on top of the zygote
+    (pages it wrote or allocated), ``shared_mb`` what it still shares with it.
+    """
+    fields: Dict[str, int] = {}
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return {}
+    to_mb = lambda kb: round(kb / 1024, 1)  # noqa: E731
+    return {
+        'rss_mb': to_mb(fields.get('Rss', 0)),
+        'pss_mb': to_mb(fields.get('Pss', 0)),
+        'private_mb': to_mb(fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)),
+        'shared_mb': to_mb(fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)),
+    }
+
+
+class WorkerInfo:
+    """What a forked worker knows about its own startup, reported in ``ready`` and ``ping``."""
+
+    def __init__(self, zygote_pid: int, forked_at: float, generation: int, zygote_memory: Dict[str, float]):
+        self.pid = os.getpid()
+        self.zygote_pid = zygote_pid
+        self.forked_at = forked_at
+        self.generation = generation
+        self.zygote_memory = zygote_memory
+        self.startup_ms: Optional[float] = None
+
+    def mark_ready(self) -> None:
+        self.startup_ms = round((time.time() - self.forked_at) * 1000, 1)
+
+    def describe(self) -> Dict[str, Any]:
+        memory = memory_snapshot()
+        return {
+            'mode': 'zygote',
+            'pid': self.pid,
+            'zygote_pid': self.zygote_pid,
+            'generation': self.generation,
+            'startup_ms': self.startup_ms,
+            'memory': memory,
+            # RSS the worker added on top of what it shares with the zygote
+            'rss_delta_mb': memory.get('private_mb'),
+            'zygote_rss_mb': self.zygote_memory.get('rss_mb'),
+        }
+
+
+def run_zygote(preload: Callable[[], Any], serve: Callable[[Any, WorkerInfo], int],
+               emit: Callable[[dict], None]) -> int:
+    """Preload once, then keep one forked worker serving stdin/stdout.
+
+    ``serve(state, info)`` runs in the worker and returns its exit code; 0 means
+    stdin closed normally and the zygote exits too. Any other exit is reported
+    as a ``worker_exit`` event and a new worker is forked, unless workers keep
+    dying (``MAX_RESTARTS`` within ``RESTART_WINDOW_SECONDS``).
+    """
+    started = time.time()
+    state = preload()
+    zygote_memory = memory_snapshot()
+    logger.info(f"Zygote preloaded in {time.time() - started:.1f}s "
+                f"(RSS {zygote_memory.get('rss_mb', '?')} MB)")
+
+    restarts: deque = deque()
+    generation = 0
+    while True:
+        generation += 1
+        forked_at = time.time()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = serve(state, WorkerInfo(os.getppid(), forked_at, generation, zygote_memory))
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException as e:
+                logger.error(f"Bridge worker failed: {e}")
+            finally:
+                logging.shutdown()
+                os._exit(code)
+
+        logger.info(f"Zygote forked bridge worker {pid} (generation {generation})")
+        _, status = os.waitpid(pid, 0)
+        code = os.waitstatus_to_exitcode(status) if hasattr(os, 'waitstatus_to_exitcode') else status
+        if code == 0:
+            logger.info(f"Bridge worker {pid} exited normally; zygote shutting down")
+            return 0
+
+        logger.error(f"Bridge worker {pid} exited with {code}; forking a replacement")
+        emit({'event': 'worker_exit', 'pid': pid, 'code': code, 'generation': generation})
+        now = time.time()
+        restarts.append(now)
+        while restarts and now - restarts[0] > RESTART_WINDOW_SECONDS:
+            restarts.popleft()
+        if len(restarts) > MAX_RESTARTS:
+            logger.error(f"Bridge worker crashed {len(restarts)} times in {RESTART_WINDOW_SECONDS:.0f}s; giving up")
+            return 1
@@ -0,0 +1,125 @@
+/**
+ * Idle-time scheduling for bank compaction
+ *
+ * Every `add_to_memory` call is chunked on its own, so banks fed by agent
+ * sessions fill up with small fragments. The scheduler counts appends per bank
+ * and, once the server has seen no tool calls for `idleMs`, starts a
+ * compaction for the bank with the most appends past `minAppends`. One bank is
+ * compacted at a time and nothing starts while the bridge has work in flight.
+ */
+
+import { logger } from './logger.js';
+
+export interface IdleCompactionOptions {
+  /** Quiet period (no tool calls) before a compaction may start */
+  idleMs: number;
+  /** Appends a bank must accumulate before it is worth compacting */
+  minAppends: number;
+  /** How often the idle check runs */
+  checkIntervalMs?: number | undefined;
+}
+
+export interface IdleCompactionHooks {
+  /** True while the bridge has requests queued or running */
+  isBusy: () => boolean;
+  /** True while a build or compaction job is active for the bank */
+  hasActiveJob: (bankName: string) => boolean;
+  /** Start the compaction job; resolves when it has finished */
+  start: (bankName: string) => Promise<unknown>;
+}
+
+export interface IdleCompactionStats {
+  idle_ms: number;
+  min_appends: number;
+  pending: Record<string, number>;
+  running: string | null;
+  started: number;
+  last_activity_at: string;
+}
+
+const DEFAULT_CHECK_INTERVAL_MS = 30000;
+
+export class IdleCompactionScheduler {
+  private appends = new Map<string, number>();
+  private lastActivity = Date.now();
+  private running: string | null = null;
+  private started = 0;
+  private timer: NodeJS.Timeout | null = null;
+
+  constructor(private options: IdleCompactionOptions, private hooks: IdleCompactionHooks) {}
+
+  /** Any tool call resets the idle clock */
+  noteActivity(now: number = Date.now()): void {
+    this.lastActivity = now;
+  }
+
+  noteAppend(bankName: string, now: number = Date.now()): void {
+    this.appends.set(bankName, (this.appends.get(bankName) ?? 0) + 1);
+    this.noteActivity(now);
+  }
+
+  /** Reset a bank's append count after it was compacted (or removed) */
+  noteCompacted(bankName: string): void {
+    this.appends.delete(bankName);
+  }
+
+  /**
+   * Start a compaction if the server is idle and a bank qualifies.
+   * Returns the bank picked, or null.
+   */
+  check(now: number = Date.now()): string | null {
+    if (this.running || now - this.lastActivity < this.options.idleMs || this.hooks.isBusy()) {
+      return null;
+    }
+
+    let candidate: string | null = null;
+    let most = 0;
+    for (const [bankName, count] of this.appends) {
+      if (count >= this.options.minAppends && count > most && !this.hooks.hasActiveJob(bankName)) {
+        candidate = bankName;
+        most = count;
+      }
+    }
+    if (!candidate) {
+      return null;
+    }
+
+    const bankName = candidate;
+    this.running = bankName;
+    this.started++;
+    logger.info(`Server idle for ${now - this.lastActivity}ms; compacting '${bankName}' after ${most} appends`);
+    this.hooks.start(bankName)
+      .catch(error => logger.warn(`Idle compaction of '${bankName}' failed:`, error))
+      .finally(() => {
+        this.running = null;
+      });
+    return bankName;
+  }
+
+  start(): void {
+    if (this.timer) {
+      return;
+    }
+    this.timer = setInterval(() => this.check(), this.options.checkIntervalMs ?? DEFAULT_CHECK_INTERVAL_MS);
+    // Idle checks never keep the process alive on their own
+    this.timer.unref();
+  }
+
+  stop(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  getStats(): IdleCompactionStats {
+    return {
+      idle_ms: this.options.idleMs,
+      min_appends: this.options.minAppends,
+      pending: Object.fromEntries(this.appends),
+      running: this.running,
+      started: this.started,
+      last_activity_at: new Date(this.lastActivity).toISOString()
+    };
+  }
+}
@@ -1,7 +1,11 @@
+import { spawn } from 'child_process';
 import path from 'path';
 import os from 'os';
 import { promises as fs } from 'fs';
 import { logger } from './logger.js';
+import { ENVIRONMENT_CACHE_FILE, EnvironmentCache, environmentCacheEnabled, environmentFingerprint } from './environment-cache.js';
+
+const PYTHON_CANDIDATES = ['python3', 'python', 'py'];
 
 interface EnvironmentConfig {
   memoryBanksDir: string;
@@ -13,6 +17,7 @@ interface EnvironmentConfig {
 export class ConfigManager {
   private static instance: ConfigManager;
   private environmentConfig: EnvironmentConfig | null = null;
+  private environmentCache: EnvironmentCache | null | undefined;
 
   static getInstance(): ConfigManager {
     if (!ConfigManager.instance) {
@@ -30,22 +35,40 @@ export class ConfigManager {
     return this.environmentConfig;
   }
 
+  /**
+   * Directory for the server's own files (setup notes, environment cache)
+   */
+  getConfigDir(): string {
+    return path.join(this.getUserDataDirectory(), 'memvid-mcp');
+  }
+
+  /**
+   * Persisted detection results, or null when MEMVID_ENV_CACHE turns the cache off
+   */
+  getEnvironmentCache(): EnvironmentCache | null {
+    if (this.environmentCache === undefined) {
+      this.environmentCache = environmentCacheEnabled()
+        ? new EnvironmentCache(path.join(this.getConfigDir(), ENVIRONMENT_CACHE_FILE))
+        : null;
+    }
+    return this.environmentCache;
+  }
+
   private async detectEnvironment(): Promise<EnvironmentConfig> {
     // Check if running as npm package (npx)
     const isNpxRun = Boolean(process.env.npm_config_user_config) || 
                      Boolean(process.argv[0]?.includes('npx'));
 
     // Default directories based on platform
-    const userDataDir = this.getUserDataDirectory();
-    const configDir = path.join(userDataDir, 'memvid-mcp');
+    const configDir = this.getConfigDir();
     const memoryBanksDir = path.join(configDir, 'memory-banks');
 
     // Ensure directories exist
     await this.ensureDirectoryExists(configDir);
     await this.ensureDirectoryExists(memoryBanksDir);
 
-    // Detect Python installation
-    const pythonExecutable = await this.detectPython();
+    // Detect Python installation (skipped while the cached result still matches)
+    const pythonExecutable = process.env.PYTHON_EXECUTABLE || await this.detectPythonCached();
 
     const config: EnvironmentConfig = {
       memoryBanksDir: process.env.MEMORY_BANKS_DIR || memoryBanksDir,
@@ -86,17 +109,33 @@ export class ConfigManager {
     }
   }
 
-  private async detectPython(): Promise<string> {
-    const candidates = [
-      'python3',
-      'python',
-      'py'
-    ];
+  private async detectPythonCached(): Promise<string> {
+    const cache = this.getEnvironmentCache();
+    const fingerprint = cache ? environmentFingerprint(PYTHON_CANDIDATES) : null;
+    if (cache && fingerprint) {
+      const cached = await cache.get<string>('python', fingerprint);
+      if (cached) {
+        logger.info(`Python detected: ${cached} (cached)`);
+        return cached;
+      }
+    }
+
+    const detected = await this.detectPython();
+    if (detected) {
+      if (cache && fingerprint) {
+        await cache.set('python', fingerprint, detected);
+      }
+      return detected;
+    }
 
-    for (const candidate of candidates) {
+    // Fallback to 'python' and let the user handle installation
+    logger.warn('Python not detected. Please ensure Python is installed and accessible.');
+    return 'python';
+  }
+
+  private async detectPython(): Promise<string | null> {
+    for (const candidate of PYTHON_CANDIDATES) {
       try {
-        const { spawn } = require('child_process');
-        
         await new Promise<void>((resolve, reject) => {
           const proc = spawn(candidate, ['--version'], { stdio: 'pipe' });
           proc.on('close', (code: number | null) => code === 0 ? resolve() : reject(new Error(`Process exited with code ${code}`)));
@@ -109,10 +148,7 @@ export class ConfigManager {
         // Continue to next candidate
       }
     }
-
-    // Fallback to 'python' and let the user handle installation
-    logger.warn('Python not detected. Please ensure Python is installed and accessible.');
-    return 'python';
+    return null;
   }
 
   async setupMemvidEnvironment(): Promise<void> {
@@ -120,8 +156,6 @@ export class ConfigManager {
     
     // Check if MemVid is installed
     try {
-      const { spawn } = require('child_process');
-      
       await new Promise<void>((resolve, reject) => {
         const proc = spawn(config.pythonExecutable, ['-c', 'import memvid'], { stdio: 'pipe' });
         proc.on('close', (code: number | null) => code === 0 ? resolve() : reject(new Error(`Process exited with code ${code}`)));
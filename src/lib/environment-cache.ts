@@ -0,0 +1,177 @@
+/**
+ * Persisted environment detection for fast server starts.
+ *
+ * Finding Python (`--version` for every candidate command) and checking the
+ * memvid install (a Python import) cost seconds on each launch, and editors
+ * start and restart the MCP server often. Detection results are saved in the
+ * config directory with a fingerprint of what they depend on: each candidate
+ * command resolved on PATH to a file path, size and mtime (a few stat calls, no
+ * process spawned), the environment variables that change detection, and the
+ * platform. An entry is reused only while its fingerprint still matches and it
+ * is younger than the maximum age, so upgrading or reinstalling Python, or
+ * pointing the server somewhere else, triggers a fresh probe.
+ */
+
+import { promises as fs, statSync } from 'fs';
+import path from 'path';
+import { logger } from './logger.js';
+
+export const ENVIRONMENT_CACHE_FILE = 'environment-cache.json';
+export const DEFAULT_CACHE_MAX_AGE_MS = 24 * 60 * 60 * 1000;
+export const FINGERPRINT_ENV = ['PYTHON_EXECUTABLE', 'MEMORY_BANKS_DIR', 'PYTHONPATH'];
+const CACHE_FORMAT = 1;
+
+export interface ExecutableFingerprint {
+  path: string;
+  size: number;
+  mtimeMs: number;
+}
+
+export interface EnvironmentFingerprint {
+  platform: string;
+  arch: string;
+  env: Record<string, string>;
+  executables: Record<string, ExecutableFingerprint | null>;
+}
+
+interface CacheEntry {
+  saved_at: number;
+  fingerprint: EnvironmentFingerprint;
+  value: unknown;
+}
+
+interface CacheFile {
+  format: number;
+  entries: Record<string, CacheEntry>;
+}
+
+/**
+ * Find a command the way the shell would (PATH, plus PATHEXT on Windows) without running it
+ */
+export function resolveExecutable(command: string, pathEnv: string = process.env.PATH ?? ''): ExecutableFingerprint | null {
+  const isWindows = process.platform === 'win32';
+  const candidates = command.includes('/') || (isWindows && command.includes('\\'))
+    ? [path.resolve(command)]
+    : pathEnv.split(path.delimiter).filter(Boolean).map(dir => path.join(dir, command));
+  const extensions = isWindows
+    ? ['', ...(process.env.PATHEXT ?? '.EXE;.CMD;.BAT').split(';').filter(Boolean)]
+    : [''];
+
+  for (const candidate of candidates) {
+    for (const extension of extensions) {
+      try {
+        const stat = statSync(candidate + extension);
+        if (stat.isFile() && (isWindows || (stat.mode & 0o111) !== 0)) {
+          return { path: candidate + extension, size: stat.size, mtimeMs: Math.floor(stat.mtimeMs) };
+        }
+      } catch {
+        // Not here; keep looking
+      }
+    }
+  }
+  return null;
+}
+
+/**
+ * What a detection result depends on: the candidate commands as they resolve now and the relevant variables
+ */
+export function environmentFingerprint(commands: string[], envNames: string[] = FINGERPRINT_ENV): EnvironmentFingerprint {
+  const env: Record<string, string> = {};
+  for (const name of envNames) {
+    const value = process.env[name];
+    if (value) {
+      env[name] = value;
+    }
+  }
+  const executables: Record<string, ExecutableFingerprint | null> = {};
+  for (const command of commands) {
+    executables[command] = resolveExecutable(command);
+  }
+  return { platform: process.platform, arch: process.arch, env, executables };
+}
+
+function canonical(value: unknown): string {
+  if (value === null || typeof value !== 'object') {
+    return JSON.stringify(value);
+  }
+  if (Array.isArray(value)) {
+    return `[${value.map(canonical).join(',')}]`;
+  }
+  const record = value as Record<string, unknown>;
+  return `{${Object.keys(record).sort().map(key => `${JSON.stringify(key)}:${canonical(record[key])}`).join(',')}}`;
+}
+
+export function fingerprintsEqual(a: EnvironmentFingerprint, b: EnvironmentFingerprint): boolean {
+  return canonical(a) === canonical(b);
+}
+
+/**
+ * Detection results keyed by name in one JSON file; unreadable or stale entries are treated as missing
+ */
+export class EnvironmentCache {
+  constructor(
+    private readonly filePath: string,
+    private readonly maxAgeMs: number = DEFAULT_CACHE_MAX_AGE_MS
+  ) {}
+
+  get path(): string {
+    return this.filePath;
+  }
+
+  /**
+   * The cached value when its fingerprint matches and it is not too old, else null
+   */
+  async get<T>(key: string, fingerprint: EnvironmentFingerprint, now: number = Date.now()): Promise<T | null> {
+    const entry = (await this.read()).entries[key];
+    if (!entry) {
+      return null;
+    }
+    if (now - entry.saved_at > this.maxAgeMs || entry.saved_at > now) {
+      logger.debug(`Environment cache entry '${key}' expired`);
+      return null;
+    }
+    if (!fingerprintsEqual(entry.fingerprint, fingerprint)) {
+      logger.debug(`Environment cache entry '${key}' no longer matches the environment`);
+      return null;
+    }
+    return entry.value as T;
+  }
+
+  async set(key: string, fingerprint: EnvironmentFingerprint, value: unknown, now: number = Date.now()): Promise<void> {
+    const file = await this.read();
+    file.entries[key] = { saved_at: now, fingerprint, value };
+    try {
+      await fs.mkdir(path.dirname(this.filePath), { recursive: true });
+      // Write then rename so a concurrently starting server never reads half a file
+      const tempPath = `${this.filePath}.${process.pid}.tmp`;
+      await fs.writeFile(tempPath, JSON.stringify(file, null, 2));
+      await fs.rename(tempPath, this.filePath);
+    } catch (error) {
+      logger.debug('Could not write the environment cache:', error instanceof Error ? error.message : error);
+    }
+  }
+
+  async clear(): Promise<void> {
+    await fs.rm(this.filePath, { force: true });
+  }
+
+  private async read(): Promise<CacheFile> {
+    try {
+      const parsed = JSON.parse(await fs.readFile(this.filePath, 'utf-8'));
+      if (parsed?.format === CACHE_FORMAT && parsed.entries && typeof parsed.entries === 'object') {
+        return parsed as CacheFile;
+      }
+    } catch {
+      // Missing or corrupt: start over
+    }
+    return { format: CACHE_FORMAT, entries: {} };
+  }
+}
+
+/**
+ * Whether the environment cache is enabled (`MEMVID_ENV_CACHE=0` always probes afresh)
+ */
+export function environmentCacheEnabled(): boolean {
+  const value = process.env.MEMVID_ENV_CACHE?.trim().toLowerCase();
+  return !['0', 'false', 'no', 'off'].includes(value ?? '');
+}
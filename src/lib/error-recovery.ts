@@ -135,6 +135,19 @@ export class ErrorRecoveryManager {
     // Classify based on error message and type
     const errorMessage = error.message.toLowerCase();
     
+    // Admission control: the bridge queue is full
+    if (errorMessage.includes('queue is full')) {
+      return this.createEnhancedError(
+        ErrorCode.TEMPORARY_RESOURCE_CONSTRAINT,
+        ErrorSeverity.MEDIUM,
+        true,
+        'The server is busy with other requests',
+        error.message,
+        'Wait a moment and try again',
+        context
+      );
+    }
+
     // Network and communication errors
     if (errorMessage.includes('timeout') || errorMessage.includes('econnreset')) {
       return this.createEnhancedError(
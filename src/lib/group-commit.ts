@@ -0,0 +1,164 @@
+/**
+ * Group commit for appends
+ *
+ * Every append publishes a new bank generation: the bridge re-reads the bank,
+ * embeds, rewrites the index and the server rewrites the registry. An agent
+ * saving a burst of small notes paid that once per note. The committer holds
+ * items per key (bank) for a short window and hands them to `commit` together,
+ * so a burst costs one write. While a group for a key is being committed the
+ * next one keeps filling and is committed as soon as the first finishes, so
+ * groups grow with the commit time under sustained load, up to `maxItems`;
+ * further items queue in the following group. Each submitter gets its own
+ * item's result.
+ */
+
+export interface GroupCommitOptions {
+  /** How long the first item of a group waits for others */
+  windowMs: number;
+  /** A group this large is committed without waiting for the window */
+  maxItems: number;
+}
+
+export interface GroupCommitStats {
+  window_ms: number;
+  max_items: number;
+  groups: number;
+  items: number;
+  largest_group: number;
+  pending: Record<string, number>;
+  committing: string[];
+}
+
+interface PendingItem<T, R> {
+  item: T;
+  resolve: (result: R) => void;
+  reject: (error: Error) => void;
+}
+
+interface PendingGroup<T, R> {
+  entries: PendingItem<T, R>[];
+  timer: NodeJS.Timeout | null;
+  /** Window over or group full; committed once the key's running commit finishes */
+  due: boolean;
+}
+
+export class GroupCommitter<T, R> {
+  /** Groups per key in commit order; only the last one still takes items */
+  private pending = new Map<string, PendingGroup<T, R>[]>();
+  private committing = new Set<string>();
+  private groups = 0;
+  private items = 0;
+  private largestGroup = 0;
+
+  /**
+   * `commit` writes one group and returns one result per item, in order
+   */
+  constructor(
+    private options: GroupCommitOptions,
+    private commit: (key: string, items: T[]) => Promise<R[]>
+  ) {}
+
+  /**
+   * Queue one item for `key`; resolves with its result once its group is committed
+   */
+  submit(key: string, item: T): Promise<R> {
+    return new Promise<R>((resolve, reject) => {
+      let queue = this.pending.get(key);
+      if (!queue) {
+        queue = [];
+        this.pending.set(key, queue);
+      }
+      let group = queue[queue.length - 1];
+      if (!group || group.entries.length >= this.options.maxItems) {
+        // A full group waiting behind a running commit is closed; start the next one
+        const created: PendingGroup<T, R> = { entries: [], timer: null, due: false };
+        created.timer = setTimeout(() => this.markDue(key, created), this.options.windowMs);
+        queue.push(created);
+        group = created;
+      }
+      group.entries.push({ item, resolve, reject });
+      if (group.entries.length >= this.options.maxItems) {
+        this.markDue(key, group);
+      }
+    });
+  }
+
+  /**
+   * Queue many items for one key (split into groups of at most `maxItems`)
+   */
+  submitMany(key: string, items: T[]): Promise<R[]> {
+    return Promise.all(items.map(item => this.submit(key, item)));
+  }
+
+  /**
+   * Commit the key's pending groups now, or as soon as its running commit finishes
+   */
+  flush(key: string): void {
+    for (const group of this.pending.get(key) ?? []) {
+      this.markDue(key, group);
+    }
+  }
+
+  private markDue(key: string, group: PendingGroup<T, R>): void {
+    if (group.timer) {
+      clearTimeout(group.timer);
+      group.timer = null;
+    }
+    group.due = true;
+    this.drain(key);
+  }
+
+  /**
+   * Commit the key's first group if it is due and nothing is committing for the key
+   */
+  private drain(key: string): void {
+    const queue = this.pending.get(key);
+    const group = queue?.[0];
+    if (!queue || !group?.due || this.committing.has(key)) {
+      return;
+    }
+
+    queue.shift();
+    if (queue.length === 0) {
+      this.pending.delete(key);
+    }
+    this.committing.add(key);
+    const entries = group.entries;
+    this.groups++;
+    this.items += entries.length;
+    this.largestGroup = Math.max(this.largestGroup, entries.length);
+
+    this.commit(key, entries.map(entry => entry.item))
+      .then(
+        results => entries.forEach((entry, i) => {
+          const result = results[i];
+          if (result === undefined) {
+            entry.reject(new Error(`Group commit returned no result for item ${i} of ${entries.length}`));
+          } else {
+            entry.resolve(result);
+          }
+        }),
+        error => {
+          const failure = error instanceof Error ? error : new Error(String(error));
+          entries.forEach(entry => entry.reject(failure));
+        }
+      )
+      .finally(() => {
+        this.committing.delete(key);
+        this.drain(key);
+      });
+  }
+
+  getStats(): GroupCommitStats {
+    return {
+      window_ms: this.options.windowMs,
+      max_items: this.options.maxItems,
+      groups: this.groups,
+      items: this.items,
+      largest_group: this.largestGroup,
+      pending: Object.fromEntries([...this.pending].map(([key, queue]) =>
+        [key, queue.reduce((sum, group) => sum + group.entries.length, 0)])),
+      committing: [...this.committing]
+    };
+  }
+}
@@ -0,0 +1,211 @@
+/**
+ * Background job tracking for long-running bank operations
+ *
+ * A bank build can take minutes, far longer than an MCP client will wait on a
+ * single tool call. `create_memory_bank` starts a job and returns its id right
+ * away; the bridge's per-stage progress events update the job, clients poll it
+ * with `get_job_status` and stop it with `cancel_job`.
+ */
+
+import { EventEmitter } from 'events';
+import { randomUUID } from 'crypto';
+import { logger } from './logger.js';
+import { getMetrics } from './metrics.js';
+import type { BridgeProgressEvent } from './memvid.js';
+import type { JobState } from '../types/index.js';
+
+/** Bridge build stages in pipeline order, used to derive overall progress */
+export const BUILD_STAGES = ['read', 'chunk', 'encode_frames', 'embed', 'index_write'] as const;
+
+const MAX_FINISHED_JOBS = 50;
+
+const jobDurations = getMetrics().histogram('job_duration_ms', 'Background job run time by kind and final state');
+
+export interface JobStageRecord {
+  stage: string;
+  started_at: string;
+}
+
+export interface JobStatus {
+  job_id: string;
+  kind: string;
+  bank_name: string;
+  state: JobState;
+  stage: string | null;
+  progress: {
+    current: number | null;
+    total: number | null;
+    message: string | null;
+    /** Fraction of the whole pipeline completed, 0..1 */
+    overall: number;
+  };
+  stages: JobStageRecord[];
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  duration_ms: number | null;
+  result: any;
+  error: string | null;
+}
+
+export interface JobContext {
+  signal: AbortSignal;
+  reportProgress: (event: BridgeProgressEvent) => void;
+}
+
+interface JobEntry {
+  status: JobStatus;
+  controller: AbortController;
+  promise: Promise<any>;
+}
+
+export class JobManager extends EventEmitter {
+  private jobs = new Map<string, JobEntry>();
+
+  /**
+   * Start `run` in the background and return its job status immediately.
+   * `run` resolving means success; `{ success: false }` results or rejections mark the job failed.
+   */
+  start(kind: string, bankName: string, run: (context: JobContext) => Promise<any>): JobStatus {
+    const controller = new AbortController();
+    const status: JobStatus = {
+      job_id: randomUUID(),
+      kind,
+      bank_name: bankName,
+      state: 'queued',
+      stage: null,
+      progress: { current: null, total: null, message: null, overall: 0 },
+      stages: [],
+      created_at: new Date().toISOString(),
+      started_at: null,
+      finished_at: null,
+      duration_ms: null,
+      result: null,
+      error: null
+    };
+
+    const context: JobContext = {
+      signal: controller.signal,
+      reportProgress: event => this.recordProgress(status, event)
+    };
+
+    const promise = Promise.resolve()
+      .then(() => {
+        status.state = 'running';
+        status.started_at = new Date().toISOString();
+        return run(context);
+      })
+      .then(
+        result => {
+          status.result = result ?? null;
+          if (controller.signal.aborted) {
+            this.finish(status, 'cancelled', 'Job cancelled');
+          } else if (result && result.success === false) {
+            this.finish(status, 'failed', result.message || result.error || 'Job failed');
+          } else {
+            this.finish(status, 'succeeded', null);
+          }
+          return result;
+        },
+        error => {
+          const message = error instanceof Error ? error.message : String(error);
+          this.finish(status, controller.signal.aborted ? 'cancelled' : 'failed', message);
+          return { success: false, message };
+        }
+      );
+
+    this.jobs.set(status.job_id, { status, controller, promise });
+    logger.info(`Started ${kind} job ${status.job_id} for '${bankName}'`);
+    return this.snapshot(status);
+  }
+
+  private recordProgress(status: JobStatus, event: BridgeProgressEvent): void {
+    if (status.state !== 'running') {
+      return;
+    }
+    if (status.stage !== event.stage) {
+      status.stage = event.stage;
+      status.stages.push({ stage: event.stage, started_at: new Date().toISOString() });
+    }
+    status.progress.current = event.current ?? null;
+    status.progress.total = event.total ?? null;
+    status.progress.message = event.message ?? null;
+
+    const index = (BUILD_STAGES as readonly string[]).indexOf(event.stage);
+    if (index !== -1) {
+      const within = event.total ? Math.min(1, (event.current ?? 0) / event.total) : 0;
+      status.progress.overall = Math.max(status.progress.overall, (index + within) / BUILD_STAGES.length);
+    }
+    this.emit('progress', this.snapshot(status), event);
+  }
+
+  private finish(status: JobStatus, state: JobState, error: string | null): void {
+    status.state = state;
+    status.error = error;
+    status.finished_at = new Date().toISOString();
+    const durationMs = Date.parse(status.finished_at) - Date.parse(status.started_at ?? status.created_at);
+    status.duration_ms = durationMs;
+    if (state === 'succeeded') {
+      status.progress.overall = 1;
+    }
+    jobDurations.observe({ kind: status.kind, state }, durationMs);
+    logger.info(`Job ${status.job_id} (${status.kind} '${status.bank_name}') ${state} in ${status.duration_ms}ms`);
+    this.emit('finished', this.snapshot(status));
+    this.prune();
+  }
+
+  private prune(): void {
+    const finished = [...this.jobs.values()].filter(job => job.status.finished_at !== null);
+    for (const job of finished.slice(0, Math.max(0, finished.length - MAX_FINISHED_JOBS))) {
+      this.jobs.delete(job.status.job_id);
+    }
+  }
+
+  private snapshot(status: JobStatus): JobStatus {
+    return { ...status, progress: { ...status.progress }, stages: [...status.stages] };
+  }
+
+  get(jobId: string): JobStatus | null {
+    const job = this.jobs.get(jobId);
+    return job ? this.snapshot(job.status) : null;
+  }
+
+  /**
+   * Most recent jobs first
+   */
+  list(): JobStatus[] {
+    return [...this.jobs.values()].reverse().map(job => this.snapshot(job.status));
+  }
+
+  /**
+   * Wait for a job to finish; resolves with the job's result
+   */
+  wait(jobId: string): Promise<any> {
+    const job = this.jobs.get(jobId);
+    return job ? job.promise : Promise.reject(new Error(`Job '${jobId}' not found`));
+  }
+
+  /**
+   * Request cancellation; returns false when the job is unknown or already finished
+   */
+  cancel(jobId: string): boolean {
+    const job = this.jobs.get(jobId);
+    if (!job || job.status.finished_at !== null) {
+      return false;
+    }
+    job.controller.abort();
+    return true;
+  }
+
+  /**
+   * The unfinished job for a bank, if one is running or queued
+   */
+  activeJobFor(bankName: string): JobStatus | null {
+    for (const job of this.jobs.values()) {
+      if (job.status.bank_name === bankName && job.status.finished_at === null) {
+        return this.snapshot(job.status);
+      }
+    }
+    return null;
+  }
+}
@@ -1,18 +1,107 @@
-// Simple console logger for Phase 1 - will upgrade to Winston later
-// NOTE: All output goes to stderr to avoid interfering with MCP JSON-RPC on stdout
-export const logger = {
-  info: (message: string, ...args: any[]) => {
-    console.error(`[INFO] ${new Date().toISOString()} - ${message}`, ...args);
-  },
-  warn: (message: string, ...args: any[]) => {
-    console.error(`[WARN] ${new Date().toISOString()} - ${message}`, ...args);
-  },
-  error: (message: string, ...args: any[]) => {
-    console.error(`[ERROR] ${new Date().toISOString()} - ${message}`, ...args);
-  },
-  debug: (message: string, ...args: any[]) => {
-    if (process.env.DEBUG === 'true') {
-      console.error(`[DEBUG] ${new Date().toISOString()} - ${message}`, ...args);
+/**
+ * Server logger
+ *
+ * All output goes to stderr to avoid interfering with MCP JSON-RPC on stdout.
+ * Lines are queued and written in one batch per event-loop turn rather than
+ * with a synchronous write per call, and the most recent entries (including
+ * the Python bridge's warnings and errors) are kept in a ring buffer that
+ * `system_diagnostics` returns with `includeLogs`.
+ *
+ * `LOG_LEVEL` (debug | info | warn | error, default info) sets the level;
+ * `DEBUG=true` still turns on debug output.
+ */
+
+import { writeSync } from 'fs';
+import { format } from 'util';
+
+export type LogLevel = 'debug' | 'info' | 'warn' | 'error';
+
+export interface LogEntry {
+  /** Milliseconds since the epoch */
+  ts: number;
+  level: LogLevel;
+  /** `server`, or the bridge logger that produced the entry (`bridge`, `bridge_frames`, ...) */
+  component: string;
+  msg: string;
+}
+
+const LEVEL_ORDER: Record<LogLevel, number> = { debug: 10, info: 20, warn: 30, error: 40 };
+const RING_SIZE = 1000;
+
+function configuredLevel(): number {
+  if (process.env.DEBUG === 'true') {
+    return LEVEL_ORDER.debug;
+  }
+  const level = process.env.LOG_LEVEL?.trim().toLowerCase() as LogLevel | undefined;
+  return level && level in LEVEL_ORDER ? LEVEL_ORDER[level] : LEVEL_ORDER.info;
+}
+
+const threshold = configuredLevel();
+const ring: LogEntry[] = [];
+let ringNext = 0;
+let pending: string[] = [];
+let flushScheduled = false;
+
+function flush(): void {
+  flushScheduled = false;
+  if (pending.length === 0) {
+    return;
+  }
+  const out = pending.join('');
+  pending = [];
+  process.stderr.write(out);
+}
+
+// Lines still queued when the process exits are written synchronously
+process.on('exit', () => {
+  if (pending.length > 0) {
+    try {
+      writeSync(2, pending.join(''));
+    } catch {
+      // stderr already closed
     }
+    pending = [];
+  }
+});
+
+function record(entry: LogEntry): void {
+  if (LEVEL_ORDER[entry.level] < threshold) {
+    return;
+  }
+  if (ring.length < RING_SIZE) {
+    ring.push(entry);
+  } else {
+    ring[ringNext] = entry;
+  }
+  ringNext = (ringNext + 1) % RING_SIZE;
+
+  const origin = entry.component === 'server' ? '' : `[${entry.component}] `;
+  pending.push(`[${entry.level.toUpperCase()}] ${new Date(entry.ts).toISOString()} - ${origin}${entry.msg}\n`);
+  if (!flushScheduled) {
+    flushScheduled = true;
+    setImmediate(flush);
+  }
+}
+
+function write(level: LogLevel, message: string, args: any[]): void {
+  if (LEVEL_ORDER[level] < threshold) {
+    return;
+  }
+  record({ ts: Date.now(), level, component: 'server', msg: args.length > 0 ? format(message, ...args) : message });
+}
+
+export const logger = {
+  info: (message: string, ...args: any[]) => write('info', message, args),
+  warn: (message: string, ...args: any[]) => write('warn', message, args),
+  error: (message: string, ...args: any[]) => write('error', message, args),
+  debug: (message: string, ...args: any[]) => write('debug', message, args),
+
+  /** Log an entry produced elsewhere (e.g. a structured line from the Python bridge) */
+  entry: (entry: LogEntry) => record(entry),
+
+  /** Most recent entries at or above `minLevel`, oldest first */
+  recent: (limit: number = RING_SIZE, minLevel: LogLevel = 'debug'): LogEntry[] => {
+    const ordered = ring.length < RING_SIZE ? ring.slice() : [...ring.slice(ringNext), ...ring.slice(0, ringNext)];
+    return ordered.filter(entry => LEVEL_ORDER[entry.level] >= LEVEL_ORDER[minLevel]).slice(-limit);
   }
-}; 
\ No newline at end of file
+};
@@ -9,6 +9,7 @@ import sys
 import os
 import traceback
 import warnings
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
@@ -18,17 +19,18 @@ import time
 # Suppress all warnings
 warnings.filterwarnings('ignore')
 
-# Enhanced logging setup for concurrent operations debugging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - [%(threadName)s] - %(message)s',
-    handlers=[
-        logging.FileHandler('memvid_bridge.log', mode='w'),
-        logging.StreamHandler()
-    ]
-)
-
-logger = logging.getLogger(__name__)
+# Bridge helper modules live next to this script (copied together into dist/lib)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Structured logging: request threads only enqueue records, a writer thread does the I/O
+from bridge_control import CONTROL_METHODS, ControlChannel, control_fd
+from bridge_logging import configure_logging, log_mode, recent_logs
+if __name__ != '__mp_main__':
+    # Frame render workers re-import this script under that name; they must not
+    # take over the bridge's log file or start another writer thread
+    configure_logging()
+
+logger = logging.getLogger('bridge')
 logger.info("Memvid bridge script started - Phase 3d concurrent operations support")
 
 # Suppress warnings during imports
@@ -54,6 +56,65 @@ import ipaddress
 import socket
 from urllib.parse import urlparse
 
+from bridge_routing import BankRouter, extract_index_vectors, route_summary_path, select_top_m, write_route_summary
+from bridge_keyword_index import KeywordIndexCache, build_keyword_index, keyword_index_path
+from bridge_chunk_metadata import (ChunkFilter, chunk_metadata_path, describe_file, describe_text,
+                                   read_chunk_metadata, write_chunk_metadata)
+from bridge_embedding import EmbeddingStage, PrecomputedEmbeddings, configure_torch_threads
+from bridge_mapped_bank import (ChunkStoreCache, MappedRetriever, backfill_chunk_store, chunk_store_current,
+                                index_load_mode, read_chunk_store_header, write_chunk_store)
+from bridge_bank_stats import bank_files, memory_footprint, read_faiss_header
+from bridge_compaction import bank_bytes, dedupe_chunks, plan_compaction
+from bridge_memory import UsageClock, rss_mb, trim_heap
+from bridge_metrics import BridgeMetrics, gauge
+from bridge_generations import GenerationTracker, allocate, discard, publish, resolve
+from bridge_frames import FrameContainer, frame_workers, frames_path, qr_helpers_available, write_video
+from bridge_context import DEFAULT_SEPARATOR, dedupe_hits, expand_hits, join_chunks, make_tokenizer, pack_context
+from bridge_synthetic import HashingEmbedder, SyntheticCorpus, hashing_dimension
+from bridge_scheduler import (PRIORITY_BULK, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, BridgeScheduler,
+                              QueueFull, RequestAborted, RequestContext, checkpoint, progress)
+from bridge_zygote import WorkerInfo, run_zygote, zygote_supported
+
+SEARCH_MODES = ('vector', 'keyword', 'hybrid')
+KEYWORD_SCORE_SATURATION = 3.0
+DEFAULT_CHUNK_SIZE = 512
+DEFAULT_OVERLAP = 50
+OVERFETCH_FACTOR = 4  # initial candidate multiplier when filters are active; grows 4x per round
+
+# Interactive lookups run before appends, appends before bulk builds
+METHOD_PRIORITIES = {
+    'search': PRIORITY_INTERACTIVE,
+    'route': PRIORITY_INTERACTIVE,
+    'assemble_context': PRIORITY_INTERACTIVE,
+    'add_content': PRIORITY_NORMAL,
+    'encode': PRIORITY_BULK,
+    'compact': PRIORITY_BULK,
+    'warm': PRIORITY_BULK,
+}
+
+# Libraries may print to sys.stdout (and heavy imports temporarily redirect it),
+# so protocol lines always go to the original stream under a lock
+_PROTOCOL_STDOUT = sys.stdout
+_emit_lock = threading.Lock()
+
+
+def emit(message: dict) -> None:
+    """Write one JSON protocol line; safe to call from any worker thread."""
+    line = json.dumps(message)
+    with _emit_lock:
+        _PROTOCOL_STDOUT.write(line + '\n')
+        _PROTOCOL_STDOUT.flush()
+
+
+def _distance_to_similarity(distance: float) -> float:
+    """Map a squared-L2 distance between unit embeddings to cosine similarity in [0, 1]."""
+    return max(0.0, min(1.0, 1.0 - float(distance) / 2.0))
+
+
+def _squash_keyword_score(score: float) -> float:
+    """Monotonic 0-1 squash of a BM25 score so keyword hits compare across banks."""
+    return score / (score + KEYWORD_SCORE_SATURATION) if score > 0 else 0.0
+
 
 def _url_sources_enabled() -> bool:
     value = os.environ.get('MEMVID_ALLOW_URL_SOURCES', '').strip().lower()
@@ -121,11 +182,28 @@ class DirectMemvidBridge:
     def __init__(self):
         self.encoders = {}
         self.retrievers = {}  # Cache retrievers for concurrent access
+        self._retriever_clock = UsageClock()  # last use per retriever, for shed_memory()
         self._heavy_imports_loaded = False
         self._heavy_imports_lock = threading.Lock()  # Thread safety for heavy imports
         self._encoders_lock = threading.Lock()  # Thread safety for encoder storage
         self._request_count = 0
         self._request_lock = threading.Lock()
+        self.router = BankRouter()
+        self.keyword_indexes = KeywordIndexCache()
+        self._chunk_texts = {}
+        self._chunk_texts_lock = threading.Lock()
+        self._chunk_metadata = {}
+        self._frame_containers = {}
+        self.chunk_stores = ChunkStoreCache()
+        self.generations = GenerationTracker(self._forget_generation)
+        self._bank_write_locks = {}
+        self._backfill_locks = {}
+        self._retriever_locks = {}
+        self._embedding_models = {}
+        self._embedding_models_lock = threading.Lock()
+        self._tokenizers = {}
+        self._share_models = False  # preload() routes every memvid model load through _get_embedding_model
+        self.scheduler = None  # set by main(); None when the bridge is used as a library
         logger.info("DirectMemvidBridge initialized with concurrent operations support")
     
     def _ensure_heavy_imports(self):
@@ -161,6 +239,7 @@ class DirectMemvidBridge:
                 logger.info("Loading torch...")
                 import torch
                 logger.info(f"torch version: {torch.__version__}")
+                configure_torch_threads()
                 
                 logger.info("Loading sentence_transformers (this may take time on first run)...")
                 import sentence_transformers
@@ -180,10 +259,14 @@ class DirectMemvidBridge:
                 
                 from memvid.retriever import MemvidRetriever
                 logger.info("MemvidRetriever loaded successfully")
+
+                from memvid.config import get_default_config
                 
                 # Store the imports as class attributes for later use
                 self.MemvidEncoder = MemvidEncoder
                 self.MemvidRetriever = MemvidRetriever
+                self.default_embedding_model = get_default_config()["embedding"]["model"]
+                self._route_memvid_models()
                 
                 self._heavy_imports_loaded = True
                 logger.info("All heavy dependencies loaded successfully!")
@@ -204,6 +287,638 @@ class DirectMemvidBridge:
             self._request_count += 1
             return self._request_count
     
+    def _get_embedding_model(self, model_name: Optional[str] = None):
+        """Return a shared embedding model (routing, and memvid's own indexes after ``preload``).
+
+        ``hashing[:<dimension>]`` names give the offline ``HashingEmbedder``;
+        anything else is a SentenceTransformer.
+        """
+        dimension = hashing_dimension(model_name)
+        if dimension is None:
+            self._ensure_heavy_imports()
+            model_name = model_name or self.default_embedding_model
+        with self._embedding_models_lock:
+            model = self._embedding_models.get(model_name)
+            if model is None:
+                logger.info(f"Loading embedding model: {model_name}")
+                if dimension is not None:
+                    model = HashingEmbedder(dimension)
+                else:
+                    from sentence_transformers import SentenceTransformer
+                    model = SentenceTransformer(model_name)
+                self._embedding_models[model_name] = model
+            return model
+
+    def _route_memvid_models(self) -> None:
+        """Send memvid's IndexManager model loads through ``_get_embedding_model``.
+
+        Hashing models always go through it (SentenceTransformer cannot load
+        them); other models only after ``preload`` enables sharing.
+        """
+        try:
+            import memvid.index as memvid_index
+        except ImportError:
+            return
+        if not hasattr(memvid_index, 'SentenceTransformer'):
+            return
+        load_private = memvid_index.SentenceTransformer
+
+        def shared_model(model_name_or_path=None, *args, **kwargs):
+            if isinstance(model_name_or_path, str) and not args and not kwargs and (
+                    self._share_models or hashing_dimension(model_name_or_path) is not None):
+                return self._get_embedding_model(model_name_or_path)
+            return load_private(model_name_or_path, *args, **kwargs)
+
+        memvid_index.SentenceTransformer = shared_model
+
+    def _memvid_config(self, model_name: Optional[str]) -> Optional[dict]:
+        """memvid config embedding with a hashing model, or None for memvid's defaults.
+
+        Only hashing models are honored here; other names keep memvid's
+        configured model, as before.
+        """
+        if hashing_dimension(model_name) is None:
+            return None
+        from memvid.config import get_default_config
+        config = get_default_config()
+        config['embedding']['model'] = model_name
+        config['embedding']['dimension'] = self._get_embedding_model(model_name).get_sentence_embedding_dimension()
+        return config
+
+    def _new_encoder(self, model_name: Optional[str] = None):
+        config = self._memvid_config(model_name)
+        return self.MemvidEncoder(config) if config else self.MemvidEncoder()
+
+    def _bank_embedding_model(self, index_base: str) -> Optional[str]:
+        """The embedding model recorded in a bank's chunk store header."""
+        store = read_chunk_store_header(index_base)
+        return store[1].get('embedding_model') if store else None
+
+    def preload(self) -> None:
+        """Import everything and load the default model before any request (zygote mode).
+
+        memvid's IndexManager loads a private SentenceTransformer for every encoder
+        and retriever; routing that construction through ``_get_embedding_model``
+        lets them all reuse the preloaded weights, which forked workers then share
+        with the zygote copy-on-write. No inference runs here, so torch's thread
+        pools are first started in the worker.
+        """
+        self._ensure_heavy_imports()
+        self._share_models = True
+        self._get_embedding_model()
+
+    def warm(self, model_name: Optional[str] = None) -> Dict[str, Any]:
+        """``preload`` for a bridge that is already serving (fast start).
+
+        The server sends this right after the ready signal instead of blocking
+        its own startup on it; it runs at bulk priority, so a real request is
+        never queued behind it, and memvid's indexes share the warmed model.
+
+        ``model_name`` is resolved like ``_memvid_config``: only hashing models
+        are honored, anything else warms memvid's configured model. Models are
+        cached by name, so warming the server's spelling of the same model
+        would load a second copy that searches never use.
+        """
+        started = time.time()
+        try:
+            self._ensure_heavy_imports()
+            self._share_models = True
+            name = model_name if hashing_dimension(model_name) is not None else self.default_embedding_model
+            model = self._get_embedding_model(name)
+            return {'status': 'success', 'model': name, 'requested_model': model_name,
+                    'warm_ms': round((time.time() - started) * 1000, 1),
+                    'dimension': model.get_sentence_embedding_dimension()}
+        except Exception as e:
+            logger.error(f"Warm-up failed: {e}")
+            return {'status': 'error', 'error': str(e)}
+
+    def _write_routing_summary(self, index_manager, index_base: str, request_id: int) -> None:
+        """Persist the bank's k-means routing codebook next to its index."""
+        try:
+            vectors = extract_index_vectors(index_manager.index)
+            if vectors is None:
+                texts = [m.get('text', '') for m in getattr(index_manager, 'metadata', [])]
+                vectors = index_manager.embedding_model.encode(texts, show_progress_bar=False) if texts else None
+            model_name = index_manager.config.get('embedding', {}).get('model', self.default_embedding_model)
+            summary = write_route_summary(index_base, vectors, model_name)
+            self.router.invalidate(index_base)
+            logger.info(f"[REQ-{request_id}] Wrote routing summary for {index_base}: {summary}")
+        except Exception as e:
+            # Routing is an optimization; a bank without a summary is simply never pruned
+            logger.warning(f"[REQ-{request_id}] Could not write routing summary for {index_base}: {e}")
+
+    def _write_keyword_index(self, index_manager, index_base: str, request_id: int) -> None:
+        """Build the BM25 keyword index for a freshly built bank."""
+        try:
+            documents = [(m.get('id', i), m.get('text', '')) for i, m in enumerate(index_manager.metadata)]
+            self.keyword_indexes.invalidate(index_base)
+            stats = build_keyword_index(index_base, documents)
+            logger.info(f"[REQ-{request_id}] Wrote keyword index for {index_base}: {stats}")
+        except Exception as e:
+            logger.warning(f"[REQ-{request_id}] Could not write keyword index for {index_base}: {e}")
+
+    def _write_chunk_metadata(self, index_manager, index_base: str, chunk_meta: list, request_id: int) -> None:
+        """Write the per-chunk metadata sidecar, aligned with the index by chunk id."""
+        try:
+            entries = []
+            for i, m in enumerate(index_manager.metadata):
+                chunk_id = m.get('id', i)
+                entry = dict(chunk_meta[chunk_id]) if chunk_id < len(chunk_meta) else {}
+                entry['length'] = m.get('length', len(m.get('text', '')))
+                entry['frame'] = m.get('frame', chunk_id)
+                while len(entries) <= chunk_id:
+                    entries.append({})
+                entries[chunk_id] = entry
+            write_chunk_metadata(index_base, entries)
+            with self._chunk_texts_lock:
+                self._chunk_metadata.pop(chunk_metadata_path(index_base), None)
+            logger.info(f"[REQ-{request_id}] Wrote metadata for {len(entries)} chunks to {chunk_metadata_path(index_base)}")
+        except Exception as e:
+            # Filters fall back to chunk length only for banks without a sidecar
+            logger.warning(f"[REQ-{request_id}] Could not write chunk metadata for {index_base}: {e}")
+            return
+        self._write_chunk_store(index_manager, index_base, entries, request_id)
+
+    def _write_chunk_store(self, index_manager, index_base: str, entries: list, request_id: int) -> None:
+        """Write the binary chunk store mapped by searches in ``mmap`` load mode."""
+        try:
+            texts = [''] * len(entries)
+            for i, m in enumerate(index_manager.metadata):
+                texts[m.get('id', i)] = m.get('text', '')
+            info = {'embedding_model': index_manager.config.get('embedding', {}).get('model', self.default_embedding_model)}
+            dimension = getattr(index_manager.index, 'd', None)
+            if dimension:
+                info['dimension'] = int(dimension)
+            self.chunk_stores.invalidate(index_base)
+            stats = write_chunk_store(index_base, texts, entries, info)
+            logger.info(f"[REQ-{request_id}] Wrote chunk store for {index_base}: {stats}")
+        except Exception as e:
+            # Searches backfill the store from the JSON index on first use
+            logger.warning(f"[REQ-{request_id}] Could not write chunk store for {index_base}: {e}")
+
+    def _load_chunk_texts(self, index_base: str) -> dict:
+        """Chunk id -> text from the bank's JSON index, cached until the file changes."""
+        index_path = f"{index_base}.json"
+        mtime = os.path.getmtime(index_path)
+        with self._chunk_texts_lock:
+            cached = self._chunk_texts.get(index_path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        texts = {m.get('id', i): m.get('text', '') for i, m in enumerate(data.get('metadata', []))}
+        with self._chunk_texts_lock:
+            self._chunk_texts[index_path] = (mtime, texts)
+        return texts
+
+    def _load_frame_container(self, index_base: str) -> Optional[FrameContainer]:
+        """The bank's ``.frames`` container, cached until the file changes (None if absent)."""
+        path = frames_path(index_base)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        with self._chunk_texts_lock:
+            cached = self._frame_containers.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        container = FrameContainer(path)
+        with self._chunk_texts_lock:
+            self._frame_containers[path] = (mtime, container)
+        return container
+
+    def _load_chunk_metadata(self, index_base: str) -> list:
+        """Per-chunk metadata sidecar, cached until the file changes (empty for older banks)."""
+        path = chunk_metadata_path(index_base)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return []
+        with self._chunk_texts_lock:
+            cached = self._chunk_metadata.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        entries = read_chunk_metadata(index_base)
+        with self._chunk_texts_lock:
+            self._chunk_metadata[path] = (mtime, entries)
+        return entries
+
+    def _get_chunk_store(self, index_base: str, request_id: int):
+        """The bank's mapped chunk store, backfilled from its JSON index when missing or stale."""
+        if not chunk_store_current(index_base):
+            # Concurrent first searches of an older bank write it once
+            with self._backfill_lock(index_base):
+                if not chunk_store_current(index_base):
+                    try:
+                        stats = backfill_chunk_store(index_base, read_chunk_metadata(index_base))
+                        self.chunk_stores.invalidate(index_base)
+                        logger.info(f"[REQ-{request_id}] Backfilled chunk store for {index_base}: {stats}")
+                    except Exception as e:
+                        logger.warning(f"[REQ-{request_id}] Could not backfill chunk store for {index_base}: {e}")
+                        return None
+        return self.chunk_stores.get(index_base)
+
+    def _get_keyword_index(self, index_base: str, request_id: int):
+        """Open the bank's keyword index, building it from the JSON index if missing."""
+        path = keyword_index_path(index_base)
+        # The file can vanish between the check and the open (its generation was
+        # collected), so re-resolve once before giving up
+        for _ in range(2):
+            if not os.path.exists(path):
+                # Concurrent first searches of an older bank build it once
+                with self._backfill_lock(index_base):
+                    if not os.path.exists(path):
+                        texts = self._load_chunk_texts(index_base)
+                        stats = build_keyword_index(index_base, sorted(texts.items()))
+                        logger.info(f"[REQ-{request_id}] Backfilled keyword index for {index_base}: {stats}")
+            try:
+                keyword_index = self.keyword_indexes.get(index_base)
+            except FileNotFoundError:
+                keyword_index = None
+            if keyword_index is not None:
+                return keyword_index
+        raise ValueError(f"Keyword index of {index_base} disappeared while opening it")
+
+    def _open_retriever(self, video_path: str, index_path: str, request_id: int, store=None):
+        """Open a bank's retriever: mapped over its chunk store if given, else through memvid."""
+        logger.info(f"[REQ-{request_id}] Creating new retriever for {video_path}:{index_path}")
+        index_base = index_path[:-len('.json')] if index_path.endswith('.json') else index_path
+        if store is not None:
+            retriever = MappedRetriever(index_base, store, self._get_embedding_model(store.embedding_model))
+            logger.info(f"[REQ-{request_id}] Opened {index_base} ({retriever.load_mode}) "
+                        f"in {retriever.open_ms}ms")
+            return retriever
+        config = self._memvid_config(self._bank_embedding_model(index_base))
+        return (self.MemvidRetriever(video_path, index_path, config) if config
+                else self.MemvidRetriever(video_path, index_path))
+
+    def _get_retriever(self, video_path: str, index_path: str, request_id: int, store=None):
+        """Return the cached retriever for a bank, creating it on first use.
+
+        With a mapped chunk store (``mmap`` load mode) the bank is opened through a
+        memory-mapped FAISS index instead of memvid's full load.
+        """
+        retriever_key = f"{video_path}:{index_path}"
+        retriever = self.retrievers.get(retriever_key)
+        if retriever is None:
+            # Double-checked: a search that waited on the lock reuses the retriever just opened
+            with self._retriever_lock(retriever_key):
+                retriever = self.retrievers.get(retriever_key)
+                if retriever is None:
+                    retriever = self._open_retriever(video_path, index_path, request_id, store)
+                    self.retrievers[retriever_key] = retriever
+        else:
+            logger.info(f"[REQ-{request_id}] Using cached retriever for {retriever_key}")
+        self._retriever_clock.touch(retriever_key)
+        return retriever
+
+    def _vector_candidates(self, retriever, query_vector, k: int) -> list:
+        """Top-k ``(chunk_id, similarity, extras)`` straight from the FAISS index."""
+        distances, ids = retriever.index_manager.index.search(query_vector, k)
+        return [
+            (int(chunk_id), _distance_to_similarity(distance), {})
+            for chunk_id, distance in zip(ids[0], distances[0])
+            if chunk_id >= 0
+        ]
+
+    def _keyword_candidates(self, keyword_index, query: str, k: int) -> list:
+        return [
+            (chunk_id, _squash_keyword_score(score), {"keyword_score": score})
+            for chunk_id, score in keyword_index.search(query, k)
+        ]
+
+    def _hybrid_candidates(self, retriever, keyword_index, query: str, query_vector,
+                           k: int, alpha: float) -> list:
+        """Fuse vector similarity and normalized BM25 over both candidate pools."""
+        pool = max(k * 3, 10)
+        vector_hits = {chunk_id: score for chunk_id, score, _ in self._vector_candidates(retriever, query_vector, pool)}
+        keyword_hits = dict(keyword_index.search(query, pool))
+        max_keyword = max(keyword_hits.values(), default=0.0) or 1.0
+
+        fused = []
+        for chunk_id in set(vector_hits) | set(keyword_hits):
+            vector_score = vector_hits.get(chunk_id, 0.0)
+            keyword_score = keyword_hits.get(chunk_id, 0.0)
+            fused.append((
+                chunk_id,
+                alpha * vector_score + (1 - alpha) * keyword_score / max_keyword,
+                {"vector_score": vector_score, "keyword_score": keyword_score},
+            ))
+        fused.sort(key=lambda c: c[1], reverse=True)
+        return fused
+
+    def _collect_results(self, candidates, total: int, top_k: int, min_score: float,
+                         chunk_filter: ChunkFilter, chunk_meta: list, texts: dict,
+                         frames: Optional[FrameContainer] = None) -> tuple:
+        """Apply min_score and filters during retrieval, over-fetching until top_k pass.
+
+        Candidates arrive best first, so the first one under ``min_score`` ends the
+        scan. When filters reject hits the candidate pool grows geometrically until
+        ``top_k`` are accepted or the bank is exhausted. Chunks missing from the JSON
+        index are read from the bank's frame container when it has one.
+        """
+        k = min(total, top_k * OVERFETCH_FACTOR if chunk_filter.active else top_k)
+        while True:
+            pool = candidates(k)
+            accepted = []
+            below_threshold = False
+            for chunk_id, score, extras in pool:
+                if score < min_score:
+                    below_threshold = True
+                    break
+                meta = dict(chunk_meta[chunk_id]) if chunk_id < len(chunk_meta) else {}
+                text = texts.get(chunk_id)
+                if text is None:
+                    text = (frames.read_chunk(chunk_id) if frames is not None and chunk_id < len(frames) else None) or ''
+                meta.setdefault('length', len(text))
+                if not chunk_filter.matches(meta):
+                    continue
+                meta['chunk_id'] = chunk_id
+                accepted.append({"content": text, "score": score, "chunk_id": chunk_id, "metadata": meta, **extras})
+                if len(accepted) == top_k:
+                    break
+            if len(accepted) >= top_k or below_threshold or k >= total:
+                return accepted, k
+            k = min(total, k * OVERFETCH_FACTOR)
+
+    def _backfill_routing_summary(self, index_base: str, request_id: int) -> bool:
+        """Build a routing summary for a bank created before routing existed.
+
+        This runs on the routing path, so a bank whose summary cannot be built
+        is remembered by index mtime and not retried until it is rebuilt.
+        """
+        faiss_path = f"{index_base}.faiss"
+        try:
+            index_mtime = os.path.getmtime(faiss_path)
+        except OSError:
+            return False
+        if not self.router.should_backfill(index_base, index_mtime):
+            return False
+        try:
+            import faiss
+            vectors = extract_index_vectors(faiss.read_index(faiss_path))
+            if vectors is None:
+                self.router.backfill_failed(index_base, index_mtime)
+                return False
+            write_route_summary(index_base, vectors,
+                                self._bank_embedding_model(index_base) or self.default_embedding_model)
+            self.router.invalidate(index_base)
+            logger.info(f"[REQ-{request_id}] Backfilled routing summary for {index_base}")
+            return True
+        except Exception as e:
+            self.router.backfill_failed(index_base, index_mtime)
+            logger.warning(f"[REQ-{request_id}] Routing summary backfill failed for {index_base}: {e}")
+            return False
+
+    def route_banks(self, query: str, banks: list, **kwargs):
+        """Rank candidate banks for a query using their routing codebooks"""
+        request_id = self._get_request_id()
+        try:
+            self._ensure_heavy_imports()
+            start_time = time.time()
+
+            candidates = []
+            for bank in banks:
+                index_base = bank['bank_path']
+                for ext in ('.mp4', '.json', '.faiss'):
+                    if index_base.endswith(ext):
+                        index_base = index_base[: -len(ext)]
+                        break
+                _, index_base = resolve(index_base)
+                if not os.path.exists(route_summary_path(index_base)):
+                    with self._backfill_lock(index_base):
+                        if not os.path.exists(route_summary_path(index_base)):
+                            self._backfill_routing_summary(index_base, request_id)
+                candidates.append({'name': bank['name'], 'index_base': index_base})
+
+            # Scores from different models are not comparable, so banks built with the
+            # hashing embedder are routed with it only when every summary agrees
+            summary_models = set()
+            for candidate in candidates:
+                try:
+                    summary = self.router.load(candidate['index_base'])
+                except Exception:
+                    summary = None
+                if summary is not None:
+                    summary_models.add(summary['model'])
+            model_name = next(iter(summary_models)) if len(summary_models) == 1 else None
+            model = self._get_embedding_model(model_name if hashing_dimension(model_name) else None)
+            query_vector = model.encode([query], show_progress_bar=False)[0]
+            ranked = self.router.rank(query_vector, candidates)
+            route_time = time.time() - start_time
+
+            logger.info(f"[REQ-{request_id}] Routed query across {len(candidates)} banks in {route_time:.3f}s")
+            return {
+                "status": "success",
+                "ranked": ranked,
+                "route_time": route_time
+            }
+
+        except Exception as e:
+            logger.error(f"[REQ-{request_id}] Failed to route query: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    def pool_gauges(self) -> list:
+        """Gauge families for what the bridge holds open: retrievers, chunk stores, keyword indexes, pins."""
+        load_modes: Dict[str, int] = {}
+        for retriever in list(self.retrievers.values()):
+            mode = retriever.load_mode if isinstance(retriever, MappedRetriever) else 'memory'
+            load_modes[mode] = load_modes.get(mode, 0) + 1
+        return [
+            gauge('retrievers', 'Cached bank retrievers by load mode',
+                  [({'load_mode': mode}, count) for mode, count in sorted(load_modes.items())]),
+            gauge('chunk_stores_open', 'Memory-mapped chunk stores held open', [({}, len(self.chunk_stores))]),
+            gauge('keyword_indexes_open', 'Keyword indexes held open', [({}, len(self.keyword_indexes))]),
+            gauge('generations_pinned', 'Bank generation pins held by running requests',
+                  [({}, self.generations.pinned())]),
+        ]
+
+    def shed_memory(self, evict_idle_seconds: Optional[float] = None, release_buffers: bool = False) -> dict:
+        """Give memory back under host pressure; everything dropped reopens on next use.
+
+        ``evict_idle_seconds`` evicts retrievers unused for that long (0 evicts all);
+        ``release_buffers`` drops decoded chunk texts and metadata, frame containers,
+        routing summaries and the keyword index and chunk store mappings. Requests
+        holding a reference keep it until they finish.
+        """
+        rss_before = rss_mb()
+        evicted = []
+        if evict_idle_seconds is not None:
+            for key in self._retriever_clock.idle(list(self.retrievers), evict_idle_seconds):
+                if self.retrievers.pop(key, None) is not None:
+                    evicted.append(key)
+                self._retriever_clock.forget(key)
+        released = {}
+        if release_buffers:
+            with self._chunk_texts_lock:
+                released['chunk_texts'] = len(self._chunk_texts)
+                released['chunk_metadata'] = len(self._chunk_metadata)
+                released['frame_containers'] = len(self._frame_containers)
+                self._chunk_texts.clear()
+                self._chunk_metadata.clear()
+                self._frame_containers.clear()
+            released['keyword_indexes'] = self.keyword_indexes.clear()
+            released['chunk_stores'] = self.chunk_stores.clear()
+            released['route_summaries'] = self.router.clear()
+        trimmed = trim_heap() if evicted or released else False
+        if evicted or released:
+            logger.info(f"Shed memory: evicted {len(evicted)} idle retrievers, released {released}, "
+                        f"RSS {rss_before} -> {rss_mb()} MB")
+        return {
+            'rss_mb': rss_mb(),
+            'rss_before_mb': rss_before,
+            'retrievers': len(self.retrievers),
+            'evicted_retrievers': evicted,
+            'released': released,
+            'heap_trimmed': trimmed,
+        }
+
+    def bank_stats(self, bank_path: str) -> dict:
+        """Statistics for one bank from file headers and the retriever cache; never loads the bank."""
+        try:
+            base_path = bank_path.replace('.mp4', '').replace('.json', '').replace('.faiss', '')
+            number, current = resolve(base_path)
+            header = read_faiss_header(f"{current}.faiss")
+            store = read_chunk_store_header(current)
+            if header is None and store is None and not os.path.exists(f"{current}.json"):
+                raise ValueError(f"Memory bank not found at {base_path}")
+
+            files = bank_files(current)
+            retriever = self.retrievers.get(f"{current}.mp4:{current}.json")
+            if retriever is None:
+                load_mode = None
+            elif isinstance(retriever, MappedRetriever):
+                load_mode = retriever.load_mode
+            else:
+                load_mode = 'memory'
+            mapped_store = isinstance(retriever, MappedRetriever)
+            info = store[1] if store else {}
+            return {
+                "status": "success",
+                "bank_path": base_path,
+                "generation": number,
+                # one vector per chunk; the store count covers banks whose index is unreadable
+                "chunks": header['vectors'] if header else (store[0] if store else None),
+                "dimension": header['dimension'] if header else info.get('dimension'),
+                "index_type": header['index_type'] if header else None,
+                "metric": header['metric'] if header else None,
+                "embedding_model": info.get('embedding_model'),
+                "bytes_on_disk": sum(files.values()),
+                "files": files,
+                "memory": memory_footprint(files, load_mode, mapped_store),
+                "retriever": {
+                    "cached": retriever is not None,
+                    "load_mode": load_mode,
+                    "open_ms": getattr(retriever, 'open_ms', None),
+                    "in_use": sum(self.generations.in_use(base_path).values()),
+                },
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "bank_path": bank_path,
+                "error": str(e)
+            }
+
+    def compact_bank(self, bank_path: str, **kwargs):
+        """Merge adjacent small appends, drop duplicate chunks and rebuild the bank as a new generation."""
+        request_id = self._get_request_id()
+        try:
+            logger.info(f"[REQ-{request_id}] Compacting memory bank: {bank_path}")
+            self._ensure_heavy_imports()
+            base_path = bank_path.replace('.mp4', '').replace('.json', '').replace('.faiss', '')
+            with self._bank_write_lock(base_path), self.generations.use(base_path) as current:
+                return self._compact_locked(base_path, current, request_id, **kwargs)
+        except RequestAborted:
+            raise
+        except Exception as e:
+            logger.error(f"[REQ-{request_id}] Failed to compact memory bank {bank_path}: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    def _compact_locked(self, base_path: str, current: str, request_id: int, **kwargs) -> dict:
+        started = time.time()
+        chunk_size = kwargs.get('chunk_size') or DEFAULT_CHUNK_SIZE
+        overlap = kwargs.get('overlap') if kwargs.get('overlap') is not None else DEFAULT_OVERLAP
+        if not os.path.exists(f"{current}.json"):
+            raise ValueError(f"Memory bank not found at {base_path}")
+
+        checkpoint('chunk')
+        texts_by_id = self._load_chunk_texts(current)
+        texts = [texts_by_id.get(i, '') for i in range(max(texts_by_id, default=-1) + 1)]
+        metas = read_chunk_metadata(current)
+        segments, appends_merged = plan_compaction(texts, metas, chunk_size)
+
+        encoder = self._new_encoder(self._bank_embedding_model(current))
+        chunk_meta = []
+        for kind, content, meta in segments:
+            if kind == 'keep':
+                encoder.add_chunks(content)
+                chunk_meta.extend(dict(meta) for _ in content)
+            else:
+                self._add_document(encoder, content, meta, chunk_meta, chunk_size, overlap)
+        chunks, chunk_meta, duplicates = dedupe_chunks(encoder.chunks, chunk_meta)
+        encoder.chunks = chunks
+        progress('chunk', 1, 1, f"{appends_merged} appends merged, {duplicates} duplicates")
+
+        report = {
+            "status": "success",
+            "bank_path": base_path,
+            "chunks_before": len(texts),
+            "chunks_after": len(chunks),
+            "appends_merged": appends_merged,
+            "duplicates_removed": duplicates,
+            "bytes_before": bank_bytes(current),
+        }
+        if not appends_merged and not duplicates:
+            logger.info(f"[REQ-{request_id}] Nothing to compact in {base_path}")
+            return {**report, "skipped": True, "chunks_after": len(texts), "bytes_after": report["bytes_before"],
+                    "seconds": round(time.time() - started, 3)}
+
+        samples = [texts[i][:200] for i in range(0, len(texts), max(1, len(texts) // 5))][:5]
+        search_before = self._search_latency_ms(current, samples, request_id)
+        _, embedding_stats = self._write_generation(encoder, base_path, chunk_meta, request_id)
+        _, compacted = resolve(base_path)
+        search_after = self._search_latency_ms(compacted, samples, request_id)
+
+        report.update({
+            "skipped": False,
+            "bytes_after": bank_bytes(compacted),
+            "search_ms_before": search_before,
+            "search_ms_after": search_after,
+            "embedding": embedding_stats,
+            "seconds": round(time.time() - started, 3),
+        })
+        report["bytes_reclaimed"] = report["bytes_before"] - report["bytes_after"]
+        logger.info(f"[REQ-{request_id}] Compacted {base_path}: {report['chunks_before']} -> {report['chunks_after']} "
+                    f"chunks, {report['bytes_reclaimed']} bytes reclaimed, search {search_before} -> {search_after} ms")
+        return report
+
+    def _search_latency_ms(self, index_base: str, samples: list, request_id: int, rounds: int = 5) -> Optional[float]:
+        """Mean vector-search latency over one generation for a few sample queries (index lookup only)."""
+        if not samples:
+            return None
+        try:
+            store = self._get_chunk_store(index_base, request_id) if index_load_mode() == 'mmap' else None
+            retriever = self._get_retriever(f"{index_base}.mp4", f"{index_base}.json", request_id, store)
+            index_manager = retriever.index_manager
+            vectors = index_manager.embedding_model.encode(samples, show_progress_bar=False).astype('float32')
+            k = min(10, index_manager.index.ntotal) or 1
+            started = time.perf_counter()
+            for _ in range(rounds):
+                index_manager.index.search(vectors, k)
+            return round((time.perf_counter() - started) * 1000 / (rounds * len(samples)), 3)
+        except Exception as e:
+            logger.warning(f"[REQ-{request_id}] Could not time searches on {index_base}: {e}")
+            return None
+
     def _paths_from_output(self, output_path: Optional[str], bank_name: str) -> tuple[str, str]:
         """Derive video and index paths from output_path or MEMORY_BANKS_DIR."""
         if output_path:
@@ -226,6 +941,155 @@ class DirectMemvidBridge:
 
         return video_path, index_path
 
+    def _add_document(self, encoder, text: str, meta: dict, chunk_meta: list,
+                      chunk_size: int, overlap: int) -> int:
+        """Chunk one document into the encoder and record its metadata per chunk."""
+        before = len(encoder.chunks)
+        encoder.add_text(text, chunk_size=chunk_size, overlap=overlap)
+        added = len(encoder.chunks) - before
+        chunk_meta.extend(dict(meta) for _ in range(added))
+        return added
+
+    def _build_bank(self, encoder, video_path: str, index_base: str, embedding_stats: Optional[dict] = None):
+        """Run ``build_video`` with per-stage checkpoints and progress events.
+
+        memvid renders QR frames first, then embeds chunks into the index
+        (``index_manager.add_chunks``) and finally saves it, so the index manager's
+        methods are wrapped on this encoder's instance to mark those boundaries.
+        Chunks are embedded by an ``EmbeddingStage`` (throughput figures land in
+        ``embedding_stats``) and memvid receives the precomputed vectors.
+
+        When memvid's QR helpers are available and ``MEMVID_FRAME_WORKERS`` is not
+        0, frames are rendered by a process pool and streamed to the writer
+        (``bridge_frames.write_video``) instead of memvid's single-core loop; the
+        index is then built through the same wrapped ``add_chunks``/``save``.
+        """
+        index_manager = encoder.index_manager
+        add_chunks, save = index_manager.add_chunks, index_manager.save
+        total = len(encoder.chunks)
+
+        def staged_add_chunks(*args, **kwargs):
+            checkpoint('embed')
+            progress('embed', 0, total)
+            chunks = args[0] if args else kwargs.get('chunks')
+            model = index_manager.embedding_model
+            if chunks:
+                def on_batch(done, count):
+                    checkpoint('embed')
+                    progress('embed', done, count)
+
+                stage = EmbeddingStage(model)
+                vectors = stage.embed(list(chunks), on_batch=on_batch)
+                if embedding_stats is not None:
+                    embedding_stats.update(stage.stats)
+                index_manager.embedding_model = PrecomputedEmbeddings(model, chunks, vectors)
+            try:
+                result = add_chunks(*args, **kwargs)
+            finally:
+                index_manager.embedding_model = model
+            progress('embed', total, total)
+            return result
+
+        def staged_save(*args, **kwargs):
+            checkpoint('index_write')
+            progress('index_write')
+            return save(*args, **kwargs)
+
+        def on_frame(done, count):
+            checkpoint('encode_frames')
+            progress('encode_frames', done, count)
+
+        index_manager.add_chunks = staged_add_chunks
+        index_manager.save = staged_save
+        try:
+            checkpoint('encode_frames')
+            progress('encode_frames', 0, total)
+            if frame_workers() == 0 or not qr_helpers_available():
+                return encoder.build_video(video_path, index_base)
+
+            chunks = list(encoder.chunks)
+            stats = write_video(chunks, video_path, index_base, on_frame=on_frame)
+            index_manager.add_chunks(chunks, list(range(len(chunks))), False)
+            index_manager.save(index_base)
+            return stats
+        finally:
+            index_manager.add_chunks = add_chunks
+            index_manager.save = save
+
+    def _bank_write_lock(self, index_base: str) -> threading.Lock:
+        """Serializes builds of one bank so concurrent appends never publish over each other."""
+        with self._encoders_lock:
+            return self._bank_write_locks.setdefault(os.path.abspath(index_base), threading.Lock())
+
+    def _backfill_lock(self, index_base: str) -> threading.Lock:
+        """Serializes search-path backfills of one bank's side files, which share a temporary path."""
+        with self._encoders_lock:
+            return self._backfill_locks.setdefault(os.path.abspath(index_base), threading.Lock())
+
+    def _retriever_lock(self, retriever_key: str) -> threading.Lock:
+        """Serializes opening one bank's retriever, so concurrent first searches load it once."""
+        with self._encoders_lock:
+            return self._retriever_locks.setdefault(retriever_key, threading.Lock())
+
+    def _write_generation(self, encoder, index_base: str, chunk_meta: list, request_id: int) -> tuple:
+        """Build ``encoder``'s chunks into a new generation of the bank and publish it.
+
+        The generation is written and its retriever opened before the pointer
+        swap, so searches move over without a reload stall; searches already
+        running finish on the generation they started with. Returns
+        ``(build stats, embedding stats)``.
+        """
+        number, generation = allocate(index_base)
+        embedding_stats = {}
+        try:
+            result = self._build_bank(encoder, f"{generation}.mp4", generation, embedding_stats)
+            self._write_routing_summary(encoder.index_manager, generation, request_id)
+            self._write_keyword_index(encoder.index_manager, generation, request_id)
+            self._write_chunk_metadata(encoder.index_manager, generation, chunk_meta, request_id)
+            self._warm_generation(generation, request_id)
+            publish(index_base, number)
+        except BaseException:
+            # A cancelled or failed build leaves the published generation untouched
+            self._forget_generation(generation)
+            discard(index_base, number)
+            logger.info(f"[REQ-{request_id}] Discarded unpublished generation {number} of {index_base}")
+            raise
+        logger.info(f"[REQ-{request_id}] Published generation {number} of {index_base}")
+        # A bank that was flat until now is only read through its generations from here on
+        self.retrievers.pop(f"{index_base}.mp4:{index_base}.json", None)
+        self.chunk_stores.invalidate(index_base)
+        self.generations.collect(index_base)
+        return result, embedding_stats
+
+    def _warm_generation(self, generation: str, request_id: int) -> None:
+        """Open a new generation's retriever and keyword index ahead of the swap."""
+        try:
+            store = self._get_chunk_store(generation, request_id) if index_load_mode() == 'mmap' else None
+            self._get_retriever(f"{generation}.mp4", f"{generation}.json", request_id, store)
+            self.keyword_indexes.get(generation)
+        except Exception as e:
+            # The first search opens it instead
+            logger.warning(f"[REQ-{request_id}] Could not pre-open {generation}: {e}")
+
+    def _forget_generation(self, generation: str) -> None:
+        """Drop everything cached for a generation that is being deleted."""
+        prefix = f"{generation}."
+        for key in [key for key in self.retrievers if key.startswith(prefix)]:
+            self.retrievers.pop(key, None)
+            self._retriever_clock.forget(key)
+        with self._encoders_lock:
+            for key in [key for key in self._retriever_locks if key.startswith(prefix)]:
+                del self._retriever_locks[key]
+        self.chunk_stores.invalidate(generation)
+        self.keyword_indexes.invalidate(generation)
+        self.router.invalidate(generation)
+        with self._chunk_texts_lock:
+            self._chunk_texts.pop(f"{generation}.json", None)
+            self._chunk_metadata.pop(chunk_metadata_path(generation), None)
+            cached = self._frame_containers.pop(frames_path(generation), None)
+        if cached:
+            cached[1].close()
+
     def create_memory_bank(self, bank_name: str, sources: list, output_path: Optional[str] = None, **kwargs):
         """Create a new memory bank from sources - Thread-safe implementation"""
         request_id = self._get_request_id()
@@ -236,25 +1100,31 @@ class DirectMemvidBridge:
             self._ensure_heavy_imports()
             
             # Initialize encoder (create new instance for each request to avoid conflicts)
-            encoder = self.MemvidEncoder()
+            encoder = self._new_encoder(kwargs.get('embedding_model'))
             
             # Thread-safe encoder storage
             with self._encoders_lock:
                 self.encoders[f"{bank_name}_{request_id}"] = encoder
             
-            # Process sources properly by type
-            content_text = ""
-            for source in sources:
+            chunk_size = kwargs.get('chunk_size') or DEFAULT_CHUNK_SIZE
+            overlap = kwargs.get('overlap') if kwargs.get('overlap') is not None else DEFAULT_OVERLAP
+
+            # Process sources properly by type; each document keeps its own metadata
+            documents = []
+            for source_number, source in enumerate(sources):
+                checkpoint('read')
+                progress('read', source_number, len(sources))
                 try:
                     if isinstance(source, str):
-                        content_text += source + "\n\n"
+                        documents.append((source, describe_text(), None))
                     elif isinstance(source, dict):
                         source_type = source.get('type', 'text')
                         source_path = source.get('path', '')
+                        options = source.get('options') or {}
                         
                         if source_type == 'text':
                             # Direct text content
-                            content_text += source_path + "\n\n"
+                            documents.append((source_path, describe_text(), options))
                         elif source_type == 'file':
                             if not _is_path_allowed(source_path):
                                 raise ValueError(f'Path not allowed: {source_path}')
@@ -262,8 +1132,11 @@ class DirectMemvidBridge:
                             if os.path.exists(source_path):
                                 with open(source_path, 'r', encoding='utf-8', errors='ignore') as f:
                                     file_content = f.read()
-                                    content_text += f"\n\n=== {os.path.basename(source_path)} ===\n\n"
-                                    content_text += file_content + "\n\n"
+                                documents.append((
+                                    f"=== {os.path.basename(source_path)} ===\n\n{file_content}",
+                                    describe_file(source_path),
+                                    options
+                                ))
                             else:
                                 logger.warning(f"[REQ-{request_id}] File not found: {source_path}")
                         elif source_type == 'directory':
@@ -271,7 +1144,6 @@ class DirectMemvidBridge:
                                 raise ValueError(f'Path not allowed: {source_path}')
                             logger.info(f"[REQ-{request_id}] Processing directory: {source_path}")
                             if os.path.exists(source_path) and os.path.isdir(source_path):
-                                options = source.get('options', {})
                                 file_types = options.get('file_types', ['txt', 'md', 'py', 'js', 'ts', 'json'])
                                 
                                 # Add dot prefix if not present
@@ -287,8 +1159,11 @@ class DirectMemvidBridge:
                                                 with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                                                     file_content = f.read()
                                                     rel_path = os.path.relpath(file_path, source_path)
-                                                    content_text += f"\n\n=== {rel_path} ===\n\n"
-                                                    content_text += file_content + "\n\n"
+                                                    documents.append((
+                                                        f"=== {rel_path} ===\n\n{file_content}",
+                                                        describe_file(file_path),
+                                                        options
+                                                    ))
                                                     logger.info(f"[REQ-{request_id}] Processed file: {rel_path}")
                                             except Exception as e:
                                                 logger.warning(f"[REQ-{request_id}] Could not read file {file_path}: {e}")
@@ -301,33 +1176,62 @@ class DirectMemvidBridge:
                                 import urllib.request
                                 with urllib.request.urlopen(source_path) as response:
                                     url_content = response.read().decode('utf-8', errors='ignore')
-                                    content_text += f"\n\n=== {source_path} ===\n\n"
-                                    content_text += url_content + "\n\n"
+                                documents.append((
+                                    f"=== {source_path} ===\n\n{url_content}",
+                                    describe_text(source_path),
+                                    options
+                                ))
                             except Exception as e:
                                 logger.warning(f"[REQ-{request_id}] Could not fetch URL {source_path}: {e}")
+                        elif source_type == 'synthetic':
+                            # Generated benchmark corpus (tests/performance/scale-benchmark.py);
+                            # one chunk per document. Not part of the MCP tool schema.
+                            count = int(options.get('chunks', 1000))
+                            chars = int(options.get('chunk_size') or chunk_size)
+                            corpus = SyntheticCorpus(seed=int(options.get('seed', 0)))
+                            meta = describe_text('synthetic')
+                            document_options = {'chunk_size': chars, 'overlap': 0}
+                            documents.extend((text, meta, document_options) for text in corpus.chunks(count, chars))
+                            logger.info(f"[REQ-{request_id}] Generated {count} synthetic chunks")
                         elif 'content' in source:
                             # Legacy content field support
-                            content_text += source['content'] + "\n\n"
+                            documents.append((source['content'], describe_text(), options))
                         else:
                             logger.warning(f"[REQ-{request_id}] Unknown source type or missing content: {source}")
                             
+                except RequestAborted:
+                    raise
                 except Exception as e:
                     logger.error(f"[REQ-{request_id}] Error processing source {source}: {e}")
                     continue
             
-            if not content_text.strip():
+            documents = [doc for doc in documents if doc[0] and doc[0].strip()]
+            if not documents:
                 raise ValueError("No content was extracted from sources. Please check source paths and types.")
             
-            logger.info(f"[REQ-{request_id}] Extracted {len(content_text)} characters from sources")
+            logger.info(f"[REQ-{request_id}] Extracted {sum(len(doc[0]) for doc in documents)} characters "
+                        f"from {len(documents)} documents")
             
-            # Add content to encoder
-            encoder.add_text(content_text)
+            progress('read', len(sources), len(sources), f"{len(documents)} documents")
+
+            # Add content to encoder, recording which document each chunk came from
+            checkpoint('chunk')
+            chunk_meta = []
+            report_every = max(1, len(documents) // 20)
+            for document_number, (text, meta, options) in enumerate(documents):
+                options = options or {}
+                self._add_document(encoder, text, meta, chunk_meta,
+                                   options.get('chunk_size') or chunk_size,
+                                   options['overlap'] if options.get('overlap') is not None else overlap)
+                if document_number % report_every == 0:
+                    progress('chunk', document_number + 1, len(documents))
+            progress('chunk', len(documents), len(documents), f"{len(chunk_meta)} chunks")
             
-            # Build video and index files
+            # Build video and index files into a new generation, then publish it
             resolved_output = output_path or kwargs.get('output_path')
             video_path, index_path = self._paths_from_output(resolved_output, bank_name)
-            
-            result = encoder.build_video(video_path, index_path)
+            with self._bank_write_lock(index_path):
+                result, embedding_stats = self._write_generation(encoder, index_path, chunk_meta, request_id)
             
             # Clean up temporary encoder reference
             with self._encoders_lock:
@@ -340,10 +1244,19 @@ class DirectMemvidBridge:
                 "bank_name": bank_name,
                 "video_path": video_path,
                 "index_path": f"{index_path}.json",
+                "chunks_created": len(chunk_meta),
+                "embedding": embedding_stats,
                 "stats": result
             }
             
+        except RequestAborted:
+            # Cancels and deadlines surface as typed errors (see request_outcome)
+            with self._encoders_lock:
+                self.encoders.pop(f"{bank_name}_{request_id}", None)
+            raise
         except Exception as e:
+            with self._encoders_lock:
+                self.encoders.pop(f"{bank_name}_{request_id}", None)
             logger.error(f"[REQ-{request_id}] Failed to create memory bank {bank_name}: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
             return {
@@ -351,53 +1264,234 @@ class DirectMemvidBridge:
                 "error": str(e)
             }
     
+    def _search_generation(self, index_base: str, query: str, request_id: int, mode: str, top_k: int,
+                           min_score: float, chunk_filter: ChunkFilter, hybrid_alpha: Optional[float] = None) -> tuple:
+        """Search one pinned generation.
+
+        Returns ``(results, candidates examined, chunk lookup, embedding model)``;
+        the lookup maps a chunk id to ``(text, metadata)`` in the same generation
+        and the model is None in keyword mode.
+        """
+        checkpoint('search')
+        model = None
+        store = self._get_chunk_store(index_base, request_id) if index_load_mode() == 'mmap' else None
+        if store is not None:
+            texts, chunk_meta = store.texts, store.metadata
+        else:
+            texts = self._load_chunk_texts(index_base)
+            chunk_meta = self._load_chunk_metadata(index_base)
+
+        if mode == 'keyword':
+            # Exact-term lookups skip heavy imports and the embedding model entirely
+            keyword_index = self._get_keyword_index(index_base, request_id)
+            total = keyword_index.n_docs
+            candidates = lambda k: self._keyword_candidates(keyword_index, query, k)
+        else:
+            # Lazy load heavy dependencies only when needed
+            self._ensure_heavy_imports()
+            retriever = self._get_retriever(f"{index_base}.mp4", f"{index_base}.json", request_id, store)
+            index_manager = retriever.index_manager
+            total = index_manager.index.ntotal
+            model = index_manager.embedding_model
+
+            # Embed once; over-fetch rounds only repeat the index lookup
+            query_vector = index_manager.embedding_model.encode([query], show_progress_bar=False)
+            query_vector = query_vector.astype('float32')
+            if mode == 'hybrid':
+                alpha = float(0.5 if hybrid_alpha is None else hybrid_alpha)
+                keyword_index = self._get_keyword_index(index_base, request_id)
+                candidates = lambda k: self._hybrid_candidates(retriever, keyword_index, query, query_vector, k, alpha)
+            else:
+                candidates = lambda k: self._vector_candidates(retriever, query_vector, k)
+
+        frames = self._load_frame_container(index_base)
+        results, examined = self._collect_results(candidates, total, top_k, min_score,
+                                                  chunk_filter, chunk_meta, texts, frames)
+
+        def lookup(chunk_id: int):
+            if chunk_id < 0:
+                return None
+            text = texts.get(chunk_id)
+            if text is None and frames is not None and chunk_id < len(frames):
+                text = frames.read_chunk(chunk_id)
+            if text is None:
+                return None
+            return text, dict(chunk_meta[chunk_id]) if chunk_id < len(chunk_meta) else {}
+
+        return results, examined, lookup, model
+
     def search_memory_bank(self, video_path: str, index_path: str, query: str, **kwargs):
         """Search a memory bank for relevant content - Thread-safe with retriever caching"""
         request_id = self._get_request_id()
         try:
-            logger.info(f"[REQ-{request_id}] Searching memory bank: {video_path} for query: {query}")
-            
-            # Lazy load heavy dependencies only when needed
-            self._ensure_heavy_imports()
-            
-            # Get or create cached retriever for better performance
-            retriever_key = f"{video_path}:{index_path}"
-            
-            if retriever_key not in self.retrievers:
-                logger.info(f"[REQ-{request_id}] Creating new retriever for {retriever_key}")
-                retriever = self.MemvidRetriever(video_path, index_path)
-                self.retrievers[retriever_key] = retriever
-            else:
-                logger.info(f"[REQ-{request_id}] Using cached retriever for {retriever_key}")
-                retriever = self.retrievers[retriever_key]
-            
-            # Perform search
+            mode = kwargs.get('mode') or 'vector'
+            if mode not in SEARCH_MODES:
+                raise ValueError(f"Unknown search mode: {mode}")
             top_k = kwargs.get('top_k', 5)
+            min_score = float(kwargs.get('min_score') or 0.0)
+            chunk_filter = ChunkFilter(kwargs.get('filters'))
+            bank_base = index_path[:-len('.json')] if index_path.endswith('.json') else index_path
+            logger.info(f"[REQ-{request_id}] Searching memory bank ({mode}): {video_path} for query: {query}")
+
+            # Pin the published generation: a rebuild may swap in a new one meanwhile,
+            # but this search finishes on the files (and retriever) it started with
+            with self.generations.use(bank_base) as index_base:
+                start_time = time.time()
+                results, examined, _, _ = self._search_generation(index_base, query, request_id, mode, top_k,
+                                                                  min_score, chunk_filter, kwargs.get('hybrid_alpha'))
+                search_time = time.time() - start_time
+
+                logger.info(f"[REQ-{request_id}] Search found {len(results)} results "
+                            f"({examined} candidates examined) in {search_time:.3f}s")
+                return {
+                    "status": "success",
+                    "results": results,
+                    "total_results": len(results),
+                    "candidates_examined": examined,
+                    "search_time": search_time
+                }
+
+        except RequestAborted:
+            raise
+        except Exception as e:
+            logger.error(f"[REQ-{request_id}] Failed to search memory bank {video_path}: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    def assemble_context(self, query: str, banks: list, **kwargs):
+        """Search banks and pack the best spans into one token-budgeted context (``get_context``).
+
+        ``banks`` are ``{name, bank_path}``; with ``route_top_m`` set and more
+        banks than that, only the top-M routed banks (plus unrouted ones) are
+        searched. Every bank stays pinned to its generation while neighbors are
+        read, so spans never mix chunks from two builds.
+        """
+        request_id = self._get_request_id()
+        try:
             start_time = time.time()
-            results = retriever.search(query, top_k=top_k)
-            search_time = time.time() - start_time
-            
-            logger.info(f"[REQ-{request_id}] Search found {len(results)} results in {search_time:.3f}s")
+            mode = kwargs.get('mode') or 'vector'
+            if mode not in SEARCH_MODES:
+                raise ValueError(f"Unknown search mode: {mode}")
+            max_tokens = int(kwargs.get('max_tokens') or 4000)
+            top_k = int(kwargs.get('top_k') or 8)
+            neighbors = max(0, int(kwargs.get('neighbors') or 0))
+            min_score = float(kwargs.get('min_score') or 0.0)
+            chunk_filter = ChunkFilter(kwargs.get('filters'))
+            separator = kwargs.get('separator') or DEFAULT_SEPARATOR
+
+            route_top_m = kwargs.get('route_top_m')
+            routed = None
+            if route_top_m and len(banks) > route_top_m:
+                route = self.route_banks(query, banks)
+                if route.get('status') == 'success':
+                    keep = set(select_top_m(route['ranked'], route_top_m)[0])
+                    routed = [bank['name'] for bank in banks if bank['name'] in keep]
+                    banks = [bank for bank in banks if bank['name'] in keep]
+
+            hits, lookups, searched, model = [], {}, [], None
+            with ExitStack() as pins:
+                for bank in banks:
+                    bank_base = bank['bank_path']
+                    for ext in ('.mp4', '.json', '.faiss'):
+                        if bank_base.endswith(ext):
+                            bank_base = bank_base[: -len(ext)]
+                            break
+                    try:
+                        index_base = pins.enter_context(self.generations.use(bank_base))
+                        results, _, lookup, bank_model = self._search_generation(
+                            index_base, query, request_id, mode, top_k, min_score, chunk_filter,
+                            kwargs.get('hybrid_alpha'))
+                    except RequestAborted:
+                        raise
+                    except Exception as e:
+                        logger.warning(f"[REQ-{request_id}] Skipping bank {bank['name']} in context assembly: {e}")
+                        continue
+                    model = model or bank_model
+                    lookups[bank['name']] = lookup
+                    searched.append(bank['name'])
+                    hits.extend({'bank': bank['name'], 'chunk_id': r['chunk_id'], 'score': r['score'],
+                                 'content': r['content'], 'metadata': r['metadata']} for r in results)
+
+                checkpoint('assemble')
+                hits.sort(key=lambda hit: hit['score'], reverse=True)
+                candidates = len(hits)
+                spans = expand_hits(dedupe_hits(hits), neighbors, lookups)
+                sections = []
+                for span in spans:
+                    lookup = lookups[span['bank']]
+                    texts = [chunk[0] for chunk in map(lookup, range(span['start'], span['end'] + 1)) if chunk]
+                    header = ''
+                    if kwargs.get('include_metadata'):
+                        source = span['metadata'].get('source')
+                        header = f"[Source: {span['bank']}{f' - {source}' if source else ''}]\n"
+                    sections.append({'header': header, 'text': join_chunks(texts), 'span': span})
+
+            tokenizer = self._context_tokenizer(kwargs.get('tokenizer'), model)
+            context, packed, total_tokens = pack_context(sections, max_tokens, tokenizer, separator)
+            sources = [{
+                'bank_name': section['span']['bank'],
+                'chunk_ids': list(range(section['span']['start'], section['span']['end'] + 1)),
+                'hit_chunk_ids': section['span']['hits'],
+                'score': section['span']['score'],
+                'tokens': section['tokens'],
+                'truncated': section['truncated'],
+                'metadata': section['span']['metadata'],
+                'content_preview': section['text'][:100] + ('...' if len(section['text']) > 100 else ''),
+            } for section in packed]
+            assemble_time = time.time() - start_time
+            logger.info(f"[REQ-{request_id}] Assembled {total_tokens}/{max_tokens} tokens ({tokenizer.name}) from "
+                        f"{len(packed)}/{len(spans)} spans across {len(searched)} banks in {assemble_time:.3f}s")
             return {
                 "status": "success",
-                "results": results,
-                "total_results": len(results),
-                "search_time": search_time
+                "context": context,
+                "sources": sources,
+                "total_tokens": total_tokens,
+                "max_tokens": max_tokens,
+                "tokenizer": tokenizer.name,
+                "candidates": candidates,
+                "spans": len(spans),
+                "banks_searched": searched,
+                "routed": routed,
+                "assemble_time": assemble_time,
             }
-            
+
+        except RequestAborted:
+            raise
         except Exception as e:
-            logger.error(f"[REQ-{request_id}] Failed to search memory bank {video_path}: {e}")
+            logger.error(f"[REQ-{request_id}] Failed to assemble context: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
             return {
                 "status": "error",
                 "error": str(e)
             }
 
-    def add_content_to_bank(self, bank_path: str, content: str, metadata: dict = None, **kwargs):
-        """Add content to an existing memory bank - Thread-safe implementation"""
+    def _context_tokenizer(self, spec: Optional[str], model):
+        """Cached tokenizer for ``assemble_context`` (see ``bridge_context.make_tokenizer``)."""
+        key = (spec or 'auto', id(model) if model is not None else None)
+        with self._embedding_models_lock:
+            tokenizer = self._tokenizers.get(key)
+        if tokenizer is None:
+            tokenizer = make_tokenizer(spec, model)
+            with self._embedding_models_lock:
+                self._tokenizers[key] = tokenizer
+        return tokenizer
+
+    def add_content_to_bank(self, bank_path: str, content: Optional[str] = None, metadata: dict = None,
+                            items: Optional[list] = None, **kwargs):
+        """Add content to an existing memory bank - Thread-safe implementation
+
+        ``items`` (``[{content, metadata}, ...]``) group-commits many documents:
+        they are chunked one by one but embedded, indexed and published as one
+        new generation, and the result reports ``items`` per document.
+        """
         request_id = self._get_request_id()
         try:
-            logger.info(f"[REQ-{request_id}] Adding content to memory bank: {bank_path}")
+            if items is None:
+                items = [{'content': content, 'metadata': metadata}]
+            logger.info(f"[REQ-{request_id}] Adding {len(items)} document(s) to memory bank: {bank_path}")
             
             # Lazy load heavy dependencies only when needed
             self._ensure_heavy_imports()
@@ -405,105 +1499,11 @@ class DirectMemvidBridge:
             # Derive file paths from bank_path
             # bank_path could be the .mp4 file or the base name
             base_path = bank_path.replace('.mp4', '').replace('.json', '').replace('.faiss', '')
-            video_path = f"{base_path}.mp4"
-            index_path = f"{base_path}.json"
-            faiss_path = f"{base_path}.faiss"
-            
-            # Check if memory bank exists
-            if not os.path.exists(video_path) or not os.path.exists(index_path):
-                raise ValueError(f"Memory bank not found at {base_path}")
-            
-            logger.info(f"[REQ-{request_id}] Loading existing memory bank from {base_path}")
-            
-            # Load the existing retriever/encoder to get the current state
-            # Create a new encoder instance for adding content
-            encoder = self.MemvidEncoder()
-            
-            # Read existing JSON index to get current chunks
-            try:
-                with open(index_path, 'r', encoding='utf-8') as f:
-                    existing_index = json.load(f)
-                    
-                # Add existing content to the new encoder
-                if 'chunks' in existing_index and isinstance(existing_index['chunks'], list):
-                    logger.info(f"[REQ-{request_id}] Loading {len(existing_index['chunks'])} existing chunks")
-                    for chunk in existing_index['chunks']:
-                        if isinstance(chunk, dict) and 'text' in chunk:
-                            encoder.add_text(chunk['text'])
-                        elif isinstance(chunk, str):
-                            encoder.add_text(chunk)
-                            
-            except Exception as e:
-                logger.warning(f"[REQ-{request_id}] Could not load existing index: {e}")
-                # If we can't load existing content, we'll just add the new content
-                # This might result in a partial rebuild, but it's better than failing
-            
-            # Add the new content
-            if metadata:
-                # Format content with metadata if provided
-                formatted_content = f"\n\n=== New Content ===\n"
-                if metadata.get('source'):
-                    formatted_content += f"Source: {metadata['source']}\n"
-                if metadata.get('category'):
-                    formatted_content += f"Category: {metadata['category']}\n"
-                if metadata.get('timestamp'):
-                    formatted_content += f"Timestamp: {metadata['timestamp']}\n"
-                formatted_content += f"\n{content}\n\n"
-            else:
-                formatted_content = f"\n\n=== New Content ===\n{content}\n\n"
-            
-            # Add new content to encoder
-            encoder.add_text(formatted_content)
-            logger.info(f"[REQ-{request_id}] Added {len(content)} characters of new content")
-            
-            # Create backup of existing files
-            backup_video = f"{video_path}.backup"
-            backup_index = f"{index_path}.backup" 
-            backup_faiss = f"{faiss_path}.backup"
-            
-            try:
-                if os.path.exists(video_path):
-                    os.rename(video_path, backup_video)
-                if os.path.exists(index_path):
-                    os.rename(index_path, backup_index)
-                if os.path.exists(faiss_path):
-                    os.rename(faiss_path, backup_faiss)
-                    
-                # Rebuild the memory bank with all content (existing + new)
-                result = encoder.build_video(video_path, base_path)
-                
-                # Clean up backup files if successful
-                for backup_file in [backup_video, backup_index, backup_faiss]:
-                    if os.path.exists(backup_file):
-                        os.remove(backup_file)
-                        
-                logger.info(f"[REQ-{request_id}] Successfully added content to memory bank: {base_path}")
-                
-                # Invalidate cached retriever since the bank has been updated
-                retriever_key = f"{video_path}:{index_path}"
-                if retriever_key in self.retrievers:
-                    del self.retrievers[retriever_key]
-                    logger.info(f"[REQ-{request_id}] Invalidated cached retriever for updated bank")
-                
-                return {
-                    "status": "success",
-                    "bank_path": base_path,
-                    "chunks_added": 1,  # Estimate - could be calculated more precisely
-                    "stats": result
-                }
-                
-            except Exception as e:
-                # Restore backup files if rebuild failed
-                logger.error(f"[REQ-{request_id}] Rebuild failed, restoring backups: {e}")
-                
-                for original, backup in [(video_path, backup_video), (index_path, backup_index), (faiss_path, backup_faiss)]:
-                    if os.path.exists(backup):
-                        if os.path.exists(original):
-                            os.remove(original)
-                        os.rename(backup, original)
-                        
-                raise e
-                
+            with self._bank_write_lock(base_path):
+                return self._add_content_locked(base_path, items, request_id, **kwargs)
+
+        except RequestAborted:
+            raise
         except Exception as e:
             logger.error(f"[REQ-{request_id}] Failed to add content to memory bank {bank_path}: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
@@ -512,14 +1512,386 @@ class DirectMemvidBridge:
                 "error": str(e)
             }
 
-def main():
-    """Main bridge loop for handling MCP requests"""
+    def _add_content_locked(self, base_path: str, items: list, request_id: int, **kwargs) -> dict:
+        """Rebuild the bank's current generation plus the ``items`` documents into a new generation."""
+        _, current = resolve(base_path)
+        video_path = f"{current}.mp4"
+        index_path = f"{current}.json"
+
+        # Check if memory bank exists
+        if not os.path.exists(video_path) or not os.path.exists(index_path):
+            raise ValueError(f"Memory bank not found at {base_path}")
+
+        logger.info(f"[REQ-{request_id}] Loading existing memory bank from {current}")
+        encoder = self._new_encoder(self._bank_embedding_model(current))
+
+        # Carry the existing chunks (and their metadata) over unchanged; the
+        # JSON index stores them under 'metadata' in chunk id order
+        with open(index_path, 'r', encoding='utf-8') as f:
+            existing_index = json.load(f)
+        existing_chunks = [m.get('text', '') for m in existing_index.get('metadata', [])]
+        chunk_meta = read_chunk_metadata(current)
+        chunk_meta = [chunk_meta[i] if i < len(chunk_meta) else {} for i in range(len(existing_chunks))]
+        if existing_chunks:
+            logger.info(f"[REQ-{request_id}] Loading {len(existing_chunks)} existing chunks")
+            encoder.add_chunks(existing_chunks)
+
+        chunk_size = kwargs.get('chunk_size') or DEFAULT_CHUNK_SIZE
+        overlap = kwargs.get('overlap') if kwargs.get('overlap') is not None else DEFAULT_OVERLAP
+        item_results = []
+        for item in items:
+            content = item.get('content') or ''
+            metadata = item.get('metadata') or {}
+            content_meta = describe_text(metadata.get('source'), category=metadata.get('category'),
+                                         tags=metadata.get('tags'))
+            if metadata.get('timestamp'):
+                content_meta['timestamp'] = metadata['timestamp']
+            before = len(encoder.chunks)
+            try:
+                added = self._add_document(encoder, content, content_meta, chunk_meta, chunk_size, overlap)
+                item_results.append({'success': True, 'chunks_added': added})
+            except Exception as e:
+                # One bad document does not fail the rest of its group
+                del encoder.chunks[before:]
+                del chunk_meta[before:]
+                logger.warning(f"[REQ-{request_id}] Could not chunk document {len(item_results)}: {e}")
+                item_results.append({'success': False, 'chunks_added': 0, 'error': str(e)})
+        chunks_added = sum(result['chunks_added'] for result in item_results)
+        if not any(result['success'] for result in item_results):
+            raise ValueError(f"No document could be added: {item_results[0].get('error') if item_results else 'no items'}")
+        logger.info(f"[REQ-{request_id}] Added {len(items)} document(s) of new content ({chunks_added} chunks)")
+        progress('chunk', chunks_added, chunks_added)
+
+        # Rebuild the memory bank with all content (existing + new) as a new
+        # generation; the current one keeps serving searches until the swap
+        result, embedding_stats = self._write_generation(encoder, base_path, chunk_meta, request_id)
+        logger.info(f"[REQ-{request_id}] Successfully added content to memory bank: {base_path}")
+
+        return {
+            "status": "success",
+            "bank_path": base_path,
+            "chunks_added": chunks_added,
+            "total_chunks": len(encoder.chunks),
+            "items": item_results,
+            "embedding": embedding_stats,
+            "stats": result
+        }
+
+def bank_stats_result(bridge: DirectMemvidBridge, params: dict) -> dict:
+    """Result of a ``stats`` request: header-only statistics; ``bank_paths`` asks for many banks at once"""
+    def stats_result(result):
+        return {'success': result.get('status') == 'success',
+                **{k: v for k, v in result.items() if k != 'status'}}
+
+    if 'bank_paths' in params:
+        return {
+            'success': True,
+            'banks': [stats_result(bridge.bank_stats(path)) for path in params['bank_paths']],
+            'cached_retrievers': len(bridge.retrievers),
+        }
+    return stats_result(bridge.bank_stats(params['bank_path']))
+
+
+def handle_request(bridge: DirectMemvidBridge, request: dict) -> dict:
+    """Run one scheduled JSON-RPC request and build its response envelope"""
+    request_id = request.get('id')
+    method = request.get('method')
+    params = request.get('params', {})
+
+    if method == 'encode':
+        # Create memory bank 
+        sources = params['sources']
+        output_path = params['output_path']
+        
+        # Extract bank name from output path
+        bank_name = os.path.basename(output_path).replace('.mp4', '')
+        
+        result = bridge.create_memory_bank(bank_name, sources, output_path=output_path,
+                                           chunk_size=params.get('chunk_size'),
+                                           overlap=params.get('overlap'),
+                                           embedding_model=params.get('embedding_model'))
+        
+        # Format as JSON-RPC response
+        if result.get('status') == 'success':
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': True,
+                    'chunks_created': result.get('chunks_created', 0),
+                    'embedding': result.get('embedding') or None,
+                    'files': {
+                        'mp4': result['video_path'],
+                        'faiss': result['index_path'].replace('.json', '.faiss'),
+                        'json': result['index_path']
+                    }
+                }
+            }
+        else:
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': False,
+                    'error': result.get('error', 'Unknown error'),
+                    'chunks_created': 0
+                }
+            }
+        
+        return response
+        
+    elif method == 'search':
+        # Search memory bank
+        video_path = params['video_path']
+        index_path = params['index_path']
+        query = params['query']
+        
+        # Extract other parameters (excluding the ones we pass as positional args)
+        other_params = {k: v for k, v in params.items() 
+                      if k not in ['video_path', 'index_path', 'query']}
+        
+        result = bridge.search_memory_bank(video_path, index_path, query, **other_params)
+        
+        # Format as JSON-RPC response
+        if result.get('status') == 'success':
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': True,
+                    'results': result['results'],
+                    'total_results': result['total_results'],
+                    'candidates_examined': result.get('candidates_examined', 0)
+                }
+            }
+        else:
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': False,
+                    'error': result.get('error', 'Unknown error'),
+                    'results': []
+                }
+            }
+        
+        return response
+        
+    elif method == 'add_content':
+        # Add content to existing memory bank
+        bank_path = params['bank_path']
+        content = params.get('content')
+        metadata = params.get('metadata', {})
+        items = params.get('items')  # group commit: many documents, one new generation
+        
+        # Extract other parameters
+        other_params = {k: v for k, v in params.items() 
+                      if k not in ['bank_path', 'content', 'metadata', 'items']}
+        
+        result = bridge.add_content_to_bank(bank_path, content, metadata, items=items, **other_params)
+        
+        # Format as JSON-RPC response
+        if result.get('status') == 'success':
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': True,
+                    'chunks_added': result.get('chunks_added', 0),
+                    'total_chunks': result.get('total_chunks'),
+                    'items': result.get('items'),
+                    'embedding': result.get('embedding') or None
+                }
+            }
+        else:
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': False,
+                    'error': result.get('error', 'Unknown error'),
+                    'chunks_added': 0
+                }
+            }
+        
+        return response
+        
+    elif method == 'assemble_context':
+        # Search, neighbor expansion and token packing for get_context in one request
+        other_params = {k: v for k, v in params.items() if k not in ['query', 'banks']}
+        result = bridge.assemble_context(params['query'], params.get('banks', []), **other_params)
+        if result.get('status') == 'success':
+            return {'id': request_id,
+                    'result': {'success': True, **{k: v for k, v in result.items() if k != 'status'}}}
+        return {'id': request_id, 'result': {'success': False, 'error': result.get('error', 'Unknown error')}}
+
+    elif method == 'warm':
+        # Fast start: load libraries and the embedding model ahead of the first real request
+        result = bridge.warm(params.get('model'))
+        return {'id': request_id,
+                'result': {'success': result.get('status') == 'success',
+                           **{k: v for k, v in result.items() if k != 'status'}}}
+
+    elif method == 'compact':
+        # Merge small appends and duplicates into a new bank generation
+        other_params = {k: v for k, v in params.items() if k != 'bank_path'}
+        result = bridge.compact_bank(params['bank_path'], **other_params)
+
+        if result.get('status') == 'success':
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': True,
+                    **{k: v for k, v in result.items() if k not in ('status', 'bank_path')}
+                }
+            }
+        else:
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': False,
+                    'error': result.get('error', 'Unknown error')
+                }
+            }
+
+        return response
+
+    elif method == 'route':
+        # Rank candidate banks for a query before the full search
+        result = bridge.route_banks(params['query'], params.get('banks', []))
+
+        if result.get('status') == 'success':
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': True,
+                    'ranked': result['ranked'],
+                    'route_time': result['route_time']
+                }
+            }
+        else:
+            response = {
+                'id': request_id,
+                'result': {
+                    'success': False,
+                    'error': result.get('error', 'Unknown error'),
+                    'ranked': []
+                }
+            }
+
+        return response
+
+    logger.error(f"Unknown method: {method}")
+    return {
+        'id': request_id,
+        'error': {
+            'message': f"Unknown method: {method}",
+            'type': 'ValueError'
+        }
+    }
+
+
+def request_outcome(response: dict) -> str:
+    """Metrics outcome of a handled request: ok, failed (success false), cancelled, expired or error."""
+    error = response.get('error')
+    if error:
+        return {'RequestCancelled': 'cancelled', 'DeadlineExceeded': 'expired'}.get(error.get('type'), 'error')
+    return 'failed' if response.get('result', {}).get('success') is False else 'ok'
+
+
+def main(bridge: Optional[DirectMemvidBridge] = None, worker: Optional[WorkerInfo] = None):
+    """Main bridge loop: answers control requests inline and schedules the rest.
+
+    In zygote mode ``bridge`` is the preloaded instance inherited by this forked
+    worker and ``worker`` describes it in the ready signal and ping replies.
+    """
     try:
-        bridge = DirectMemvidBridge()
+        bridge = bridge or DirectMemvidBridge()
+
+        def run_scheduled(request: dict, context: RequestContext) -> str:
+            request_id = request.get('id')
+            context.progress_sink = lambda event: emit({'event': 'progress', 'id': request_id, **event})
+            try:
+                context.checkpoint('start')
+                response = handle_request(bridge, request)
+            except Exception as e:
+                logger.error(f"Error processing request: {e}")
+                logger.error(f"Traceback: {traceback.format_exc()}")
+                response = {
+                    'id': request.get('id'),
+                    'error': {
+                        'message': str(e),
+                        'type': type(e).__name__,
+                    }
+                }
+            emit(response)
+            return request_outcome(response)
+
+        def drop_scheduled(request: dict, context: RequestContext, error_type: str, message: str) -> None:
+            emit({'id': request.get('id'), 'error': {'message': message, 'type': error_type}})
+
+        metrics = BridgeMetrics()
+        scheduler = BridgeScheduler(run_scheduled, drop_scheduled, metrics=metrics)
+        bridge.scheduler = scheduler
+
+        def answer_control(request: dict) -> dict:
+            """Answer a control request without queueing, so it works while every worker is busy."""
+            request_id = request.get('id')
+            method = request.get('method')
+            params = request.get('params') or {}
+            if method == 'ping':
+                result = {'status': 'pong'}
+                if worker is not None:
+                    result['worker'] = worker.describe()
+            elif method == 'logs':
+                result = {
+                    'success': True,
+                    'mode': log_mode(),
+                    'entries': recent_logs(params.get('limit'), params.get('level', 'debug'))
+                }
+            elif method == 'metrics':
+                # Queue depth stays visible while every worker is busy
+                queue = scheduler.snapshot()
+                result = {
+                    'success': True,
+                    **metrics.snapshot([
+                        gauge('queue_depth', 'Requests waiting in the bridge queue by priority',
+                              [({'priority': name}, depth) for name, depth in queue['queued'].items()]),
+                        gauge('requests_running', 'Requests running on bridge workers',
+                              [({}, len(queue['running']))]),
+                        gauge('workers', 'Bridge worker threads', [({}, queue['workers'])]),
+                        *bridge.pool_gauges(),
+                    ])
+                }
+            elif method == 'memory':
+                # Sheds caches while every worker is busy
+                result = {
+                    'success': True,
+                    **bridge.shed_memory(params.get('evict_idle_seconds'),
+                                         bool(params.get('release_buffers', False)))
+                }
+            elif method == 'stats':
+                # Only reads file headers, so list_memory_banks never waits behind a build
+                result = bank_stats_result(bridge, params)
+            elif method == 'cancel':
+                # Reaches requests queued behind long jobs
+                state = scheduler.cancel(params.get('request_id'))
+                logger.info(f"Cancel requested for {params.get('request_id')}: {state}")
+                result = {'success': state != 'unknown', 'state': state}
+            else:
+                raise ValueError(f"Not a control method: {method}")
+            return {'id': request_id, 'result': result}
+
+        fd = control_fd()
+        if fd is not None:
+            control = ControlChannel(fd, answer_control)
+            control.start()
+            logger.info(f"Serving control requests on descriptor {fd}")
         
-        # Send ready signal immediately (no heavy imports at startup)
-        print(json.dumps({'status': 'ready'}), flush=True)
-        logger.info("Bridge ready, sent JSON ready signal")
+        # Send ready signal immediately (no heavy imports at startup, or already preloaded)
+        ready = {'status': 'ready', 'control': fd is not None}
+        if worker is not None:
+            worker.mark_ready()
+            ready['worker'] = worker.describe()
+            logger.info(f"Bridge worker {worker.pid} ready {worker.startup_ms}ms after fork "
+                        f"(+{ready['worker']['rss_delta_mb']} MB private)")
+        emit(ready)
+        logger.info(f"Bridge ready, sent JSON ready signal ({scheduler.workers} workers, "
+                    f"queue limit {scheduler.max_queued})")
         
         # Process JSON-RPC requests
         for line in sys.stdin:
@@ -529,128 +1901,24 @@ def main():
                 method = request.get('method')
                 params = request.get('params', {})
                 
-                logger.info(f"Received JSON-RPC request: method={method}, id={request_id}")
+                logger.debug(f"Received JSON-RPC request: method={method}, id={request_id}")
                 
-                if method == 'encode':
-                    # Create memory bank 
-                    sources = params['sources']
-                    output_path = params['output_path']
-                    
-                    # Extract bank name from output path
-                    bank_name = os.path.basename(output_path).replace('.mp4', '')
-                    
-                    result = bridge.create_memory_bank(bank_name, sources, output_path=output_path)
-                    
-                    # Format as JSON-RPC response
-                    if result.get('status') == 'success':
-                        response = {
-                            'id': request_id,
-                            'result': {
-                                'success': True,
-                                'chunks_created': 1,  # Will be updated when we track this
-                                'files': {
-                                    'mp4': result['video_path'],
-                                    'faiss': result['index_path'].replace('.json', '.faiss'),
-                                    'json': result['index_path']
-                                }
-                            }
-                        }
-                    else:
-                        response = {
-                            'id': request_id,
-                            'result': {
-                                'success': False,
-                                'error': result.get('error', 'Unknown error'),
-                                'chunks_created': 0
-                            }
-                        }
-                    
-                    print(json.dumps(response), flush=True)
-                    
-                elif method == 'search':
-                    # Search memory bank
-                    video_path = params['video_path']
-                    index_path = params['index_path']
-                    query = params['query']
-                    
-                    # Extract other parameters (excluding the ones we pass as positional args)
-                    other_params = {k: v for k, v in params.items() 
-                                  if k not in ['video_path', 'index_path', 'query']}
-                    
-                    result = bridge.search_memory_bank(video_path, index_path, query, **other_params)
-                    
-                    # Format as JSON-RPC response
-                    if result.get('status') == 'success':
-                        response = {
-                            'id': request_id,
-                            'result': {
-                                'success': True,
-                                'results': result['results'],
-                                'total_results': result['total_results']
-                            }
-                        }
-                    else:
-                        response = {
-                            'id': request_id,
-                            'result': {
-                                'success': False,
-                                'error': result.get('error', 'Unknown error'),
-                                'results': []
-                            }
-                        }
-                    
-                    print(json.dumps(response), flush=True)
-                    
-                elif method == 'add_content':
-                    # Add content to existing memory bank
-                    bank_path = params['bank_path']
-                    content = params['content']
-                    metadata = params.get('metadata', {})
-                    
-                    # Extract other parameters
-                    other_params = {k: v for k, v in params.items() 
-                                  if k not in ['bank_path', 'content', 'metadata']}
-                    
-                    result = bridge.add_content_to_bank(bank_path, content, metadata, **other_params)
-                    
-                    # Format as JSON-RPC response
-                    if result.get('status') == 'success':
-                        response = {
-                            'id': request_id,
-                            'result': {
-                                'success': True,
-                                'chunks_added': result.get('chunks_added', 1)
-                            }
-                        }
-                    else:
-                        response = {
+                if method in CONTROL_METHODS:
+                    # Answered inline (when the server has no control channel open)
+                    emit(answer_control(request))
+
+                else:
+                    try:
+                        scheduler.submit(request, METHOD_PRIORITIES.get(method, PRIORITY_NORMAL))
+                    except QueueFull as e:
+                        logger.warning(f"Rejected request {request_id} ({method}): {e}")
+                        emit({
                             'id': request_id,
-                            'result': {
-                                'success': False,
-                                'error': result.get('error', 'Unknown error'),
-                                'chunks_added': 0
+                            'error': {
+                                'message': str(e),
+                                'type': 'QueueFull'
                             }
-                        }
-                    
-                    print(json.dumps(response), flush=True)
-                    
-                elif method == 'ping':
-                    response = {
-                        'id': request_id,
-                        'result': {'status': 'pong'}
-                    }
-                    print(json.dumps(response), flush=True)
-                    
-                else:
-                    logger.error(f"Unknown method: {method}")
-                    response = {
-                        'id': request_id,
-                        'error': {
-                            'message': f"Unknown method: {method}",
-                            'type': 'ValueError'
-                        }
-                    }
-                    print(json.dumps(response), flush=True)
+                        })
                     
             except Exception as e:
                 logger.error(f"Error processing request: {e}")
@@ -662,13 +1930,40 @@ def main():
                         'type': type(e).__name__,
                     }
                 }
-                print(json.dumps(error_response), flush=True)
+                emit(error_response)
+
+        # stdin closed: let queued and running work finish before exiting
+        scheduler.stop()
+        scheduler.join()
                 
     except Exception as e:
         logger.error(f"Bridge main loop failed: {e}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         sys.exit(1)
 
+def zygote_main():
+    """Preload once, then serve from forked workers that restart in well under a second"""
+    def preload() -> DirectMemvidBridge:
+        bridge = DirectMemvidBridge()
+        bridge.preload()
+        return bridge
+
+    def serve(bridge: DirectMemvidBridge, worker: WorkerInfo) -> int:
+        main(bridge, worker)
+        return 0
+
+    try:
+        code = run_zygote(preload, serve, emit)
+    except Exception as e:
+        # Preloading failed (e.g. missing dependencies): serve normally so requests report the error
+        logger.error(f"Zygote preload failed, starting a plain bridge: {e}")
+        main()
+        return
+    sys.exit(code)
+
 if __name__ == "__main__":
     logger.info("Script is being run directly")
-    main() 
\ No newline at end of file
+    if '--zygote' in sys.argv and zygote_supported():
+        zygote_main()
+    else:
+        main() 
\ No newline at end of file
@@ -1,28 +1,169 @@
 import { spawn, ChildProcess } from 'child_process';
+import { Duplex } from 'stream';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import { existsSync } from 'fs';
-import { MemvidConfig, SearchResult, ContentMetadata } from '../types/index.js';
-import { logger } from './logger.js';
+import { MemvidConfig, SearchResult, ContentMetadata, BankRouteScore, SearchMode, SearchFilters, EmbeddingStats, CompactionStats, BankStats, ContextSource } from '../types/index.js';
+import { logger, LogLevel } from './logger.js';
 import { ErrorRecoveryManager } from './error-recovery.js';
 import { SystemHealthMonitor } from './system-health-monitor.js';
 import { ConfigManager } from './config.js';
 import { buildPythonBridgeEnv } from './python-env.js';
+import { getSearchCache } from './search-cache.js';
+import { BridgePriority, BridgeQueueFullError, BridgeRequestScheduler, BridgeSchedulerOptions } from './bridge-scheduler.js';
+import { getMetrics, MetricFamily } from './metrics.js';
 
 export interface DirectMemvidIntegrationOptions {
   memoryBanksDir?: string;
   pythonExecutable?: string;
   allowedPaths?: string[];
+  scheduler?: Partial<BridgeSchedulerOptions>;
+  bridgeWorkers?: number;
+  /** Preload the bridge once and serve from forked workers (`--zygote`) */
+  zygote?: boolean;
+}
+
+const READY_TIMEOUT_MS = 10000;
+const STDERR_TAIL_LINES = 50;
+
+/** Python logging level names -> server log levels */
+const BRIDGE_LOG_LEVELS: Record<string, LogLevel> = {
+  debug: 'debug',
+  info: 'info',
+  warning: 'warn',
+  error: 'error',
+  critical: 'error'
+};
+// A zygote imports torch and loads the embedding model before its first worker is ready
+const ZYGOTE_READY_TIMEOUT_MS = 180000;
+
+const bridgeRequests = getMetrics().counter('bridge_requests_total', 'Requests sent to the Python bridge by method and outcome');
+const bridgeLatency = getMetrics().histogram(
+  'bridge_request_duration_ms', 'Bridge round trips by method, including time queued in the server'
+);
+
+/** Metrics outcome for a failed bridge request */
+function bridgeErrorOutcome(error: unknown): string {
+  if (error instanceof BridgeQueueFullError || (error as any)?.type === 'QueueFull') {
+    return 'rejected';
+  }
+  const message = error instanceof Error ? error.message : '';
+  if (message.startsWith('Request timeout')) {
+    return 'timeout';
+  }
+  return message.startsWith('Request cancelled') ? 'cancelled' : 'error';
+}
+
+/**
+ * Requests the bridge answers on its control channel, a separate pipe served by
+ * its own thread, so health checks and cancels are not held up by data-plane traffic
+ */
+const CONTROL_METHODS = new Set(['ping', 'cancel', 'logs', 'metrics', 'memory', 'stats']);
+
+/** The control pipe's descriptor in the bridge (Windows bridges get control requests on stdin) */
+const CONTROL_FD = 3;
+
+/** Dispatch order for bridge methods; control methods bypass the queue */
+const BRIDGE_METHOD_PRIORITIES: Record<string, BridgePriority> = {
+  search: 'interactive',
+  route: 'interactive',
+  assemble_context: 'interactive',
+  add_content: 'normal',
+  encode: 'bulk',
+  compact: 'bulk',
+  warm: 'bulk'
+};
+
+/** Result of the bridge's `memory` request */
+export interface BridgeMemoryReport {
+  rss_mb: number | null;
+  rss_before_mb: number | null;
+  retrievers: number;
+  evicted_retrievers: string[];
+  released: Record<string, number>;
+  heap_trimmed: boolean;
+}
+
+export interface BankSearchOptions {
+  mode?: SearchMode | undefined;
+  hybridAlpha?: number | undefined;
+  filters?: SearchFilters | undefined;
+  /** Registry name of the bank, so appends to it only detach its own in-flight searches */
+  bankName?: string | undefined;
+}
+
+export interface ContextAssemblyOptions {
+  maxTokens: number;
+  /** Chunks retrieved per bank */
+  topK: number;
+  neighbors: number;
+  minScore: number;
+  includeMetadata?: boolean | undefined;
+  tokenizer?: string | undefined;
+  /** Search only the top-M routed banks when more are given */
+  routeTopM?: number | undefined;
+}
+
+export interface AssembledContext {
+  context: string;
+  sources: ContextSource[];
+  totalTokens: number;
+  tokenizer: string;
+  banksSearched: string[];
+  /** Banks kept by routing, or null when every bank was searched */
+  routed: string[] | null;
+  candidates: number;
+  assembleTimeMs: number;
 }
 
 interface JsonRpcRequest {
   id: string;
   method: string;
   params: any;
+  deadline?: number; // epoch ms; the bridge drops work that has not started by then
+}
+
+/** Stage progress reported by the bridge while a long request runs */
+export interface BridgeProgressEvent {
+  stage: string;
+  current?: number | undefined;
+  total?: number | undefined;
+  message?: string | undefined;
+}
+
+export interface BridgeRequestOptions {
+  onProgress?: ((event: BridgeProgressEvent) => void) | undefined;
+  signal?: AbortSignal | undefined;
+}
+
+/** A zygote-forked bridge worker, as reported in its ready signal */
+export interface BridgeWorkerInfo {
+  mode: 'zygote';
+  pid: number;
+  zygote_pid: number;
+  generation: number;
+  startup_ms: number | null;
+  memory: {
+    rss_mb?: number;
+    pss_mb?: number;
+    private_mb?: number;
+    shared_mb?: number;
+  };
+  /** Memory the worker added on top of the pages it shares with the zygote */
+  rss_delta_mb: number | null;
+  zygote_rss_mb: number | null;
 }
 
 interface JsonRpcResponse {
   id: string;
+  event?: 'progress' | 'worker_exit';
+  status?: string;
+  worker?: BridgeWorkerInfo;
+  code?: number;
+  stage?: string;
+  current?: number;
+  total?: number;
+  message?: string;
   result?: any;
   error?: {
     message: string;
@@ -38,11 +179,13 @@ interface JsonRpcResponse {
  */
 export class DirectMemvidIntegration {
   private pythonProcess: ChildProcess | null = null;
+  private controlChannel: Duplex | null = null;
   private requestId = 0;
   private pendingRequests = new Map<string, {
     resolve: (value: any) => void;
     reject: (error: Error) => void;
-    timeout: NodeJS.Timeout;
+    timeout: NodeJS.Timeout | null;
+    onProgress?: ((event: BridgeProgressEvent) => void) | undefined;
   }>();
   private isInitialized = false;
   private initializationPromise: Promise<void> | null = null;
@@ -52,6 +195,11 @@ export class DirectMemvidIntegration {
   private memoryBanksDir: string;
   private pythonExecutable: string | undefined;
   private allowedPaths: string[];
+  private bridgeWorkers: number | undefined;
+  private zygote: boolean;
+  private bridgeWorker: BridgeWorkerInfo | null = null;
+  private stderrTail: string[] = [];
+  private scheduler: BridgeRequestScheduler;
 
   constructor(config: MemvidConfig, options?: DirectMemvidIntegrationOptions) {
     this.errorRecovery = new ErrorRecoveryManager();
@@ -59,6 +207,15 @@ export class DirectMemvidIntegration {
     this.memoryBanksDir = options?.memoryBanksDir || './memory-banks';
     this.pythonExecutable = options?.pythonExecutable;
     this.allowedPaths = options?.allowedPaths ?? [];
+    this.bridgeWorkers = options?.bridgeWorkers;
+    this.zygote = options?.zygote ?? false;
+    this.scheduler = new BridgeRequestScheduler(options?.scheduler);
+
+    const metrics = getMetrics();
+    metrics.gauge('bridge_queue_depth', 'Requests waiting in the server-side bridge queue by priority', () =>
+      Object.entries(this.scheduler.getStats().queued).map(([priority, value]) => ({ labels: { priority }, value }))
+    );
+    metrics.gauge('bridge_in_flight', 'Requests sent to the bridge and awaiting a response', () => this.scheduler.getStats().inFlight);
   }
 
   private getServerDir(): string {
@@ -129,6 +286,13 @@ export class DirectMemvidIntegration {
     }
   }
 
+  /**
+   * The running health monitor, so other components can follow its alerts (null when not started)
+   */
+  getHealthMonitor(): SystemHealthMonitor | null {
+    return this.healthMonitor;
+  }
+
   /**
    * Get current health status
    */
@@ -143,6 +307,20 @@ export class DirectMemvidIntegration {
     return this.errorRecovery.getCircuitBreakerStatus();
   }
 
+  /**
+   * Get bridge request queue status
+   */
+  getSchedulerStats() {
+    return this.scheduler.getStats();
+  }
+
+  /**
+   * Current zygote-forked bridge worker (startup time, RSS delta); null outside zygote mode
+   */
+  getBridgeWorkerInfo(): BridgeWorkerInfo | null {
+    return this.bridgeWorker;
+  }
+
   /**
    * Initialize the Python bridge process
    */
@@ -185,13 +363,16 @@ export class DirectMemvidIntegration {
       }
 
       // Spawn Python bridge process
-      logger.info('Spawning Python bridge process...');
-      this.pythonProcess = spawn(pythonPath, [bridgePath], {
-        stdio: ['pipe', 'pipe', 'pipe'],
+      logger.info(`Spawning Python bridge process${this.zygote ? ' (zygote mode)' : ''}...`);
+      const useControlChannel = process.platform !== 'win32';
+      this.pythonProcess = spawn(pythonPath, this.zygote ? [bridgePath, '--zygote'] : [bridgePath], {
+        stdio: useControlChannel ? ['pipe', 'pipe', 'pipe', 'pipe'] : ['pipe', 'pipe', 'pipe'],
         cwd: path.join(serverDir, 'memvid'), // Run from memvid directory
         env: buildPythonBridgeEnv({
           memoryBanksDir: this.memoryBanksDir,
           allowedPaths: this.allowedPaths,
+          ...(this.bridgeWorkers ? { bridgeWorkers: this.bridgeWorkers } : {}),
+          ...(useControlChannel ? { controlFd: CONTROL_FD } : {}),
         })
       });
 
@@ -215,18 +396,26 @@ export class DirectMemvidIntegration {
         }
       });
 
-      // Handle stderr
+      // Handle stderr: the bridge only writes warnings and errors there, as JSON
+      // lines; anything else (library output, tracebacks) is kept for crash reports
+      let stderrBuffer = '';
       this.pythonProcess.stderr.on('data', (data) => {
-        const message = data.toString().trim();
-        if (message) {
-          // Log at info level for better visibility during debugging
-          logger.info('Python bridge stderr:', message);
+        stderrBuffer += data.toString();
+        const lines = stderrBuffer.split('\n');
+        stderrBuffer = lines.pop() || '';
+        for (const line of lines) {
+          if (line.trim()) {
+            this.handleStderrLine(line.trim());
+          }
         }
       });
 
       // Handle process exit
       this.pythonProcess.on('exit', (code, signal) => {
         logger.warn(`Python bridge exited with code ${code}, signal ${signal}`);
+        if (code !== 0 && this.stderrTail.length > 0) {
+          logger.error(`Last Python bridge stderr output:\n${this.stderrTail.join('\n')}`);
+        }
         this.cleanup();
       });
 
@@ -236,7 +425,10 @@ export class DirectMemvidIntegration {
       });
 
       // Wait for ready signal
-      await this.waitForReady();
+      const ready = await this.waitForReady();
+      if (useControlChannel && ready.control) {
+        this.openControlChannel(this.pythonProcess.stdio[CONTROL_FD] as Duplex);
+      }
       
       this.isInitialized = true;
       logger.info('DirectMemvidIntegration initialized successfully');
@@ -248,14 +440,119 @@ export class DirectMemvidIntegration {
     }
   }
 
+  /**
+   * Read control responses; they resolve the same pending requests as stdout responses
+   */
+  private openControlChannel(channel: Duplex): void {
+    let buffer = '';
+    channel.on('data', (data: Buffer) => {
+      buffer += data.toString();
+      const lines = buffer.split('\n');
+      buffer = lines.pop() || '';
+      for (const line of lines) {
+        if (line.trim()) {
+          this.handleResponse(line.trim());
+        }
+      }
+    });
+    channel.on('error', (error) => {
+      logger.warn('Bridge control channel failed; control requests fall back to stdin:', error.message);
+      this.controlChannel = null;
+    });
+    this.controlChannel = channel;
+    logger.info('Bridge control channel open');
+  }
+
+  /**
+   * Route one stderr line from the bridge: structured entries go to the logger
+   * at their own level, other output is logged at debug and kept for crash reports
+   */
+  private handleStderrLine(line: string): void {
+    if (line.startsWith('{')) {
+      try {
+        const entry = JSON.parse(line);
+        if (typeof entry.msg === 'string' && typeof entry.level === 'string') {
+          logger.entry({
+            ts: typeof entry.ts === 'number' ? Math.round(entry.ts * 1000) : Date.now(),
+            level: BRIDGE_LOG_LEVELS[entry.level] ?? 'info',
+            component: typeof entry.component === 'string' ? entry.component : 'bridge',
+            msg: entry.msg
+          });
+          return;
+        }
+      } catch {
+        // Not a structured entry
+      }
+    }
+    this.stderrTail.push(line);
+    if (this.stderrTail.length > STDERR_TAIL_LINES) {
+      this.stderrTail.shift();
+    }
+    logger.debug('Python bridge stderr:', line);
+  }
+
+  /**
+   * Recent entries from the bridge's in-memory log ring buffer (answered on the bridge's control channel)
+   */
+  async getBridgeLogs(limit: number, level: string = 'debug'): Promise<{ mode: string; entries: any[] } | null> {
+    if (!this.isInitialized) {
+      return null;
+    }
+    try {
+      const result = await this.sendRequest('logs', { limit, level }, 5000);
+      return { mode: result.mode, entries: result.entries ?? [] };
+    } catch (error) {
+      logger.warn('Could not fetch bridge logs:', error instanceof Error ? error.message : error);
+      return null;
+    }
+  }
+
+  /**
+   * The bridge's own counters, histograms and pool gauges (answered on the bridge's control channel)
+   */
+  async getBridgeMetrics(): Promise<{ uptime_seconds: number; families: MetricFamily[] } | null> {
+    if (!this.isInitialized) {
+      return null;
+    }
+    try {
+      const result = await this.sendRequest('metrics', {}, 5000);
+      return { uptime_seconds: result.uptime_seconds, families: result.families ?? [] };
+    } catch (error) {
+      logger.warn('Could not fetch bridge metrics:', error instanceof Error ? error.message : error);
+      return null;
+    }
+  }
+
+  /**
+   * The bridge's RSS, optionally after shedding memory: evicting retrievers idle for
+   * `evictIdleSeconds` and releasing decoded buffers (answered on the bridge's control channel)
+   */
+  async bridgeMemory(
+    options: { evictIdleSeconds?: number; releaseBuffers?: boolean } = {}
+  ): Promise<BridgeMemoryReport | null> {
+    if (!this.isInitialized) {
+      return null;
+    }
+    try {
+      const result = await this.sendRequest('memory', {
+        evict_idle_seconds: options.evictIdleSeconds ?? null,
+        release_buffers: options.releaseBuffers ?? false
+      }, 5000);
+      return result.success === false ? null : result;
+    } catch (error) {
+      logger.warn('Could not query bridge memory:', error instanceof Error ? error.message : error);
+      return null;
+    }
+  }
+
   /**
    * Wait for the Python bridge to signal it's ready
    */
-  private async waitForReady(): Promise<void> {
+  private async waitForReady(): Promise<{ control?: boolean }> {
     return new Promise((resolve, reject) => {
       const timeout = setTimeout(() => {
         reject(new Error('Timeout waiting for Python bridge ready signal'));
-      }, 10000); // 10 second timeout
+      }, this.zygote ? ZYGOTE_READY_TIMEOUT_MS : READY_TIMEOUT_MS);
 
       const handleData = (data: Buffer) => {
         const message = data.toString().trim();
@@ -264,7 +561,7 @@ export class DirectMemvidIntegration {
           if (parsed.status === 'ready') {
             clearTimeout(timeout);
             this.pythonProcess?.stdout?.off('data', handleData);
-            resolve();
+            resolve(parsed);
           }
         } catch {
           // Ignore non-JSON messages during startup
@@ -281,10 +578,49 @@ export class DirectMemvidIntegration {
   private handleResponse(line: string): void {
     try {
       const response: JsonRpcResponse = JSON.parse(line);
+
+      // Zygote mode: every (re)forked worker announces itself with a ready signal
+      if (response.status === 'ready') {
+        if (response.worker) {
+          this.bridgeWorker = response.worker;
+          logger.info(
+            `Bridge worker ${response.worker.pid} ready in ${response.worker.startup_ms}ms ` +
+            `(generation ${response.worker.generation}, +${response.worker.rss_delta_mb} MB private)`
+          );
+        }
+        return;
+      }
+
+      // The worker died; the zygote is forking a replacement, but in-flight requests are lost
+      if (response.event === 'worker_exit') {
+        logger.warn(`Python bridge worker exited with code ${response.code}; zygote is restarting it`);
+        for (const pending of this.pendingRequests.values()) {
+          if (pending.timeout) {
+            clearTimeout(pending.timeout);
+          }
+          pending.reject(new Error(`Python bridge worker restarted (exit code ${response.code})`));
+        }
+        this.pendingRequests.clear();
+        return;
+      }
+
       const pending = this.pendingRequests.get(response.id);
+
+      // Progress events precede the final response for the same id
+      if (response.event === 'progress') {
+        pending?.onProgress?.({
+          stage: response.stage ?? 'unknown',
+          current: response.current,
+          total: response.total,
+          message: response.message
+        });
+        return;
+      }
       
       if (pending) {
-        clearTimeout(pending.timeout);
+        if (pending.timeout) {
+          clearTimeout(pending.timeout);
+        }
         this.pendingRequests.delete(response.id);
 
         if (response.error) {
@@ -301,54 +637,124 @@ export class DirectMemvidIntegration {
   }
 
   /**
-   * Send JSON-RPC request to Python bridge
+   * Send JSON-RPC request to Python bridge through the request scheduler.
+   * The timeout covers queueing as well as execution and is sent along as the
+   * request's deadline, so the bridge never starts work nobody is waiting for.
+   * Background jobs pass a `null` timeout and rely on `options.signal` instead.
+   */
+  private async sendRequest(
+    method: string,
+    params: any,
+    timeoutMs: number | null = 30000,
+    options: BridgeRequestOptions = {}
+  ): Promise<any> {
+    const deadline = timeoutMs === null ? null : Date.now() + timeoutMs;
+    const priority = BRIDGE_METHOD_PRIORITIES[method];
+    const stopTimer = bridgeLatency.startTimer({ method });
+    try {
+      const result = !priority
+        ? await this.dispatchRequest(method, params, deadline, options)
+        : await this.scheduler.schedule(
+            method, priority, deadline, () => this.dispatchRequest(method, params, deadline, options), options.signal
+          );
+      bridgeRequests.inc({ method, outcome: result?.success === false ? 'failed' : 'ok' });
+      return result;
+    } catch (error) {
+      bridgeRequests.inc({ method, outcome: bridgeErrorOutcome(error) });
+      throw error;
+    } finally {
+      stopTimer();
+    }
+  }
+
+  /**
+   * Write one request to the bridge and wait for its response until the deadline
    */
-  private async sendRequest(method: string, params: any, timeoutMs: number = 30000): Promise<any> {
+  private async dispatchRequest(
+    method: string,
+    params: any,
+    deadline: number | null,
+    options: BridgeRequestOptions = {}
+  ): Promise<any> {
     await this.initialize();
 
     if (!this.pythonProcess || !this.pythonProcess.stdin) {
       throw new Error('Python bridge not available');
     }
+    if (options.signal?.aborted) {
+      throw new Error(`Request cancelled: ${method}`);
+    }
 
     const id = (++this.requestId).toString();
-    const request: JsonRpcRequest = { id, method, params };
+    const request: JsonRpcRequest = { id, method, params, ...(deadline !== null ? { deadline } : {}) };
 
     return new Promise((resolve, reject) => {
-      const timeout = setTimeout(() => {
+      const timeout = deadline === null ? null : setTimeout(() => {
         this.pendingRequests.delete(id);
         reject(new Error(`Request timeout: ${method}`));
-      }, timeoutMs);
+        // Stop the bridge from finishing work whose result is no longer awaited
+        if (method !== 'cancel' && method !== 'ping') {
+          this.cancelRequest(id);
+        }
+      }, Math.max(0, deadline - Date.now()));
+
+      // Aborting a running request asks the bridge to stop at its next stage;
+      // the bridge still answers, so the pending entry resolves normally
+      const signal = options.signal;
+      if (signal) {
+        const onAbort = () => this.cancelRequest(id);
+        signal.addEventListener('abort', onAbort, { once: true });
+        const settle = <T>(fn: (value: T) => void) => (value: T) => {
+          signal.removeEventListener('abort', onAbort);
+          fn(value);
+        };
+        resolve = settle(resolve);
+        reject = settle(reject);
+      }
 
-      this.pendingRequests.set(id, { resolve, reject, timeout });
+      this.pendingRequests.set(id, { resolve, reject, timeout, onProgress: options.onProgress });
 
       const requestLine = JSON.stringify(request) + '\n';
-      this.pythonProcess!.stdin!.write(requestLine);
+      const channel = CONTROL_METHODS.has(method) && this.controlChannel ? this.controlChannel : this.pythonProcess!.stdin!;
+      channel.write(requestLine);
     });
   }
 
+  /**
+   * Ask the bridge to drop a queued request or abort a running one at its next stage
+   */
+  private cancelRequest(id: string): void {
+    this.sendRequest('cancel', { request_id: id }, 5000)
+      .then(result => logger.info(`Cancelled bridge request ${id} (${result?.state ?? 'unknown'})`))
+      .catch(error => logger.debug(`Cancel for bridge request ${id} failed:`, error instanceof Error ? error.message : error));
+  }
+
   /**
    * Create a memory bank from sources using MemVid encoder
    */
   async createMemoryBank(
     name: string,
     sources: Array<{ type: string; path: string; content?: string; options?: any }>,
-    outputPath: string
-  ): Promise<{ success: boolean; chunksCreated: number; error?: string }> {
+    outputPath: string,
+    options: BridgeRequestOptions = {}
+  ): Promise<{ success: boolean; chunksCreated: number; embedding?: EmbeddingStats | undefined; error?: string }> {
     return await this.errorRecovery.executeWithRecovery(
       async () => {
       logger.info(`Creating memory bank '${name}' from ${sources.length} sources`);
 
+      // No fixed timeout: builds run as jobs and are stopped through options.signal
       const result = await this.sendRequest('encode', {
         sources,
         output_path: outputPath,
         chunk_size: this.memvidConfig.chunk_size,
         overlap: this.memvidConfig.overlap,
         embedding_model: this.memvidConfig.embedding_model
-      }, 180000);
+      }, null, options);
 
       return {
         success: result.success,
         chunksCreated: result.chunks_created || 0,
+        embedding: result.embedding ?? undefined,
         error: result.success ? undefined : result.error
       };
       },
@@ -371,11 +777,33 @@ export class DirectMemvidIntegration {
     bankPath: string,
     query: string,
     topK: number = 5,
-    minScore: number = 0.3
+    minScore: number = 0.3,
+    options: BankSearchOptions = {}
+  ): Promise<SearchResult[]> {
+    // Concurrent identical bank searches share one bridge request
+    const requestKey = JSON.stringify([
+      bankPath.replace(/\.(mp4|json|faiss)$/, ''), query, topK, minScore,
+      options.mode || 'vector', options.hybridAlpha ?? null, options.filters ?? null
+    ]);
+    return getSearchCache().coalesceBankSearch(requestKey, () =>
+      this.executeBankSearch(bankPath, query, topK, minScore, options),
+      options.bankName
+    );
+  }
+
+  /**
+   * Send one search to the bridge (callers go through searchMemoryBank)
+   */
+  private async executeBankSearch(
+    bankPath: string,
+    query: string,
+    topK: number,
+    minScore: number,
+    options: BankSearchOptions
   ): Promise<SearchResult[]> {
     return await this.errorRecovery.executeWithRecovery(
       async () => {
-      logger.info(`Searching memory bank at '${bankPath}' for query: '${query}'`);
+      logger.info(`Searching memory bank at '${bankPath}' for query: '${query}' (mode: ${options.mode || 'vector'})`);
 
       // Derive video_path and index_path from bankPath
       // bankPath could be either the .mp4 file or the base name
@@ -388,7 +816,10 @@ export class DirectMemvidIntegration {
         index_path: indexPath,
         query,
         top_k: topK,
-        min_score: minScore
+        min_score: minScore,
+        mode: options.mode || 'vector',
+        ...(options.hybridAlpha !== undefined ? { hybrid_alpha: options.hybridAlpha } : {}),
+        ...(options.filters ? { filters: options.filters } : {})
       });
 
       if (result.success) {
@@ -399,35 +830,127 @@ export class DirectMemvidIntegration {
       }
       },
       'searchMemoryBank',
-      { bankPath, query, topK, minScore }
+      { bankPath, query, topK, minScore, mode: options.mode }
     ).catch(error => {
       logger.error(`Error searching memory bank:`, error);
       return [];
     });
   }
 
+  /**
+   * Rank candidate banks for a query using their routing codebooks
+   */
+  async routeBanks(
+    query: string,
+    banks: Array<{ name: string; bankPath: string }>
+  ): Promise<{ ranked: BankRouteScore[]; routeTimeMs: number } | null> {
+    try {
+      const result = await this.sendRequest('route', {
+        query,
+        banks: banks.map(bank => ({ name: bank.name, bank_path: bank.bankPath }))
+      });
+
+      if (!result.success) {
+        logger.warn('Bank routing failed, falling back to full fan-out:', result.error);
+        return null;
+      }
+
+      return {
+        ranked: result.ranked || [],
+        routeTimeMs: Math.round((result.route_time || 0) * 1000)
+      };
+
+    } catch (error) {
+      logger.warn('Bank routing unavailable, falling back to full fan-out:', error);
+      return null;
+    }
+  }
+
+  /**
+   * Search banks and pack the best spans (with neighbor chunks) into one
+   * token-budgeted context, all in one bridge request. Null when the bridge
+   * cannot assemble it, so callers can fall back to plain searches.
+   */
+  async assembleContext(
+    query: string,
+    banks: Array<{ name: string; bankPath: string }>,
+    options: ContextAssemblyOptions
+  ): Promise<AssembledContext | null> {
+    try {
+      const result = await this.sendRequest('assemble_context', {
+        query,
+        banks: banks.map(bank => ({ name: bank.name, bank_path: bank.bankPath })),
+        max_tokens: options.maxTokens,
+        top_k: options.topK,
+        neighbors: options.neighbors,
+        min_score: options.minScore,
+        include_metadata: options.includeMetadata ?? false,
+        ...(options.tokenizer ? { tokenizer: options.tokenizer } : {}),
+        ...(options.routeTopM ? { route_top_m: options.routeTopM } : {})
+      });
+
+      if (!result.success) {
+        logger.warn('Context assembly failed:', result.error);
+        return null;
+      }
+
+      return {
+        context: result.context ?? '',
+        sources: (result.sources || []).map((source: any) => ({
+          bank_name: source.bank_name,
+          content_preview: source.content_preview ?? '',
+          score: typeof source.score === 'number' ? source.score : 0,
+          chunk_ids: source.chunk_ids ?? [],
+          tokens: source.tokens ?? 0,
+          truncated: Boolean(source.truncated)
+        })),
+        totalTokens: result.total_tokens ?? 0,
+        tokenizer: result.tokenizer ?? 'unknown',
+        banksSearched: result.banks_searched || [],
+        routed: result.routed ?? null,
+        candidates: result.candidates ?? 0,
+        assembleTimeMs: Math.round((result.assemble_time || 0) * 1000)
+      };
+
+    } catch (error) {
+      logger.warn('Context assembly unavailable:', error);
+      return null;
+    }
+  }
+
   /**
    * Add content to existing memory bank
    */
   async addToMemoryBank(
     bankPath: string,
     content: string,
-    metadata?: ContentMetadata
-  ): Promise<{ success: boolean; chunksAdded: number; error?: string }> {
+    metadata?: ContentMetadata,
+    options: BridgeRequestOptions = {}
+  ): Promise<{
+    success: boolean;
+    chunksAdded: number;
+    totalChunks?: number | undefined;
+    embedding?: EmbeddingStats | undefined;
+    error?: string;
+  }> {
     try {
       logger.info(`Adding content to memory bank at '${bankPath}'`);
 
+      // An append rebuilds the whole bank, so like builds it has no fixed
+      // timeout (a timeout cancels the rebuild); stopped through options.signal
       const result = await this.sendRequest('add_content', {
         bank_path: bankPath,
         content,
         metadata: metadata || {},
         chunk_size: this.memvidConfig.chunk_size,
         overlap: this.memvidConfig.overlap
-      });
+      }, null, options);
 
       return {
         success: result.success,
         chunksAdded: result.chunks_added || 0,
+        totalChunks: typeof result.total_chunks === 'number' ? result.total_chunks : undefined,
+        embedding: result.embedding ?? undefined,
         error: result.success ? undefined : result.error
       };
 
@@ -442,17 +965,130 @@ export class DirectMemvidIntegration {
   }
 
   /**
-   * Get memory bank statistics
+   * Append many documents to one bank in a single write: they are embedded,
+   * indexed and published as one new generation. `items` has one entry per
+   * document, in order.
+   */
+  async addItemsToMemoryBank(
+    bankPath: string,
+    documents: Array<{ content: string; metadata?: ContentMetadata | undefined }>,
+    options: BridgeRequestOptions = {}
+  ): Promise<{
+    success: boolean;
+    chunksAdded: number;
+    totalChunks?: number | undefined;
+    embedding?: EmbeddingStats | undefined;
+    items: Array<{ success: boolean; chunks_added: number; error?: string }>;
+    error?: string;
+  }> {
+    try {
+      logger.info(`Adding ${documents.length} documents to memory bank at '${bankPath}'`);
+
+      // No fixed timeout, as for single appends: a group rebuilds the bank once
+      const result = await this.sendRequest('add_content', {
+        bank_path: bankPath,
+        items: documents.map(document => ({ content: document.content, metadata: document.metadata || {} })),
+        chunk_size: this.memvidConfig.chunk_size,
+        overlap: this.memvidConfig.overlap
+      }, null, options);
+
+      return {
+        success: result.success,
+        chunksAdded: result.chunks_added || 0,
+        totalChunks: typeof result.total_chunks === 'number' ? result.total_chunks : undefined,
+        embedding: result.embedding ?? undefined,
+        items: Array.isArray(result.items) ? result.items : [],
+        error: result.success ? undefined : result.error
+      };
+
+    } catch (error) {
+      logger.error(`Error adding documents to memory bank:`, error);
+      return {
+        success: false,
+        chunksAdded: 0,
+        items: [],
+        error: error instanceof Error ? error.message : 'Unknown error'
+      };
+    }
+  }
+
+  /**
+   * Compact a bank: merge adjacent small appends, drop duplicate chunks and
+   * publish the rebuilt bank as a new generation (searches keep running)
+   */
+  async compactMemoryBank(
+    bankPath: string,
+    options: BridgeRequestOptions = {}
+  ): Promise<{ success: boolean; compaction?: CompactionStats | undefined; error?: string }> {
+    try {
+      logger.info(`Compacting memory bank at '${bankPath}'`);
+
+      // Runs as a job like builds: no fixed timeout, stopped through options.signal
+      const result = await this.sendRequest('compact', {
+        bank_path: bankPath,
+        chunk_size: this.memvidConfig.chunk_size,
+        overlap: this.memvidConfig.overlap
+      }, null, options);
+
+      if (!result.success) {
+        return { success: false, error: result.error };
+      }
+      const { success: _success, ...compaction } = result;
+      return { success: true, compaction: compaction as CompactionStats };
+
+    } catch (error) {
+      logger.error(`Error compacting memory bank:`, error);
+      return {
+        success: false,
+        error: error instanceof Error ? error.message : 'Unknown error'
+      };
+    }
+  }
+
+  /**
+   * Get memory bank statistics (header reads only; the bank is not loaded, so
+   * the request is answered on the bridge's control channel)
    */
-  async getMemoryBankStats(bankPath: string): Promise<{ chunks: number; size: number } | null> {
+  async getMemoryBankStats(bankPath: string): Promise<BankStats | null> {
     try {
       logger.info(`Getting stats for memory bank at '${bankPath}'`);
       
-      const stats = await this.sendRequest('stats', {
+      const { success, error, ...stats } = await this.sendRequest('stats', {
         bank_path: bankPath
-      });
+      }, 10000);
+
+      if (!success) {
+        logger.warn(`No stats for memory bank at '${bankPath}': ${error}`);
+        return null;
+      }
+      return stats as BankStats;
+
+    } catch (error) {
+      logger.error(`Error getting memory bank stats:`, error);
+      return null;
+    }
+  }
 
-      return stats;
+  /**
+   * Statistics for many banks in one bridge request, keyed by bank path.
+   * Banks the bridge could not read map to their error; null if the request failed.
+   * Answered on the bridge's control channel, so a running build does not delay it.
+   */
+  async getMemoryBanksStats(bankPaths: string[]): Promise<Map<string, BankStats | { error: string }> | null> {
+    if (bankPaths.length === 0) {
+      return new Map();
+    }
+    try {
+      const result = await this.sendRequest('stats', { bank_paths: bankPaths }, 10000);
+      const byPath = new Map<string, BankStats | { error: string }>();
+      (result.banks as any[]).forEach((entry, i) => {
+        const { success, ...stats } = entry;
+        const bankPath = bankPaths[i];
+        if (bankPath !== undefined) {
+          byPath.set(bankPath, success ? stats as BankStats : { error: stats.error ?? 'Unknown error' });
+        }
+      });
+      return byPath;
 
     } catch (error) {
       logger.error(`Error getting memory bank stats:`, error);
@@ -460,6 +1096,26 @@ export class DirectMemvidIntegration {
     }
   }
 
+  /**
+   * Load the bridge's heavy libraries and embedding model before the first
+   * request needs them (fast start warms the bridge in the background).
+   * The bridge only honors hashing model names and otherwise warms memvid's
+   * configured model; `model` is the name it was cached under.
+   */
+  async warm(): Promise<{ warm_ms: number; model: string } | null> {
+    try {
+      const result = await this.sendRequest('warm', { model: this.memvidConfig.embedding_model }, 300000);
+      if (!result?.success) {
+        logger.warn('Bridge warm-up failed:', result?.error);
+        return null;
+      }
+      return { warm_ms: result.warm_ms, model: result.model };
+    } catch (error) {
+      logger.warn('Bridge warm-up failed:', error instanceof Error ? error.message : error);
+      return null;
+    }
+  }
+
   /**
    * Ping the Python bridge to check for a live connection
    */
@@ -475,27 +1131,25 @@ export class DirectMemvidIntegration {
   }
 
   /**
-   * Standardize search results
+   * Standardize search results. Scores, threshold and filters are all applied
+   * by the bridge; results arrive best first with real similarity scores.
    */
   private parseSearchResults(results: any[], bankName: string): SearchResult[] {
-    return (results || []).map((r, index) => {
-      // Handle direct string results from MemVid retriever
+    return (results || []).map(r => {
+      // Handle bare string results from older bridges (no score available)
       if (typeof r === 'string') {
         return {
           bank_name: bankName,
-          source: 'MemVid',
           content: r,
-          score: 1.0 - (index * 0.1), // Assign descending scores based on order
+          score: 0,
           metadata: {}
         };
       }
-      
-      // Handle object results (legacy or future format)
+
       return {
         bank_name: bankName,
-        source: r.source || 'Unknown',
-        content: r.content || r,
-        score: r.score || (1.0 - (index * 0.1)),
+        content: r.content ?? '',
+        score: typeof r.score === 'number' ? r.score : 0,
         metadata: r.metadata || {}
       };
     });
@@ -516,10 +1170,14 @@ export class DirectMemvidIntegration {
       }
       this.pythonProcess = null;
     }
+    this.controlChannel?.destroy();
+    this.controlChannel = null;
     
     // Reject all pending requests
     for (const [id, pending] of this.pendingRequests.entries()) {
-      clearTimeout(pending.timeout);
+      if (pending.timeout) {
+        clearTimeout(pending.timeout);
+      }
       pending.reject(new Error('Memvid integration is shutting down'));
     }
     this.pendingRequests.clear();
@@ -531,6 +1189,7 @@ export class DirectMemvidIntegration {
    * Gracefully destroy the integration instance
    */
   async destroy(): Promise<void> {
+    this.scheduler.drain('Memvid integration is shutting down');
     this.cleanup();
   }
 }
@@ -0,0 +1,352 @@
+/**
+ * Metrics registry
+ *
+ * Diagnostics and cache stats are point-in-time snapshots; they cannot show
+ * request rates or how latency is distributed. The registry keeps counters,
+ * gauges and fixed-bucket latency histograms that MemoryTools, the bridge
+ * client, the search cache and the tool dispatcher all record into.
+ * `get_metrics` returns them (with the bridge's own families) as JSON or
+ * Prometheus text, and `TextfileExporter` rewrites a Prometheus textfile on an
+ * interval for node_exporter's textfile collector.
+ */
+
+import { promises as fs } from 'fs';
+import path from 'path';
+import { performance } from 'perf_hooks';
+import { logger } from './logger.js';
+
+export type MetricType = 'counter' | 'gauge' | 'histogram';
+export type MetricLabels = Record<string, string>;
+
+/** Upper bounds in milliseconds, from a cached search to a large build (matches the bridge) */
+export const DEFAULT_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000];
+
+export interface ValueSeries {
+  labels: MetricLabels;
+  value: number;
+}
+
+export interface HistogramSeries {
+  labels: MetricLabels;
+  count: number;
+  sum: number;
+  /** `[upper bound, cumulative count]`; observations above the last bound only appear in `count` */
+  buckets: Array<[number, number]>;
+  p50: number | null;
+  p95: number | null;
+  p99: number | null;
+}
+
+export interface MetricFamily {
+  name: string;
+  type: MetricType;
+  help: string;
+  series: Array<ValueSeries | HistogramSeries>;
+}
+
+function labelKey(labels: MetricLabels): string {
+  return JSON.stringify(Object.keys(labels).sort().map(name => [name, labels[name]]));
+}
+
+/**
+ * Interpolate a quantile from per-bucket counts (the last count is the overflow bucket)
+ */
+export function estimateQuantile(bounds: number[], counts: number[], total: number, q: number): number | null {
+  if (total === 0) {
+    return null;
+  }
+  const rank = q * total;
+  let seen = 0;
+  for (let i = 0; i < counts.length; i++) {
+    const count = counts[i] ?? 0;
+    if (count > 0 && seen + count >= rank) {
+      const upper = bounds[i];
+      if (upper === undefined) {
+        return bounds[bounds.length - 1] ?? null;
+      }
+      const lower = i > 0 ? bounds[i - 1] ?? 0 : 0;
+      return Math.round((lower + (upper - lower) * (rank - seen) / count) * 1000) / 1000;
+    }
+    seen += count;
+  }
+  return bounds[bounds.length - 1] ?? null;
+}
+
+export class Counter {
+  private values = new Map<string, ValueSeries>();
+
+  constructor(readonly name: string, readonly help: string) {}
+
+  inc(labels: MetricLabels = {}, by: number = 1): void {
+    const key = labelKey(labels);
+    const series = this.values.get(key);
+    if (series) {
+      series.value += by;
+    } else {
+      this.values.set(key, { labels: { ...labels }, value: by });
+    }
+  }
+
+  collect(): ValueSeries[] {
+    return [...this.values.values()].map(series => ({ ...series }));
+  }
+}
+
+export class Histogram {
+  private values = new Map<string, { labels: MetricLabels; counts: number[]; count: number; sum: number }>();
+
+  constructor(readonly name: string, readonly help: string, readonly bounds: number[] = DEFAULT_BUCKETS_MS) {}
+
+  observe(labels: MetricLabels, value: number): void {
+    const key = labelKey(labels);
+    let series = this.values.get(key);
+    if (!series) {
+      series = { labels: { ...labels }, counts: new Array(this.bounds.length + 1).fill(0), count: 0, sum: 0 };
+      this.values.set(key, series);
+    }
+    let bucket = this.bounds.findIndex(bound => value <= bound);
+    if (bucket === -1) {
+      bucket = this.bounds.length;
+    }
+    series.counts[bucket] = (series.counts[bucket] ?? 0) + 1;
+    series.count++;
+    series.sum += value;
+  }
+
+  /**
+   * Start timing; call the returned function to record the elapsed milliseconds
+   */
+  startTimer(labels: MetricLabels = {}): (extraLabels?: MetricLabels) => number {
+    const start = performance.now();
+    return (extraLabels = {}) => {
+      const elapsed = performance.now() - start;
+      this.observe({ ...labels, ...extraLabels }, elapsed);
+      return elapsed;
+    };
+  }
+
+  collect(): HistogramSeries[] {
+    return [...this.values.values()].map(series => {
+      let cumulative = 0;
+      const buckets = this.bounds.map((bound, i): [number, number] => {
+        cumulative += series.counts[i] ?? 0;
+        return [bound, cumulative];
+      });
+      return {
+        labels: { ...series.labels },
+        count: series.count,
+        sum: Math.round(series.sum * 1000) / 1000,
+        buckets,
+        p50: estimateQuantile(this.bounds, series.counts, series.count, 0.5),
+        p95: estimateQuantile(this.bounds, series.counts, series.count, 0.95),
+        p99: estimateQuantile(this.bounds, series.counts, series.count, 0.99)
+      };
+    });
+  }
+}
+
+interface GaugeEntry {
+  help: string;
+  collect: () => ValueSeries[];
+}
+
+export class MetricsRegistry {
+  private counters = new Map<string, Counter>();
+  private histograms = new Map<string, Histogram>();
+  private gauges = new Map<string, GaugeEntry>();
+  readonly startedAt = Date.now();
+
+  /**
+   * The counter named `name`, created on first use
+   */
+  counter(name: string, help: string): Counter {
+    let counter = this.counters.get(name);
+    if (!counter) {
+      counter = new Counter(name, help);
+      this.counters.set(name, counter);
+    }
+    return counter;
+  }
+
+  /**
+   * The histogram named `name`, created on first use
+   */
+  histogram(name: string, help: string, bounds?: number[]): Histogram {
+    let histogram = this.histograms.get(name);
+    if (!histogram) {
+      histogram = new Histogram(name, help, bounds);
+      this.histograms.set(name, histogram);
+    }
+    return histogram;
+  }
+
+  /**
+   * A gauge read when metrics are collected. Registering the same name again
+   * replaces the callback (e.g. when the component that owns it is recreated).
+   */
+  gauge(name: string, help: string, collect: () => ValueSeries[] | number): void {
+    this.gauges.set(name, {
+      help,
+      collect: () => {
+        const value = collect();
+        return typeof value === 'number' ? [{ labels: {}, value }] : value;
+      }
+    });
+  }
+
+  snapshot(): MetricFamily[] {
+    const families: MetricFamily[] = [];
+    for (const counter of this.counters.values()) {
+      families.push({ name: counter.name, type: 'counter', help: counter.help, series: counter.collect() });
+    }
+    for (const [name, gauge] of this.gauges) {
+      let series: ValueSeries[];
+      try {
+        series = gauge.collect();
+      } catch (error) {
+        logger.debug(`Gauge ${name} failed:`, error instanceof Error ? error.message : error);
+        continue;
+      }
+      families.push({ name, type: 'gauge', help: gauge.help, series });
+    }
+    for (const histogram of this.histograms.values()) {
+      families.push({ name: histogram.name, type: 'histogram', help: histogram.help, series: histogram.collect() });
+    }
+    return families;
+  }
+
+  uptimeSeconds(): number {
+    return (Date.now() - this.startedAt) / 1000;
+  }
+}
+
+function escapeLabelValue(value: string): string {
+  return value.replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatLabels(labels: MetricLabels, extra: MetricLabels = {}): string {
+  const all = { ...labels, ...extra };
+  const names = Object.keys(all);
+  return names.length === 0 ? '' : `{${names.map(name => `${name}="${escapeLabelValue(all[name] ?? '')}"`).join(',')}}`;
+}
+
+/**
+ * Prometheus text exposition for a list of families, each name prefixed with `prefix`
+ */
+export function renderPrometheus(families: MetricFamily[], prefix: string): string {
+  const lines: string[] = [];
+  for (const family of families) {
+    const name = `${prefix}${family.name}`;
+    lines.push(`# HELP ${name} ${family.help.replace(/\n/g, ' ')}`);
+    lines.push(`# TYPE ${name} ${family.type}`);
+    for (const series of family.series) {
+      if ('buckets' in series) {
+        for (const [bound, count] of series.buckets) {
+          lines.push(`${name}_bucket${formatLabels(series.labels, { le: String(bound) })} ${count}`);
+        }
+        lines.push(`${name}_bucket${formatLabels(series.labels, { le: '+Inf' })} ${series.count}`);
+        lines.push(`${name}_sum${formatLabels(series.labels)} ${series.sum}`);
+        lines.push(`${name}_count${formatLabels(series.labels)} ${series.count}`);
+      } else {
+        lines.push(`${name}${formatLabels(series.labels)} ${series.value}`);
+      }
+    }
+  }
+  return lines.length > 0 ? `${lines.join('\n')}\n` : '';
+}
+
+/**
+ * Rewrites a Prometheus textfile on an interval. Each write goes to a
+ * temporary file that is renamed over the target, so scrapers never read a
+ * partial file.
+ */
+export class TextfileExporter {
+  private timer: NodeJS.Timeout | null = null;
+  private writing = false;
+
+  constructor(
+    private filePath: string,
+    private intervalMs: number,
+    private render: () => Promise<string>
+  ) {}
+
+  start(): void {
+    if (this.timer) {
+      return;
+    }
+    void this.write();
+    this.timer = setInterval(() => void this.write(), this.intervalMs);
+    this.timer.unref();
+    logger.info(`Writing Prometheus metrics to ${this.filePath} every ${Math.round(this.intervalMs / 1000)}s`);
+  }
+
+  stop(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  /**
+   * Write the textfile once; skipped while a previous write is still running
+   */
+  async write(): Promise<boolean> {
+    if (this.writing) {
+      return false;
+    }
+    this.writing = true;
+    const tmpPath = `${this.filePath}.${process.pid}.tmp`;
+    try {
+      const text = await this.render();
+      await fs.mkdir(path.dirname(this.filePath), { recursive: true });
+      await fs.writeFile(tmpPath, text, 'utf-8');
+      await fs.rename(tmpPath, this.filePath);
+      return true;
+    } catch (error) {
+      logger.warn(`Could not write metrics textfile ${this.filePath}:`, error instanceof Error ? error.message : error);
+      await fs.unlink(tmpPath).catch(() => undefined);
+      return false;
+    } finally {
+      this.writing = false;
+    }
+  }
+}
+
+let globalMetrics: MetricsRegistry | null = null;
+
+/**
+ * The process-wide registry every component records into
+ */
+export function getMetrics(): MetricsRegistry {
+  if (!globalMetrics) {
+    globalMetrics = new MetricsRegistry();
+  }
+  return globalMetrics;
+}
+
+const startupMarks = new Map<string, number>();
+
+/**
+ * Record when a startup phase first completes, in milliseconds since the
+ * process was launched (`performance.now()` counts from process start); later
+ * marks of the same phase are ignored. Exported as the `startup_ms` gauge.
+ */
+export function markStartup(phase: string): number {
+  const existing = startupMarks.get(phase);
+  if (existing !== undefined) {
+    return existing;
+  }
+  const elapsed = Math.round(performance.now() * 10) / 10;
+  startupMarks.set(phase, elapsed);
+  getMetrics().gauge('startup_ms', 'Milliseconds from process launch to each startup phase', () =>
+    [...startupMarks].map(([name, value]) => ({ labels: { phase: name }, value }))
+  );
+  return elapsed;
+}
+
+/**
+ * Startup phases reached so far, in milliseconds since launch
+ */
+export function getStartupMarks(): Record<string, number> {
+  return Object.fromEntries(startupMarks);
+}
@@ -23,6 +23,23 @@ const FORWARDED_ENV_KEYS = [
   'OMP_NUM_THREADS',
   'MEMVID_ALLOW_URL_SOURCES',
   'MEMVID_WORKSPACE_ROOT',
+  'MEMVID_ROUTING_CENTROIDS',
+  'MEMVID_BRIDGE_WORKERS',
+  'MEMVID_BRIDGE_QUEUE',
+  'MEMVID_TORCH_THREADS',
+  'MEMVID_TORCH_INTEROP_THREADS',
+  'MEMVID_EMBED_BATCH_SIZE',
+  'MEMVID_EMBED_BATCH_CHARS',
+  'MEMVID_EMBED_MEMORY_MB',
+  'MEMVID_FRAME_WORKERS',
+  'MEMVID_FRAME_CONTAINER',
+  'MEMVID_INDEX_LOAD',
+  'MEMVID_LOG_MODE',
+  'MEMVID_LOG_LEVEL',
+  'MEMVID_LOG_LEVELS',
+  'MEMVID_LOG_SAMPLE',
+  'MEMVID_LOG_FILE',
+  'LOG_LEVEL',
   'LANG',
   'LC_ALL',
   'TZ',
@@ -31,6 +48,9 @@ const FORWARDED_ENV_KEYS = [
 export interface PythonBridgeEnvOptions {
   memoryBanksDir: string;
   allowedPaths: string[];
+  bridgeWorkers?: number;
+  /** Descriptor of the control channel pipe in the bridge process */
+  controlFd?: number;
 }
 
 /**
@@ -51,6 +71,12 @@ export function buildPythonBridgeEnv(options: PythonBridgeEnvOptions): NodeJS.Pr
   if (process.env.MEMVID_WORKSPACE_ROOT) {
     env.MEMVID_WORKSPACE_ROOT = process.env.MEMVID_WORKSPACE_ROOT;
   }
+  if (options.bridgeWorkers) {
+    env.MEMVID_BRIDGE_WORKERS = String(options.bridgeWorkers);
+  }
+  if (options.controlFd !== undefined) {
+    env.MEMVID_CONTROL_FD = String(options.controlFd);
+  }
 
   for (const key of FORWARDED_ENV_KEYS) {
     const value = process.env[key];
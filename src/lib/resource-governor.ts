@@ -0,0 +1,287 @@
+/**
+ * Memory-pressure-driven shedding
+ *
+ * The server and the bridge cache freely: search results, validation results,
+ * a retriever per opened bank and the chunk texts, metadata and mappings
+ * decoded for it. On a host that is running short this is what pushes it into
+ * swap or the OOM killer. The governor samples system memory (and reacts to
+ * the health monitor's alerts) plus the bridge's RSS reported by its inline
+ * `memory` request, and while either is over its limit it sheds one level at
+ * a time:
+ *
+ *   1. trim_search_cache      shrink the search cache, clear validation results
+ *   2. evict_idle_retrievers  drop bridge retrievers idle for `idleRetrieverSeconds`
+ *   3. release_buffers        drop decoded chunk texts, metadata and index mappings
+ *   4. reject_bulk            refuse new bank builds and compactions
+ *
+ * Once usage falls below the limit by `recoveryMarginPercent` it steps back
+ * down the same way, restoring the cache size and accepting bulk work again.
+ * Every level change and every shed is recorded for diagnostics.
+ */
+
+import { EventEmitter } from 'events';
+import { logger } from './logger.js';
+import { getMetrics } from './metrics.js';
+
+export const PRESSURE_LEVELS = [
+  'normal',
+  'trim_search_cache',
+  'evict_idle_retrievers',
+  'release_buffers',
+  'reject_bulk'
+] as const;
+
+export type PressureLevel = typeof PRESSURE_LEVELS[number];
+
+export interface ResourceGovernorOptions {
+  /** System memory use (percent) at which shedding starts */
+  memoryThresholdPercent: number;
+  /** System memory use at which each check escalates without waiting `stepIntervalMs` */
+  criticalPercent: number;
+  /** Bridge RSS at which shedding starts; 0 disables the RSS limit */
+  bridgeRssLimitMb: number;
+  /** How far below the limits usage must fall before stepping back down */
+  recoveryMarginPercent: number;
+  /** Minimum time between level changes */
+  stepIntervalMs: number;
+  /** How often memory is sampled */
+  checkIntervalMs?: number | undefined;
+  /** Bridge retrievers unused this long are evicted at `evict_idle_retrievers` */
+  idleRetrieverSeconds: number;
+  /** Share of its normal size the search cache keeps while trimmed */
+  searchCacheFraction: number;
+}
+
+/** What the bridge reports (and released) for a `memory` request */
+export interface BridgeMemorySample {
+  rss_mb: number | null;
+  evicted_retrievers?: string[];
+  released?: Record<string, number>;
+}
+
+export interface ResourceGovernorHooks {
+  /** Current system memory use in percent */
+  systemMemoryPercent: () => number;
+  /** Sample the bridge, optionally shedding; null when the bridge is not running */
+  bridgeMemory: (options: { evictIdleSeconds?: number; releaseBuffers?: boolean }) => Promise<BridgeMemorySample | null>;
+  /** Shrink server-side caches to `fraction` of their normal size; returns entries dropped */
+  trimCaches: (fraction: number) => number;
+  /** Put server-side caches back to their normal size */
+  restoreCaches: () => void;
+}
+
+export interface GovernorAction {
+  at: string;
+  action: string;
+  level: PressureLevel;
+  memory_percent: number;
+  bridge_rss_mb: number | null;
+  detail?: Record<string, unknown>;
+}
+
+export interface ResourceGovernorStats {
+  level: PressureLevel;
+  accepting_bulk: boolean;
+  memory_percent: number | null;
+  bridge_rss_mb: number | null;
+  memory_threshold_percent: number;
+  critical_percent: number;
+  bridge_rss_limit_mb: number;
+  last_check_at: string | null;
+  actions_total: number;
+  recent_actions: GovernorAction[];
+}
+
+const DEFAULT_CHECK_INTERVAL_MS = 15000;
+const MAX_RECORDED_ACTIONS = 50;
+
+const governorActions = getMetrics().counter('resource_governor_actions_total', 'Memory pressure actions by kind');
+
+export class ResourceGovernor {
+  private level = 0;
+  private lastChange = Number.NEGATIVE_INFINITY;
+  private lastMemoryPercent: number | null = null;
+  private lastRssMb: number | null = null;
+  private lastCheck: number | null = null;
+  private checking: Promise<PressureLevel> | null = null;
+  private actions: GovernorAction[] = [];
+  private actionsTotal = 0;
+  private timer: NodeJS.Timeout | null = null;
+
+  constructor(private options: ResourceGovernorOptions, private hooks: ResourceGovernorHooks) {
+    getMetrics().gauge('resource_pressure_level', 'Memory pressure level (0 normal ... 4 rejecting bulk work)',
+      () => this.level);
+  }
+
+  /**
+   * Follow the health monitor: its memory alerts trigger a check right away
+   */
+  attach(monitor: EventEmitter): void {
+    const onAlert = (alert: { memoryPercent?: number }) => {
+      void this.check(Date.now(), alert.memoryPercent).catch(error =>
+        logger.warn('Memory pressure check failed:', error));
+    };
+    monitor.on('warningAlert', onAlert);
+    monitor.on('criticalAlert', onAlert);
+  }
+
+  /** False while new bank builds and compactions are refused */
+  acceptingBulk(): boolean {
+    return this.level < PRESSURE_LEVELS.indexOf('reject_bulk');
+  }
+
+  getLevel(): PressureLevel {
+    return PRESSURE_LEVELS[this.level] ?? 'normal';
+  }
+
+  /**
+   * Sample memory and move at most one level (checks already running are joined).
+   * `memoryPercent` overrides the system sample, e.g. with the value from an alert.
+   */
+  check(now: number = Date.now(), memoryPercent?: number): Promise<PressureLevel> {
+    if (!this.checking) {
+      this.checking = this.runCheck(now, memoryPercent).finally(() => {
+        this.checking = null;
+      });
+    }
+    return this.checking;
+  }
+
+  private async runCheck(now: number, memoryPercent?: number): Promise<PressureLevel> {
+    const percent = memoryPercent ?? this.hooks.systemMemoryPercent();
+    const sample = await this.hooks.bridgeMemory({});
+    this.lastMemoryPercent = percent;
+    this.lastRssMb = sample?.rss_mb ?? null;
+    this.lastCheck = now;
+
+    const { memoryThresholdPercent, criticalPercent, bridgeRssLimitMb, recoveryMarginPercent } = this.options;
+    const rss = this.lastRssMb;
+    const overRss = bridgeRssLimitMb > 0 && rss !== null && rss >= bridgeRssLimitMb;
+    const pressured = percent >= memoryThresholdPercent || overRss;
+    const recovered = percent < memoryThresholdPercent - recoveryMarginPercent &&
+      !(bridgeRssLimitMb > 0 && rss !== null && rss >= bridgeRssLimitMb * (1 - recoveryMarginPercent / 100));
+    const stepDue = now - this.lastChange >= this.options.stepIntervalMs;
+
+    if (pressured && this.level < PRESSURE_LEVELS.length - 1 && (stepDue || percent >= criticalPercent)) {
+      this.level++;
+      this.lastChange = now;
+      await this.escalate(now);
+    } else if (pressured && this.level >= PRESSURE_LEVELS.indexOf('evict_idle_retrievers')) {
+      // Retrievers go idle (and buffers are reopened) while pressure lasts
+      await this.shedBridge(now, this.level >= PRESSURE_LEVELS.indexOf('release_buffers'), false);
+    } else if (recovered && this.level > 0 && stepDue) {
+      this.level--;
+      this.lastChange = now;
+      this.relax(now);
+    }
+    return this.getLevel();
+  }
+
+  private async escalate(now: number): Promise<void> {
+    const level = this.getLevel();
+    logger.warn(`Memory pressure (system ${this.lastMemoryPercent?.toFixed(1)}%, bridge RSS ` +
+      `${this.lastRssMb ?? 'n/a'} MB): escalating to ${level}`);
+    switch (level) {
+      case 'trim_search_cache':
+        this.record(now, level, { evicted_entries: this.hooks.trimCaches(this.options.searchCacheFraction) });
+        break;
+      case 'evict_idle_retrievers':
+        await this.shedBridge(now, false, true);
+        break;
+      case 'release_buffers':
+        await this.shedBridge(now, true, true);
+        break;
+      case 'reject_bulk':
+        this.record(now, level);
+        break;
+    }
+  }
+
+  private relax(now: number): void {
+    const from = PRESSURE_LEVELS[this.level + 1];
+    const detail: Record<string, unknown> = { from, to: this.getLevel() };
+    if (from === 'trim_search_cache') {
+      this.hooks.restoreCaches();
+      detail.search_cache = 'restored';
+    } else if (from === 'reject_bulk') {
+      detail.bulk = 'accepted';
+    }
+    logger.info(`Memory pressure eased (system ${this.lastMemoryPercent?.toFixed(1)}%): back to ${this.getLevel()}`);
+    this.record(now, 'restore', detail);
+  }
+
+  /**
+   * Ask the bridge to evict idle retrievers (and release buffers); repeated
+   * sheds are only recorded when they freed something
+   */
+  private async shedBridge(now: number, releaseBuffers: boolean, always: boolean): Promise<void> {
+    const report = await this.hooks.bridgeMemory({
+      evictIdleSeconds: this.options.idleRetrieverSeconds,
+      releaseBuffers
+    });
+    const evicted = report?.evicted_retrievers?.length ?? 0;
+    const released = Object.values(report?.released ?? {}).reduce((sum, count) => sum + count, 0);
+    if (report?.rss_mb != null) {
+      this.lastRssMb = report.rss_mb;
+    }
+    if (always || evicted > 0 || released > 0) {
+      this.record(now, releaseBuffers ? 'release_buffers' : 'evict_idle_retrievers', {
+        evicted_retrievers: evicted,
+        ...(releaseBuffers ? { released: report?.released ?? {} } : {}),
+        ...(report ? {} : { bridge: 'not running' })
+      });
+    }
+  }
+
+  private record(now: number, action: string, detail?: Record<string, unknown>): void {
+    const entry: GovernorAction = {
+      at: new Date(now).toISOString(),
+      action,
+      level: this.getLevel(),
+      memory_percent: Math.round((this.lastMemoryPercent ?? 0) * 10) / 10,
+      bridge_rss_mb: this.lastRssMb
+    };
+    if (detail) {
+      entry.detail = detail;
+    }
+    this.actions.push(entry);
+    if (this.actions.length > MAX_RECORDED_ACTIONS) {
+      this.actions.shift();
+    }
+    this.actionsTotal++;
+    governorActions.inc({ action });
+  }
+
+  start(): void {
+    if (this.timer) {
+      return;
+    }
+    this.timer = setInterval(() => {
+      this.check().catch(error => logger.warn('Memory pressure check failed:', error));
+    }, this.options.checkIntervalMs ?? DEFAULT_CHECK_INTERVAL_MS);
+    // Memory checks never keep the process alive on their own
+    this.timer.unref();
+  }
+
+  stop(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  getStats(): ResourceGovernorStats {
+    return {
+      level: this.getLevel(),
+      accepting_bulk: this.acceptingBulk(),
+      memory_percent: this.lastMemoryPercent === null ? null : Math.round(this.lastMemoryPercent * 10) / 10,
+      bridge_rss_mb: this.lastRssMb,
+      memory_threshold_percent: this.options.memoryThresholdPercent,
+      critical_percent: this.options.criticalPercent,
+      bridge_rss_limit_mb: this.options.bridgeRssLimitMb,
+      last_check_at: this.lastCheck === null ? null : new Date(this.lastCheck).toISOString(),
+      actions_total: this.actionsTotal,
+      recent_actions: [...this.actions]
+    };
+  }
+}
@@ -6,8 +6,12 @@
  */
 
 import crypto from 'crypto';
-import { SearchResult, SearchFilters } from '../types/index.js';
+import { SearchResult, SearchFilters, SearchMemoryResponse } from '../types/index.js';
 import { logger } from './logger.js';
+import { SingleFlight, SingleFlightStats } from './single-flight.js';
+import { getMetrics } from './metrics.js';
+
+const cacheLookups = getMetrics().counter('search_cache_lookups_total', 'Search cache lookups by result (hit, miss, expired)');
 
 interface CacheEntry {
   results: SearchResult[];
@@ -26,6 +30,9 @@ interface CacheKey {
   sort_order?: string;
   top_k?: number;
   min_score?: number;
+  route?: boolean;
+  mode?: string;
+  hybrid_alpha?: number;
 }
 
 export class SearchCache {
@@ -34,6 +41,13 @@ export class SearchCache {
   private ttlMs: number;
   private hitCount = 0;
   private missCount = 0;
+  private searchFlights = new SingleFlight<SearchMemoryResponse>();
+  private bankSearchFlights = new SingleFlight<SearchResult[]>();
+  // Invalidation epochs: a counter bumped by every invalidation, and the epoch each bank
+  // (or the whole cache) was last invalidated at
+  private epoch = 0;
+  private clearedAt = 0;
+  private bankInvalidatedAt = new Map<string, number>();
 
   constructor(
     maxCacheSize: number = 100,
@@ -41,6 +55,13 @@ export class SearchCache {
   ) {
     this.maxCacheSize = maxCacheSize;
     this.ttlMs = ttlMinutes * 60 * 1000;
+
+    const metrics = getMetrics();
+    metrics.gauge('search_cache_entries', 'Cached search results', () => this.cache.size);
+    metrics.gauge('search_cache_hit_ratio', 'Search cache hits / lookups since the cache was last cleared', () => {
+      const lookups = this.hitCount + this.missCount;
+      return lookups > 0 ? this.hitCount / lookups : 0;
+    });
     
     logger.info(`Search cache initialized: maxSize=${maxCacheSize}, ttl=${ttlMinutes}min`);
   }
@@ -57,7 +78,10 @@ export class SearchCache {
       sort_by: cacheKey.sort_by,
       sort_order: cacheKey.sort_order,
       top_k: cacheKey.top_k,
-      min_score: cacheKey.min_score
+      min_score: cacheKey.min_score,
+      route: cacheKey.route,
+      mode: cacheKey.mode,
+      hybrid_alpha: cacheKey.hybrid_alpha
     });
 
     // Hash for consistent, short keys
@@ -73,6 +97,7 @@ export class SearchCache {
 
     if (!entry) {
       this.missCount++;
+      cacheLookups.inc({ result: 'miss' });
       logger.debug(`Cache MISS for query: ${cacheKey.query}`);
       return null;
     }
@@ -82,6 +107,7 @@ export class SearchCache {
     if (now - entry.timestamp > this.ttlMs) {
       this.cache.delete(key);
       this.missCount++;
+      cacheLookups.inc({ result: 'expired' });
       logger.debug(`Cache EXPIRED for query: ${cacheKey.query}`);
       return null;
     }
@@ -89,21 +115,61 @@ export class SearchCache {
     // Cache hit!
     entry.hit_count++;
     this.hitCount++;
+    cacheLookups.inc({ result: 'hit' });
     logger.info(`Cache HIT for query: ${cacheKey.query} (${entry.results.length} results, hit #${entry.hit_count})`);
     
     return entry;
   }
 
+  /**
+   * Share one in-flight search between concurrent identical requests
+   * (same query, bank set and parameters) that all missed the cache
+   */
+  coalesceSearch(cacheKey: CacheKey, search: () => Promise<SearchMemoryResponse>): Promise<SearchMemoryResponse> {
+    // Without an explicit bank list the search covers every bank
+    const banks = cacheKey.memory_banks?.length ? [...cacheKey.memory_banks] : undefined;
+    return this.searchFlights.run(this.generateCacheKey(cacheKey), search, banks);
+  }
+
+  /**
+   * Share one in-flight bridge search per bank between concurrent identical requests
+   */
+  coalesceBankSearch(
+    requestKey: string,
+    search: () => Promise<SearchResult[]>,
+    bankName?: string
+  ): Promise<SearchResult[]> {
+    const key = crypto.createHash('md5').update(requestKey).digest('hex');
+    return this.bankSearchFlights.run(key, search, bankName ? [bankName] : undefined);
+  }
+
+  /**
+   * Current invalidation epoch; take it before a search starts and pass it to cacheResults
+   */
+  invalidationEpoch(): number {
+    return this.epoch;
+  }
+
   /**
    * Store search results in cache
+   *
+   * With `startedAt` (an invalidationEpoch() taken before the search ran), results are
+   * dropped when any searched bank was invalidated meanwhile: they may predate the change.
    */
   async cacheResults(
     cacheKey: CacheKey,
     results: SearchResult[],
     total_results: number,
-    banks_searched: string[]
+    banks_searched: string[],
+    startedAt?: number
   ): Promise<void> {
     const key = this.generateCacheKey(cacheKey);
+
+    if (startedAt !== undefined && (this.clearedAt > startedAt ||
+        banks_searched.some(bank => (this.bankInvalidatedAt.get(bank) ?? 0) > startedAt))) {
+      logger.info(`Not caching results for query: ${cacheKey.query} (a searched bank changed during the search)`);
+      return;
+    }
     
     // Implement LRU eviction if cache is full
     if (this.cache.size >= this.maxCacheSize) {
@@ -165,6 +231,15 @@ export class SearchCache {
       }
     }
 
+    this.epoch++;
+    for (const bank of bankNames) {
+      this.bankInvalidatedAt.set(bank, this.epoch);
+    }
+
+    // Searches already running against the old bank contents must not be joined
+    this.searchFlights.forget(bankNames);
+    this.bankSearchFlights.forget(bankNames);
+
     if (invalidatedCount > 0) {
       logger.info(`Invalidated ${invalidatedCount} cache entries for banks: ${bankNames.join(', ')}`);
     }
@@ -178,11 +253,33 @@ export class SearchCache {
     this.cache.clear();
     this.hitCount = 0;
     this.missCount = 0;
+    this.clearedAt = ++this.epoch;
+    this.bankInvalidatedAt.clear();
+    this.searchFlights.forget();
+    this.bankSearchFlights.forget();
+    this.searchFlights.resetStats();
+    this.bankSearchFlights.resetStats();
     logger.info(`Cleared search cache (${size} entries)`);
   }
 
   /**
-   * Get cache performance statistics
+   * Change the entry limit, evicting least valuable entries down to it; returns how many were evicted
+   */
+  resize(maxSize: number): number {
+    this.maxCacheSize = Math.max(1, Math.floor(maxSize));
+    let evicted = 0;
+    while (this.cache.size > this.maxCacheSize) {
+      this.evictLeastRecentlyUsed();
+      evicted++;
+    }
+    if (evicted > 0) {
+      logger.info(`Search cache resized to ${this.maxCacheSize} entries (evicted ${evicted})`);
+    }
+    return evicted;
+  }
+
+  /**
+   * Get cache performance statistics (totals only; lookups over time are in the metrics registry)
    */
   getStats(): {
     size: number;
@@ -191,23 +288,14 @@ export class SearchCache {
     hitCount: number;
     missCount: number;
     hitRate: number;
-    entries: Array<{
-      query_hash: string;
-      results_count: number;
-      hit_count: number;
-      age_minutes: number;
-    }>;
+    coalescing: {
+      searches: SingleFlightStats;
+      bankSearches: SingleFlightStats;
+    };
   } {
     const totalRequests = this.hitCount + this.missCount;
     const hitRate = totalRequests > 0 ? (this.hitCount / totalRequests) * 100 : 0;
 
-    const entries = Array.from(this.cache.entries()).map(([key, entry]) => ({
-      query_hash: key.substring(0, 8) + '...',
-      results_count: entry.results.length,
-      hit_count: entry.hit_count,
-      age_minutes: Math.round((Date.now() - entry.timestamp) / 60000)
-    }));
-
     return {
       size: this.cache.size,
       maxSize: this.maxCacheSize,
@@ -215,7 +303,10 @@ export class SearchCache {
       hitCount: this.hitCount,
       missCount: this.missCount,
       hitRate: Math.round(hitRate * 100) / 100,
-      entries
+      coalescing: {
+        searches: this.searchFlights.getStats(),
+        bankSearches: this.bankSearchFlights.getStats()
+      }
     };
   }
 
@@ -0,0 +1,81 @@
+/**
+ * Single-flight request coalescing
+ *
+ * Concurrent calls with the same key share one in-flight promise instead of
+ * each doing the same work. The entry is dropped as soon as the promise
+ * settles, so later calls start a fresh flight (results are cached elsewhere).
+ * A flight can name the banks it reads, so a change to one bank only detaches
+ * the flights that involve it.
+ */
+
+export interface SingleFlightStats {
+  inFlight: number;
+  leaders: number;
+  coalesced: number;
+}
+
+interface Flight<T> {
+  promise: Promise<T>;
+  /** Banks the flight reads; undefined means any bank */
+  banks: string[] | undefined;
+}
+
+export class SingleFlight<T> {
+  private flights = new Map<string, Flight<T>>();
+  private leaders = 0;
+  private coalesced = 0;
+
+  /**
+   * Run `fn` for `key`, or join the flight already running for it.
+   * `banks` scopes the flight for `forget()`; leave it out when it reads every bank.
+   */
+  run(key: string, fn: () => Promise<T>, banks?: string[]): Promise<T> {
+    const existing = this.flights.get(key);
+    if (existing) {
+      this.coalesced++;
+      return existing.promise;
+    }
+
+    this.leaders++;
+    // Start fn on the next microtask so the flight is registered before it can settle
+    const flight = Promise.resolve()
+      .then(fn)
+      .finally(() => {
+        if (this.flights.get(key)?.promise === flight) {
+          this.flights.delete(key);
+        }
+      });
+    this.flights.set(key, { promise: flight, banks });
+    return flight;
+  }
+
+  /**
+   * Detach in-flight entries so later calls start fresh flights (used when
+   * the underlying data changes mid-flight): all of them, or only those that
+   * involve one of `banks`
+   */
+  forget(banks?: string[]): void {
+    if (!banks) {
+      this.flights.clear();
+      return;
+    }
+    for (const [key, flight] of this.flights) {
+      if (!flight.banks || flight.banks.some(bank => banks.includes(bank))) {
+        this.flights.delete(key);
+      }
+    }
+  }
+
+  getStats(): SingleFlightStats {
+    return {
+      inFlight: this.flights.size,
+      leaders: this.leaders,
+      coalesced: this.coalesced
+    };
+  }
+
+  resetStats(): void {
+    this.leaders = 0;
+    this.coalesced = 0;
+  }
+}
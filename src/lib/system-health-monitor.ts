@@ -422,12 +422,14 @@ export class SystemHealthMonitor extends EventEmitter {
     if (result.status === 'unhealthy') {
       this.emit('criticalAlert', {
         errors: result.errors,
+        memoryPercent: result.metrics.systemResources.memoryUsage.percentage,
         timestamp: result.metrics.timestamp
       });
     } else if (result.status === 'degraded') {
       this.emit('warningAlert', {
         warnings: result.warnings,
         errors: result.errors,
+        memoryPercent: result.metrics.systemResources.memoryUsage.percentage,
         timestamp: result.metrics.timestamp
       });
     }
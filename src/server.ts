@@ -17,16 +17,47 @@ import {
   SearchMemoryArgsSchema,
   ListMemoryBanksArgsSchema,
   AddToMemoryArgsSchema,
+  AddToMemoryBatchArgsSchema,
   GetContextArgsSchema,
+  GetJobStatusArgsSchema,
+  CancelJobArgsSchema,
+  CompactMemoryBankArgsSchema,
+  GetMetricsArgsSchema,
   ServerConfig
 } from './types/index.js';
 import { MemoryTools } from './tools/memory.js';
 import { HealthTools } from './tools/health.js';
 import { MCP_TOOL_DEFINITIONS } from './tools/mcp-tool-definitions.js';
 import { logger } from './lib/logger.js';
+import { getMetrics, markStartup } from './lib/metrics.js';
 import { sanitizeToolArgsForLog } from './lib/log-sanitize.js';
 import { CLI } from './lib/cli.js';
-import { AutoSetup } from './lib/auto-setup.js';
+import { AutoSetup, SetupStatus } from './lib/auto-setup.js';
+
+const toolCalls = getMetrics().counter('tool_calls_total', 'MCP tool calls by tool and status (ok or error)');
+const toolDuration = getMetrics().histogram('tool_duration_ms', 'MCP tool call latency by tool');
+const KNOWN_TOOLS = new Set<string>(MCP_TOOL_DEFINITIONS.map(tool => tool.name));
+
+/**
+ * Count and time every tool call; unknown tool names share one label so clients cannot grow the series
+ */
+function instrumentToolCall<R>(handler: (request: any, extra: any) => Promise<R>): (request: any, extra: any) => Promise<R> {
+  return async (request, extra) => {
+    const name = request.params?.name;
+    const tool = KNOWN_TOOLS.has(name) ? name : 'unknown';
+    const stopTimer = toolDuration.startTimer({ tool });
+    try {
+      const result = await handler(request, extra);
+      toolCalls.inc({ tool, status: 'ok' });
+      return result;
+    } catch (error) {
+      toolCalls.inc({ tool, status: 'error' });
+      throw error;
+    } finally {
+      stopTimer();
+    }
+  };
+}
 
 class MemvidMCPServer {
   private server: Server;
@@ -52,28 +83,31 @@ class MemvidMCPServer {
   }
 
   async initialize(): Promise<void> {
-    // Check system setup first
-    const setupStatus = await AutoSetup.detectSetup();
-    
-    if (!setupStatus.isReady) {
-      // Log setup issues but continue - MCP should still respond
-      logger.warn('Setup issues detected:');
-      for (const issue of setupStatus.issues.filter(i => i.severity === 'error')) {
-        logger.error(`${issue.component}: ${issue.message}`);
-      }
-      logger.info('Server will start but some features may not work. Run --setup for details.');
-    }
-    
     // Load configuration
     await this.loadConfig();
+    const fastStart = this.isFastStart();
+
+    // Check system setup (the last ready result is reused while Python is unchanged);
+    // fast start reports it in the background instead of waiting for it
+    const setupCheck = AutoSetup.detectSetupCached().then(status => this.reportSetupStatus(status));
+    if (fastStart) {
+      logger.info('Fast start: the Python bridge starts in the background');
+      setupCheck.catch(error => logger.warn('Setup check failed:', error instanceof Error ? error.message : error));
+    } else {
+      await setupCheck;
+    }
     
     // Initialize memory tools with enhanced error handling
     try {
       this.memoryTools = new MemoryTools(this.config);
-      await this.memoryTools.initialize();
+      await this.memoryTools.initialize({ deferBridge: fastStart });
       
       // Initialize health tools
-      this.healthTools = new HealthTools((this.memoryTools as any).memvid);
+      this.healthTools = new HealthTools(
+        (this.memoryTools as any).memvid,
+        () => this.memoryTools.getCompactionStats(),
+        () => this.memoryTools.getResourceGovernorStats()
+      );
       
       // NOW setup MCP request handlers - tools are initialized
       this.setupHandlers();
@@ -88,6 +122,30 @@ class MemvidMCPServer {
     }
   }
 
+  private reportSetupStatus(status: SetupStatus & { cached?: boolean }): void {
+    if (status.cached) {
+      logger.debug('Setup check: using the cached result (Python unchanged since the last check)');
+    }
+    if (!status.isReady) {
+      // Log setup issues but continue - MCP should still respond
+      logger.warn('Setup issues detected:');
+      for (const issue of status.issues.filter(i => i.severity === 'error')) {
+        logger.error(`${issue.component}: ${issue.message}`);
+      }
+      logger.info('Server will start but some features may not work. Run --setup for details.');
+    }
+  }
+
+  /**
+   * MEMVID_FAST_START overrides `performance.fast_start`
+   */
+  private isFastStart(): boolean {
+    const fastStartEnv = process.env.MEMVID_FAST_START?.trim().toLowerCase();
+    return fastStartEnv !== undefined && fastStartEnv !== ''
+      ? ['1', 'true', 'yes'].includes(fastStartEnv)
+      : this.config.performance?.fast_start ?? false;
+  }
+
   private async loadConfig(): Promise<void> {
     // Get the server's actual directory (where dist/server.js is located)
     const __filename = fileURLToPath(import.meta.url);
@@ -132,12 +190,48 @@ class MemvidMCPServer {
         search: {
           default_top_k: 5,
           min_score_threshold: 0.3,
-          max_context_tokens: 4000
+          max_context_tokens: 4000,
+          routing: {
+            enabled: true,
+            top_m: 4
+          },
+          context: {
+            neighbors: 1,
+            candidates_per_bank: 8,
+            tokenizer: 'auto'
+          }
         },
         performance: {
           cache_size: 100,
           parallel_processing: true,
-          max_concurrent_searches: 5
+          max_concurrent_searches: 5,
+          bridge: {
+            max_in_flight: 4,
+            max_queued: 64,
+            workers: 2,
+            zygote: false
+          },
+          compaction: {
+            enabled: false,
+            idle_seconds: 300,
+            min_appends: 20
+          },
+          metrics: {
+            interval_seconds: 15
+          },
+          memory_pressure: {
+            enabled: true,
+            memory_threshold_percent: 85,
+            critical_percent: 95,
+            bridge_rss_limit_mb: 0,
+            check_seconds: 15,
+            idle_retriever_seconds: 300
+          },
+          group_commit: {
+            window_ms: 25,
+            max_items: 256
+          },
+          fast_start: false
         }
       };
       
@@ -163,13 +257,15 @@ class MemvidMCPServer {
 
     // List available tools
     this.server.setRequestHandler(ListToolsRequestSchema, async () => {
+      // Launch-to-first-list_tools is the startup time an MCP client actually waits for
+      markStartup('first_list_tools');
       return {
         tools: [...MCP_TOOL_DEFINITIONS],
       };
     });
 
     // Handle tool calls
-    this.server.setRequestHandler(CallToolRequestSchema, async (request: any) => {
+    this.server.setRequestHandler(CallToolRequestSchema, instrumentToolCall(async (request: any, extra: any) => {
       const { name, arguments: args } = request.params;
       const isMcpMode = !process.stdin.isTTY || process.argv.includes('--mcp');
 
@@ -180,6 +276,9 @@ class MemvidMCPServer {
         logger.info(`Tool name: ${name}, args:`, JSON.stringify(args, null, 2));
       }
 
+      // Idle compaction waits for a quiet period between tool calls
+      this.memoryTools?.noteActivity();
+
       try {
         switch (name) {
           case 'create_memory_bank': {
@@ -190,7 +289,24 @@ class MemvidMCPServer {
               );
             }
             const validatedArgs = CreateMemoryBankArgsSchema.parse(args);
-            const result = await this.memoryTools.createMemoryBank(validatedArgs);
+            // Progress tokens are only valid while this call is open, so stage
+            // progress is forwarded for `wait: true`; otherwise clients poll get_job_status
+            const progressToken = request.params._meta?.progressToken;
+            const onProgress = validatedArgs.wait && progressToken !== undefined
+              ? (job: { progress: { overall: number } }, event: { stage: string; current?: number | undefined; total?: number | undefined; message?: string | undefined }) => {
+                  const detail = event.total ? ` ${event.current ?? 0}/${event.total}` : '';
+                  extra.sendNotification({
+                    method: 'notifications/progress',
+                    params: {
+                      progressToken,
+                      progress: Math.round(job.progress.overall * 100),
+                      total: 100,
+                      message: `${event.stage}${detail}${event.message ? `: ${event.message}` : ''}`
+                    }
+                  }).catch((error: unknown) => logger.debug('Failed to send progress notification:', error));
+                }
+              : undefined;
+            const result = await this.memoryTools.createMemoryBank(validatedArgs, { onProgress });
             return {
               content: [
                 {
@@ -258,6 +374,25 @@ class MemvidMCPServer {
             };
           }
 
+          case 'add_to_memory_batch': {
+            if (!this.memoryTools) {
+              throw new McpError(
+                ErrorCode.InternalError,
+                'Memory tools not available'
+              );
+            }
+            const validatedArgs = AddToMemoryBatchArgsSchema.parse(args);
+            const result = await this.memoryTools.addToMemoryBatch(validatedArgs);
+            return {
+              content: [
+                {
+                  type: 'text',
+                  text: JSON.stringify(result, null, 2)
+                }
+              ]
+            };
+          }
+
           case 'get_context': {
             if (!this.memoryTools) {
               throw new McpError(
@@ -277,6 +412,82 @@ class MemvidMCPServer {
             };
           }
 
+          case 'get_job_status': {
+            if (!this.memoryTools) {
+              throw new McpError(
+                ErrorCode.InternalError,
+                'Memory tools not available'
+              );
+            }
+            const validatedArgs = GetJobStatusArgsSchema.parse(args);
+            const result = await this.memoryTools.getJobStatus(validatedArgs);
+            return {
+              content: [
+                {
+                  type: 'text',
+                  text: JSON.stringify(result, null, 2)
+                }
+              ]
+            };
+          }
+
+          case 'cancel_job': {
+            if (!this.memoryTools) {
+              throw new McpError(
+                ErrorCode.InternalError,
+                'Memory tools not available'
+              );
+            }
+            const validatedArgs = CancelJobArgsSchema.parse(args);
+            const result = await this.memoryTools.cancelJob(validatedArgs);
+            return {
+              content: [
+                {
+                  type: 'text',
+                  text: JSON.stringify(result, null, 2)
+                }
+              ]
+            };
+          }
+
+          case 'compact_memory_bank': {
+            if (!this.memoryTools) {
+              throw new McpError(
+                ErrorCode.InternalError,
+                'Memory tools not available'
+              );
+            }
+            const validatedArgs = CompactMemoryBankArgsSchema.parse(args);
+            const result = await this.memoryTools.compactMemoryBank(validatedArgs);
+            return {
+              content: [
+                {
+                  type: 'text',
+                  text: JSON.stringify(result, null, 2)
+                }
+              ]
+            };
+          }
+
+          case 'get_metrics': {
+            if (!this.memoryTools) {
+              throw new McpError(
+                ErrorCode.InternalError,
+                'Memory tools not available'
+              );
+            }
+            const validatedArgs = GetMetricsArgsSchema.parse(args);
+            const result = await this.memoryTools.getMetrics(validatedArgs);
+            return {
+              content: [
+                {
+                  type: 'text',
+                  text: result.format === 'prometheus' ? result.text ?? '' : JSON.stringify(result, null, 2)
+                }
+              ]
+            };
+          }
+
           case 'health_check': {
             if (!this.healthTools) {
               throw new McpError(
@@ -331,14 +542,14 @@ class MemvidMCPServer {
           `Tool execution failed: ${error instanceof Error ? error.message : 'Unknown error'}`
         );
       }
-    });
+    }));
   }
 
   async run(): Promise<void> {
     const transport = new StdioServerTransport();
     logger.info('Connecting MCP server to stdio transport...');
     await this.server.connect(transport);
-    logger.info('MemVid MCP Server connected and running on stdio');
+    logger.info(`MemVid MCP Server connected and running on stdio (${markStartup('connected')}ms after launch)`);
   }
 }
 
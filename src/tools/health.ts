@@ -4,8 +4,13 @@
  */
 
 import { HealthCheckResult, SystemHealthMetrics } from '../types/index.js';
-import { DirectMemvidIntegration } from '../lib/memvid.js';
-import { logger } from '../lib/logger.js';
+import { DirectMemvidIntegration, BridgeWorkerInfo } from '../lib/memvid.js';
+import { SearchCache, getSearchCache } from '../lib/search-cache.js';
+import { BridgeSchedulerStats } from '../lib/bridge-scheduler.js';
+import { IdleCompactionStats } from '../lib/compaction-scheduler.js';
+import { ResourceGovernorStats } from '../lib/resource-governor.js';
+import { logger, LogEntry } from '../lib/logger.js';
+import { getStartupMarks } from '../lib/metrics.js';
 
 export interface HealthCheckArgs {
   detailed?: boolean;
@@ -33,6 +38,8 @@ export interface HealthCheckResponse {
 export interface DiagnosticsArgs {
   includeMetrics?: boolean;
   includeLogs?: boolean;
+  /** Entries per log source to return with includeLogs (default 200) */
+  logLimit?: number;
 }
 
 export interface DiagnosticsResponse {
@@ -50,13 +57,30 @@ export interface DiagnosticsResponse {
     successCount: number;
     lastFailureTime: number;
   };
-  recentLogs?: string[];
+  searchCache?: ReturnType<SearchCache['getStats']>;
+  bridgeQueue?: BridgeSchedulerStats;
+  bridgeWorker?: BridgeWorkerInfo | null;
+  compaction?: IdleCompactionStats | null;
+  /** Memory pressure level and the shedding actions taken */
+  resourceGovernor?: ResourceGovernorStats | null;
+  /** Milliseconds from process launch to each startup phase reached so far */
+  startup?: Record<string, number>;
+  recentLogs?: {
+    server: LogEntry[];
+    bridge: { mode: string; entries: any[] } | null;
+  };
 }
 
+const DEFAULT_LOG_LIMIT = 200;
+
 export class HealthTools {
   private startTime: number;
 
-  constructor(private memvid: DirectMemvidIntegration) {
+  constructor(
+    private memvid: DirectMemvidIntegration,
+    private compactionStats: () => IdleCompactionStats | null = () => null,
+    private governorStats: () => ResourceGovernorStats | null = () => null
+  ) {
     this.startTime = Date.now();
   }
 
@@ -211,11 +235,22 @@ export class HealthTools {
         }
       };
 
-      // Include recent logs if requested
+      if (args.includeMetrics) {
+        diagnostics.searchCache = getSearchCache().getStats();
+        diagnostics.bridgeQueue = this.memvid.getSchedulerStats();
+        diagnostics.bridgeWorker = this.memvid.getBridgeWorkerInfo();
+        diagnostics.compaction = this.compactionStats();
+        diagnostics.resourceGovernor = this.governorStats();
+        diagnostics.startup = getStartupMarks();
+      }
+
+      // Dump the in-memory log ring buffers of the server and the bridge
       if (args.includeLogs) {
-        // This would require implementing a log buffer in the logger
-        // For now, we'll just indicate that logs are available
-        diagnostics.recentLogs = ['Log collection not yet implemented'];
+        const limit = args.logLimit ?? DEFAULT_LOG_LIMIT;
+        diagnostics.recentLogs = {
+          server: logger.recent(limit),
+          bridge: await this.memvid.getBridgeLogs(limit)
+        };
       }
 
       logger.info('System diagnostics gathered successfully');
@@ -17,7 +17,9 @@ WHEN NOT TO USE (prefer Cursor codebase search / read_file instead):
 
 STALENESS: Banks are a snapshot at creation time. Content on disk can drift until you recreate the bank or use add_to_memory. After large source changes, recreate or incrementally update.
 
-URL sources require MEMVID_ALLOW_URL_SOURCES=true (HTTPS only). File/directory paths must be under allowed roots.`,
+URL sources require MEMVID_ALLOW_URL_SOURCES=true (HTTPS only). File/directory paths must be under allowed roots.
+
+Builds run in the background: the call returns a job_id immediately. Poll get_job_status until the job succeeds before searching the new bank, or pass wait: true to block (with progress notifications when the client sends a progressToken).`,
     inputSchema: {
       type: 'object',
       properties: {
@@ -70,6 +72,10 @@ URL sources require MEMVID_ALLOW_URL_SOURCES=true (HTTPS only). File/directory p
           items: { type: 'string' },
           description: 'Optional tags for filtering in search_memory',
         },
+        wait: {
+          type: 'boolean',
+          description: 'Wait for the build to finish instead of returning a job_id right away (default: false)',
+        },
       },
       required: ['name', 'sources'],
     },
@@ -111,7 +117,7 @@ STALENESS: Results reflect the last index build, not live disk. If answers seem
           type: 'number',
           minimum: 0,
           maximum: 1,
-          description: 'Minimum relevance score 0–1 (default: 0.3)',
+          description: 'Minimum similarity score 0–1, applied during retrieval (default: 0.3)',
         },
         filters: {
           type: 'object',
@@ -129,6 +135,8 @@ STALENESS: Results reflect the last index build, not live disk. If answers seem
                 end: { type: 'string', description: 'End date (ISO)' },
               },
             },
+            min_file_size: { type: 'number', description: 'Minimum source file size in bytes' },
+            max_file_size: { type: 'number', description: 'Maximum source file size in bytes' },
             tags: {
               type: 'array',
               items: { type: 'string' },
@@ -153,6 +161,23 @@ STALENESS: Results reflect the last index build, not live disk. If answers seem
           enum: ['asc', 'desc'],
           description: 'Sort order (default: desc)',
         },
+        route: {
+          type: 'boolean',
+          description:
+            'When searching all banks, prune to the most relevant banks first (default: true). Set false for a full fan-out.',
+        },
+        mode: {
+          type: 'string',
+          enum: ['vector', 'keyword', 'hybrid'],
+          description:
+            'vector: semantic embeddings (default). keyword: BM25 exact-term lookup, best for identifiers like Class.method, no embedding model needed. hybrid: fuse both.',
+        },
+        hybrid_alpha: {
+          type: 'number',
+          minimum: 0,
+          maximum: 1,
+          description: 'Weight of the vector score in hybrid mode (default: 0.5)',
+        },
       },
       required: ['query'],
     },
@@ -167,7 +192,7 @@ Use before search_memory to discover bank names and judge staleness — compare
       properties: {
         include_stats: {
           type: 'boolean',
-          description: 'Include chunk counts and file sizes when available',
+          description: 'Include chunk count, vector dimension, index type, bytes on disk and in memory, and retriever cache state (read from index headers; banks are not loaded)',
         },
       },
     },
@@ -196,6 +221,31 @@ Use when sources gained new material but most of the bank is still valid — red
       required: ['memory_bank', 'content'],
     },
   },
+  {
+    name: 'add_to_memory_batch',
+    description: `Append many notes at once, to one or several banks, with a result per item.
+
+Use instead of repeated add_to_memory calls when saving a burst of notes: items for the same bank are written in one commit (one embedding batch, one index update), so 100 small notes cost about as much as one append.`,
+    inputSchema: {
+      type: 'object',
+      properties: {
+        items: {
+          type: 'array',
+          description: 'Notes to append (1-1000)',
+          items: {
+            type: 'object',
+            properties: {
+              memory_bank: { type: 'string', description: 'Existing bank name from list_memory_banks' },
+              content: { type: 'string', description: 'New text to index and append' },
+              metadata: { type: 'object', description: 'Optional source label, date, or tags for this note' },
+            },
+            required: ['memory_bank', 'content'],
+          },
+        },
+      },
+      required: ['items'],
+    },
+  },
   {
     name: 'get_context',
     description: `Return search results formatted as a single context block for the conversation.
@@ -210,15 +260,65 @@ Same staleness rules as search_memory. Prefer read_file for live workspace code;
           items: { type: 'string' },
           description: 'Banks to search (default: all)',
         },
-        max_tokens: { type: 'number', description: 'Cap on formatted context length' },
+        max_tokens: { type: 'number', description: 'Token budget for the context (counted with a real tokenizer)' },
         include_metadata: {
           type: 'boolean',
           description: 'Include source paths and scores in the output',
         },
+        neighbors: {
+          type: 'number',
+          description: 'Adjacent chunks of the same document to add around each hit (0-5, default from config)',
+        },
       },
       required: ['query'],
     },
   },
+  {
+    name: 'get_job_status',
+    description:
+      'Status of a background job started by create_memory_bank: state, current stage (read, chunk, encode_frames, embed, index_write), progress and result. Omit job_id to list recent jobs.',
+    inputSchema: {
+      type: 'object',
+      properties: {
+        job_id: { type: 'string', description: 'Job id returned by create_memory_bank' },
+      },
+    },
+  },
+  {
+    name: 'cancel_job',
+    description: 'Cancel a running bank build. The bridge stops at the next stage boundary and removes partial files.',
+    inputSchema: {
+      type: 'object',
+      properties: {
+        job_id: { type: 'string', description: 'Job id returned by create_memory_bank' },
+      },
+      required: ['job_id'],
+    },
+  },
+  {
+    name: 'compact_memory_bank',
+    description:
+      'Merge a bank\'s small add_to_memory appends and drop duplicate chunks, rebuilding it as a new generation in the background. Searches keep using the current generation until the swap. Returns a job_id; pass wait: true to block.',
+    inputSchema: {
+      type: 'object',
+      properties: {
+        memory_bank: { type: 'string', description: 'Name of the memory bank to compact' },
+        wait: { type: 'boolean', description: 'Block until compaction finishes (default: false)' },
+      },
+      required: ['memory_bank'],
+    },
+  },
+  {
+    name: 'get_metrics',
+    description:
+      'Counters and latency histograms since startup: tool calls and latency per tool, bridge requests, queue depth, per-stage bridge timings, search cache hit ratio and retriever-pool occupancy. JSON by default, or Prometheus text exposition.',
+    inputSchema: {
+      type: 'object',
+      properties: {
+        format: { type: 'string', enum: ['json', 'prometheus'], description: 'Output format (default: json)' },
+      },
+    },
+  },
   {
     name: 'health_check',
     description: 'Check Python bridge, storage, and server readiness. Run if tools fail or after env changes.',
@@ -236,7 +336,8 @@ Same staleness rules as search_memory. Prefer read_file for live workspace code;
       type: 'object',
       properties: {
         includeMetrics: { type: 'boolean', description: 'Include performance metrics' },
-        includeLogs: { type: 'boolean', description: 'Include recent log excerpts' },
+        includeLogs: { type: 'boolean', description: 'Include recent structured log entries from the server and bridge ring buffers' },
+        logLimit: { type: 'number', minimum: 1, maximum: 2000, description: 'Entries per source with includeLogs (default: 200)' },
       },
     },
   },
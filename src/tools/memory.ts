@@ -5,21 +5,37 @@ import {
   SearchMemoryResponse,
   SearchResult,
   SearchFilters,
+  SearchRoutingDecision,
   AddToMemoryArgs,
   AddToMemoryResponse,
+  AddToMemoryBatchArgs,
+  AddToMemoryBatchResponse,
   GetContextArgs,
   GetContextResponse,
   ListMemoryBanksArgs,
   ListMemoryBanksResponse,
+  MemoryBankListEntry,
+  GetJobStatusArgs,
+  CancelJobArgs,
+  CompactMemoryBankArgs,
+  CompactMemoryBankResponse,
+  GetMetricsArgs,
+  GetMetricsResponse,
   MemoryBankNotFoundError,
   InvalidSourceError,
   ServerConfig
 } from '../types/index.js';
-import { DirectMemvidIntegration, DirectMemvidIntegrationOptions } from '../lib/memvid.js';
+import { DirectMemvidIntegration, DirectMemvidIntegrationOptions, BridgeProgressEvent } from '../lib/memvid.js';
+import { JobManager, JobContext, JobStatus } from '../lib/job-manager.js';
+import { IdleCompactionScheduler, IdleCompactionStats } from '../lib/compaction-scheduler.js';
+import { ResourceGovernor, ResourceGovernorStats } from '../lib/resource-governor.js';
+import { GroupCommitter } from '../lib/group-commit.js';
 import { StorageManager } from '../lib/storage.js';
 import { logger } from '../lib/logger.js';
 import { getSearchCache } from '../lib/search-cache.js';
+import { getMetrics, markStartup, renderPrometheus, TextfileExporter } from '../lib/metrics.js';
 import { memoryBankValidator, MemoryBankValidator } from '../lib/memory-bank-validator.js';
+import os from 'os';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import {
@@ -28,11 +44,23 @@ import {
   isUrlSourcesEnabled
 } from '../lib/path-policy.js';
 
+const searchLatency = getMetrics().histogram('search_duration_ms', 'search_memory latency by cache result (hit or miss)');
+const appendGroupSize = getMetrics().histogram(
+  'append_group_items', 'Documents written per group-committed append', [1, 2, 5, 10, 25, 50, 100, 250, 500]
+);
+
+type AppendItem = Pick<AddToMemoryArgs, 'content' | 'metadata'>;
+
 export class MemoryTools {
   private memvid: DirectMemvidIntegration;
   private storage: StorageManager;
   private validator: MemoryBankValidator;
   private allowedRoots: string[];
+  private jobs = new JobManager();
+  private compaction: IdleCompactionScheduler | null = null;
+  private governor: ResourceGovernor | null = null;
+  private appends: GroupCommitter<AppendItem, AddToMemoryResponse>;
+  private metricsExporter: TextfileExporter | null = null;
 
   constructor(private config: ServerConfig) {
     const __filename = fileURLToPath(import.meta.url);
@@ -46,40 +74,176 @@ export class MemoryTools {
     if (process.env.PYTHON_EXECUTABLE) {
       memvidOptions.pythonExecutable = process.env.PYTHON_EXECUTABLE;
     }
+    const bridgeQueue = config.performance?.bridge;
+    if (bridgeQueue) {
+      memvidOptions.scheduler = { maxInFlight: bridgeQueue.max_in_flight, maxQueued: bridgeQueue.max_queued };
+      memvidOptions.bridgeWorkers = bridgeQueue.workers;
+    }
+    const zygoteEnv = process.env.MEMVID_BRIDGE_ZYGOTE?.trim().toLowerCase();
+    memvidOptions.zygote = zygoteEnv !== undefined && zygoteEnv !== ''
+      ? ['1', 'true', 'yes'].includes(zygoteEnv)
+      : bridgeQueue?.zygote ?? false;
     this.memvid = new DirectMemvidIntegration(config.memvid, memvidOptions);
     this.storage = new StorageManager(config);
     // Create validator with correct memory banks directory
     this.validator = new MemoryBankValidator(config.storage.memory_banks_dir as string);
+
+    const compaction = config.performance?.compaction;
+    if (compaction?.enabled) {
+      this.compaction = new IdleCompactionScheduler(
+        { idleMs: compaction.idle_seconds * 1000, minAppends: compaction.min_appends },
+        {
+          isBusy: () => this.memvid.getSchedulerStats().inFlight > 0 || !this.acceptingBulk(),
+          hasActiveJob: bankName => this.jobs.activeJobFor(bankName) !== null,
+          start: async bankName => {
+            const started = await this.compactMemoryBank({ memory_bank: bankName });
+            if (started.job_id) {
+              await this.jobs.wait(started.job_id).catch(() => undefined);
+            }
+          }
+        }
+      );
+    }
+
+    const groupCommit = config.performance?.group_commit;
+    this.appends = new GroupCommitter(
+      { windowMs: groupCommit?.window_ms ?? 25, maxItems: groupCommit?.max_items ?? 256 },
+      (bankName, items) => this.commitAppends(bankName, items)
+    );
+
+    const pressure = config.performance?.memory_pressure;
+    if (pressure?.enabled) {
+      const searchCacheSize = getSearchCache().getStats().maxSize;
+      this.governor = new ResourceGovernor(
+        {
+          memoryThresholdPercent: pressure.memory_threshold_percent,
+          criticalPercent: pressure.critical_percent,
+          bridgeRssLimitMb: pressure.bridge_rss_limit_mb,
+          recoveryMarginPercent: 5,
+          stepIntervalMs: pressure.check_seconds * 2000,
+          checkIntervalMs: pressure.check_seconds * 1000,
+          idleRetrieverSeconds: pressure.idle_retriever_seconds,
+          searchCacheFraction: 0.25
+        },
+        {
+          systemMemoryPercent: () => (1 - os.freemem() / os.totalmem()) * 100,
+          bridgeMemory: options => this.memvid.bridgeMemory(options),
+          trimCaches: fraction => {
+            const validations = this.validator.getValidationStats().cacheSize +
+              memoryBankValidator.getValidationStats().cacheSize;
+            this.validator.clearCache();
+            memoryBankValidator.clearCache();
+            return getSearchCache().resize(searchCacheSize * fraction) + validations;
+          },
+          restoreCaches: () => {
+            getSearchCache().resize(searchCacheSize);
+          }
+        }
+      );
+    }
+
+    const metricsTextfile = process.env.MEMVID_METRICS_TEXTFILE?.trim() || config.performance?.metrics?.textfile;
+    if (metricsTextfile) {
+      const intervalSeconds = config.performance?.metrics?.interval_seconds ?? 15;
+      this.metricsExporter = new TextfileExporter(
+        path.resolve(metricsTextfile),
+        Math.max(1, intervalSeconds) * 1000,
+        async () => (await this.getMetrics({ format: 'prometheus' })).text ?? ''
+      );
+    }
   }
 
   /**
-   * Initialize the memory tools
+   * Initialize the memory tools. With `deferBridge` (fast start) the Python
+   * bridge is spawned and warmed in the background instead of being awaited:
+   * registry-only tools answer at once, and bridge requests wait for the
+   * start in progress (or retry it if it failed).
    */
-  async initialize(): Promise<void> {
+  async initialize(options: { deferBridge?: boolean } = {}): Promise<void> {
     await this.storage.initialize();
-    await this.memvid.initialize(); // Initialize the direct Python bridge
+    if (options.deferBridge) {
+      void this.startBridgeInBackground();
+    } else {
+      await this.memvid.initialize(); // Initialize the direct Python bridge
+      markStartup('bridge_ready');
+    }
     
     // Only start health monitoring in non-MCP mode to avoid polluting stdio 
     const isMcpMode = !process.stdin.isTTY || process.argv.includes('--mcp');
     if (!isMcpMode) {
       this.memvid.startHealthMonitoring();
+      const monitor = this.memvid.getHealthMonitor();
+      if (monitor) {
+        this.governor?.attach(monitor);
+      }
       logger.info('Memory tools initialized with direct MemVid integration and health monitoring');
     } else {
       logger.info('Memory tools initialized with direct MemVid integration (health monitoring disabled for MCP mode)');
     }
+    this.compaction?.start();
+    this.governor?.start();
+    this.metricsExporter?.start();
+  }
+
+  private async startBridgeInBackground(): Promise<void> {
+    try {
+      await this.memvid.initialize();
+      logger.info(`Python bridge ready ${markStartup('bridge_ready')}ms after launch`);
+      const warmed = await this.memvid.warm();
+      if (warmed) {
+        logger.info(`Python bridge warmed (${warmed.model}, ${warmed.warm_ms}ms) ${markStartup('bridge_warm')}ms after launch`);
+      }
+    } catch (error) {
+      logger.warn('Background bridge start failed; the first bridge request will retry it:',
+        error instanceof Error ? error.message : error);
+    }
+  }
+
+  /**
+   * Mark a tool call; idle compaction only starts after a quiet period
+   */
+  noteActivity(): void {
+    this.compaction?.noteActivity();
+  }
+
+  /**
+   * Idle compaction state, or null when it is disabled
+   */
+  getCompactionStats(): IdleCompactionStats | null {
+    return this.compaction?.getStats() ?? null;
+  }
+
+  /**
+   * Memory pressure level and the actions taken, or null when shedding is disabled
+   */
+  getResourceGovernorStats(): ResourceGovernorStats | null {
+    return this.governor?.getStats() ?? null;
+  }
+
+  /**
+   * False while memory pressure has new bank builds and compactions refused
+   */
+  private acceptingBulk(): boolean {
+    return this.governor?.acceptingBulk() ?? true;
   }
 
   /**
    * Shut down the Python bridge and release resources.
    */
   async shutdown(): Promise<void> {
+    this.compaction?.stop();
+    this.governor?.stop();
+    this.metricsExporter?.stop();
     await this.memvid.destroy();
   }
 
   /**
    * Create a new memory bank from sources
    */
-  async createMemoryBank(args: CreateMemoryBankArgs): Promise<CreateMemoryBankResponse> {
+  async createMemoryBank(
+    args: CreateMemoryBankArgs,
+    options: { onProgress?: ((job: JobStatus, event: BridgeProgressEvent) => void) | undefined } = {}
+  ): Promise<CreateMemoryBankResponse> {
     try {
       logger.info(`Creating memory bank '${args.name}'`);
 
@@ -126,39 +290,51 @@ export class MemoryTools {
         };
       }
 
-      // Get output path
-      const outputPath = this.storage.getMemoryBankPath(args.name);
-
-      // Create memory bank using MemVid
-      logger.info(`Starting MemVid creation for '${args.name}' with sources: ${JSON.stringify(args.sources)}`);
-      const result = await this.memvid.createMemoryBank(args.name, args.sources, outputPath);
-      logger.info(`MemVid creation completed for '${args.name}':`, result);
-
-      if (!result.success) {
+      if (!this.acceptingBulk()) {
         return {
           success: false,
-          message: result.error || 'Failed to create memory bank',
+          message: `Memory pressure: new memory banks are not being built right now ` +
+            `(temporary resource constraint, try again shortly)`,
           bank_name: args.name
         };
       }
 
-      // Register in storage manager
-      await this.storage.registerMemoryBank(
-        args.name,
-        args.description || `Memory bank created from ${args.sources.length} sources`,
-        outputPath,
-        args.tags || [],
-        result.chunksCreated
-      );
+      // A build for this name may still be running (the bank is registered only when it finishes)
+      const activeJob = this.jobs.activeJobFor(args.name);
+      if (activeJob) {
+        return {
+          success: false,
+          message: `Memory bank '${args.name}' is already being created (job ${activeJob.job_id})`,
+          bank_name: args.name,
+          job_id: activeJob.job_id,
+          status: activeJob.state
+        };
+      }
 
-      logger.info(`Successfully created memory bank '${args.name}' with ${result.chunksCreated} chunks`);
+      // Build in the background; progress flows from the bridge into the job
+      const job = this.jobs.start('create_memory_bank', args.name, context => this.buildMemoryBank(args, context));
+      if (options.onProgress) {
+        const onProgress = options.onProgress;
+        const forward = (status: JobStatus, event: BridgeProgressEvent) => {
+          if (status.job_id === job.job_id) {
+            onProgress(status, event);
+          }
+        };
+        this.jobs.on('progress', forward);
+        void this.jobs.wait(job.job_id).finally(() => this.jobs.off('progress', forward));
+      }
+
+      if (args.wait) {
+        const result: CreateMemoryBankResponse = await this.jobs.wait(job.job_id);
+        return { bank_name: args.name, ...result, job_id: job.job_id, status: this.jobs.get(job.job_id)?.state ?? 'succeeded' };
+      }
 
       return {
         success: true,
-        message: `Memory bank '${args.name}' created successfully`,
+        message: `Creating memory bank '${args.name}' in the background; poll get_job_status with job_id '${job.job_id}'`,
         bank_name: args.name,
-        file_path: outputPath,
-        chunks_created: result.chunksCreated
+        job_id: job.job_id,
+        status: job.state
       };
 
     } catch (error) {
@@ -180,6 +356,98 @@ export class MemoryTools {
     }
   }
 
+  /**
+   * Run one bank build (the body of a create_memory_bank job) and register the result
+   */
+  private async buildMemoryBank(args: CreateMemoryBankArgs, job: JobContext): Promise<CreateMemoryBankResponse> {
+    const outputPath = this.storage.getMemoryBankPath(args.name);
+
+    // Create memory bank using MemVid
+    logger.info(`Starting MemVid creation for '${args.name}' with sources: ${JSON.stringify(args.sources)}`);
+    const result = await this.memvid.createMemoryBank(args.name, args.sources, outputPath, {
+      onProgress: job.reportProgress,
+      signal: job.signal
+    });
+    logger.info(`MemVid creation completed for '${args.name}':`, result);
+
+    if (!result.success || job.signal.aborted) {
+      return {
+        success: false,
+        message: job.signal.aborted ? 'Memory bank creation cancelled' : result.error || 'Failed to create memory bank',
+        bank_name: args.name
+      };
+    }
+
+    // Register in storage manager
+    await this.storage.registerMemoryBank(
+      args.name,
+      args.description || `Memory bank created from ${args.sources.length} sources`,
+      outputPath,
+      args.tags || [],
+      result.chunksCreated
+    );
+
+    logger.info(`Successfully created memory bank '${args.name}' with ${result.chunksCreated} chunks` +
+      (result.embedding ? ` (embedding: ${result.embedding.chunks_per_sec ?? '?'} chunks/sec)` : ''));
+
+    return {
+      success: true,
+      message: `Memory bank '${args.name}' created successfully`,
+      bank_name: args.name,
+      file_path: outputPath,
+      chunks_created: result.chunksCreated,
+      ...(result.embedding ? { embedding: result.embedding } : {})
+    };
+  }
+
+  /**
+   * Status of one background job, or of recent jobs when no id is given
+   */
+  async getJobStatus(args: GetJobStatusArgs): Promise<{ success: boolean; message?: string; job?: JobStatus; jobs?: JobStatus[] }> {
+    if (!args.job_id) {
+      return { success: true, jobs: this.jobs.list() };
+    }
+    const job = this.jobs.get(args.job_id);
+    if (!job) {
+      return { success: false, message: `Job '${args.job_id}' not found` };
+    }
+    return { success: true, job };
+  }
+
+  /**
+   * Cancel a background job; the bridge stops the build at its next stage boundary
+   */
+  async cancelJob(args: CancelJobArgs): Promise<{ success: boolean; message: string; job?: JobStatus }> {
+    const cancelled = this.jobs.cancel(args.job_id);
+    const job = this.jobs.get(args.job_id);
+    if (!job) {
+      return { success: false, message: `Job '${args.job_id}' not found` };
+    }
+    return {
+      success: cancelled,
+      message: cancelled ? `Cancellation requested for job '${args.job_id}'` : `Job '${args.job_id}' already ${job.state}`,
+      job
+    };
+  }
+
+  /**
+   * Counters and latency histograms from the server and the bridge, as JSON or Prometheus text
+   */
+  async getMetrics(args: GetMetricsArgs): Promise<GetMetricsResponse> {
+    const registry = getMetrics();
+    const server = registry.snapshot();
+    const bridge = await this.memvid.getBridgeMetrics();
+    const base = {
+      generated_at: new Date().toISOString(),
+      uptime_seconds: Math.round(registry.uptimeSeconds() * 1000) / 1000
+    };
+    if (args.format === 'prometheus') {
+      const text = renderPrometheus(server, 'memvid_') + (bridge ? renderPrometheus(bridge.families, 'memvid_bridge_') : '');
+      return { format: 'prometheus', ...base, text };
+    }
+    return { format: 'json', ...base, server, bridge };
+  }
+
   /**
    * Search across memory banks with Phase 2 enhanced filtering and Phase 3c caching
    */
@@ -197,12 +465,16 @@ export class MemoryTools {
         sort_by: args.sort_by,
         sort_order: args.sort_order,
         top_k: args.top_k,
-        min_score: args.min_score
+        min_score: args.min_score,
+        route: args.route,
+        mode: args.mode,
+        hybrid_alpha: args.hybrid_alpha
       } as any;
 
       const cachedResults = await cache.getCachedResults(cacheKey);
       if (cachedResults && cachedResults.results) {
         const searchTime = Date.now() - searchStart;
+        searchLatency.observe({ cache: 'hit' }, searchTime);
         logger.info(`Cache HIT: Search completed in ${searchTime}ms (${cachedResults.results.length} results)`);
         
         return {
@@ -213,74 +485,10 @@ export class MemoryTools {
         };
       }
 
-      let banksToSearch: string[] = [];
-      if (args.memory_banks && args.memory_banks.length > 0) {
-        banksToSearch = args.memory_banks;
-      } else {
-        const allBanks = await this.storage.listMemoryBanks();
-        banksToSearch = allBanks
-          .filter(bank => {
-            if (args.filters?.tags && args.filters.tags.length > 0) {
-              return args.filters.tags.some(tag => bank.tags.includes(tag));
-            }
-            return true;
-          })
-          .map(bank => bank.name);
-      }
-
-      if (banksToSearch.length === 0) {
-        return {
-          results: [],
-          total_results: 0,
-          query: args.query,
-          banks_searched: []
-        };
-      }
-
-      const allResults = [];
-      const actualBanksSearched = [];
-
-      for (const bankName of banksToSearch) {
-        const isReady = await this.validator.isMemoryBankReady(bankName, 'search');
-        if (!isReady) {
-          logger.warn(`🚨 Memory bank '${bankName}' is not ready for search operations, skipping`);
-          continue;
-        }
-
-        const bankMetadata = await this.storage.getMemoryBank(bankName);
-        if (!bankMetadata) {
-          logger.warn(`Memory bank '${bankName}' not found in registry, skipping`);
-          continue;
-        }
-
-        const bankResults = await this.memvid.searchMemoryBank(
-          bankMetadata.file_path,
-          args.query,
-          args.top_k || this.config.search.default_top_k,
-          args.min_score || this.config.search.min_score_threshold
-        );
-
-        const filteredResults = this.applySearchFilters(bankResults, args.filters as SearchFilters);
-        allResults.push(...filteredResults);
-        actualBanksSearched.push(bankName);
-      }
-
-      const sortedResults = this.applySorting(allResults, args.sort_by, args.sort_order);
-
-      const topK = args.top_k || this.config.search.default_top_k;
-      const finalResults = sortedResults.slice(0, topK);
-
-      const searchTime = Date.now() - searchStart;
-      logger.info(`Enhanced search found ${finalResults.length} results across ${actualBanksSearched.length} banks in ${searchTime}ms`);
-
-      await cache.cacheResults(cacheKey, finalResults, finalResults.length, actualBanksSearched);
-
-      return {
-        results: finalResults,
-        total_results: finalResults.length,
-        query: args.query,
-        banks_searched: actualBanksSearched
-      };
+      // Identical searches already in flight share that result instead of re-querying the bridge
+      const response = await cache.coalesceSearch(cacheKey, () => this.executeSearch(args, cacheKey, searchStart));
+      searchLatency.observe({ cache: 'miss' }, Date.now() - searchStart);
+      return response;
 
     } catch (error) {
       const searchTime = Date.now() - searchStart;
@@ -295,44 +503,141 @@ export class MemoryTools {
   }
 
   /**
-   * Apply Phase 2 search filters to results
+   * Run a search that missed the cache and cache its results
    */
-  private applySearchFilters(results: SearchResult[], filters?: SearchFilters): SearchResult[] {
-    if (!filters) return results;
-
-    return results.filter(result => {
-      // Filter by file types
-      if (filters.file_types && filters.file_types.length > 0) {
-        const sourceExt = result.metadata.source?.split('.').pop()?.toLowerCase();
-        if (!sourceExt || !filters.file_types.includes(sourceExt)) {
-          return false;
-        }
+  private async executeSearch(
+    args: SearchMemoryArgs,
+    cacheKey: any,
+    searchStart: number
+  ): Promise<SearchMemoryResponse> {
+    const cache = getSearchCache();
+    // Results are only cached if no searched bank is invalidated while this runs
+    const startedAt = cache.invalidationEpoch();
+
+    let banksToSearch: string[] = [];
+    if (args.memory_banks && args.memory_banks.length > 0) {
+      banksToSearch = args.memory_banks;
+    } else {
+      const allBanks = await this.storage.listMemoryBanks();
+      banksToSearch = allBanks
+        .filter(bank => {
+          if (args.filters?.tags && args.filters.tags.length > 0) {
+            return args.filters.tags.some(tag => bank.tags.includes(tag));
+          }
+          return true;
+        })
+        .map(bank => bank.name);
+    }
+
+    if (banksToSearch.length === 0) {
+      return {
+        results: [],
+        total_results: 0,
+        query: args.query,
+        banks_searched: []
+      };
+    }
+
+    // Prune to the top-M candidate banks when the caller did not pick banks explicitly
+    let routing: SearchRoutingDecision | null = null;
+    const routingConfig = this.config.search.routing;
+    const explicitBanks = Boolean(args.memory_banks && args.memory_banks.length > 0);
+    if (!explicitBanks && args.route !== false && routingConfig?.enabled &&
+        banksToSearch.length > routingConfig.top_m) {
+      routing = await this.routeBanks(args.query, banksToSearch, routingConfig.top_m);
+      if (routing) {
+        banksToSearch = routing.selected;
       }
+    }
 
-      // Filter by date range
-      if (filters.date_range && result.metadata.timestamp) {
-        const resultDate = new Date(result.metadata.timestamp);
-        if (filters.date_range.start && resultDate < new Date(filters.date_range.start)) {
-          return false;
-        }
-        if (filters.date_range.end && resultDate > new Date(filters.date_range.end)) {
-          return false;
-        }
+    const allResults = [];
+    const actualBanksSearched = [];
+
+    for (const bankName of banksToSearch) {
+      const isReady = await this.validator.isMemoryBankReady(bankName, 'search');
+      if (!isReady) {
+        logger.warn(`🚨 Memory bank '${bankName}' is not ready for search operations, skipping`);
+        continue;
       }
 
-      // Filter by content length
-      if (filters.content_length) {
-        const contentLength = result.content.length;
-        if (filters.content_length.min && contentLength < filters.content_length.min) {
-          return false;
-        }
-        if (filters.content_length.max && contentLength > filters.content_length.max) {
-          return false;
-        }
+      const bankMetadata = await this.storage.getMemoryBank(bankName);
+      if (!bankMetadata) {
+        logger.warn(`Memory bank '${bankName}' not found in registry, skipping`);
+        continue;
       }
 
-      return true;
-    });
+      const bankResults = await this.memvid.searchMemoryBank(
+        bankMetadata.file_path,
+        args.query,
+        args.top_k || this.config.search.default_top_k,
+        args.min_score ?? this.config.search.min_score_threshold,
+        { mode: args.mode, hybridAlpha: args.hybrid_alpha, filters: args.filters as SearchFilters, bankName }
+      );
+
+      // Threshold and filters were applied by the bridge during retrieval
+      allResults.push(...bankResults);
+      actualBanksSearched.push(bankName);
+    }
+
+    const sortedResults = this.applySorting(allResults, args.sort_by, args.sort_order);
+
+    const topK = args.top_k || this.config.search.default_top_k;
+    const finalResults = sortedResults.slice(0, topK);
+
+    const searchTime = Date.now() - searchStart;
+    logger.info(`Enhanced search found ${finalResults.length} results across ${actualBanksSearched.length} banks in ${searchTime}ms`);
+
+    await cache.cacheResults(cacheKey, finalResults, finalResults.length, actualBanksSearched, startedAt);
+
+    return {
+      results: finalResults,
+      total_results: finalResults.length,
+      query: args.query,
+      banks_searched: actualBanksSearched,
+      ...(routing ? { routing } : {})
+    };
+  }
+
+  /**
+   * Pick the top-M banks for a query from the bridge's routing codebooks.
+   * Banks without a routing summary are never pruned.
+   */
+  private async routeBanks(
+    query: string,
+    bankNames: string[],
+    topM: number
+  ): Promise<SearchRoutingDecision | null> {
+    const registry = await this.storage.listMemoryBanks();
+    const byName = new Map(registry.map(bank => [bank.name, bank]));
+    const candidates = bankNames
+      .map(name => byName.get(name))
+      .filter((bank): bank is NonNullable<typeof bank> => Boolean(bank))
+      .map(bank => ({ name: bank.name, bankPath: bank.file_path }));
+
+    const route = await this.memvid.routeBanks(query, candidates);
+    if (!route) {
+      return null;
+    }
+
+    const scored = route.ranked.filter(entry => entry.score !== null);
+    const unscored = route.ranked.filter(entry => entry.score === null);
+    const selected = [
+      ...scored.slice(0, topM).map(entry => entry.bank_name),
+      ...unscored.map(entry => entry.bank_name)
+    ];
+    const pruned = scored.slice(topM).map(entry => entry.bank_name);
+
+    logger.info(`Routing selected ${selected.length}/${candidates.length} banks (pruned ${pruned.length}) in ${route.routeTimeMs}ms`);
+
+    return {
+      strategy: 'centroid',
+      top_m: topM,
+      candidates: candidates.length,
+      selected,
+      pruned,
+      scores: route.ranked,
+      route_time_ms: route.routeTimeMs
+    };
   }
 
   /**
@@ -360,13 +665,12 @@ export class MemoryTools {
           bValue = b.metadata.timestamp ? new Date(b.metadata.timestamp).getTime() : 0;
           break;
         case 'content_length':
-          aValue = a.content.length;
-          bValue = b.content.length;
+          aValue = a.metadata.length ?? a.content.length;
+          bValue = b.metadata.length ?? b.content.length;
           break;
         case 'file_size':
-          // This would need additional metadata in the future
-          aValue = a.content.length; // Proxy for now
-          bValue = b.content.length;
+          aValue = a.metadata.file_size ?? a.content.length;
+          bValue = b.metadata.file_size ?? b.content.length;
           break;
         default:
           return 0;
@@ -383,66 +687,293 @@ export class MemoryTools {
     try {
       logger.info(`Adding content to memory bank '${args.memory_bank}'`);
 
-      // Check if memory bank exists
-      const bankMetadata = await this.storage.getMemoryBank(args.memory_bank);
-      if (!bankMetadata) {
-        throw new MemoryBankNotFoundError(args.memory_bank);
-      }
+      // Appends to the same bank arriving within the group commit window share one write
+      return await this.appends.submit(args.memory_bank, { content: args.content, metadata: args.metadata });
 
-      // Add content using MemVid
-      const result = await this.memvid.addToMemoryBank(
-        bankMetadata.file_path,
-        args.content,
-        args.metadata
-      );
-
-      if (!result.success) {
+    } catch (error) {
+      logger.error(`Error adding to memory bank '${args.memory_bank}':`, error);
+      
+      if (error instanceof MemoryBankNotFoundError) {
         return {
           success: false,
-          message: result.error || 'Failed to add content to memory bank',
+          message: error.message,
           chunks_added: 0
         };
       }
 
-      // Update metadata
-      await this.storage.updateMemoryBank(args.memory_bank, {
-        size: bankMetadata.size + result.chunksAdded,
-        last_updated: new Date().toISOString()
-      });
+      return {
+        success: false,
+        message: error instanceof Error ? error.message : 'Unknown error occurred',
+        chunks_added: 0
+      };
+    }
+  }
 
-      logger.info(`Successfully added content to '${args.memory_bank}' (${result.chunksAdded} chunks)`);
+  /**
+   * Add many documents, possibly to several banks. Items for the same bank are
+   * group-committed (one embedding batch, index update and registry write per
+   * group); results are per item, in order.
+   */
+  async addToMemoryBatch(args: AddToMemoryBatchArgs): Promise<AddToMemoryBatchResponse> {
+    const results = await Promise.all(args.items.map(item => this.addToMemory(item)));
+    const added = results.filter(result => result.success).length;
+    const banks = new Set(args.items.map(item => item.memory_bank));
+    return {
+      success: added === results.length,
+      message: `Added ${added} of ${results.length} items to ${banks.size} memory bank(s)`,
+      chunks_added: results.reduce((sum, result) => sum + result.chunks_added, 0),
+      results
+    };
+  }
 
+  /**
+   * Write one group of appends to a bank: a single bridge request publishes them
+   * as one generation, then the registry and search cache are updated once
+   */
+  private async commitAppends(bankName: string, items: AppendItem[]): Promise<AddToMemoryResponse[]> {
+    // Check if memory bank exists
+    const bankMetadata = await this.storage.getMemoryBank(bankName);
+    if (!bankMetadata) {
+      throw new MemoryBankNotFoundError(bankName);
+    }
+
+    // Add content using MemVid
+    appendGroupSize.observe({}, items.length);
+    const result = await this.memvid.addItemsToMemoryBank(bankMetadata.file_path, items);
+
+    if (!result.success) {
+      return items.map(() => ({
+        success: false,
+        message: result.error || 'Failed to add content to memory bank',
+        chunks_added: 0
+      }));
+    }
+
+    // Update metadata; the bridge reports the rebuilt bank's total, so the
+    // registry size cannot drift from the bank's real chunk count
+    await this.storage.updateMemoryBank(bankName, {
+      size: result.totalChunks ?? bankMetadata.size + result.chunksAdded,
+      last_updated: new Date().toISOString()
+    });
+
+    // Cached and in-flight searches over the old contents are stale now
+    await getSearchCache().invalidateBankCache([bankName]);
+    for (let i = 0; i < items.length; i++) {
+      this.compaction?.noteAppend(bankName);
+    }
+
+    logger.info(`Successfully added ${items.length} document(s) to '${bankName}' in one commit (${result.chunksAdded} chunks)`);
+
+    return items.map((_, i) => {
+      const item = result.items[i];
+      if (item && !item.success) {
+        return { success: false, message: item.error || 'Failed to add content to memory bank', chunks_added: 0 };
+      }
       return {
         success: true,
-        message: `Content added to memory bank '${args.memory_bank}'`,
-        chunks_added: result.chunksAdded
+        message: `Content added to memory bank '${bankName}'`,
+        chunks_added: item?.chunks_added ?? (items.length === 1 ? result.chunksAdded : 0),
+        ...(items.length > 1 ? { group_size: items.length } : {}),
+        ...(result.embedding ? { embedding: result.embedding } : {})
       };
+    });
+  }
 
-    } catch (error) {
-      logger.error(`Error adding to memory bank '${args.memory_bank}':`, error);
-      
-      if (error instanceof MemoryBankNotFoundError) {
+  /**
+   * Compact a bank in the background: merge adjacent small appends, drop
+   * duplicate chunks and rebuild its indexes as a new generation. Searches
+   * keep using the current generation until the rebuilt one is published.
+   */
+  async compactMemoryBank(
+    args: CompactMemoryBankArgs,
+    options: { onProgress?: ((job: JobStatus, event: BridgeProgressEvent) => void) | undefined } = {}
+  ): Promise<CompactMemoryBankResponse> {
+    try {
+      const bankMetadata = await this.storage.getMemoryBank(args.memory_bank);
+      if (!bankMetadata) {
+        throw new MemoryBankNotFoundError(args.memory_bank);
+      }
+
+      const activeJob = this.jobs.activeJobFor(args.memory_bank);
+      if (activeJob) {
         return {
           success: false,
-          message: error.message,
-          chunks_added: 0
+          message: `Memory bank '${args.memory_bank}' already has a ${activeJob.kind} job running (job ${activeJob.job_id})`,
+          bank_name: args.memory_bank,
+          job_id: activeJob.job_id,
+          status: activeJob.state
+        };
+      }
+
+      if (!this.acceptingBulk()) {
+        return {
+          success: false,
+          message: `Memory pressure: compactions are not being started right now ` +
+            `(temporary resource constraint, try again shortly)`,
+          bank_name: args.memory_bank
         };
       }
 
+      const job = this.jobs.start('compact_memory_bank', args.memory_bank,
+        context => this.runCompaction(args.memory_bank, bankMetadata.file_path, context));
+      if (options.onProgress) {
+        const onProgress = options.onProgress;
+        const forward = (status: JobStatus, event: BridgeProgressEvent) => {
+          if (status.job_id === job.job_id) {
+            onProgress(status, event);
+          }
+        };
+        this.jobs.on('progress', forward);
+        void this.jobs.wait(job.job_id).finally(() => this.jobs.off('progress', forward));
+      }
+
+      if (args.wait) {
+        const result: CompactMemoryBankResponse = await this.jobs.wait(job.job_id);
+        return { ...result, job_id: job.job_id, status: this.jobs.get(job.job_id)?.state ?? 'succeeded' };
+      }
+
+      return {
+        success: true,
+        message: `Compacting memory bank '${args.memory_bank}' in the background; poll get_job_status with job_id '${job.job_id}'`,
+        bank_name: args.memory_bank,
+        job_id: job.job_id,
+        status: job.state
+      };
+
+    } catch (error) {
+      logger.error(`Error compacting memory bank '${args.memory_bank}':`, error);
       return {
         success: false,
         message: error instanceof Error ? error.message : 'Unknown error occurred',
-        chunks_added: 0
+        bank_name: args.memory_bank
       };
     }
   }
 
   /**
-   * Get context from memory banks for a query
+   * Run one compaction (the body of a compact_memory_bank job) and update the registry
+   */
+  private async runCompaction(bankName: string, bankPath: string, job: JobContext): Promise<CompactMemoryBankResponse> {
+    const result = await this.memvid.compactMemoryBank(bankPath, {
+      onProgress: job.reportProgress,
+      signal: job.signal
+    });
+
+    if (!result.success || !result.compaction || job.signal.aborted) {
+      return {
+        success: false,
+        message: job.signal.aborted ? 'Compaction cancelled' : result.error || 'Failed to compact memory bank',
+        bank_name: bankName
+      };
+    }
+
+    const compaction = result.compaction;
+    this.compaction?.noteCompacted(bankName);
+    if (!compaction.skipped) {
+      await this.storage.updateMemoryBank(bankName, {
+        size: compaction.chunks_after,
+        last_updated: new Date().toISOString()
+      });
+      await getSearchCache().invalidateBankCache([bankName]);
+    }
+
+    logger.info(`Compacted '${bankName}': ${compaction.chunks_before} -> ${compaction.chunks_after} chunks, ` +
+      `${compaction.bytes_reclaimed ?? 0} bytes reclaimed`);
+
+    return {
+      success: true,
+      message: compaction.skipped
+        ? `Memory bank '${bankName}' has nothing to compact`
+        : `Memory bank '${bankName}' compacted: ${compaction.appends_merged} appends merged, ` +
+          `${compaction.duplicates_removed} duplicate chunks removed`,
+      bank_name: bankName,
+      compaction
+    };
+  }
+
+  /**
+   * Get context from memory banks for a query. The bridge searches every bank,
+   * widens hits with neighboring chunks and packs them to the token budget in
+   * one request; plain searches are the fallback when it cannot.
    */
   async getContext(args: GetContextArgs): Promise<GetContextResponse> {
     try {
       logger.info(`Getting context for query: "${args.query}"`);
+      const explicitBanks = Boolean(args.memory_banks && args.memory_banks.length > 0);
+      const bankNames = explicitBanks
+        ? args.memory_banks ?? []
+        : (await this.storage.listMemoryBanks()).map(bank => bank.name);
+
+      const banks: Array<{ name: string; bankPath: string }> = [];
+      for (const bankName of bankNames) {
+        if (!(await this.validator.isMemoryBankReady(bankName, 'search'))) {
+          logger.warn(`Memory bank '${bankName}' is not ready for search operations, skipping`);
+          continue;
+        }
+        const bankMetadata = await this.storage.getMemoryBank(bankName);
+        if (bankMetadata) {
+          banks.push({ name: bankName, bankPath: bankMetadata.file_path });
+        }
+      }
+      if (banks.length === 0) {
+        return {
+          context: 'No relevant context found for the query.',
+          sources: [],
+          total_tokens: 0
+        };
+      }
+
+      const contextConfig = this.config.search.context;
+      const routingConfig = this.config.search.routing;
+      const assembled = await this.memvid.assembleContext(args.query, banks, {
+        maxTokens: args.max_tokens || this.config.search.max_context_tokens,
+        topK: contextConfig?.candidates_per_bank ?? 8,
+        neighbors: args.neighbors ?? contextConfig?.neighbors ?? 1,
+        minScore: this.config.search.min_score_threshold,
+        includeMetadata: args.include_metadata,
+        tokenizer: contextConfig?.tokenizer,
+        routeTopM: !explicitBanks && routingConfig?.enabled ? routingConfig.top_m : undefined
+      });
+      if (!assembled) {
+        logger.warn('Falling back to search-based context packing');
+        return await this.getContextFromSearch(args);
+      }
+
+      logger.info(`Assembled context: ${assembled.totalTokens} tokens (${assembled.tokenizer}) from ` +
+        `${assembled.sources.length} spans across ${assembled.banksSearched.length} banks in ${assembled.assembleTimeMs}ms`);
+      if (assembled.sources.length === 0) {
+        return {
+          context: 'No relevant context found for the query.',
+          sources: [],
+          total_tokens: 0,
+          tokenizer: assembled.tokenizer,
+          banks_searched: assembled.banksSearched
+        };
+      }
+      return {
+        context: assembled.context,
+        sources: assembled.sources,
+        total_tokens: assembled.totalTokens,
+        tokenizer: assembled.tokenizer,
+        banks_searched: assembled.banksSearched
+      };
+
+    } catch (error) {
+      logger.error('Error in getContext method:', error);
+      return {
+        context: 'Error retrieving context.',
+        sources: [],
+        total_tokens: 0
+      };
+    }
+  }
+
+  /**
+   * Search-based context packing (tokens estimated as characters / 4), used
+   * when the bridge cannot assemble the context itself
+   */
+  private async getContextFromSearch(args: GetContextArgs): Promise<GetContextResponse> {
+    try {
       logger.debug(`Context args:`, { 
         query: args.query, 
         memory_banks: args.memory_banks,
@@ -578,16 +1109,23 @@ export class MemoryTools {
       logger.info('Listing memory banks from registry');
 
       // Get all banks directly from the storage registry
-      const banks = await this.storage.listMemoryBanks();
+      const banks: MemoryBankListEntry[] = await this.storage.listMemoryBanks();
 
-      // Optionally include detailed stats from the registry, avoiding live validation
+      // Stats come from one batched bridge request that only reads file headers;
+      // the registry size is the fallback when the bridge cannot answer
       if (args.include_stats) {
+        const stats = await this.memvid.getMemoryBanksStats(banks.map(bank => bank.file_path));
         for (const bank of banks) {
-          // The size in the registry should represent chunks, which is a key stat.
-          // No need for a live check which is expensive.
-          (bank as any).stats = {
-            chunks: bank.size,
-          };
+          const entry = stats?.get(bank.file_path);
+          if (entry && !('error' in entry)) {
+            bank.stats = { ...entry, source: 'bridge' };
+          } else {
+            bank.stats = {
+              chunks: bank.size,
+              source: 'registry',
+              ...(entry && 'error' in entry ? { error: entry.error } : {})
+            };
+          }
         }
       }
 
@@ -1,10 +1,12 @@
 import { z } from 'zod';
 import { MemoryBankNameSchema } from '../lib/bank-name.js';
+import type { MetricFamily } from '../lib/metrics.js';
 
 // Configuration types
 export interface MemvidConfig {
   chunk_size: number;
   overlap: number;
+  /** sentence-transformers model, or `hashing[:<dimension>]` for the offline benchmarking embedder */
   embedding_model: string;
 }
 
@@ -14,16 +16,81 @@ export interface StorageConfig {
   cleanup_temp_files: boolean;
 }
 
+export interface SearchRoutingConfig {
+  enabled: boolean;
+  top_m: number;
+}
+
+export interface ContextAssemblyConfig {
+  /** Adjacent chunks of the same document added on each side of a hit */
+  neighbors: number;
+  /** Chunks retrieved per bank before spans are packed */
+  candidates_per_bank: number;
+  /** `auto` (the embedding model's tokenizer), `model`, `estimate` or `tiktoken[:<encoding>]` */
+  tokenizer: string;
+}
+
 export interface SearchConfig {
   default_top_k: number;
   min_score_threshold: number;
   max_context_tokens: number;
+  routing?: SearchRoutingConfig;
+  context?: ContextAssemblyConfig;
+}
+
+export interface BridgeQueueConfig {
+  max_in_flight: number;
+  max_queued: number;
+  workers: number;
+  /** Preload imports and the model once, then fork bridge workers from it (Linux/macOS) */
+  zygote?: boolean;
+}
+
+export interface CompactionConfig {
+  enabled: boolean;
+  /** Server idle time (no tool calls) before a compaction is started */
+  idle_seconds: number;
+  /** add_to_memory calls a bank must receive before it is compacted */
+  min_appends: number;
+}
+
+export interface MetricsConfig {
+  /** Prometheus textfile rewritten every `interval_seconds`; unset disables it */
+  textfile?: string;
+  interval_seconds: number;
+}
+
+export interface MemoryPressureConfig {
+  enabled: boolean;
+  /** System memory use (percent) at which caches start to be shed */
+  memory_threshold_percent: number;
+  /** System memory use at which shedding escalates on every check */
+  critical_percent: number;
+  /** Bridge process RSS that also counts as pressure; 0 disables it */
+  bridge_rss_limit_mb: number;
+  check_seconds: number;
+  /** Bridge retrievers unused this long are evicted under pressure */
+  idle_retriever_seconds: number;
+}
+
+export interface GroupCommitConfig {
+  /** How long an append waits for others to the same bank before they are written together */
+  window_ms: number;
+  /** Appends per group; a full group is written without waiting for the window */
+  max_items: number;
 }
 
 export interface PerformanceConfig {
   cache_size: number;
   parallel_processing: boolean;
   max_concurrent_searches: number;
+  bridge?: BridgeQueueConfig;
+  compaction?: CompactionConfig;
+  metrics?: MetricsConfig;
+  memory_pressure?: MemoryPressureConfig;
+  group_commit?: GroupCommitConfig;
+  /** Answer the MCP handshake and registry-only tools before the Python bridge is up; it starts in the background */
+  fast_start?: boolean;
 }
 
 export interface ServerConfig {
@@ -61,10 +128,17 @@ export interface ContentMetadata {
   timestamp?: string | undefined;
 }
 
+export interface ChunkMetadata extends ContentMetadata {
+  file_type?: string | undefined;
+  length?: number | undefined;
+  file_size?: number | undefined;
+  chunk_id?: number | undefined;
+}
+
 export interface SearchResult {
   content: string;
   score: number;
-  metadata: ContentMetadata;
+  metadata: ChunkMetadata;
   bank_name: string;
 }
 
@@ -82,6 +156,7 @@ export const CreateMemoryBankArgsSchema = z.object({
     }).optional(),
   })),
   tags: z.array(z.string()).optional(),
+  wait: z.boolean().optional(),
 });
 
 // Enhanced search arguments for Phase 2 - matches Zod schema exactly
@@ -121,6 +196,9 @@ export const SearchMemoryArgsSchema = z.object({
   }).optional(),
   sort_by: z.enum(['relevance', 'date', 'file_size', 'content_length']).optional(),
   sort_order: z.enum(['asc', 'desc']).optional(),
+  route: z.boolean().optional(),
+  mode: z.enum(['vector', 'keyword', 'hybrid']).optional(),
+  hybrid_alpha: z.number().min(0).max(1).optional(),
 });
 
 export const AddToMemoryArgsSchema = z.object({
@@ -134,23 +212,66 @@ export const AddToMemoryArgsSchema = z.object({
   }).optional(),
 });
 
+export const AddToMemoryBatchArgsSchema = z.object({
+  items: z.array(AddToMemoryArgsSchema).min(1).max(1000),
+});
+
 export const GetContextArgsSchema = z.object({
   query: z.string().min(1),
   memory_banks: z.array(MemoryBankNameSchema).optional(),
   max_tokens: z.number().min(100).max(20000).optional(),
   include_metadata: z.boolean().optional(),
+  neighbors: z.number().min(0).max(5).optional(),
 });
 
 export const ListMemoryBanksArgsSchema = z.object({
   include_stats: z.boolean().optional(),
 });
 
+export const GetJobStatusArgsSchema = z.object({
+  job_id: z.string().min(1).optional(),
+});
+
+export const CancelJobArgsSchema = z.object({
+  job_id: z.string().min(1),
+});
+
+export const CompactMemoryBankArgsSchema = z.object({
+  memory_bank: MemoryBankNameSchema,
+  wait: z.boolean().optional(),
+});
+
+export const GetMetricsArgsSchema = z.object({
+  format: z.enum(['json', 'prometheus']).optional(),
+});
+
+export type SearchMode = 'vector' | 'keyword' | 'hybrid';
+
+export type JobState = 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+
+/** Throughput of the bridge's embedding stage for one build */
+export interface EmbeddingStats {
+  chunks: number;
+  seconds: number;
+  chunks_per_sec: number | null;
+  batches: number;
+  batch_size: number;
+  batch_sizes: number[];
+  intra_op_threads: number;
+  inter_op_threads: number;
+}
+
 // Tool argument types
 export type CreateMemoryBankArgs = z.infer<typeof CreateMemoryBankArgsSchema>;
 export type SearchMemoryArgs = z.infer<typeof SearchMemoryArgsSchema>;
 export type AddToMemoryArgs = z.infer<typeof AddToMemoryArgsSchema>;
+export type AddToMemoryBatchArgs = z.infer<typeof AddToMemoryBatchArgsSchema>;
 export type GetContextArgs = z.infer<typeof GetContextArgsSchema>;
 export type ListMemoryBanksArgs = z.infer<typeof ListMemoryBanksArgsSchema>;
+export type GetJobStatusArgs = z.infer<typeof GetJobStatusArgsSchema>;
+export type CancelJobArgs = z.infer<typeof CancelJobArgsSchema>;
+export type CompactMemoryBankArgs = z.infer<typeof CompactMemoryBankArgsSchema>;
+export type GetMetricsArgs = z.infer<typeof GetMetricsArgsSchema>;
 
 // Tool response types
 export interface CreateMemoryBankResponse {
@@ -159,6 +280,25 @@ export interface CreateMemoryBankResponse {
   bank_name: string;
   file_path?: string;
   chunks_created?: number;
+  job_id?: string;
+  status?: JobState;
+  embedding?: EmbeddingStats;
+}
+
+export interface BankRouteScore {
+  bank_name: string;
+  score: number | null;
+  has_summary: boolean;
+}
+
+export interface SearchRoutingDecision {
+  strategy: 'centroid';
+  top_m: number;
+  candidates: number;
+  selected: string[];
+  pruned: string[];
+  scores: BankRouteScore[];
+  route_time_ms: number;
 }
 
 export interface SearchMemoryResponse {
@@ -166,26 +306,113 @@ export interface SearchMemoryResponse {
   total_results: number;
   query: string;
   banks_searched: string[];
+  routing?: SearchRoutingDecision;
 }
 
 export interface AddToMemoryResponse {
   success: boolean;
   message: string;
   chunks_added: number;
+  /** Documents written together with this one in a group commit */
+  group_size?: number;
+  embedding?: EmbeddingStats;
+}
+
+export interface AddToMemoryBatchResponse {
+  success: boolean;
+  message: string;
+  chunks_added: number;
+  /** One result per item, in request order */
+  results: AddToMemoryResponse[];
+}
+
+/** What one compaction merged, dropped and reclaimed */
+export interface CompactionStats {
+  skipped: boolean;
+  chunks_before: number;
+  chunks_after: number;
+  appends_merged: number;
+  duplicates_removed: number;
+  bytes_before: number;
+  bytes_after: number;
+  bytes_reclaimed?: number;
+  /** Mean vector-search time per query on the old and new generation */
+  search_ms_before?: number | null;
+  search_ms_after?: number | null;
+  seconds: number;
+  embedding?: EmbeddingStats;
+}
+
+export interface CompactMemoryBankResponse {
+  success: boolean;
+  message: string;
+  bank_name: string;
+  job_id?: string;
+  status?: JobState;
+  compaction?: CompactionStats;
+}
+
+export interface GetMetricsResponse {
+  format: 'json' | 'prometheus';
+  generated_at: string;
+  uptime_seconds: number;
+  /** Metric families recorded by the server (JSON format) */
+  server?: MetricFamily[];
+  /** The bridge's families; null when the bridge is not running or did not answer (JSON format) */
+  bridge?: { uptime_seconds: number; families: MetricFamily[] } | null;
+  /** Prometheus text exposition of both (prometheus format) */
+  text?: string;
+}
+
+export interface ContextSource {
+  bank_name: string;
+  content_preview: string;
+  score: number;
+  /** Chunk ids of the packed span (hits plus neighbors) */
+  chunk_ids?: number[];
+  tokens?: number;
+  /** The span was cut to fit the token budget */
+  truncated?: boolean;
 }
 
 export interface GetContextResponse {
   context: string;
-  sources: Array<{
-    bank_name: string;
-    content_preview: string;
-    score: number;
-  }>;
+  sources: ContextSource[];
   total_tokens: number;
+  /** Tokenizer the budget was counted with; absent when the search-based fallback estimated it */
+  tokenizer?: string;
+  banks_searched?: string[];
 }
 
+/** Bank statistics read by the bridge from file headers (the bank is never loaded for them) */
+export interface BankStats {
+  bank_path: string;
+  generation: number | null;
+  chunks: number | null;
+  dimension: number | null;
+  index_type: string | null;
+  metric: string | null;
+  embedding_model: string | null;
+  bytes_on_disk: number;
+  /** Bytes per file suffix (`.mp4`, `.faiss`, `.chunks`, ...) */
+  files: Record<string, number>;
+  /** Estimated memory of the open bank: private, and shared through mapped files */
+  memory: { private_bytes: number; mapped_bytes: number };
+  retriever: {
+    cached: boolean;
+    load_mode: 'mmap' | 'memory' | null;
+    open_ms: number | null;
+    /** Searches currently pinned to this bank */
+    in_use: number;
+  };
+}
+
+export type MemoryBankListEntry = MemoryBankMetadata & {
+  stats?: (Partial<BankStats> & { chunks: number | null; source: 'bridge' | 'registry'; error?: string }) | undefined;
+};
+
 export interface ListMemoryBanksResponse {
-  banks: MemoryBankMetadata[];
+  banks: MemoryBankListEntry[];
   total_count: number;
 }
 
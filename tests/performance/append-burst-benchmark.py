@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark a burst of small appends: one at a time versus one group commit.
+
+A bank of --chunks synthetic chunks is built with the offline hashing embedder,
+then the same --notes short notes are appended twice through the bridge:
+  single     - one add_content request (one note), for reference
+  sequential - one add_content request per note (what add_to_memory paid before)
+  grouped    - one add_content request carrying every note as ``items``
+                 (what the server's group commit sends for a burst)
+Each append rebuilds the bank as a new generation, so the grouped burst should
+cost about as much as the single append.
+
+Usage: python tests/performance/append-burst-benchmark.py [--chunks 2000] [--notes 100]
+Needs the bridge's Python dependencies (see python/requirements.txt).
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_spec = importlib.util.spec_from_file_location('scale_benchmark', Path(__file__).with_name('scale-benchmark.py'))
+scale_benchmark = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(scale_benchmark)
+Bridge, build = scale_benchmark.Bridge, scale_benchmark.build
+
+
+def note(index: int) -> dict:
+    return {'content': f'Note {index}: the deploy script now retries uploads {index % 7 + 1} times before failing.',
+            'metadata': {'source': 'benchmark', 'tags': ['note']}}
+
+
+def append(bridge: Bridge, base: str, params: dict) -> float:
+    started = time.perf_counter()
+    bridge.call('add_content', {'bank_path': f'{base}.mp4', **params})
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chunks', type=int, default=2000, help='chunks in the bank before the appends')
+    parser.add_argument('--notes', type=int, default=100)
+    parser.add_argument('--chunk-size', type=int, default=480)
+    parser.add_argument('--model', default='hashing:384', help='embedding model (hashing[:<dimension>] runs offline)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        import memvid  # noqa: F401
+    except ImportError:
+        print('memvid is not installed; nothing to benchmark', file=sys.stderr)
+        return 1
+
+    notes = [note(i) for i in range(args.notes)]
+    report = {'model': args.model, 'bank_chunks': args.chunks, 'notes': args.notes}
+    with tempfile.TemporaryDirectory() as workdir:
+        bridge = Bridge(workdir)
+        try:
+            for mode in ('sequential', 'grouped'):
+                base = os.path.join(workdir, mode)
+                build(bridge, base, args.chunks, args)
+                if mode == 'sequential':
+                    single = append(bridge, base, notes[0])
+                    report['single_seconds'] = round(single, 3)
+                    seconds = single + sum(append(bridge, base, item) for item in notes[1:])
+                else:
+                    seconds = append(bridge, base, {'items': notes})
+                report[f'{mode}_seconds'] = round(seconds, 3)
+        finally:
+            bridge.close()
+
+    report['grouped_vs_single'] = round(report['grouped_seconds'] / report['single_seconds'], 2)
+    report['speedup'] = round(report['sequential_seconds'] / report['grouped_seconds'], 1)
+    print(f"{args.notes} notes: sequential {report['sequential_seconds']:.2f}s  grouped {report['grouped_seconds']:.2f}s  "
+          f"single {report['single_seconds']:.2f}s  ({report['speedup']}x)", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark QR frame generation and frame access.
+
+Compares, on the same synthetic chunks:
+  serial     - one process renders and writes frames one at a time (memvid's build_video loop)
+  pool       - bridge_frames.render_frames on a process pool, streamed in order to the writer
+  pool+frames- the pool path also writing the lossless .frames container
+and random access to single frames: seek + decode in the .mp4 vs an O(1) container read.
+
+Usage: python tests/performance/frame-render-benchmark.py [--chunks 2000] [--workers N] [--samples 200]
+Needs memvid, opencv-python and numpy (see python/requirements.txt).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+import bridge_frames  # noqa: E402
+from bridge_frames import FrameContainer, frame_workers, frames_path, write_video  # noqa: E402
+
+WORDS = ('memory bank frame index chunk vector search query context retrieval '
+         'encoder decoder stream window worker process render codec').split()
+
+
+def synthetic_chunks(count: int, size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    chunks = []
+    while len(chunks) < count:
+        text = ' '.join(rng.choice(WORDS) for _ in range(size // 6))
+        chunks.append(f"[{len(chunks)}] {text}"[:size])
+    return chunks
+
+
+def run_build(label: str, chunks: list, workdir: str, workers: int, container: bool) -> dict:
+    os.environ['MEMVID_FRAME_WORKERS'] = str(workers)
+    os.environ['MEMVID_FRAME_CONTAINER'] = 'frames' if container else ''
+    base = os.path.join(workdir, label.replace('+', '_'))
+    started = time.perf_counter()
+    stats = write_video(chunks, f"{base}.mp4", base)
+    seconds = time.perf_counter() - started
+    result = {
+        'label': label,
+        'workers': stats['render_workers'],
+        'seconds': round(seconds, 3),
+        'frames_per_sec': round(len(chunks) / seconds, 1),
+        'video_mb': stats['video_size_mb'],
+    }
+    if container:
+        result['frames_mb'] = stats['frames_size_mb']
+    return result, base
+
+
+def time_random_access(base: str, count: int, samples: int) -> dict:
+    import cv2
+    from memvid.utils import decode_qr
+
+    rng = random.Random(11)
+    picks = [rng.randrange(count) for _ in range(samples)]
+
+    capture = cv2.VideoCapture(f"{base}.mp4")
+    started = time.perf_counter()
+    mp4_decoded = 0
+    for frame_number in picks:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        ok, frame = capture.read()
+        if ok and decode_qr(frame):
+            mp4_decoded += 1
+    mp4_ms = (time.perf_counter() - started) * 1000 / samples
+    capture.release()
+
+    container = FrameContainer(frames_path(base))
+    started = time.perf_counter()
+    frames_decoded = sum(1 for frame_number in picks if container.read_chunk(frame_number) is not None)
+    frames_ms = (time.perf_counter() - started) * 1000 / samples
+    container.close()
+
+    return {
+        'samples': samples,
+        'mp4_ms_per_frame': round(mp4_ms, 3),
+        'mp4_decode_success': round(mp4_decoded / samples, 3),
+        'frames_ms_per_frame': round(frames_ms, 3),
+        'frames_decode_success': round(frames_decoded / samples, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chunks', type=int, default=2000)
+    parser.add_argument('--chunk-size', type=int, default=512)
+    parser.add_argument('--workers', type=int, default=None, help='pool size (default: bridge default)')
+    parser.add_argument('--samples', type=int, default=200)
+    args = parser.parse_args()
+
+    if not bridge_frames.qr_helpers_available():
+        print('memvid is not installed; nothing to benchmark', file=sys.stderr)
+        return 1
+
+    chunks = synthetic_chunks(args.chunks, args.chunk_size)
+    workers = args.workers or max(2, frame_workers())
+    report = {'chunks': args.chunks, 'chunk_size': args.chunk_size, 'runs': []}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for label, run_workers, container in (('serial', 1, False), ('pool', workers, False),
+                                              ('pool+frames', workers, True)):
+            result, base = run_build(label, chunks, workdir, run_workers, container)
+            report['runs'].append(result)
+            print(f"{label:12s} {result['seconds']:8.2f}s  {result['frames_per_sec']:8.1f} frames/s", file=sys.stderr)
+        report['random_access'] = time_random_access(base, args.chunks, args.samples)
+
+    serial, pool = report['runs'][0], report['runs'][1]
+    report['pool_speedup'] = round(serial['seconds'] / pool['seconds'], 2) if pool['seconds'] else None
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark the MemVid bridge at realistic bank sizes without a GPU or network.
+
+For each scale point a synthetic corpus (bridge_synthetic.SyntheticCorpus) is
+built into a bank through the bridge's JSON-RPC interface, embedded with the
+offline hashing embedder, and then searched from a freshly started bridge:
+  build   - wall time, chunks/s, and seconds per pipeline stage (from progress events)
+  open    - first search on the bank (index open + search), and the retriever's open_ms
+  search  - p50/p99 client-side latency over repeated queries
+  memory  - bridge RSS after the build and after the searches, and its peak (Linux)
+
+Usage: python tests/performance/scale-benchmark.py [--scales 1000,10000,100000] [--queries 200]
+                                                   [--model hashing:384] [--baseline previous.json]
+1M chunks (--scales 1000000) works too, but QR frame rendering dominates the
+build and the bank needs several GB of disk. Needs the bridge's Python
+dependencies (see python/requirements.txt) but not the sentence-transformers
+model. With --baseline, exits 1 when throughput or p99 regress beyond --tolerance.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LIB_DIR = Path(__file__).resolve().parents[2] / 'src' / 'lib'
+sys.path.insert(0, str(LIB_DIR))
+
+from bridge_synthetic import SyntheticCorpus, percentile  # noqa: E402
+
+
+class Bridge:
+    """One bridge process driven over stdin/stdout."""
+
+    def __init__(self, workdir: str):
+        env = dict(os.environ, MEMORY_BANKS_DIR=workdir, MEMVID_LOG_FILE='', MEMVID_LOG_LEVEL='WARNING')
+        self.process = subprocess.Popen([sys.executable, str(LIB_DIR / 'memvid-bridge.py')],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, env=env)
+        self.next_id = 0
+        ready = json.loads(self.process.stdout.readline())
+        if ready.get('status') != 'ready':
+            raise RuntimeError(f'bridge did not start: {ready}')
+
+    def call(self, method: str, params: dict, on_progress=None) -> dict:
+        self.next_id += 1
+        request_id = f'bench-{self.next_id}'
+        self.process.stdin.write(json.dumps({'id': request_id, 'method': method, 'params': params}) + '\n')
+        self.process.stdin.flush()
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError(f'bridge exited during {method}')
+            message = json.loads(line)
+            if message.get('id') != request_id:
+                continue
+            if message.get('event') == 'progress':
+                if on_progress:
+                    on_progress(message)
+                continue
+            if 'error' in message:
+                raise RuntimeError(f"{method} failed: {message['error'].get('message')}")
+            result = message.get('result', {})
+            if result.get('success') is False:
+                raise RuntimeError(f"{method} failed: {result.get('error')}")
+            return result
+
+    def memory_mb(self) -> dict:
+        """Current and peak RSS from /proc (empty where unavailable)."""
+        fields = {}
+        try:
+            with open(f'/proc/{self.process.pid}/status') as f:
+                for line in f:
+                    name, _, value = line.partition(':')
+                    if name in ('VmRSS', 'VmHWM'):
+                        fields['rss_mb' if name == 'VmRSS' else 'peak_rss_mb'] = round(int(value.split()[0]) / 1024, 1)
+        except OSError:
+            pass
+        return fields
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        try:
+            self.process.wait(30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def build(bridge: Bridge, base: str, chunks: int, args) -> dict:
+    stages, last = {}, {'stage': None, 'at': time.perf_counter()}
+
+    def on_progress(event):
+        now = time.perf_counter()
+        if event['stage'] != last['stage']:
+            if last['stage'] is not None:
+                stages[last['stage']] = stages.get(last['stage'], 0.0) + now - last['at']
+            last.update(stage=event['stage'], at=now)
+
+    started = time.perf_counter()
+    result = bridge.call('encode', {
+        'sources': [{'type': 'synthetic', 'path': '', 'options': {'chunks': chunks, 'seed': args.seed}}],
+        'output_path': f'{base}.mp4',
+        'chunk_size': args.chunk_size,
+        'embedding_model': args.model,
+    }, on_progress)
+    seconds = time.perf_counter() - started
+    if last['stage'] is not None:
+        stages[last['stage']] = stages.get(last['stage'], 0.0) + started + seconds - last['at']
+    return {
+        'chunks': result.get('chunks_created'),
+        'seconds': round(seconds, 3),
+        'chunks_per_sec': round(chunks / seconds, 1),
+        'stage_seconds': {stage: round(value, 3) for stage, value in stages.items()},
+        'embedding': result.get('embedding'),
+    }
+
+
+def search(bridge: Bridge, base: str, queries: list, top_k: int) -> list:
+    latencies = []
+    for query, _ in queries:
+        started = time.perf_counter()
+        bridge.call('search', {'video_path': f'{base}.mp4', 'index_path': f'{base}.json', 'query': query,
+                               'top_k': top_k})
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def run_scale(chunks: int, workdir: str, warmup_base: str, corpus: SyntheticCorpus, args) -> dict:
+    base = os.path.join(workdir, f'scale-{chunks}')
+    bridge = Bridge(workdir)
+    try:
+        report = {'chunks': chunks, 'build': build(bridge, base, chunks, args)}
+        report['build']['memory'] = bridge.memory_mb()
+    finally:
+        bridge.close()
+
+    # A fresh bridge, warmed up on a tiny bank so the first search times the open, not imports
+    bridge = Bridge(workdir)
+    try:
+        queries = corpus.queries(args.queries)
+        search(bridge, warmup_base, queries[:1], args.top_k)
+        first_ms = search(bridge, base, queries[:1], args.top_k)[0]
+        stats = bridge.call('stats', {'bank_path': base})
+        latencies = search(bridge, base, queries, args.top_k)
+        report['open'] = {'first_search_ms': round(first_ms, 3),
+                          'open_ms': stats.get('retriever', {}).get('open_ms'),
+                          'load_mode': stats.get('retriever', {}).get('load_mode'),
+                          'bytes_on_disk': stats.get('bytes_on_disk')}
+        report['search'] = {'queries': len(latencies),
+                            'p50_ms': round(percentile(latencies, 50), 3),
+                            'p99_ms': round(percentile(latencies, 99), 3)}
+        report['memory'] = bridge.memory_mb()
+    finally:
+        bridge.close()
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions against a previous report, as messages."""
+    previous = {point['chunks']: point for point in baseline.get('points', [])}
+    regressions = []
+    for point in report['points']:
+        before = previous.get(point['chunks'])
+        if not before:
+            continue
+        throughput, throughput_before = point['build']['chunks_per_sec'], before['build']['chunks_per_sec']
+        if throughput < throughput_before * (1 - tolerance):
+            regressions.append(f"{point['chunks']} chunks: build {throughput_before} -> {throughput} chunks/s")
+        p99, p99_before = point['search']['p99_ms'], before['search']['p99_ms']
+        if p99 > p99_before * (1 + tolerance):
+            regressions.append(f"{point['chunks']} chunks: search p99 {p99_before} -> {p99} ms")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='1000,10000,100000', help='comma-separated chunk counts')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-k', type=int, default=5)
+    parser.add_argument('--chunk-size', type=int, default=480)
+    parser.add_argument('--model', default='hashing:384', help='embedding model (hashing[:<dimension>] runs offline)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', default=None, help='keep the banks here instead of a temporary directory')
+    parser.add_argument('--baseline', default=None, help='previous JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed regression fraction (default 0.2)')
+    args = parser.parse_args()
+
+    try:
+        import memvid  # noqa: F401
+    except ImportError:
+        print('memvid is not installed; nothing to benchmark', file=sys.stderr)
+        return 1
+
+    scales = [int(value) for value in args.scales.split(',') if value.strip()]
+    corpus = SyntheticCorpus(seed=args.seed)
+    report = {'model': args.model, 'chunk_size': args.chunk_size, 'seed': args.seed, 'points': []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        warmup_base = os.path.join(workdir, 'warmup')
+        bridge = Bridge(workdir)
+        try:
+            build(bridge, warmup_base, 100, args)
+        finally:
+            bridge.close()
+
+        for chunks in scales:
+            point = run_scale(chunks, workdir, warmup_base, corpus, args)
+            report['points'].append(point)
+            print(f"{chunks:>9d} chunks  build {point['build']['chunks_per_sec']:9.1f} chunks/s  "
+                  f"open {point['open']['first_search_ms']:8.1f} ms  p99 {point['search']['p99_ms']:7.2f} ms  "
+                  f"rss {point['memory'].get('peak_rss_mb', '?')} MB", file=sys.stderr)
+
+    code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report['regressions'] = regressions
+        for message in regressions:
+            print(f'REGRESSION: {message}', file=sys.stderr)
+        code = 1 if regressions else 0
+    print(json.dumps(report, indent=2))
+    return code
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
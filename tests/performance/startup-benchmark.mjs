@@ -0,0 +1,157 @@
+#!/usr/bin/env node
+/**
+ * Benchmark MCP server startup the way an editor sees it.
+ *
+ * Each run launches `node dist/server.js --mcp` with a fresh memory banks
+ * directory, sends the MCP handshake, `tools/list`, a `list_memory_banks` call
+ * and `get_metrics`, and records:
+ *   list_tools          - launch to the first tools/list response (client clock)
+ *   list_memory_banks   - launch to the list_memory_banks response
+ *   server              - the server's own startup_ms gauge (first_list_tools, connected, bridge_ready, ...)
+ * Runs alternate between the normal and fast-start modes (MEMVID_FAST_START).
+ * The first run of each mode may refresh the environment cache; pass
+ * --cold to disable the cache (MEMVID_ENV_CACHE=0) and measure full detection.
+ *
+ * Usage: node tests/performance/startup-benchmark.mjs [--runs 5] [--modes normal,fast] [--cold] [--json]
+ *                                                      [--max-list-tools-ms 1000]
+ * With --max-list-tools-ms, exits 1 when the fast-start median exceeds it.
+ * Needs a build (npm run build); the normal mode also needs the bridge's Python dependencies.
+ */
+import { spawn } from 'child_process';
+import { mkdtempSync, rmSync } from 'fs';
+import os from 'os';
+import path from 'path';
+import { performance } from 'perf_hooks';
+import { fileURLToPath } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+const serverPath = path.join(projectRoot, 'dist', 'server.js');
+const TIMEOUT_MS = 120000;
+
+function parseArgs(argv) {
+  const options = { runs: 5, modes: ['normal', 'fast'], cold: false, json: false, maxListToolsMs: null };
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i];
+    if (arg === '--runs') options.runs = Number(argv[++i]);
+    else if (arg === '--modes') options.modes = argv[++i].split(',');
+    else if (arg === '--cold') options.cold = true;
+    else if (arg === '--json') options.json = true;
+    else if (arg === '--max-list-tools-ms') options.maxListToolsMs = Number(argv[++i]);
+    else throw new Error(`Unknown argument: ${arg}`);
+  }
+  return options;
+}
+
+function percentile(values, q) {
+  if (values.length === 0) return null;
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.max(0, Math.ceil((q / 100) * sorted.length) - 1)];
+}
+
+/**
+ * Launch one server, drive the handshake and a few requests, and time the responses
+ */
+function runOnce(mode, cold) {
+  const banksDir = mkdtempSync(path.join(os.tmpdir(), 'memvid-startup-'));
+  const env = {
+    ...process.env,
+    MEMORY_BANKS_DIR: banksDir,
+    MEMVID_FAST_START: mode === 'fast' ? '1' : '0',
+    ...(cold ? { MEMVID_ENV_CACHE: '0' } : {})
+  };
+  const started = performance.now();
+  const child = spawn(process.execPath, [serverPath, '--mcp'], { env, stdio: ['pipe', 'pipe', 'ignore'] });
+  const timings = {};
+
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => finish(new Error(`${mode} run timed out`)), TIMEOUT_MS);
+    let buffer = '';
+    let done = false;
+
+    function finish(error, server) {
+      if (done) return;
+      done = true;
+      clearTimeout(timer);
+      child.kill();
+      rmSync(banksDir, { recursive: true, force: true });
+      if (error) reject(error);
+      else resolve({ mode, ...timings, server });
+    }
+
+    child.on('exit', code => finish(new Error(`server exited with code ${code} during the ${mode} run`)));
+    child.stdout.on('data', data => {
+      buffer += data.toString();
+      const lines = buffer.split('\n');
+      buffer = lines.pop() ?? '';
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        const message = JSON.parse(line);
+        const elapsed = Math.round((performance.now() - started) * 10) / 10;
+        if (message.error) {
+          finish(new Error(`request ${message.id} failed: ${message.error.message}`));
+        } else if (message.id === 2) {
+          timings.list_tools = elapsed;
+        } else if (message.id === 3) {
+          timings.list_memory_banks = elapsed;
+        } else if (message.id === 4) {
+          const metrics = JSON.parse(message.result.content[0].text);
+          const family = metrics.server.find(f => f.name === 'startup_ms');
+          finish(null, Object.fromEntries((family?.series ?? []).map(s => [s.labels.phase, s.value])));
+        }
+      }
+    });
+
+    const send = message => child.stdin.write(JSON.stringify({ jsonrpc: '2.0', ...message }) + '\n');
+    send({
+      id: 1,
+      method: 'initialize',
+      params: { protocolVersion: '2024-11-05', capabilities: {}, clientInfo: { name: 'startup-benchmark', version: '1.0.0' } }
+    });
+    send({ method: 'notifications/initialized' });
+    send({ id: 2, method: 'tools/list', params: {} });
+    send({ id: 3, method: 'tools/call', params: { name: 'list_memory_banks', arguments: {} } });
+    send({ id: 4, method: 'tools/call', params: { name: 'get_metrics', arguments: { format: 'json' } } });
+  });
+}
+
+async function main() {
+  const options = parseArgs(process.argv.slice(2));
+  const runs = [];
+  for (let i = 0; i < options.runs; i++) {
+    for (const mode of options.modes) {
+      runs.push(await runOnce(mode, options.cold));
+    }
+  }
+
+  const summary = {};
+  for (const mode of options.modes) {
+    const ofMode = runs.filter(run => run.mode === mode);
+    summary[mode] = {};
+    for (const key of ['list_tools', 'list_memory_banks']) {
+      const values = ofMode.map(run => run[key]).filter(value => value !== undefined);
+      summary[mode][key] = { p50: percentile(values, 50), max: percentile(values, 100) };
+    }
+    const serverFirst = ofMode.map(run => run.server?.first_list_tools).filter(value => value !== undefined);
+    summary[mode].server_first_list_tools_p50 = percentile(serverFirst, 50);
+  }
+
+  if (options.json) {
+    console.log(JSON.stringify({ runs, summary }, null, 2));
+  } else {
+    for (const [mode, stats] of Object.entries(summary)) {
+      console.log(`${mode.padEnd(6)} list_tools p50 ${stats.list_tools.p50}ms (max ${stats.list_tools.max}ms), ` +
+        `list_memory_banks p50 ${stats.list_memory_banks.p50}ms, server first_list_tools p50 ${stats.server_first_list_tools_p50}ms`);
+    }
+  }
+
+  const fastMedian = summary.fast?.list_tools.p50;
+  if (options.maxListToolsMs !== null && fastMedian != null && fastMedian > options.maxListToolsMs) {
+    console.error(`FAIL: fast-start list_tools p50 ${fastMedian}ms exceeds ${options.maxListToolsMs}ms`);
+    process.exit(1);
+  }
+}
+
+main().catch(error => {
+  console.error(error instanceof Error ? error.message : error);
+  process.exit(1);
+});
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Unit probe: concurrent first searches of an older bank backfill its side files and open its retriever once.
+
+Also checks that a cancelled search is reported as a cancellation, not as a search error.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+LIB = Path(__file__).resolve().parents[2] / 'src' / 'lib'
+sys.path.insert(0, str(LIB))
+os.environ['MEMVID_LOG_FILE'] = ''  # no bridge log file in the working directory
+os.environ.setdefault('MEMVID_LOG_LEVEL', 'error')
+
+_spec = importlib.util.spec_from_file_location('memvid_bridge', LIB / 'memvid-bridge.py')
+bridge_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bridge_module)
+
+import bridge_scheduler as scheduler_module  # noqa: E402
+
+SEARCHES = 8
+
+
+def slowed(builder, calls: list):
+    """Count backfill writes and widen the window in which two of them could overlap."""
+    def build(*args, **kwargs):
+        calls.append(args[0])
+        time.sleep(0.05)
+        return builder(*args, **kwargs)
+    return build
+
+
+def concurrently(target) -> tuple:
+    barrier = threading.Barrier(SEARCHES)
+    results, failures = [], []
+
+    def run(i: int) -> None:
+        barrier.wait()
+        try:
+            results.append(target(i))
+        except Exception as e:
+            failures.append(f'{type(e).__name__}: {e}')
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(SEARCHES)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    return results, failures
+
+
+def main() -> int:
+    errors: list[str] = []
+    bridge = bridge_module.DirectMemvidBridge()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A bank from before keyword indexes: only its JSON index exists
+        base = os.path.join(tmp, 'older')
+        texts = [f'note {i} about the circuit breaker and retry budget {i}' for i in range(200)]
+        with open(f'{base}.json', 'w', encoding='utf-8') as f:
+            json.dump({'metadata': [{'id': i, 'text': text} for i, text in enumerate(texts)], 'config': {}}, f)
+
+        builds: list = []
+        bridge_module.build_keyword_index = slowed(bridge_module.build_keyword_index, builds)
+        indexes, failures = concurrently(lambda i: bridge._get_keyword_index(base, i))
+        if failures:
+            errors.append(f'concurrent keyword backfills should not fail searches: {failures}')
+        if len(builds) != 1:
+            errors.append(f'the keyword index should be built once: {len(builds)} builds')
+        if len(indexes) != SEARCHES or any(index is None or index.n_docs != len(texts) for index in indexes):
+            errors.append('every search should open the complete keyword index')
+        elif not indexes[0].search('note 7', 1):
+            errors.append('the backfilled keyword index should answer queries')
+
+        writes: list = []
+        bridge_module.backfill_chunk_store = slowed(bridge_module.backfill_chunk_store, writes)
+        stores, failures = concurrently(lambda i: bridge._get_chunk_store(base, i))
+        if failures:
+            errors.append(f'concurrent chunk store backfills should not fail searches: {failures}')
+        if len(writes) != 1:
+            errors.append(f'the chunk store should be written once: {len(writes)} writes')
+        if len(stores) != SEARCHES or any(store is None or len(store) != len(texts) for store in stores):
+            errors.append('every search should open the complete chunk store')
+        elif stores[0].text(199) != texts[199]:
+            errors.append('the backfilled chunk store should hold every chunk text')
+
+        # An index file removed between the existence check and the open is re-resolved
+        cache_get = bridge.keyword_indexes.get
+        misses = [None]
+        bridge.keyword_indexes.get = lambda index_base: misses.pop() if misses else cache_get(index_base)
+        if bridge._get_keyword_index(base, 0) is None:
+            errors.append('a keyword index that vanished once should be re-resolved')
+        bridge.keyword_indexes.get = lambda index_base: None
+        try:
+            bridge._get_keyword_index(base, 0)
+            errors.append('a keyword index that keeps vanishing should raise')
+        except ValueError:
+            pass
+        bridge.keyword_indexes.get = cache_get
+
+        opened: list = []
+        bridge._open_retriever = slowed(lambda *args: object(), opened)
+        retrievers, failures = concurrently(
+            lambda i: bridge._get_retriever(f'{base}.mp4', f'{base}.json', i))
+        if failures or len(opened) != 1 or len({id(retriever) for retriever in retrievers}) != 1:
+            errors.append(f'concurrent first searches should share one retriever: {len(opened)} opened')
+
+        # Invalidating the cached index leaves mappings held by running searches usable
+        bridge.keyword_indexes.invalidate(base)
+        try:
+            indexes[0].search('circuit breaker', 3)
+        except ValueError as e:
+            errors.append(f'invalidate() should not close a mapping still in use: {e}')
+
+        # A cancel reaching the search checkpoint propagates to the scheduler as RequestCancelled
+        context = scheduler_module.RequestContext('cancelled-search', 'search_memory_bank', 0)
+        context.cancel()
+        scheduler_module._local.context = context
+        try:
+            reply = bridge.search_memory_bank(f'{base}.mp4', f'{base}.json', 'circuit breaker', mode='keyword')
+            errors.append(f'a cancelled search should raise RequestCancelled, not return {reply.get("status")}')
+        except scheduler_module.RequestCancelled:
+            pass
+        finally:
+            scheduler_module._local.context = None
+
+        leftovers = [name for name in os.listdir(tmp) if name.endswith('.tmp')]
+        if leftovers:
+            errors.append(f'no temporary files should be left behind: {leftovers}')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Backfill checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Unit probe: bank stats come from FAISS and chunk store headers without loading the bank."""
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_bank_stats import bank_files, memory_footprint, read_faiss_header  # noqa: E402
+from bridge_mapped_bank import read_chunk_store_header, write_chunk_store  # noqa: E402
+
+
+def index_header(fourcc: bytes, dimension: int, ntotal: int, metric: int) -> bytes:
+    """The fourcc and fixed header FAISS writes before an index's data."""
+    return fourcc + struct.pack('<iqqqBi', dimension, ntotal, 1 << 20, 1 << 20, 1, metric)
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, 'notes')
+
+        # memvid's layout: an ID map wrapping a flat L2 index; vectors follow the headers
+        with open(f"{base}.faiss", 'wb') as f:
+            f.write(index_header(b'IxMp', 384, 1234, 1))
+            f.write(index_header(b'IxF2', 384, 1234, 1))
+            f.write(b'\0' * 4096)
+        header = read_faiss_header(f"{base}.faiss")
+        expected = {'index_type': 'IndexIDMap(IndexFlatL2)', 'dimension': 384, 'vectors': 1234, 'metric': 'l2'}
+        if header != expected:
+            errors.append(f'faiss header should give type, dimension, count and metric: {header}')
+
+        flat = os.path.join(tmp, 'flat.faiss')
+        with open(flat, 'wb') as f:
+            f.write(index_header(b'IxFI', 768, 5, 0))
+        if read_faiss_header(flat) != {'index_type': 'IndexFlatIP', 'dimension': 768, 'vectors': 5, 'metric': 'inner_product'}:
+            errors.append(f'unwrapped indexes should be read directly: {read_faiss_header(flat)}')
+
+        truncated = os.path.join(tmp, 'short.faiss')
+        with open(truncated, 'wb') as f:
+            f.write(b'IxF2\0\0')
+        if read_faiss_header(truncated) is not None or read_faiss_header(os.path.join(tmp, 'missing.faiss')) is not None:
+            errors.append('truncated or missing index files should give None')
+
+        write_chunk_store(base, ['a', 'b', 'c'], [], {'embedding_model': 'test-model', 'dimension': 384})
+        if read_chunk_store_header(base) != (3, {'embedding_model': 'test-model', 'dimension': 384}):
+            errors.append(f'chunk store header should give count and info: {read_chunk_store_header(base)}')
+        if read_chunk_store_header(os.path.join(tmp, 'missing')) is not None:
+            errors.append('a missing chunk store should give None')
+
+        for suffix in ('.mp4', '.json', '.current', '.json.tmp'):
+            with open(f"{base}{suffix}", 'wb') as f:
+                f.write(b'x' * 10)
+        files = bank_files(base)
+        if sorted(files) != ['.chunks', '.faiss', '.json', '.mp4'] or files['.faiss'] != os.path.getsize(f"{base}.faiss"):
+            errors.append(f'bank_files should list bank files by suffix with their sizes: {files}')
+
+        if memory_footprint(files, None, False) != {'private_bytes': 0, 'mapped_bytes': 0}:
+            errors.append('a bank without a cached retriever should hold no memory')
+        mapped = memory_footprint(files, 'mmap', True)
+        if mapped != {'private_bytes': 0, 'mapped_bytes': files['.faiss'] + files['.chunks']}:
+            errors.append(f'a mapped bank should only hold shared mapped bytes: {mapped}')
+        loaded = memory_footprint(files, 'memory', False)
+        if loaded != {'private_bytes': files['.faiss'] + files['.json'], 'mapped_bytes': 0}:
+            errors.append(f'a fully loaded bank should hold index and JSON privately: {loaded}')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Bank stats checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Unit probe: structured bridge logging queues records off-thread, samples per request and keeps a ring buffer."""
+from __future__ import annotations
+
+import io
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_logging import (BackgroundHandler, JsonLinesFormatter, RequestSampler, RingBuffer,  # noqa: E402
+                            parse_levels, request_number)
+
+
+def make_record(name: str, level: int, message: str) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    levels = parse_levels('bridge_frames=debug, memvid=WARNING,broken,=info,x=nope')
+    if levels != {'bridge_frames': logging.DEBUG, 'memvid': logging.WARNING}:
+        errors.append(f'per-component levels should parse name=level pairs and skip bad ones: {levels}')
+
+    if request_number('[REQ-42] Searching') != 42 or request_number('Bridge ready [REQ-1]') is not None:
+        errors.append('only a leading [REQ-n] tag should identify a request')
+
+    # Sampling keeps or drops whole requests and never drops warnings or untagged lines
+    sampler = RequestSampler(0.25)
+    kept = [req for req in range(1, 2001) if sampler.filter(make_record('bridge', logging.INFO, f'[REQ-{req}] a'))]
+    if not 350 < len(kept) < 650:
+        errors.append(f'a 0.25 sample should keep about a quarter of requests: {len(kept)}/2000')
+    if any(sampler.filter(make_record('bridge', logging.INFO, f'[REQ-{req}] b')) != (req in kept) for req in range(1, 200)):
+        errors.append('every line of a request should share its sampling decision')
+    if not sampler.filter(make_record('bridge', logging.WARNING, '[REQ-3] slow')) or \
+            not sampler.filter(make_record('bridge', logging.INFO, 'Bridge ready')):
+        errors.append('warnings and untagged lines should never be sampled out')
+    if RequestSampler(0).filter(make_record('bridge', logging.INFO, '[REQ-1] x')):
+        errors.append('a zero rate should drop tagged info lines')
+
+    line = JsonLinesFormatter().format(make_record('bridge_frames', logging.ERROR, '[REQ-7] "quoted" é'))
+    entry = json.loads(line)
+    if entry.get('level') != 'error' or entry.get('component') != 'bridge_frames' or entry.get('req') != 7 \
+            or entry.get('msg') != '[REQ-7] "quoted" é':
+        errors.append(f'JSON lines should carry level, component, request and message: {line}')
+
+    ring = RingBuffer(size=3)
+    for i in range(5):
+        ring.handle(make_record('bridge', logging.WARNING if i == 3 else logging.INFO, f'line {i}'))
+    if [e['msg'] for e in ring.entries()] != ['line 2', 'line 3', 'line 4']:
+        errors.append(f'the ring buffer should keep the newest entries: {ring.entries()}')
+    if [e['msg'] for e in ring.entries(min_level='warning')] != ['line 3'] or len(ring.entries(limit=1)) != 1:
+        errors.append('ring buffer reads should filter by level and limit')
+
+    # Records are written by the writer thread; closing drains everything queued
+    stream = io.StringIO()
+    writer = logging.StreamHandler(stream)
+    writer.setFormatter(JsonLinesFormatter())
+    background = BackgroundHandler([writer])
+    log = logging.getLogger('bridge-logging-probe')
+    log.propagate = False
+    log.addHandler(background)
+    log.setLevel(logging.INFO)
+    for i in range(200):
+        log.info(f'[REQ-{i}] queued')
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        log.exception('failed')
+    background.close()
+    lines = stream.getvalue().splitlines()
+    if len(lines) != 201 or json.loads(lines[0])['msg'] != '[REQ-0] queued':
+        errors.append(f'close() should drain every queued record in order: {len(lines)} lines')
+    elif 'ValueError: boom' not in json.loads(lines[-1])['msg']:
+        errors.append('exception tracebacks should be formatted into the entry')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Bridge logging checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
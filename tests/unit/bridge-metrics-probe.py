@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Unit probe: bridge metrics count requests by outcome and time queue waits, runs and stages."""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_metrics import BridgeMetrics, Histogram, estimate_quantile, gauge, label_key  # noqa: E402
+from bridge_scheduler import PRIORITY_INTERACTIVE, BridgeScheduler, QueueFull, checkpoint  # noqa: E402
+
+
+def family(snapshot: dict, name: str) -> dict:
+    return next(f for f in snapshot['families'] if f['name'] == name)
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    histogram = Histogram((10, 100, 1000))
+    for value in [5] * 50 + [50] * 45 + [500] * 4 + [5000]:
+        histogram.observe(value)
+    series = histogram.series(label_key({'method': 'search'}))
+    if series['buckets'] != [[10, 50], [100, 95], [1000, 99]] or series['count'] != 100:
+        errors.append(f'buckets should hold cumulative counts: {series}')
+    if series['p50'] != 10.0 or not 10 < series['p95'] <= 100 or not 100 < series['p99'] <= 1000:
+        errors.append(f'quantiles should be interpolated within their bucket: {series}')
+    if estimate_quantile((10,), [0, 3], 3, 0.5) != 10.0 or estimate_quantile((10,), [0, 0], 0, 0.5) is not None:
+        errors.append('overflow quantiles should report the largest bound, and empty histograms None')
+
+    # Requests through the scheduler: stage times, outcomes, drops and rejections
+    metrics = BridgeMetrics()
+    gate = threading.Event()
+
+    def handler(request, context):
+        if request['id'] == 'blocker':
+            gate.wait(5)
+            return None
+        checkpoint('read')
+        time.sleep(0.02)
+        checkpoint('embed')
+        checkpoint('embed')  # repeated checkpoints stay in the same stage
+        return 'failed' if request['id'] == 'bad' else None
+
+    scheduler = BridgeScheduler(handler, lambda *args: None, workers=1, max_queued=3, metrics=metrics)
+    scheduler.submit({'id': 'blocker', 'method': 'search'}, PRIORITY_INTERACTIVE)
+    time.sleep(0.05)
+    scheduler.submit({'id': 'ok', 'method': 'encode'}, PRIORITY_INTERACTIVE)
+    scheduler.submit({'id': 'bad', 'method': 'encode'}, PRIORITY_INTERACTIVE)
+    scheduler.submit({'id': 'gone', 'method': 'search'}, PRIORITY_INTERACTIVE)
+    try:
+        scheduler.submit({'id': 'overflow', 'method': 'search'}, PRIORITY_INTERACTIVE)
+    except QueueFull:
+        pass
+    scheduler.cancel('gone')
+    gate.set()
+    scheduler.stop()
+    scheduler.join(5)
+
+    snapshot = metrics.snapshot([gauge('workers', 'Bridge worker threads', [({}, 1)])])
+    requests = {(s['labels']['method'], s['labels']['outcome']): s['value']
+                for s in family(snapshot, 'requests_total')['series']}
+    expected = {('search', 'ok'): 1, ('encode', 'ok'): 1, ('encode', 'failed'): 1,
+                ('search', 'cancelled'): 1, ('search', 'rejected'): 1}
+    if requests != expected:
+        errors.append(f'requests should be counted by method and outcome: {requests}')
+
+    stages = {tuple(sorted(s['labels'].items())): s for s in family(snapshot, 'stage_duration_ms')['series']}
+    read = stages.get((('method', 'encode'), ('stage', 'read')))
+    if read is None or read['count'] != 2 or read['sum'] < 30:
+        errors.append(f'stage time should run until the next checkpoint: {read}')
+    embed = stages.get((('method', 'encode'), ('stage', 'embed')))
+    if embed is None or embed['count'] != 2:
+        errors.append(f'repeated checkpoints should not split a stage: {embed}')
+
+    waits = {s['labels']['method']: s['count'] for s in family(snapshot, 'queue_wait_ms')['series']}
+    if waits != {'search': 2, 'encode': 2}:
+        errors.append(f'queue waits should cover run and cancelled requests, not rejected ones: {waits}')
+    durations = {s['labels']['method']: s for s in family(snapshot, 'request_duration_ms')['series']}
+    if durations.get('encode', {}).get('count') != 2 or durations['encode']['sum'] < 40:
+        errors.append(f'run time should be recorded for requests that ran: {durations}')
+    if family(snapshot, 'workers')['series'] != [{'labels': {}, 'value': 1}] or snapshot['uptime_seconds'] < 0:
+        errors.append('gauge families should be appended to the snapshot')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Bridge metrics checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
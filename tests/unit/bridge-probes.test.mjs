@@ -0,0 +1,54 @@
+#!/usr/bin/env node
+/**
+ * Unit checks for the Python bridge helper modules: runs every tests/unit/*-probe.py.
+ */
+import { spawnSync } from 'child_process';
+import { readdirSync } from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+const probeDir = path.join(projectRoot, 'tests', 'unit');
+const probes = readdirSync(probeDir).filter(file => file.endsWith('-probe.py')).sort();
+
+const pythonCandidates = [
+  process.env.PYTHON_EXECUTABLE,
+  process.platform === 'win32' ? path.join(projectRoot, 'memvid-env', 'Scripts', 'python.exe') : undefined,
+  'python3',
+  'python',
+].filter(Boolean);
+
+function runProbe(scriptPath) {
+  let lastError = '';
+  for (const pythonExecutable of pythonCandidates) {
+    const result = spawnSync(pythonExecutable, [scriptPath], {
+      cwd: projectRoot,
+      encoding: 'utf8',
+      env: { ...process.env, PYTHONIOENCODING: 'utf-8', PYTHONUTF8: '1' },
+    });
+    if (result.error?.code === 'ENOENT') {
+      lastError = `Python not found: ${pythonExecutable}`;
+      continue;
+    }
+    process.stdout.write(result.stdout || '');
+    process.stderr.write(result.stderr || '');
+    return result.status ?? 1;
+  }
+  console.error(`FAIL: could not run ${path.basename(scriptPath)} (${lastError || 'no python interpreter found'})`);
+  return 1;
+}
+
+let failed = 0;
+for (const probe of probes) {
+  if (runProbe(path.join(probeDir, probe)) !== 0) {
+    failed++;
+  }
+}
+
+if (failed > 0) {
+  console.error(`${failed} bridge probe(s) failed.`);
+  process.exit(1);
+}
+
+console.log(`Bridge probes passed (${probes.length}).`);
+process.exit(0);
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Unit probe: bridge scheduler priorities, admission control, deadlines and cancellation."""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_scheduler import (PRIORITY_BULK, PRIORITY_INTERACTIVE, BridgeScheduler,  # noqa: E402
+                              QueueFull, RequestCancelled, checkpoint, progress)
+
+
+def main() -> int:
+    errors: list[str] = []
+    order: list[str] = []
+    dropped: dict[str, str] = {}
+    gate = threading.Event()
+    outcomes: dict[str, str] = {}
+
+    def handler(request, context):
+        if request['id'] == 'blocker':
+            gate.wait(5)
+            return
+        if request['id'] == 'long-build':
+            gate.wait(5)
+            try:
+                checkpoint('encode')
+                outcomes['long-build'] = 'completed'
+            except RequestCancelled:
+                outcomes['long-build'] = 'cancelled'
+            return
+        order.append(request['id'])
+
+    def on_dropped(request, context, error_type, message):
+        dropped[request['id']] = error_type
+
+    # One worker: everything queues behind the blocker
+    scheduler = BridgeScheduler(handler, on_dropped, workers=1, max_queued=4)
+    scheduler.submit({'id': 'blocker', 'method': 'search'}, PRIORITY_INTERACTIVE)
+    time.sleep(0.05)
+    scheduler.submit({'id': 'build', 'method': 'encode'}, PRIORITY_BULK)
+    scheduler.submit({'id': 'search', 'method': 'search'}, PRIORITY_INTERACTIVE)
+    scheduler.submit({'id': 'expired', 'method': 'search', 'deadline': (time.time() - 1) * 1000}, PRIORITY_INTERACTIVE)
+    scheduler.submit({'id': 'doomed', 'method': 'search'}, PRIORITY_INTERACTIVE)
+    try:
+        scheduler.submit({'id': 'overflow', 'method': 'search'}, PRIORITY_INTERACTIVE)
+        errors.append('fifth queued request should be rejected with QueueFull')
+    except QueueFull:
+        pass
+    if scheduler.cancel('doomed') != 'queued' or dropped.get('doomed') != 'RequestCancelled':
+        errors.append(f'cancelling a queued request should drop it: {dropped}')
+    if scheduler.cancel('nope') != 'unknown':
+        errors.append('cancelling an unknown id should report unknown')
+
+    gate.set()
+    scheduler.stop()
+    scheduler.join(5)
+
+    if order != ['search', 'build']:
+        errors.append(f'interactive work should run before bulk work: {order}')
+    if dropped.get('expired') != 'DeadlineExceeded':
+        errors.append(f'expired request should be dropped before running: {dropped}')
+
+    # Two workers: a bulk job never takes the last worker, and cancel stops it at a checkpoint
+    gate.clear()
+    order.clear()
+    scheduler = BridgeScheduler(handler, on_dropped, workers=2, max_queued=8)
+    scheduler.submit({'id': 'long-build', 'method': 'encode'}, PRIORITY_BULK)
+    scheduler.submit({'id': 'queued-build', 'method': 'encode'}, PRIORITY_BULK)
+    time.sleep(0.05)
+    scheduler.submit({'id': 'quick-search', 'method': 'search'}, PRIORITY_INTERACTIVE)
+    time.sleep(0.1)
+    if order != ['quick-search']:
+        errors.append(f'search should run while a build occupies the bulk slot: {order}')
+    if scheduler.cancel('long-build') != 'running':
+        errors.append('cancelling a running request should report running')
+    gate.set()
+    scheduler.stop()
+    scheduler.join(5)
+    if outcomes.get('long-build') != 'cancelled':
+        errors.append(f'running build should stop at its next checkpoint: {outcomes}')
+    if order != ['quick-search', 'queued-build']:
+        errors.append(f'queued build should run after the first one finished: {order}')
+
+    checkpoint('outside-a-request')  # no-op without a scheduled context
+    progress('outside-a-request', 1, 2)
+
+    # Progress reported by a running request reaches its context's sink
+    events: list[dict] = []
+
+    def progress_handler(request, context):
+        context.progress_sink = events.append
+        progress('embed', 0, 10)
+        progress('embed', 10, 10, 'done')
+
+    scheduler = BridgeScheduler(progress_handler, on_dropped, workers=1, max_queued=2)
+    scheduler.submit({'id': 'build-with-progress', 'method': 'encode'}, PRIORITY_BULK)
+    scheduler.stop()
+    scheduler.join(5)
+    if events != [{'stage': 'embed', 'current': 0, 'total': 10},
+                  {'stage': 'embed', 'current': 10, 'total': 10, 'message': 'done'}]:
+        errors.append(f'progress events should reach the request sink: {events}')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Bridge scheduler checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
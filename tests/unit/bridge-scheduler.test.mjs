@@ -0,0 +1,79 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: bridge request scheduler priorities, admission control, queue expiry and abort.
+ */
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+
+const { BridgeRequestScheduler, BridgeQueueFullError } = await import(
+  pathToFileURL(path.join(projectRoot, 'dist/lib/bridge-scheduler.js')).href
+);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.error(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+const farDeadline = () => Date.now() + 10000;
+
+// One slot: the blocker runs, everything else queues behind it
+const scheduler = new BridgeRequestScheduler({ maxInFlight: 1, maxQueued: 3 });
+const order = [];
+let release;
+const blocker = scheduler.schedule('search', 'interactive', farDeadline(), () => new Promise(resolve => { release = resolve; }));
+const build = scheduler.schedule('encode', 'bulk', farDeadline(), async () => order.push('encode'));
+const append = scheduler.schedule('add_content', 'normal', farDeadline(), async () => order.push('add_content'));
+const search = scheduler.schedule('search', 'interactive', farDeadline(), async () => order.push('search'));
+
+const overflow = await scheduler.schedule('search', 'interactive', farDeadline(), async () => 'ran').catch(error => error);
+check(overflow instanceof BridgeQueueFullError, 'a request beyond maxQueued should be rejected immediately');
+check(scheduler.getStats().queued.bulk === 1 && scheduler.getStats().inFlight === 1, `unexpected stats ${JSON.stringify(scheduler.getStats())}`);
+
+release('done');
+await Promise.all([blocker, build, append, search]);
+check(order.join(',') === 'search,add_content,encode', `expected interactive, normal, bulk order, got ${order}`);
+
+// Requests whose deadline passes while queued never start
+const expiring = new BridgeRequestScheduler({ maxInFlight: 1, maxQueued: 4 });
+let ran = false;
+const slow = expiring.schedule('search', 'interactive', farDeadline(), () => sleep(60));
+const expired = await expiring.schedule('search', 'interactive', Date.now() + 10, async () => { ran = true; }).catch(error => error);
+await slow;
+check(expired instanceof Error && /timeout/i.test(expired.message), 'queued request past its deadline should reject with a timeout');
+check(!ran && expiring.getStats().expired === 1, 'expired request should never be dispatched');
+
+// With several slots, bulk work leaves one free for searches
+const reserved = new BridgeRequestScheduler({ maxInFlight: 2, maxQueued: 8 });
+const builds = [
+  reserved.schedule('encode', 'bulk', farDeadline(), () => sleep(50)),
+  reserved.schedule('encode', 'bulk', farDeadline(), () => sleep(50)),
+];
+check(reserved.getStats().inFlight === 1 && reserved.getStats().queued.bulk === 1, 'only one bulk request should hold a slot when maxInFlight is 2');
+const started = Date.now();
+await reserved.schedule('search', 'interactive', farDeadline(), async () => 'ok');
+check(Date.now() - started < 40, 'search should not wait behind bulk work');
+await Promise.all(builds);
+
+// Jobs without a deadline wait indefinitely but can be aborted while queued
+const abortable = new BridgeRequestScheduler({ maxInFlight: 1, maxQueued: 4 });
+const controller = new AbortController();
+let abortedRan = false;
+const running = abortable.schedule('encode', 'bulk', null, () => sleep(40));
+const aborted = abortable.schedule('encode', 'bulk', null, async () => { abortedRan = true; }, controller.signal).catch(error => error);
+controller.abort();
+const abortError = await aborted;
+await running;
+check(abortError instanceof Error && /cancelled/i.test(abortError.message), 'aborting a queued request should reject it');
+check(!abortedRan && abortable.getStats().queued.bulk === 0, 'aborted request should leave the queue without running');
+
+if (failed > 0) {
+  console.error(`${failed} bridge scheduler check(s) failed.`);
+  process.exit(1);
+}
+console.log('Bridge scheduler checks passed.');
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Unit probe: per-chunk metadata sidecar round trip and search filter semantics."""
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_chunk_metadata import (ChunkFilter, describe_file, file_type_of,  # noqa: E402
+                                   read_chunk_metadata, write_chunk_metadata)
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    if file_type_of('docs/Guide.MD') != 'md' or file_type_of('https://example.com/a.txt?x=1') != 'txt':
+        errors.append('file_type_of should return the lower-case extension without the dot')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / 'notes.py'
+        source.write_text('print("hello")\n', encoding='utf-8')
+        meta = describe_file(str(source))
+        if meta['file_type'] != 'py' or meta['file_size'] != source.stat().st_size or 'timestamp' not in meta:
+            errors.append(f'describe_file returned {meta}')
+
+        base = str(Path(tmp) / 'bank')
+        if read_chunk_metadata(base) != []:
+            errors.append('missing sidecar should read as an empty list')
+        write_chunk_metadata(base, [dict(meta, length=15), {'file_type': 'md', 'length': 900}])
+        entries = read_chunk_metadata(base)
+        if len(entries) != 2 or entries[1]['file_type'] != 'md':
+            errors.append(f'sidecar round trip failed: {entries}')
+
+    if ChunkFilter().active or ChunkFilter({'tags': ['x']}).active:
+        errors.append('empty and tag-only filters should be inactive')
+
+    by_type = ChunkFilter({'file_types': ['.PY', 'ts']})
+    if not by_type.matches({'file_type': 'py'}) or by_type.matches({'file_type': 'md'}):
+        errors.append('file_types filter should normalise dots and case')
+
+    by_date = ChunkFilter({'date_range': {'start': '2026-01-01', 'end': '2026-06-30T23:59:59Z'}})
+    if not by_date.matches({'timestamp': '2026-03-01T00:00:00+00:00'}):
+        errors.append('timestamp inside the range should match')
+    if by_date.matches({'timestamp': '2025-12-31T00:00:00+00:00'}):
+        errors.append('timestamp before the range should not match')
+    if not by_date.matches({}):
+        errors.append('chunks without a timestamp should not be excluded by a date range')
+
+    by_size = ChunkFilter({'content_length': {'min': 100}, 'max_file_size': 1000})
+    if by_size.matches({'length': 50}) or by_size.matches({'length': 200, 'file_size': 5000}):
+        errors.append('length and file size bounds should exclude out-of-range chunks')
+    if not by_size.matches({'length': 200, 'file_size': 500}):
+        errors.append('chunk within length and size bounds should match')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Chunk metadata checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Unit probe: binary chunk store layout, lazy views, backfill from the JSON index and cache reopen."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_mapped_bank import (ChunkStore, ChunkStoreCache, backfill_chunk_store, chunk_store_current,  # noqa: E402
+                                chunk_store_path, write_chunk_store)
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, 'bank')
+        texts = ['alpha chunk', '', 'gamma – unicode é', 'delta']
+        metadata = [{'source': 'a.md', 'file_type': 'md'}, {}, {'source': 'c.py', 'length': 20}]
+        stats = write_chunk_store(base, texts, metadata, {'embedding_model': 'test-model', 'dimension': 4})
+        if stats['chunks'] != 4 or stats['bytes'] != os.path.getsize(chunk_store_path(base)):
+            errors.append(f'stats should report chunks and file size: {stats}')
+
+        store = ChunkStore(chunk_store_path(base))
+        if len(store) != 4 or store.embedding_model != 'test-model' or store.info.get('dimension') != 4:
+            errors.append(f'header and info should round-trip: {len(store)} {store.info}')
+        if [store.texts.get(i) for i in range(4)] != texts:
+            errors.append('texts should round-trip by chunk id')
+        if store.texts.get(9) is not None or store.texts.get(-1, 'x') != 'x':
+            errors.append('out-of-range text lookups should return the default')
+        if [store.metadata[i] for i in range(4)] != metadata + [{}]:
+            errors.append(f'metadata should round-trip, empty for chunks without any: {[store.metadata[i] for i in range(4)]}')
+        if len(store.metadata) != 4 or sorted(store.texts.items()) != list(enumerate(texts)):
+            errors.append('views should expose len() and items() like the JSON-backed dict/list')
+        try:
+            store.metadata[4]
+            errors.append('metadata past the last chunk should raise IndexError')
+        except IndexError:
+            pass
+        store.close()
+
+        # Older bank: no store yet, only the memvid JSON index (ids may be sparse)
+        old = os.path.join(tmp, 'old')
+        with open(f"{old}.json", 'w', encoding='utf-8') as f:
+            json.dump({'metadata': [{'id': 0, 'text': 'first'}, {'id': 2, 'text': 'third'}],
+                       'config': {'embedding': {'model': 'json-model'}}}, f)
+        if chunk_store_current(old):
+            errors.append('a bank without a store should not count as current')
+        backfill_chunk_store(old, [{'source': 'x'}])
+        if not chunk_store_current(old):
+            errors.append('a backfilled store should be current')
+        cache = ChunkStoreCache()
+        backfilled = cache.get(old)
+        if [backfilled.texts.get(i) for i in range(3)] != ['first', '', 'third'] or backfilled.embedding_model != 'json-model':
+            errors.append('backfill should place texts by chunk id and keep the embedding model')
+        if backfilled.metadata[0] != {'source': 'x'} or backfilled.metadata[2] != {}:
+            errors.append('backfill should carry the metadata sidecar entries')
+        if cache.get(old) is not backfilled:
+            errors.append('cache should reuse the open store while the file is unchanged')
+
+        time.sleep(0.01)
+        write_chunk_store(old, ['rewritten'], [])
+        os.utime(chunk_store_path(old), (time.time() + 1, time.time() + 1))
+        reopened = cache.get(old)
+        if reopened is backfilled or reopened.texts.get(0) != 'rewritten':
+            errors.append('cache should reopen a rewritten store')
+        if backfilled.texts.get(2) != 'third':
+            errors.append('a store replaced on disk should stay readable for in-flight searches')
+        backfilled.close()
+        reopened.close()
+
+        if cache.get(os.path.join(tmp, 'missing')) is not None:
+            errors.append('missing stores should come back as None')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Chunk store checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
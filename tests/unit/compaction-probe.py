@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Unit probe: compaction merges adjacent small appends, keeps everything else and drops duplicate chunks."""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_chunk_metadata import ChunkFilter  # noqa: E402
+from bridge_compaction import bank_bytes, dedupe_chunks, merged_metadata, plan_compaction, split_pieces  # noqa: E402
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    doc = {'source': 'guide.md', 'file_type': 'md'}
+    texts = ['long ' * 60, 'more ' * 60,             # one document, two chunks
+             'note one', 'note two', 'note three',    # three small appends, the last with other tags
+             'x' * 400,                               # a large append
+             'lonely note']                           # a single small append
+    metas = [dict(doc, length=300, frame=0), dict(doc, length=300, frame=1),
+             {'source': 'agent', 'category': 'session', 'timestamp': '2026-01-01'},
+             {'source': 'agent', 'category': 'session', 'timestamp': '2026-01-03'},
+             {'source': 'agent', 'category': 'session', 'timestamp': '2026-01-02', 'tags': ['x']},
+             {'source': 'agent'},
+             {'source': 'agent', 'timestamp': '2026-01-04'}]
+
+    pieces = split_pieces(texts, metas)
+    if [len(chunks) for chunks, _ in pieces] != [2, 1, 1, 1, 1, 1]:
+        errors.append(f'adjacent chunks with the same metadata should form one piece: {pieces}')
+    if 'length' in pieces[0][1] or 'frame' in pieces[0][1]:
+        errors.append('per-chunk length/frame should not split or follow a piece')
+
+    segments, merged = plan_compaction(texts, metas, chunk_size=512)
+    kinds = [segment[0] for segment in segments]
+    if kinds != ['keep', 'merge', 'keep', 'keep', 'keep'] or merged != 2:
+        errors.append(f'only small appends with the same metadata should merge: {kinds} ({merged} merged)')
+    else:
+        _, text, meta = segments[1]
+        if text != 'note one\n\nnote two':
+            errors.append(f'merged text should keep append order: {text!r}')
+        if meta != {'source': 'agent', 'category': 'session', 'timestamp': '2026-01-03',
+                    'first_timestamp': '2026-01-01', 'compacted_from': 2}:
+            errors.append(f'merged metadata should keep every field and the timestamp span: {meta}')
+        if segments[2][2].get('tags') != ['x'] or segments[2][1] != ['note three']:
+            errors.append(f'a note with other tags should be kept with its own metadata: {segments[2]}')
+        if segments[0][1] != texts[:2] or segments[4][1] != ['lonely note']:
+            errors.append('chunks outside a run should be carried over unchanged')
+
+    # Notes from different sources are never merged, so their metadata survives compaction
+    notes = ['from the wiki', 'from slack', 'also slack']
+    note_metas = [{'source': 'wiki.md', 'file_type': 'md', 'timestamp': '2026-01-01'},
+                  {'source': 'slack', 'file_type': 'unknown', 'tags': ['chat'], 'timestamp': '2026-01-02'},
+                  {'source': 'slack', 'file_type': 'unknown', 'tags': ['chat'], 'timestamp': '2026-01-05'}]
+    segments, merged = plan_compaction(notes, note_metas, chunk_size=512)
+    if [segment[0] for segment in segments] != ['keep', 'merge'] or merged != 2:
+        errors.append(f'a run should break where the source changes: {segments}')
+    elif segments[0][2] != note_metas[0] or segments[1][2].get('source') != 'slack' or \
+            segments[1][2].get('tags') != ['chat']:
+        errors.append(f'merged and kept notes should keep their source and tags: {segments}')
+    else:
+        in_range = ChunkFilter({'date_range': {'start': '2026-01-03', 'end': '2026-01-04'}})
+        if not in_range.matches(segments[1][2]):
+            errors.append('a date range inside a merged chunk\'s span should match it')
+        if ChunkFilter({'date_range': {'end': '2026-01-01T12:00:00'}}).matches(segments[1][2]):
+            errors.append('a date range before a merged chunk\'s first note should not match it')
+        if not ChunkFilter({'file_types': ['md']}).matches(segments[0][2]):
+            errors.append('file type filters should still match a kept note')
+
+    if merged_metadata([{'a': 1, 'compacted_from': 3}, {'a': 1}])['compacted_from'] != 4:
+        errors.append('re-compacting should accumulate the piece count')
+
+    if plan_compaction([], [], 512) != ([], 0):
+        errors.append('an empty bank should plan nothing')
+
+    chunks, kept_metas, removed = dedupe_chunks(['a', 'b', ' a\n', 'c', 'b'], [{'i': i} for i in range(5)])
+    if chunks != ['a', 'b', 'c'] or [m['i'] for m in kept_metas] != [0, 1, 3] or removed != 2:
+        errors.append(f'later exact duplicates should be dropped with their metadata: {chunks} {kept_metas} {removed}')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, 'notes')
+        for suffix, size in (('.mp4', 100), ('.json', 20), ('.faiss', 30), ('.current', 7), ('.json.tmp', 50)):
+            with open(f"{base}{suffix}", 'wb') as f:
+                f.write(b'x' * size)
+        os.makedirs(f"{base}.generations")
+        if bank_bytes(base) != 150:
+            errors.append(f'bank_bytes should count bank files only: {bank_bytes(base)}')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Compaction checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: idle compaction waits for a quiet period, picks the bank with the most appends and runs one at a time.
+ */
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+
+const { IdleCompactionScheduler } = await import(pathToFileURL(path.join(projectRoot, 'dist/lib/compaction-scheduler.js')).href);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.error(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+let busy = false;
+const active = new Set();
+const started = [];
+let finish;
+const scheduler = new IdleCompactionScheduler({ idleMs: 1000, minAppends: 3 }, {
+  isBusy: () => busy,
+  hasActiveJob: bankName => active.has(bankName),
+  start: bankName => {
+    started.push(bankName);
+    return new Promise(resolve => { finish = resolve; });
+  }
+});
+
+const t0 = 1_000_000;
+for (let i = 0; i < 2; i++) scheduler.noteAppend('small', t0);
+for (let i = 0; i < 5; i++) scheduler.noteAppend('notes', t0);
+for (let i = 0; i < 4; i++) scheduler.noteAppend('docs', t0);
+
+check(scheduler.check(t0 + 500) === null, 'nothing should start before the idle period');
+busy = true;
+check(scheduler.check(t0 + 2000) === null, 'nothing should start while the bridge is busy');
+busy = false;
+active.add('notes');
+check(scheduler.check(t0 + 2000) === 'docs', 'banks with an active job should be skipped');
+active.delete('notes');
+check(started.join(',') === 'docs', `start should run for the picked bank: ${started}`);
+check(scheduler.check(t0 + 3000) === null, 'only one compaction should run at a time');
+check(scheduler.getStats().running === 'docs', 'stats should show the running compaction');
+
+scheduler.noteCompacted('docs');
+finish();
+await new Promise(resolve => setImmediate(resolve));
+check(scheduler.getStats().running === null, 'a finished compaction should free the slot');
+
+scheduler.noteActivity(t0 + 3000);
+check(scheduler.check(t0 + 3500) === null, 'new activity should restart the idle clock');
+check(scheduler.check(t0 + 4500) === 'notes', 'the bank with the most appends should go next');
+const stats = scheduler.getStats();
+check(stats.started === 2 && stats.pending.small === 2 && stats.pending.docs === undefined,
+  `stats should track starts and pending appends: ${JSON.stringify(stats)}`);
+check(!('notes' in stats.pending) || stats.pending.notes === 5, 'pending counts reset only through noteCompacted');
+
+if (failed > 0) {
+  console.error(`${failed} compaction scheduler check(s) failed.`);
+  process.exit(1);
+}
+console.log('Compaction scheduler checks passed.');
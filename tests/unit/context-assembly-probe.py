@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Unit probe: context assembly expands hits within a document, drops overlap and duplicates, and packs to the budget."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_context import (EstimateTokenizer, dedupe_hits, expand_hits, join_chunks, make_tokenizer,  # noqa: E402
+                            overlap_length, pack_context)
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    # Bank "a": chunks 0-3 are one document, 4-5 another; bank "b" has no metadata
+    doc1 = {'source': 'notes.md', 'timestamp': 't1'}
+    doc2 = {'source': 'todo.md', 'timestamp': 't2'}
+    chunks_a = [
+        ('Alpha one. The start of notes', dict(doc1, length=29)),
+        ('start of notes continues here. Beta two', dict(doc1, length=39)),
+        ('Gamma three follows on', dict(doc1, length=22)),
+        ('Delta four ends notes', dict(doc1, length=21)),
+        ('Todo first item', dict(doc2, length=15)),
+        ('Todo second item', dict(doc2, length=16)),
+    ]
+    chunks_b = ['Loose chunk zero', 'Loose chunk one', 'Alpha one. The start of notes']
+
+    lookups = {
+        'a': lambda i: chunks_a[i] if 0 <= i < len(chunks_a) else None,
+        'b': lambda i: (chunks_b[i], {}) if 0 <= i < len(chunks_b) else None,
+    }
+
+    def hit(bank, chunk_id, score):
+        text, meta = lookups[bank](chunk_id)
+        return {'bank': bank, 'chunk_id': chunk_id, 'score': score, 'content': text, 'metadata': dict(meta)}
+
+    hits = [hit('a', 1, 0.9), hit('b', 2, 0.85), hit('a', 3, 0.8), hit('a', 4, 0.7), hit('b', 1, 0.6)]
+    deduped = dedupe_hits(hits)
+    if len(deduped) != 5:
+        errors.append(f'distinct chunks should all be kept: {len(deduped)}')
+    if len(dedupe_hits(hits + [hit('b', 2, 0.1)])) != 5:
+        errors.append('a repeated chunk text should be dropped')
+
+    spans = expand_hits(deduped, 1, lookups)
+    by_range = {(s['bank'], s['start'], s['end']): s for s in spans}
+    if ('a', 0, 3) not in by_range or by_range[('a', 0, 3)]['hits'] != [1, 3] or by_range[('a', 0, 3)]['score'] != 0.9:
+        errors.append(f'neighbors of hits in one document should merge into one span: {sorted(by_range)}')
+    if ('a', 4, 5) not in by_range:
+        errors.append(f'expansion should stop at the document boundary: {sorted(by_range)}')
+    if ('b', 1, 1) not in by_range or ('b', 2, 2) not in by_range:
+        errors.append(f'chunks without metadata should never be expanded or merged: {sorted(by_range)}')
+    if [s['score'] for s in spans] != sorted((s['score'] for s in spans), reverse=True):
+        errors.append('spans should come back best first')
+    if len(expand_hits(deduped, 0, lookups)) != 5:
+        errors.append('neighbors=0 should keep one span per hit')
+
+    if overlap_length('The start of notes', 'start of notes continues') != len('start of notes'):
+        errors.append('overlap should be the longest suffix/prefix match')
+    if overlap_length('abc', 'xyz and more') != 0:
+        errors.append('unrelated chunks should have no overlap')
+    joined = join_chunks([chunks_a[0][0], chunks_a[1][0], chunks_a[2][0]])
+    if joined != 'Alpha one. The start of notes continues here. Beta two Gamma three follows on':
+        errors.append(f'join should drop the overlap once: {joined!r}')
+
+    tokenizer = EstimateTokenizer()
+    if tokenizer.count('Hello, world!') != 6 or tokenizer.truncate('Hello, world!', 3) != 'Hello,':
+        errors.append('the estimate should count word pieces and symbols')
+    if make_tokenizer(None).name != 'estimate' or make_tokenizer('estimate').name != 'estimate':
+        errors.append('auto without a model tokenizer should fall back to the estimate')
+    for bad in ('model', 'bogus'):
+        try:
+            make_tokenizer(bad)
+            errors.append(f'tokenizer {bad!r} should be rejected without a model tokenizer')
+        except ValueError:
+            pass
+
+    long_text = ' '.join(f'word{i}' for i in range(200))
+    sections = [
+        {'header': '[Source: a]\n', 'text': 'short relevant text', 'id': 1},
+        {'header': '', 'text': long_text, 'id': 2},
+        {'header': '', 'text': 'Short Relevant  text', 'id': 3},
+        {'header': '', 'text': 'another small section', 'id': 4},
+    ]
+    context, packed, total = pack_context(sections, 120, tokenizer)
+    if total > 120 or total != tokenizer.count(context):
+        errors.append(f'packed context should fit the budget exactly as counted: {total}')
+    ids = [s['id'] for s in packed]
+    if ids[:2] != [1, 2] or 3 in ids or not packed[1]['truncated']:
+        errors.append(f'sections should pack best first, cut the one that overflows and skip duplicates: {ids}')
+    if not context.startswith('[Source: a]\nshort relevant text\n\n---\n\nword0'):
+        errors.append(f'headers and separators should be kept: {context[:60]!r}')
+
+    _, packed, total = pack_context(sections, 40, tokenizer)
+    if [s['id'] for s in packed] != [1, 4] or total > 40:
+        errors.append(f'a section too large for the remaining budget should be skipped: {[s["id"] for s in packed]}')
+    context, packed, total = pack_context([], 100, tokenizer)
+    if context != '' or packed or total != 0:
+        errors.append('nothing to pack should give an empty context')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Context assembly checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Unit probe: the control channel answers on its own descriptor, even while the bridge's stdout is stalled."""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+LIB = Path(__file__).resolve().parents[2] / 'src' / 'lib'
+sys.path.insert(0, str(LIB))
+
+from bridge_control import CONTROL_FD_ENV, ControlChannel, control_fd  # noqa: E402
+
+
+class Replies:
+    """Newline-delimited JSON replies from one socket, one per call (a recv can hold several)."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = b''
+
+    def read(self, timeout: float) -> dict:
+        self.sock.settimeout(timeout)
+        while b'\n' not in self.buffer:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise EOFError('control channel closed')
+            self.buffer += chunk
+        line, self.buffer = self.buffer.split(b'\n', 1)
+        return json.loads(line)
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    os.environ.pop(CONTROL_FD_ENV, None)
+    if control_fd() is not None:
+        errors.append('no descriptor should be used without the variable')
+    os.environ[CONTROL_FD_ENV] = 'nope'
+    if control_fd() is not None:
+        errors.append('an invalid descriptor should be ignored')
+
+    # The channel answers requests in order and turns handler errors into error responses
+    server, client = socket.socketpair()
+    blocked = threading.Event()
+
+    def handle(request: dict) -> dict:
+        if request['method'] == 'boom':
+            raise ValueError('bad request')
+        return {'id': request['id'], 'result': {'status': 'pong', 'blocked': blocked.is_set()}}
+
+    channel = ControlChannel(server.detach(), handle)
+    channel.start()
+    replies = Replies(client)
+    client.sendall(b'{"id": "1", "method": "ping"}\n\n{"id": "2", "method": "boom"}\n')
+    first = replies.read(5)
+    if first != {'id': '1', 'result': {'status': 'pong', 'blocked': False}}:
+        errors.append(f'ping should be answered: {first}')
+    second = replies.read(5)
+    if second.get('id') != '2' or second.get('error', {}).get('type') != 'ValueError':
+        errors.append(f'handler errors should become error responses: {second}')
+    client.sendall(b'not json\n')
+    third = replies.read(5)
+    if third.get('id') is not None or 'error' not in third:
+        errors.append(f'malformed lines should get an error response: {third}')
+    client.close()
+    channel.join(5)
+    if channel.served != 3:
+        errors.append(f'three responses should have been written: {channel.served}')
+
+    # End to end: a bridge whose stdout nobody reads still answers pings on the control channel
+    server, client = socket.socketpair()
+    workdir = tempfile.TemporaryDirectory()  # the bridge writes its log file to its working directory
+    env = {**os.environ, CONTROL_FD_ENV: str(server.fileno()), 'PYTHONUNBUFFERED': '1',
+           'MEMVID_LOG_LEVELS': 'error'}
+    bridge = subprocess.Popen([sys.executable, str(LIB / 'memvid-bridge.py')], cwd=workdir.name, env=env,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              pass_fds=(server.fileno(),))
+    server.close()
+    replies = Replies(client)
+    try:
+        ready = json.loads(bridge.stdout.readline())
+        if ready.get('control') is not True:
+            errors.append(f'the ready signal should announce the control channel: {ready}')
+
+        # Fill the stdout pipe: the stdin loop blocks writing responses nobody reads
+        def flood() -> None:
+            try:
+                for i in range(5000):
+                    bridge.stdin.write(json.dumps({'id': f'log-{i}', 'method': 'logs', 'params': {'limit': 50}})
+                                       .encode() + b'\n')
+                bridge.stdin.flush()
+            except (BrokenPipeError, OSError):
+                pass
+
+        threading.Thread(target=flood, daemon=True).start()
+        time.sleep(1.0)
+
+        latencies = []
+        for i in range(20):
+            started = time.perf_counter()
+            client.sendall(json.dumps({'id': f'c{i}', 'method': 'ping'}).encode() + b'\n')
+            response = replies.read(5)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.get('result', {}).get('status') != 'pong':
+                errors.append(f'control ping should answer while stdout is stalled: {response}')
+                break
+        if latencies and max(latencies) > 500:
+            errors.append(f'control pings should stay fast under data-plane load: max {max(latencies):.1f}ms')
+
+        # Bank stats only read headers and are served here too, not behind the data plane
+        client.sendall(json.dumps({'id': 's', 'method': 'stats',
+                                   'params': {'bank_paths': [os.path.join(workdir.name, 'missing')]}}).encode() + b'\n')
+        stats = replies.read(5)
+        banks = stats.get('result', {}).get('banks') or [{}]
+        if not stats.get('result', {}).get('success') or banks[0].get('success') is not False:
+            errors.append(f'stats should be answered on the control channel: {stats}')
+
+        client.sendall(b'{"id": "m", "method": "metrics"}\n')
+        metrics = replies.read(5)
+        if not metrics.get('result', {}).get('success') or 'families' not in metrics['result']:
+            errors.append(f'metrics should be served on the control channel: {str(metrics)[:200]}')
+    except Exception as e:
+        errors.append(f'bridge control channel failed: {type(e).__name__}: {e}')
+    finally:
+        client.close()
+        bridge.kill()
+        bridge.wait()
+        workdir.cleanup()
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Control channel checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Unit probe: length-bucketed embedding batches, adaptive batch size and vector order."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_embedding import AdaptiveBatchSize, EmbeddingStage, PrecomputedEmbeddings  # noqa: E402
+
+
+class FakeModel:
+    """Returns [len(text)] per text and records each batch it was given."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        if isinstance(texts, str):
+            return ['fallback']
+        self.batches.append(list(texts))
+        return [[len(text)] for text in texts]
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    texts = ['x' * length for length in (5, 300, 40, 1000, 12, 700, 80, 3, 900, 60)]
+    model = FakeModel()
+    progress: list[tuple[int, int]] = []
+    stage = EmbeddingStage(model, batch_size=4, batch_chars=2000)
+    vectors = stage.embed(texts, on_batch=lambda done, total: progress.append((done, total)))
+
+    if vectors != [[len(text)] for text in texts]:
+        errors.append('vectors should come back in input order')
+    for batch in model.batches:
+        lengths = [len(text) for text in batch]
+        if lengths != sorted(lengths, reverse=True):
+            errors.append(f'batches should be length-sorted: {lengths}')
+        if len(batch) > 1 and len(batch) * max(lengths) > 2000:
+            errors.append(f'batch exceeds the padded character cap: {lengths}')
+    if len(model.batches[0]) != 2:
+        errors.append(f'longest chunks should get a capped batch: {[len(t) for t in model.batches[0]]}')
+    if progress[-1] != (len(texts), len(texts)) or stage.stats.get('chunks') != len(texts):
+        errors.append(f'progress and stats should cover every chunk: {progress} {stage.stats}')
+    if 'chunks_per_sec' not in stage.stats or 'intra_op_threads' not in stage.stats:
+        errors.append(f'stats should report throughput and thread config: {stage.stats}')
+
+    # Throughput hill-climb: grow while faster, step back and settle once slower
+    batcher = AdaptiveBatchSize(initial=32)
+    batcher.observe(1000, 1.0)  # warm-up batch is ignored
+    if batcher.size != 32:
+        errors.append('warm-up batch should not change the size')
+    batcher.observe(1000, 1.0)
+    batcher.observe(3000, 1.0)
+    if batcher.size != 128:
+        errors.append(f'improving throughput should keep doubling: {batcher.size}')
+    batcher.observe(1000, 1.0)
+    if batcher.size != 64:
+        errors.append(f'a throughput drop should step back: {batcher.size}')
+    batcher.observe(9000, 1.0)
+    if batcher.size != 64:
+        errors.append(f'size should stay settled: {batcher.size}')
+    batcher.observe(1000, 1.0, over_memory=True)
+    if batcher.size != 32:
+        errors.append(f'memory pressure should halve the size: {batcher.size}')
+
+    precomputed = PrecomputedEmbeddings(model, ['a'], [[1.0]])
+    if precomputed.encode('unknown') != ['fallback'] or precomputed.batches is not model.batches:
+        errors.append('unknown texts and attributes should fall through to the wrapped model')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Embedding stage checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
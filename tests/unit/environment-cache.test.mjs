@@ -0,0 +1,100 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: the environment cache finds commands without running them and drops entries when Python changes or they age out.
+ */
+import { chmodSync, mkdirSync, mkdtempSync, rmSync, utimesSync, writeFileSync } from 'fs';
+import os from 'os';
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+const { EnvironmentCache, environmentCacheEnabled, environmentFingerprint, fingerprintsEqual, resolveExecutable } = await import(
+  pathToFileURL(path.join(projectRoot, 'dist/lib/environment-cache.js')).href
+);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.log(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+const dir = mkdtempSync(path.join(os.tmpdir(), 'env-cache-test-'));
+const binA = path.join(dir, 'a');
+const binB = path.join(dir, 'b');
+mkdirSync(binA);
+mkdirSync(binB);
+const isWindows = process.platform === 'win32';
+const exe = isWindows ? '.EXE' : '';
+
+function install(binDir, contents) {
+  const file = path.join(binDir, `fakepython${exe}`);
+  writeFileSync(file, contents);
+  chmodSync(file, 0o755);
+  return file;
+}
+
+try {
+  const pathEnv = [binA, binB].join(path.delimiter);
+  check(resolveExecutable('fakepython', pathEnv) === null, 'a missing command should not resolve');
+  writeFileSync(path.join(binA, 'fakepython'), 'not executable');
+  if (!isWindows) {
+    check(resolveExecutable('fakepython', pathEnv) === null, 'non-executable files should be skipped');
+  }
+  rmSync(path.join(binA, 'fakepython'));
+
+  const pythonB = install(binB, '#!/bin/sh\n');
+  const resolved = resolveExecutable('fakepython', pathEnv);
+  check(resolved?.path === pythonB && resolved.size === 10, `the command should resolve along PATH: ${JSON.stringify(resolved)}`);
+  check(resolveExecutable(pythonB, '')?.path === pythonB, 'a command given as a path should resolve without PATH');
+
+  process.env.PATH = pathEnv;
+  process.env.PYTHON_EXECUTABLE = '';
+  const fingerprint = environmentFingerprint(['fakepython', 'no-such-python']);
+  check(fingerprint.executables['no-such-python'] === null, 'missing candidates should be recorded as null');
+  check(!('PYTHON_EXECUTABLE' in fingerprint.env), 'empty variables should not be part of the fingerprint');
+  const reordered = { ...fingerprint, executables: { 'no-such-python': null, fakepython: fingerprint.executables.fakepython } };
+  check(fingerprintsEqual(fingerprint, reordered), 'fingerprints should compare regardless of key order');
+
+  const cache = new EnvironmentCache(path.join(dir, 'config', 'environment-cache.json'), 60000);
+  const now = Date.now();
+  check(await cache.get('python', fingerprint, now) === null, 'an empty cache should miss');
+  await cache.set('python', fingerprint, 'fakepython', now);
+  await cache.set('setup', fingerprint, { isReady: true }, now);
+  check(await cache.get('python', environmentFingerprint(['fakepython', 'no-such-python']), now + 1000) === 'fakepython',
+    'an unchanged environment should hit');
+  check((await cache.get('setup', fingerprint, now))?.isReady === true, 'entries should be kept per key');
+  check(await cache.get('python', fingerprint, now + 61000) === null, 'entries older than the max age should miss');
+
+  // Reinstalling Python (new mtime) or a new candidate earlier on PATH invalidates the entry
+  utimesSync(pythonB, new Date(), new Date(now + 5000));
+  check(await cache.get('python', environmentFingerprint(['fakepython', 'no-such-python']), now) === null,
+    'a changed executable should miss');
+  await cache.set('python', environmentFingerprint(['fakepython']), 'fakepython', now);
+  install(binA, '#!/bin/sh\n# newer\n');
+  check(await cache.get('python', environmentFingerprint(['fakepython']), now) === null,
+    'a command that now resolves elsewhere should miss');
+
+  process.env.PYTHON_EXECUTABLE = '/opt/python';
+  check(!fingerprintsEqual(fingerprint, environmentFingerprint(['fakepython', 'no-such-python'])),
+    'setting PYTHON_EXECUTABLE should change the fingerprint');
+
+  writeFileSync(path.join(dir, 'config', 'environment-cache.json'), '{ not json');
+  check(await cache.get('python', fingerprint, now) === null, 'a corrupt cache file should miss');
+  await cache.set('python', fingerprint, 'fakepython', now);
+  check(await cache.get('python', fingerprint, now) === 'fakepython', 'a corrupt cache file should be replaced');
+
+  process.env.MEMVID_ENV_CACHE = 'off';
+  check(!environmentCacheEnabled(), 'MEMVID_ENV_CACHE=off should disable the cache');
+  delete process.env.MEMVID_ENV_CACHE;
+  check(environmentCacheEnabled(), 'the cache should be enabled by default');
+} finally {
+  rmSync(dir, { recursive: true, force: true });
+}
+
+if (failed > 0) {
+  console.log(`${failed} environment cache check(s) failed.`);
+  process.exit(1);
+}
+console.log('Environment cache checks passed.');
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Unit probe: ordered process-pool frame rendering and the frame-indexed container."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+import bridge_frames  # noqa: E402
+from bridge_frames import FrameContainer, FrameContainerWriter, render_frames  # noqa: E402
+
+
+def fake_init_worker(frame_size, want_png):
+    # Stand-in for memvid's QR helpers: the "frame" is the payload itself
+    bridge_frames._worker_state.update(encode=lambda payload: payload, to_frame=lambda image, size: image,
+                                       size=frame_size, png=False)
+
+
+def main() -> int:
+    errors: list[str] = []
+    bridge_frames._init_worker = fake_init_worker
+
+    texts = [f"chunk {i}" for i in range(101)]
+    for workers in (1, 3):
+        rendered = list(render_frames(texts, workers, (64, 64)))
+        numbers = [frame_number for frame_number, _, _ in rendered]
+        if numbers != list(range(len(texts))):
+            errors.append(f'{workers} worker(s): frames should stream in chunk order')
+        payloads = [json.loads(frame) for _, frame, _ in rendered]
+        if any(p['id'] != i or p['frame'] != i or p['text'] != texts[i] for i, p in enumerate(payloads)):
+            errors.append(f'{workers} worker(s): payloads should match memvid build_video')
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'bank.frames')
+        blobs = [bytes([i]) * (i + 1) for i in range(50)]
+        writer = FrameContainerWriter(path, len(blobs), (256, 128))
+        for blob in blobs:
+            writer.append(blob)
+        writer.close()
+        if os.path.exists(f"{path}.tmp"):
+            errors.append('temporary container file should be renamed into place')
+
+        container = FrameContainer(path)
+        if len(container) != 50 or container.frame_size != (256, 128):
+            errors.append(f'header mismatch: {len(container)} frames, size {container.frame_size}')
+        if any(container.frame_bytes(i) != blob for i, blob in enumerate(blobs)):
+            errors.append('frame_bytes should return each stored frame exactly')
+        try:
+            container.frame_bytes(50)
+            errors.append('out-of-range frame should raise IndexError')
+        except IndexError:
+            pass
+        container.close()
+
+        short = FrameContainerWriter(os.path.join(workdir, 'short.frames'), 3, (8, 8))
+        short.append(b'x')
+        try:
+            short.close()
+            errors.append('closing with missing frames should fail')
+        except ValueError:
+            short.abort()
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Frame container checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Unit probe: bank generations are published atomically, pinned while in use and collected after."""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_generations import (GenerationTracker, allocate, current_generation, discard,  # noqa: E402
+                                generation_base, list_generations, publish, resolve)
+
+
+def write_bank(base: str, label: str) -> None:
+    for suffix in ('.mp4', '.json', '.faiss', '.chunks'):
+        with open(f"{base}{suffix}", 'w', encoding='utf-8') as f:
+            f.write(f"{label}{suffix}")
+
+
+def read(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = os.path.join(tmp, 'notes')
+
+        # A legacy flat bank resolves to itself
+        write_bank(bank, 'flat')
+        if resolve(bank) != (None, bank):
+            errors.append(f'flat banks should resolve to their own base: {resolve(bank)}')
+
+        removed: list[str] = []
+        tracker = GenerationTracker(removed.append)
+
+        number, base = allocate(bank)
+        if number != 1 or base != generation_base(bank, 1):
+            errors.append(f'first generation should be 1: {number} {base}')
+        write_bank(base, 'g1')
+        if read(f"{bank}.json") != 'flat.json' or current_generation(bank) is not None:
+            errors.append('an unpublished generation must not be visible')
+        publish(bank, number)
+        if resolve(bank) != (1, base):
+            errors.append(f'publish should swap the pointer: {resolve(bank)}')
+        if read(f"{bank}.mp4") != 'g1.mp4' or read(f"{bank}.faiss") != 'g1.faiss':
+            errors.append('flat files should follow the published generation')
+        if os.path.exists(f"{bank}.chunks") and read(f"{bank}.chunks") != 'flat.chunks':
+            errors.append('only the flat compatibility files should be swapped')
+
+        # A search pins generation 1 while generation 2 is built and published
+        with tracker.use(bank) as pinned:
+            if pinned != base:
+                errors.append(f'use() should yield the current generation: {pinned}')
+            number2, base2 = allocate(bank)
+            write_bank(base2, 'g2')
+            publish(bank, number2)
+            tracker.collect(bank)
+            if 1 not in list_generations(bank) or read(f"{pinned}.json") != 'g1.json':
+                errors.append('a pinned generation must survive collection')
+            if tracker.in_use(bank) != {1: 1}:
+                errors.append(f'in_use should count the pinned search: {tracker.in_use(bank)}')
+        if list_generations(bank) != [2]:
+            errors.append(f'the last reader leaving should collect the old generation: {list_generations(bank)}')
+        if removed != [base]:
+            errors.append(f'collection should report removed generation bases: {removed}')
+        if read(f"{bank}.json") != 'g2.json' or resolve(bank)[0] != 2:
+            errors.append('readers after the swap should see generation 2')
+
+        # A failed build is discarded without touching the published generation
+        number3, base3 = allocate(bank)
+        write_bank(base3, 'g3')
+        discard(bank, number3)
+        if list_generations(bank) != [2] or resolve(bank)[0] != 2:
+            errors.append(f'discard should drop only the unpublished generation: {list_generations(bank)}')
+
+        # Generations still being written (newer than current) are never collected
+        number4, base4 = allocate(bank)
+        if number4 != 3:
+            errors.append(f'generation numbers should continue after the highest existing one: {number4}')
+        tracker.collect(bank)
+        if number4 not in list_generations(bank):
+            errors.append('an in-progress generation must not be collected')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Generation checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
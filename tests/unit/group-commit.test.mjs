@@ -0,0 +1,103 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: appends to one bank within the window are committed together, per key, with per-item results.
+ */
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+
+const { GroupCommitter } = await import(pathToFileURL(path.join(projectRoot, 'dist/lib/group-commit.js')).href);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.error(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+const commits = [];
+let release = null;
+const committer = new GroupCommitter({ windowMs: 20, maxItems: 5 }, async (key, items) => {
+  commits.push({ key, items: [...items] });
+  if (release) {
+    await new Promise(resolve => { release = resolve; });
+  }
+  if (items.includes('boom')) {
+    throw new Error('write failed');
+  }
+  return items.map(item => `${key}:${item}`);
+});
+
+// A burst within the window is one group; each submitter gets its own result
+const burst = await Promise.all(['a', 'b', 'c'].map(item => committer.submit('notes', item)));
+check(commits.length === 1 && commits[0].items.join() === 'a,b,c', `a burst should be one commit: ${JSON.stringify(commits)}`);
+check(burst.join() === 'notes:a,notes:b,notes:c', `each item should get its own result: ${burst}`);
+
+// Different keys are committed separately
+commits.length = 0;
+await Promise.all([committer.submit('x', 1), committer.submit('y', 2), committer.submit('x', 3)]);
+check(commits.length === 2, `each key should get its own commit: ${JSON.stringify(commits)}`);
+check(commits.find(commit => commit.key === 'x')?.items.join() === '1,3', 'items should be grouped by key');
+
+// A full group is committed without waiting for the window
+commits.length = 0;
+const started = Date.now();
+const full = committer.submitMany('notes', [1, 2, 3, 4, 5]);
+await sleep(0);
+check(commits.length === 1, 'a full group should be committed immediately');
+await full;
+check(Date.now() - started < 20, 'a full group should not wait for the window');
+
+// The next group keeps filling while one commits and is written after it
+commits.length = 0;
+release = () => {};
+const first = committer.submit('slow', 'first');
+await sleep(30);
+const queued = ['second', 'third'].map(item => committer.submit('slow', item));
+await sleep(40);
+check(commits.length === 1, 'the next group should wait for the running commit');
+check(committer.getStats().pending.slow === 2 && committer.getStats().committing.includes('slow'),
+  `stats should show the pending group: ${JSON.stringify(committer.getStats())}`);
+const releaseFirst = release;
+release = null;
+releaseFirst();
+await first;
+await Promise.all(queued);
+check(commits.length === 2 && commits[1].items.join() === 'second,third', `queued items should be committed as one group: ${JSON.stringify(commits)}`);
+
+// Under sustained load groups stay within maxItems; the overflow forms the next groups, in order
+commits.length = 0;
+release = () => {};
+const running = committer.submit('busy', 0);
+await sleep(30);
+const backlog = Array.from({ length: 12 }, (_, i) => committer.submit('busy', i + 1));
+await sleep(40);
+check(committer.getStats().pending.busy === 12, `the backlog should wait behind the running commit: ${JSON.stringify(committer.getStats())}`);
+const releaseRunning = release;
+release = null;
+releaseRunning();
+await running;
+await Promise.all(backlog);
+const sizes = commits.map(commit => commit.items.length);
+check(sizes.join() === '1,5,5,2', `groups should be capped at maxItems: ${sizes}`);
+check(commits.flatMap(commit => commit.items).join() === Array.from({ length: 13 }, (_, i) => i).join(),
+  'capped groups should commit items in submission order');
+
+// A failed commit rejects every item of its group and nothing else
+const results = await Promise.allSettled([committer.submit('bad', 'ok'), committer.submit('bad', 'boom'), committer.submit('good', 'ok')]);
+check(results[0].status === 'rejected' && results[1].status === 'rejected', 'a failed commit should reject its whole group');
+check(results[2].status === 'fulfilled', 'other keys should be unaffected by a failed commit');
+
+const stats = committer.getStats();
+check(stats.largest_group === 5 && stats.items === 30, `stats should count groups and items: ${JSON.stringify(stats)}`);
+check(Object.keys(stats.pending).length === 0 && stats.committing.length === 0, 'nothing should be left pending');
+
+if (failed > 0) {
+  console.error(`${failed} group commit check(s) failed.`);
+  process.exit(1);
+}
+console.log('Group commit checks passed.');
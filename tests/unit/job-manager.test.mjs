@@ -0,0 +1,67 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: background job lifecycle, stage progress and cancellation.
+ */
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+
+const { JobManager } = await import(pathToFileURL(path.join(projectRoot, 'dist/lib/job-manager.js')).href);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.error(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+const jobs = new JobManager();
+
+// start() returns before the work finishes; progress updates stage and overall fraction
+let finishBuild;
+const progressEvents = [];
+jobs.on('progress', status => progressEvents.push(status.progress.overall));
+const started = jobs.start('create_memory_bank', 'notes', async ({ reportProgress }) => {
+  reportProgress({ stage: 'read', current: 1, total: 1 });
+  reportProgress({ stage: 'embed', current: 5, total: 10 });
+  await new Promise(resolve => { finishBuild = resolve; });
+  return { success: true, chunks_created: 10 };
+});
+check(started.state === 'queued' && started.job_id, 'start should return a queued job with an id');
+await sleep(5);
+const running = jobs.get(started.job_id);
+check(running.state === 'running' && running.stage === 'embed', `expected running in embed, got ${running.state}/${running.stage}`);
+check(running.stages.map(s => s.stage).join(',') === 'read,embed', `unexpected stage history ${JSON.stringify(running.stages)}`);
+check(Math.abs(running.progress.overall - 0.7) < 1e-9, `embed 5/10 should be 70% overall, got ${running.progress.overall}`);
+check(progressEvents.length === 2, 'each progress report should be emitted');
+check(jobs.activeJobFor('notes')?.job_id === started.job_id, 'unfinished job should be active for its bank');
+
+finishBuild();
+const result = await jobs.wait(started.job_id);
+const done = jobs.get(started.job_id);
+check(result.chunks_created === 10 && done.state === 'succeeded' && done.progress.overall === 1, 'finished job should succeed');
+check(jobs.activeJobFor('notes') === null, 'finished job should no longer be active');
+check(!jobs.cancel(started.job_id), 'a finished job cannot be cancelled');
+
+// cancel() aborts the job's signal; failures are reported, not thrown
+const cancellable = jobs.start('create_memory_bank', 'docs', ({ signal }) => new Promise((resolve, reject) => {
+  signal.addEventListener('abort', () => reject(new Error('Request cancelled: encode')));
+}));
+await sleep(5);
+check(jobs.cancel(cancellable.job_id), 'cancelling a running job should succeed');
+await jobs.wait(cancellable.job_id);
+check(jobs.get(cancellable.job_id).state === 'cancelled', 'cancelled job should end in cancelled state');
+
+const failing = jobs.start('create_memory_bank', 'bad', async () => ({ success: false, message: 'no sources' }));
+await jobs.wait(failing.job_id);
+check(jobs.get(failing.job_id).state === 'failed' && jobs.get(failing.job_id).error === 'no sources', 'unsuccessful result should fail the job');
+check(jobs.list()[0].job_id === failing.job_id, 'list should return the most recent job first');
+
+if (failed > 0) {
+  console.error(`${failed} job manager check(s) failed.`);
+  process.exit(1);
+}
+console.log('Job manager checks passed.');
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Unit probe: BM25 keyword index build, mmap lookup and identifier tokenization."""
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_keyword_index import KeywordIndex, build_keyword_index, keyword_index_path, tokenize  # noqa: E402
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    tokens = tokenize('ErrorRecoveryManager.executeWithRecovery')
+    for expected in ('errorrecoverymanager.executewithrecovery', 'executewithrecovery', 'recovery', 'manager'):
+        if expected not in tokens:
+            errors.append(f'tokenizer missing {expected!r}: {tokens}')
+
+    documents = [
+        (10, 'ErrorRecoveryManager.executeWithRecovery retries transient failures'),
+        (11, 'Semantic search over memory banks with sentence embeddings'),
+        (12, 'The circuit breaker opens after repeated recovery failures'),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        base = str(Path(tmp) / 'bank')
+        stats = build_keyword_index(base, documents)
+        if stats['documents'] != 3:
+            errors.append(f'expected 3 documents, got {stats}')
+
+        index = KeywordIndex(keyword_index_path(base))
+        hits = index.search('ErrorRecoveryManager.executeWithRecovery', 2)
+        if not hits or hits[0][0] != 10:
+            errors.append(f'identifier query should rank chunk 10 first: {hits}')
+        if index.search('nonexistentterm', 5):
+            errors.append('unknown term should return no hits')
+        if [chunk_id for chunk_id, _ in index.search('semantic embeddings', 5)] != [11]:
+            errors.append('natural-language query should match chunk 11 only')
+        index.close()
+
+        empty_base = str(Path(tmp) / 'empty')
+        build_keyword_index(empty_base, [])
+        empty = KeywordIndex(keyword_index_path(empty_base))
+        if empty.search('anything', 3):
+            errors.append('empty index should return no hits')
+        empty.close()
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Keyword index checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
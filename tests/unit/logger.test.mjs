@@ -0,0 +1,63 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: the server logger batches stderr writes, honors LOG_LEVEL and keeps a ring buffer.
+ */
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+
+process.env.LOG_LEVEL = 'info';
+delete process.env.DEBUG;
+const { logger } = await import(pathToFileURL(path.join(projectRoot, 'dist/lib/logger.js')).href);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.log(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+const writes = [];
+const originalWrite = process.stderr.write.bind(process.stderr);
+process.stderr.write = chunk => {
+  writes.push(String(chunk));
+  return true;
+};
+
+logger.info('first %s', 'line', { id: 1 });
+logger.debug('hidden');
+logger.warn('second');
+logger.entry({ ts: Date.UTC(2026, 0, 1), level: 'error', component: 'bridge_frames', msg: 'render failed' });
+check(writes.length === 0, 'log calls should not write synchronously');
+
+await new Promise(resolve => setImmediate(resolve));
+process.stderr.write = originalWrite;
+
+check(writes.length === 1, `queued lines should go out in one write, got ${writes.length}`);
+const lines = (writes[0] ?? '').trimEnd().split('\n');
+check(lines.length === 3, `debug lines should be dropped below LOG_LEVEL: ${JSON.stringify(lines)}`);
+check(/^\[INFO\] .* - first line \{ id: 1 \}$/.test(lines[0] ?? ''), `args should be formatted like console: ${lines[0]}`);
+check((lines[2] ?? '').startsWith('[ERROR] 2026-01-01T00:00:00.000Z - [bridge_frames] render failed'),
+  `external entries should keep their time and component: ${lines[2]}`);
+
+const recent = logger.recent();
+check(recent.map(entry => entry.msg).join('|') === 'first line { id: 1 }|second|render failed', 'recent() should return entries oldest first');
+check(logger.recent(10, 'warn').length === 2 && logger.recent(1)[0]?.component === 'bridge_frames',
+  'recent() should filter by level and limit to the newest');
+
+process.stderr.write = () => true;
+for (let i = 0; i < 1100; i++) {
+  logger.info(`bulk ${i}`);
+}
+await new Promise(resolve => setImmediate(resolve));
+process.stderr.write = originalWrite;
+const all = logger.recent(5000);
+check(all.length === 1000 && all[0].msg === 'bulk 100' && all[999].msg === 'bulk 1099', 'the ring buffer should keep the newest 1000 entries');
+
+if (failed > 0) {
+  console.log(`${failed} logger check(s) failed.`);
+  process.exit(1);
+}
+console.log('Logger checks passed.');
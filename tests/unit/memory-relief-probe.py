@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Unit probe: idle tracking picks the least recently used entries and the relief helpers run anywhere."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_memory import UsageClock, rss_mb, trim_heap  # noqa: E402
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    clock = UsageClock()
+    clock.touch('a', now=100.0)
+    clock.touch('b', now=150.0)
+    clock.touch('c', now=190.0)
+
+    idle = clock.idle(['a', 'b', 'c', 'never'], 45.0, now=200.0)
+    if idle != ['never', 'a', 'b']:
+        errors.append(f'idle keys should be least recently used first, untouched ones first of all: {idle}')
+    if clock.idle(['a', 'b', 'c'], 0, now=200.0) != ['a', 'b', 'c']:
+        errors.append('an idle time of 0 should select every key')
+    if clock.idle(['a', 'b', 'c'], 1000.0, now=200.0) != []:
+        errors.append('nothing should be idle for longer than it has existed')
+
+    clock.touch('a', now=199.0)
+    if 'a' in clock.idle(['a', 'b'], 45.0, now=200.0):
+        errors.append('touching a key should make it recent again')
+    clock.forget('b')
+    if clock.idle(['b'], 1000.0, now=200.0) != ['b']:
+        errors.append('a forgotten key should count as never used')
+
+    rss = rss_mb()
+    if sys.platform.startswith('linux') and (rss is None or rss <= 0):
+        errors.append(f'RSS should be readable on Linux: {rss}')
+    if not isinstance(trim_heap(), bool) or not isinstance(trim_heap(), bool):
+        errors.append('trim_heap should report whether it ran, repeatedly')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Memory relief checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
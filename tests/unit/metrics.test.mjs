@@ -0,0 +1,109 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: the metrics registry's counters, gauges and histograms, Prometheus rendering and textfile export.
+ */
+import { mkdtempSync, readFileSync, readdirSync, rmSync } from 'fs';
+import os from 'os';
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+const { MetricsRegistry, TextfileExporter, estimateQuantile, renderPrometheus, getMetrics, markStartup, getStartupMarks } = await import(
+  pathToFileURL(path.join(projectRoot, 'dist/lib/metrics.js')).href
+);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.log(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+const registry = new MetricsRegistry();
+const calls = registry.counter('tool_calls_total', 'Tool calls');
+calls.inc({ tool: 'search_memory', status: 'ok' });
+calls.inc({ status: 'ok', tool: 'search_memory' });
+calls.inc({ tool: 'add_to_memory', status: 'error' }, 3);
+check(registry.counter('tool_calls_total', 'ignored') === calls, 'registering a counter twice should return the same counter');
+
+const latency = registry.histogram('tool_duration_ms', 'Tool latency', [10, 100, 1000]);
+for (const value of [...Array(50).fill(5), ...Array(45).fill(50), ...Array(4).fill(500), 5000]) {
+  latency.observe({ tool: 'search_memory' }, value);
+}
+
+let depth = 2;
+registry.gauge('queue_depth', 'Queue depth', () => [{ labels: { priority: 'bulk' }, value: depth }]);
+registry.gauge('in_flight', 'In flight', () => 1);
+registry.gauge('in_flight', 'In flight', () => 4);
+registry.gauge('broken', 'Throws', () => {
+  throw new Error('gone');
+});
+depth = 7;
+
+const families = registry.snapshot();
+const byName = Object.fromEntries(families.map(family => [family.name, family]));
+const callSeries = byName.tool_calls_total?.series ?? [];
+check(callSeries.length === 2 && callSeries[0].value === 2 && callSeries[1].value === 3,
+  `counters should merge label sets regardless of key order: ${JSON.stringify(callSeries)}`);
+check(byName.queue_depth?.series[0]?.value === 7, 'gauges should be read when metrics are collected');
+check(byName.in_flight?.series[0]?.value === 4 && !byName.broken,
+  'a re-registered gauge should replace the old callback, and failing gauges should be skipped');
+
+const histogram = byName.tool_duration_ms?.series[0];
+check(JSON.stringify(histogram?.buckets) === '[[10,50],[100,95],[1000,99]]' && histogram.count === 100 && histogram.sum === 9500,
+  `histograms should keep cumulative buckets, count and sum: ${JSON.stringify(histogram)}`);
+check(histogram?.p50 === 10 && histogram.p95 > 10 && histogram.p95 <= 100 && histogram.p99 > 100 && histogram.p99 <= 1000,
+  `quantiles should be interpolated within their bucket: ${JSON.stringify(histogram)}`);
+check(estimateQuantile([10], [0, 2], 2, 0.99) === 10 && estimateQuantile([10], [0, 0], 0, 0.5) === null,
+  'overflow quantiles should report the largest bound, and empty histograms null');
+
+const text = renderPrometheus(families, 'memvid_');
+check(text.includes('# TYPE memvid_tool_calls_total counter\n'), 'families should carry a TYPE line');
+check(text.includes('memvid_tool_calls_total{tool="search_memory",status="ok"} 2\n'), `counter samples should carry labels:\n${text}`);
+check(text.includes('memvid_tool_duration_ms_bucket{tool="search_memory",le="100"} 95\n') &&
+  text.includes('memvid_tool_duration_ms_bucket{tool="search_memory",le="+Inf"} 100\n') &&
+  text.includes('memvid_tool_duration_ms_count{tool="search_memory"} 100\n'), `histograms should render buckets, +Inf and count:\n${text}`);
+check(text.includes('memvid_in_flight 4\n'), 'unlabelled samples should have no braces');
+check(renderPrometheus([{ name: 'x', type: 'gauge', help: 'h', series: [{ labels: { path: 'a"b\\c' }, value: 1 }] }], '')
+  .includes('x{path="a\\"b\\\\c"} 1'), 'label values should be escaped');
+
+const stop = latency.startTimer({ tool: 'get_metrics' });
+const elapsed = stop();
+check(elapsed >= 0 && latency.collect().some(series => series.labels.tool === 'get_metrics'), 'timers should record into the histogram');
+check(getMetrics() === getMetrics(), 'getMetrics() should return one shared registry');
+
+const listTools = markStartup('first_list_tools');
+await new Promise(resolve => setTimeout(resolve, 5));
+check(listTools > 0 && markStartup('first_list_tools') === listTools, 'a startup phase should be recorded once, in ms since launch');
+check(markStartup('bridge_ready') > listTools, 'later phases should be later');
+const startup = getMetrics().snapshot().find(family => family.name === 'startup_ms');
+check(startup?.type === 'gauge' && startup.series.length === 2 &&
+  startup.series.find(s => s.labels.phase === 'first_list_tools')?.value === listTools,
+  `startup phases should be exported as the startup_ms gauge: ${JSON.stringify(startup)}`);
+check(getStartupMarks().bridge_ready !== undefined, 'getStartupMarks() should list the phases reached');
+
+const dir = mkdtempSync(path.join(os.tmpdir(), 'memvid-metrics-'));
+try {
+  const target = path.join(dir, 'nested', 'memvid.prom');
+  let renders = 0;
+  const exporter = new TextfileExporter(target, 60000, async () => `sample ${++renders}\n`);
+  check(await exporter.write() === true && readFileSync(target, 'utf-8') === 'sample 1\n', 'write() should create the textfile');
+  await exporter.write();
+  check(readFileSync(target, 'utf-8') === 'sample 2\n', 'later writes should replace the file');
+  check(readdirSync(path.dirname(target)).length === 1, 'no temporary files should be left behind');
+
+  const failing = new TextfileExporter(target, 60000, async () => {
+    throw new Error('bridge gone');
+  });
+  check(await failing.write() === false && readFileSync(target, 'utf-8') === 'sample 2\n',
+    'a failed render should keep the previous file');
+} finally {
+  rmSync(dir, { recursive: true, force: true });
+}
+
+if (failed > 0) {
+  console.log(`${failed} metrics check(s) failed.`);
+  process.exit(1);
+}
+console.log('Metrics checks passed.');
@@ -0,0 +1,114 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: under memory pressure the governor sheds one level at a time, rejects bulk work last and restores on recovery.
+ */
+import { EventEmitter } from 'events';
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+
+const { ResourceGovernor } = await import(pathToFileURL(path.join(projectRoot, 'dist/lib/resource-governor.js')).href);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.error(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+let memoryPercent = 50;
+let rss = 200;
+const bridgeCalls = [];
+let cacheSize = 100;
+const governor = new ResourceGovernor({
+  memoryThresholdPercent: 85,
+  criticalPercent: 95,
+  bridgeRssLimitMb: 1000,
+  recoveryMarginPercent: 5,
+  stepIntervalMs: 1000,
+  idleRetrieverSeconds: 300,
+  searchCacheFraction: 0.25
+}, {
+  systemMemoryPercent: () => memoryPercent,
+  bridgeMemory: async options => {
+    bridgeCalls.push(options);
+    return {
+      rss_mb: rss,
+      evicted_retrievers: options.evictIdleSeconds !== undefined ? ['a.mp4:a.json'] : [],
+      released: options.releaseBuffers ? { chunk_texts: 2 } : {}
+    };
+  },
+  trimCaches: fraction => {
+    const before = cacheSize;
+    cacheSize = Math.floor(100 * fraction);
+    return before - cacheSize;
+  },
+  restoreCaches: () => { cacheSize = 100; }
+});
+
+const t0 = 1_000_000;
+check(await governor.check(t0) === 'normal', 'no pressure should leave the level alone');
+check(governor.getStats().actions_total === 0, 'nothing should be recorded without pressure');
+
+memoryPercent = 90;
+check(await governor.check(t0 + 1000) === 'trim_search_cache', 'pressure should first trim the search cache');
+check(cacheSize === 25, `the search cache should be trimmed to its fraction: ${cacheSize}`);
+check(await governor.check(t0 + 1500) === 'trim_search_cache', 'levels should not change faster than the step interval');
+check(await governor.check(t0 + 2500) === 'evict_idle_retrievers', 'lasting pressure should evict idle retrievers next');
+check(bridgeCalls.some(call => call.evictIdleSeconds === 300 && !call.releaseBuffers), 'the bridge should be asked to evict idle retrievers');
+check(governor.acceptingBulk(), 'bulk work should still be accepted before the last level');
+
+memoryPercent = 96;
+check(await governor.check(t0 + 2600) === 'release_buffers', 'critical pressure should escalate without waiting');
+check(bridgeCalls.at(-1).releaseBuffers === true, 'the bridge should be asked to release its buffers');
+check(await governor.check(t0 + 2700) === 'reject_bulk', 'critical pressure should reach rejecting bulk work');
+check(!governor.acceptingBulk(), 'bulk work should be refused at the last level');
+check(await governor.check(t0 + 2800) === 'reject_bulk', 'the last level should hold under pressure');
+
+// Within the recovery margin nothing is restored yet
+memoryPercent = 82;
+check(await governor.check(t0 + 5000) === 'reject_bulk', 'usage just under the threshold should not restore');
+memoryPercent = 60;
+check(await governor.check(t0 + 6000) === 'release_buffers', 'recovery should step down one level');
+check(governor.acceptingBulk(), 'bulk work should be accepted again after stepping down');
+await governor.check(t0 + 7000);
+await governor.check(t0 + 8000);
+check(cacheSize === 25, 'the search cache should stay trimmed until the last step');
+check(await governor.check(t0 + 9000) === 'normal', 'recovery should return to normal');
+check(cacheSize === 100, 'the search cache size should be restored');
+
+// The bridge RSS alone counts as pressure, with the same margin on recovery
+rss = 1200;
+check(await governor.check(t0 + 10000) === 'trim_search_cache', 'bridge RSS over its limit should count as pressure');
+rss = 980;
+check(await governor.check(t0 + 11000) === 'trim_search_cache', 'RSS within the margin should not count as recovered');
+rss = 900;
+check(await governor.check(t0 + 12000) === 'normal', 'RSS well under the limit should step down');
+
+const stats = governor.getStats();
+const actions = stats.recent_actions.map(action => action.action);
+for (const action of ['trim_search_cache', 'evict_idle_retrievers', 'release_buffers', 'reject_bulk', 'restore']) {
+  check(actions.includes(action), `diagnostics should record ${action}: ${actions.join(', ')}`);
+}
+check(stats.recent_actions.every(action => typeof action.at === 'string' && 'bridge_rss_mb' in action),
+  'recorded actions should carry their time and readings');
+check(stats.bridge_rss_mb === 900 && stats.memory_percent === 60, `the last readings should be reported: ${JSON.stringify(stats)}`);
+
+// Health monitor alerts trigger a check with the alert's memory reading
+const monitor = new EventEmitter();
+governor.attach(monitor);
+memoryPercent = 10;
+rss = 100;
+const before = bridgeCalls.length;
+monitor.emit('criticalAlert', { errors: ['High memory usage: 97.0%'], memoryPercent: 97, timestamp: new Date() });
+await new Promise(resolve => setTimeout(resolve, 10));
+check(bridgeCalls.length > before, 'an alert should trigger a check');
+check(governor.getStats().memory_percent === 97, 'the alert memory reading should be used');
+
+if (failed > 0) {
+  console.error(`${failed} resource governor check(s) failed.`);
+  process.exit(1);
+}
+console.log('Resource governor checks passed.');
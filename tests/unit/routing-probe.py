@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Unit probe: k-means codebooks are deterministic, banks rank by centroid similarity, and summaries round-trip."""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_routing import (  # noqa: E402
+    DEFAULT_CENTROIDS, BankRouter, _centroid_count, compute_codebook, route_summary_path, select_top_m,
+    write_route_summary,
+)
+
+
+def clusters(np, axes: list, per_cluster: int, dimension: int = 8, seed: int = 0):
+    """Tight clusters of vectors around the given unit axes."""
+    rng = np.random.default_rng(seed)
+    vectors = []
+    for axis in axes:
+        center = np.zeros(dimension, dtype='float32')
+        center[axis] = 1.0
+        vectors.append(center + rng.normal(0, 0.05, (per_cluster, dimension)).astype('float32'))
+    return np.concatenate(vectors)
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    if route_summary_path('/banks/notes') != '/banks/notes.route.npz':
+        errors.append('the summary should sit next to the index')
+    os.environ['MEMVID_ROUTING_CENTROIDS'] = '4'
+    if _centroid_count(100) != 4 or _centroid_count(2) != 2:
+        errors.append('the centroid count should follow the variable, capped at the vector count')
+    os.environ['MEMVID_ROUTING_CENTROIDS'] = 'many'
+    if _centroid_count(100) != DEFAULT_CENTROIDS:
+        errors.append('an invalid centroid count should fall back to the default')
+    os.environ.pop('MEMVID_ROUTING_CENTROIDS')
+
+    # Top-M keeps the best scored banks and never prunes banks without a summary
+    ranked = [{'bank_name': 'a', 'score': 0.9}, {'bank_name': 'b', 'score': 0.5}, {'bank_name': 'c', 'score': 0.1},
+              {'bank_name': 'old', 'score': None}]
+    if select_top_m(ranked, 2) != (['a', 'b', 'old'], ['c']):
+        errors.append(f'top-M should select the best scored banks plus unscored ones: {select_top_m(ranked, 2)}')
+    if select_top_m(ranked, 10) != (['a', 'b', 'c', 'old'], []):
+        errors.append('a top-M larger than the candidates should prune nothing')
+
+    # A failed backfill is not retried until the bank's index changes
+    router = BankRouter()
+    router.backfill_failed('/banks/old', 100.0)
+    if router.should_backfill('/banks/old', 100.0):
+        errors.append('a failed backfill should not be retried for the same index')
+    if not router.should_backfill('/banks/old', 101.0) or not router.should_backfill('/banks/other', 100.0):
+        errors.append('a rebuilt index or another bank should be backfilled')
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        # Spherical k-means separates well-separated clusters, the same way every time
+        vectors = clusters(np, [0, 1, 2], 40)
+        centroids, counts = compute_codebook(vectors, k=3, seed=0)
+        again, _ = compute_codebook(vectors, k=3, seed=0)
+        if not np.array_equal(centroids, again):
+            errors.append('k-means should be deterministic for a seed')
+        if sorted(int(axis) for axis in np.argmax(centroids, axis=1)) != [0, 1, 2]:
+            errors.append(f'each cluster should get its own centroid: {np.argmax(centroids, axis=1)}')
+        if sorted(counts.tolist()) != [40, 40, 40]:
+            errors.append(f'every vector should be assigned to its cluster: {counts.tolist()}')
+        if not np.allclose(np.linalg.norm(centroids, axis=1), 1.0, atol=1e-5):
+            errors.append('centroids should be unit-normalized')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            first, second, unrouted = (os.path.join(tmp, name) for name in ('first', 'second', 'unrouted'))
+            written = write_route_summary(first, clusters(np, [0, 3], 20), 'hashing:8')
+            write_route_summary(second, clusters(np, [1], 20, seed=1), 'hashing:8')
+            if written != {'centroids': DEFAULT_CENTROIDS, 'dimension': 8}:
+                errors.append(f'writing should report the codebook shape: {written}')
+            if os.path.exists(f'{route_summary_path(first)}.tmp.npz'):
+                errors.append('the temporary summary file should be replaced')
+
+            summary = router.load(first)
+            if summary is None or summary['model'] != 'hashing:8' or summary['total'] != 40 or \
+                    summary['centroids'].shape != (DEFAULT_CENTROIDS, 8) or int(summary['counts'].sum()) != 40:
+                errors.append(f'the summary should round-trip: {summary}')
+            if router.load(unrouted) is not None:
+                errors.append('a bank without a summary should load as None')
+
+            query = np.zeros(8, dtype='float32')
+            query[1] = 2.0  # not normalized: rank() normalizes the query
+            banks = [{'name': name, 'index_base': base}
+                     for name, base in (('unrouted', unrouted), ('first', first), ('second', second))]
+            ranked = router.rank(query, banks)
+            if [entry['bank_name'] for entry in ranked] != ['second', 'first', 'unrouted']:
+                errors.append(f'banks should rank by best centroid, unscored last: {ranked}')
+            if ranked[-1]['score'] is not None or ranked[-1]['has_summary'] or ranked[0]['chunks'] != 20:
+                errors.append(f'rank entries should report the summary state: {ranked}')
+            if not 0.9 < ranked[0]['score'] <= 1.0001:
+                errors.append(f'the matching bank should score close to 1: {ranked[0]["score"]}')
+            if router.rank(np.zeros(4, dtype='float32'), banks[1:2])[0]['score'] is not None:
+                errors.append('a query of another dimension should leave the bank unscored')
+
+            # Cached summaries reload when the file changes, or after invalidate()
+            path = route_summary_path(first)
+            mtime = os.path.getmtime(path)
+            write_route_summary(first, clusters(np, [1], 10, seed=2), 'hashing:8')
+            os.utime(path, (mtime, mtime))
+            if router.load(first)['total'] != 40:
+                errors.append('a summary should be served from cache while its mtime is unchanged')
+            router.invalidate(first)
+            if router.load(first)['total'] != 10:
+                errors.append('invalidate() should drop the cached summary')
+            write_route_summary(first, clusters(np, [2], 5, seed=3), 'hashing:8')
+            os.utime(path, (mtime + 10, mtime + 10))
+            if router.load(first)['total'] != 5:
+                errors.append('a changed summary file should be reloaded')
+            if router.clear() != 2:
+                errors.append('clear() should report the loaded summaries')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Routing checks passed.' if np is not None else 'Routing checks passed (k-means checks skipped: no numpy).')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
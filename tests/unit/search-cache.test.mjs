@@ -0,0 +1,52 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: results of a search that overlapped an invalidation of its banks are not cached.
+ */
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+
+const { SearchCache } = await import(
+  pathToFileURL(path.join(projectRoot, 'dist/lib/search-cache.js')).href
+);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.error(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+const result = { content: 'old note', score: 0.9, metadata: {}, chunk_id: 0 };
+const key = query => ({ query, memory_banks: ['notes', 'docs'] });
+const cache = new SearchCache(10, 30);
+
+// A search on notes and docs starts, then notes is appended to before it finishes
+let startedAt = cache.invalidationEpoch();
+await cache.invalidateBankCache(['notes']);
+await cache.cacheResults(key('stale'), [result], 1, ['notes', 'docs'], startedAt);
+check(await cache.getCachedResults(key('stale')) === null, 'results from before an invalidation of a searched bank should not be cached');
+
+// An invalidation of a bank the search did not touch keeps its results
+startedAt = cache.invalidationEpoch();
+await cache.invalidateBankCache(['other']);
+await cache.cacheResults(key('fresh'), [result], 1, ['notes', 'docs'], startedAt);
+check((await cache.getCachedResults(key('fresh')))?.results.length === 1, 'invalidating an unrelated bank should not drop the results');
+
+// Clearing the whole cache counts as invalidating every bank
+startedAt = cache.invalidationEpoch();
+await cache.clearCache();
+await cache.cacheResults(key('cleared'), [result], 1, ['docs'], startedAt);
+check(await cache.getCachedResults(key('cleared')) === null, 'results from before clearCache() should not be cached');
+
+// Without an epoch results are cached as before
+await cache.cacheResults(key('plain'), [result], 1, ['notes']);
+check((await cache.getCachedResults(key('plain')))?.results.length === 1, 'cacheResults without startedAt should cache');
+
+if (failed > 0) {
+  console.error(`${failed} search cache check(s) failed.`);
+  process.exit(1);
+}
+console.log('Search cache checks passed.');
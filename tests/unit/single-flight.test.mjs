@@ -0,0 +1,75 @@
+#!/usr/bin/env node
+/**
+ * Unit checks: concurrent identical requests share one in-flight promise.
+ */
+import path from 'path';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const projectRoot = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+
+const { SingleFlight } = await import(
+  pathToFileURL(path.join(projectRoot, 'dist/lib/single-flight.js')).href
+);
+
+let failed = 0;
+function check(condition, message) {
+  if (!condition) {
+    console.error(`FAIL: ${message}`);
+    failed++;
+  }
+}
+
+const flights = new SingleFlight();
+let calls = 0;
+const slowSearch = () => new Promise(resolve => setTimeout(() => resolve(++calls), 20));
+
+const shared = await Promise.all([
+  flights.run('q', slowSearch),
+  flights.run('q', slowSearch),
+  flights.run('q', slowSearch),
+  flights.run('other', slowSearch),
+]);
+check(calls === 2, `expected 2 underlying calls, got ${calls}`);
+check(shared[0] === shared[1] && shared[1] === shared[2], 'identical requests should share one result');
+check(flights.getStats().coalesced === 2 && flights.getStats().leaders === 2, `unexpected stats ${JSON.stringify(flights.getStats())}`);
+check(flights.getStats().inFlight === 0, 'settled flights should be removed');
+
+await flights.run('q', slowSearch);
+check(calls === 3, 'a request after the flight settled should run again');
+
+const failing = () => Promise.reject(new Error('bridge down'));
+const outcomes = await Promise.allSettled([flights.run('bad', failing), flights.run('bad', failing)]);
+check(outcomes.every(o => o.status === 'rejected'), 'joined callers should see the leader\'s error');
+check(flights.getStats().inFlight === 0, 'failed flights should be removed');
+
+const throwing = () => { throw new Error('sync failure'); };
+await flights.run('sync', throwing).catch(() => {});
+check(flights.getStats().inFlight === 0, 'synchronously throwing flights should be removed');
+
+const before = calls;
+const first = flights.run('stale', slowSearch);
+flights.forget();
+const second = flights.run('stale', slowSearch);
+await Promise.all([first, second]);
+check(calls === before + 2, 'requests after forget() should not join the old flight');
+
+// forget(banks) only detaches flights that read one of those banks (or every bank)
+const scoped = new SingleFlight();
+let scopedCalls = 0;
+const scopedSearch = () => new Promise(resolve => setTimeout(() => resolve(++scopedCalls), 20));
+const pending = [
+  scoped.run('notes', scopedSearch, ['notes']),
+  scoped.run('docs', scopedSearch, ['docs']),
+  scoped.run('all', scopedSearch)
+];
+scoped.forget(['notes']);
+check(scoped.getStats().inFlight === 1, `only the unrelated bank's flight should stay joinable: ${JSON.stringify(scoped.getStats())}`);
+pending.push(scoped.run('docs', scopedSearch, ['docs']), scoped.run('notes', scopedSearch, ['notes']), scoped.run('all', scopedSearch));
+await Promise.all(pending);
+check(scopedCalls === 5, `flights on other banks should still be joined after forget(banks): ${scopedCalls} calls`);
+
+if (failed > 0) {
+  console.error(`${failed} single-flight check(s) failed.`);
+  process.exit(1);
+}
+console.log('Single-flight checks passed.');
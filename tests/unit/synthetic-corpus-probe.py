@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Unit probe: synthetic corpora are deterministic and topic-clustered, and the hashing embedder separates topics."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+from bridge_synthetic import HashingEmbedder, SyntheticCorpus, hashing_dimension, percentile  # noqa: E402
+
+
+def dot(a: list, b: list) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    if hashing_dimension('hashing') != 384 or hashing_dimension('hashing:64') != 64:
+        errors.append('hashing model names should parse to their dimension')
+    if hashing_dimension('sentence-transformers/all-MiniLM-L6-v2') is not None or hashing_dimension(None) is not None:
+        errors.append('other model names should not be hashing models')
+    for bad in ('hashing:abc', 'hashing:4'):
+        try:
+            hashing_dimension(bad)
+            errors.append(f'{bad!r} should be rejected')
+        except ValueError:
+            pass
+
+    corpus = SyntheticCorpus(seed=3)
+    again = SyntheticCorpus(seed=3)
+    if [corpus.chunk(i) for i in (0, 1, 999_999)] != [again.chunk(i) for i in (0, 1, 999_999)]:
+        errors.append('chunks should depend only on the seed and index')
+    if corpus.chunk(5) == SyntheticCorpus(seed=4).chunk(5) or corpus.chunk(5) == corpus.chunk(6):
+        errors.append('different seeds and indexes should give different chunks')
+    chunks = list(corpus.chunks(200, chars=300))
+    if any(not 250 <= len(text) <= 300 for text in chunks) or chunks[10] != corpus.chunk(10, chars=300):
+        errors.append(f'chunks should fill but not exceed the size: {sorted(len(t) for t in chunks)[:3]}')
+    if corpus.queries(5) != again.queries(5) or [topic for _, topic in corpus.queries(3)] != [0, 1, 2]:
+        errors.append('queries should be deterministic and cycle through topics')
+
+    embedder = HashingEmbedder(128)
+    vector = embedder.embed_text(chunks[0])
+    if len(vector) != 128 or abs(dot(vector, vector) - 1.0) > 1e-9 or vector != HashingEmbedder(128).embed_text(chunks[0]):
+        errors.append('embeddings should be unit length and identical across instances')
+    if any(embedder.embed_text('')):
+        errors.append('empty text should embed to the zero vector')
+
+    # A topic's query should score its own chunks above other topics' chunks
+    hits = 0
+    queries = corpus.queries(20)
+    vectors = [embedder.embed_text(text) for text in chunks]
+    for query, topic in queries:
+        q = embedder.embed_text(query)
+        best = max(range(len(chunks)), key=lambda i: dot(q, vectors[i]))
+        hits += corpus.topic_of(best) == topic
+    if hits < 18:
+        errors.append(f'queries should retrieve chunks of their own topic ({hits}/20)')
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        batch = embedder.encode(chunks[:3])
+        if batch.shape != (3, 128) or batch.dtype != np.float32 or \
+                not np.allclose(batch[1], embedder.embed_text(chunks[1]), atol=1e-6):
+            errors.append('encode() should match embed_text() as a float32 matrix')
+        if embedder.encode('one text').shape != (128,):
+            errors.append('encode() of a single string should return one vector')
+
+    if percentile([], 99) is not None or percentile([5, 1, 3, 2, 4], 50) != 3 or percentile(list(range(1, 101)), 99) != 99:
+        errors.append('percentile() should use the nearest rank')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Synthetic corpus checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
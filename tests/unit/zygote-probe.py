@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Unit probe: zygote preloads once, forks workers that inherit its state and replaces crashed ones."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src' / 'lib'))
+
+import bridge_zygote  # noqa: E402
+from bridge_zygote import memory_snapshot, run_zygote, zygote_supported  # noqa: E402
+
+
+def main() -> int:
+    errors: list[str] = []
+
+    if not zygote_supported():
+        print('Zygote checks skipped (no fork on this platform).')
+        return 0
+
+    snapshot = memory_snapshot()
+    if snapshot and not {'rss_mb', 'private_mb', 'shared_mb'} <= snapshot.keys():
+        errors.append(f'memory snapshot should split private and shared pages: {snapshot}')
+
+    preloads: list[int] = []
+    events: list[dict] = []
+    read_fd, write_fd = os.pipe()
+
+    def preload() -> dict:
+        preloads.append(os.getpid())
+        return {'weights': bytearray(8 * 1024 * 1024), 'zygote': os.getpid()}
+
+    def serve(state: dict, worker) -> int:
+        worker.mark_ready()
+        report = {'generation': worker.generation, 'inherited': state['zygote'] == worker.zygote_pid,
+                  'startup_ms': worker.startup_ms, 'describe': worker.describe()}
+        os.write(write_fd, (json.dumps(report) + '\n').encode())
+        if worker.generation == 1:
+            raise RuntimeError('simulated worker crash')
+        return 0
+
+    code = run_zygote(preload, serve, events.append)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as reader:
+        reports = [json.loads(line) for line in reader]
+
+    if code != 0:
+        errors.append(f'zygote should exit cleanly once a worker does: {code}')
+    if preloads != [os.getpid()]:
+        errors.append(f'preload should run once, in the zygote: {preloads}')
+    if [report['generation'] for report in reports] != [1, 2]:
+        errors.append(f'a crashed worker should be replaced by a new fork: {reports}')
+    if not all(report['inherited'] for report in reports):
+        errors.append('workers should inherit the preloaded state')
+    if any(report['startup_ms'] is None or report['startup_ms'] >= 1000 for report in reports):
+        errors.append(f'forked workers should start in under a second: {reports}')
+    if reports and reports[0]['describe'].get('mode') != 'zygote':
+        errors.append(f'worker info should describe zygote mode: {reports[0]["describe"]}')
+    if len(events) != 1 or events[0].get('event') != 'worker_exit' or events[0].get('code') != 1:
+        errors.append(f'a crash should be reported as one worker_exit event: {events}')
+
+    # Workers that keep crashing stop the zygote instead of fork-looping
+    bridge_zygote.MAX_RESTARTS = 2
+    crash_events: list[dict] = []
+    code = run_zygote(lambda: None, lambda state, worker: 3, crash_events.append)
+    if code != 1 or len(crash_events) != 3:
+        errors.append(f'crash loop should give up after MAX_RESTARTS: code={code} events={crash_events}')
+
+    if errors:
+        for message in errors:
+            print(f'FAIL: {message}', file=sys.stderr)
+        return 1
+
+    print('Zygote checks passed.')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())